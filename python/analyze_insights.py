@@ -1,156 +1,941 @@
 """
 입찰 히스토리 분석 및 인사이트 생성 스크립트
 Firestore의 입찰 및 낙찰 데이터를 분석하여 통계 생성
+
+- 낙찰 이력(history) 1회 스캔으로 bidId → (낙찰률, 참여업체 수) 조인 인덱스 생성
+- bids 컬렉션은 실행당 1회만 스캔, 기관/업종/지역 × 월/분기/연도 통계를 동시에 누적
+- 그룹별로 입찰 수/예산·낙찰률·참여업체 수 합계만 유지 (메모리: 입찰 수가 아닌 그룹 수에 비례)
+- 추세(trend): 직전 기간 대비 입찰 수 증감률(%), 낙찰률 변화(winRateChange, %p)
+- 증분 모드: 그룹별 누적 상태/조인 키를 InsightIndex(SQLite)에 보관, 소스 커서 이후 변경분만 조회하여
+  반영하고 값이 바뀐 인사이트 문서만 다시 씀 (비용이 전체 이력이 아닌 일일 변경량에 비례)
+  로컬 소스는 파일별 읽은 위치, Firestore는 createdAt/updatedAt/completedAt 워터마크(늦은 도착 재조회 구간 포함)
+- 로컬 모드: 수집 파일(collected_bids_*/collected_awards_*)을 Firestore 없이 집계 (insight_store.py),
+  pandas 컬럼 엔진 선택 가능 - Firestore 경로와 같은 인사이트 문서
+
+실행 예시:
+    python analyze_insights.py
+    python analyze_insights.py --periods year quarter
+    python analyze_insights.py --incremental
+    python analyze_insights.py --full          # 증분 상태 재구성
+    python analyze_insights.py --source local --data-dir ./ --engine pandas
+    python analyze_insights.py --source local --benchmark
 """
 
-import firebase_admin
-from firebase_admin import credentials, firestore
+import os
+import json
+import math
+import time
+import sqlite3
+import hashlib
+import argparse
 from datetime import datetime, timedelta
-from collections import defaultdict
-from typing import Dict, List
-import statistics
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
-class BidAnalyzer:
-    """입찰 데이터 분석 클래스"""
+from insight_store import (
+    FirestoreInsightReader, FirestoreInsightWriter, InsightReader, InsightWriter,
+    JsonInsightWriter, LocalInsightReader, firestore_client, insight_doc_id
+)
+
+# 컬럼 엔진 (선택사항, 로컬 파일 집계용)
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# 분석 차원별 설정 (기간 버킷별 최소 입찰 수)
+DIMENSIONS = {
+    'agency': {'label': '🏛️ 기관별', 'unit': '기관', 'min_bids': 3},
+    'category': {'label': '🏷️ 업종별', 'unit': '업종', 'min_bids': 5},
+    'region': {'label': '📍 지역별', 'unit': '지역', 'min_bids': 3},
+}
+
+# 기간 버킷 단위 ('2026-03' / '2026-Q1' / '2026')
+PERIOD_TYPES = ('month', 'quarter', 'year')
+
+# 인사이트 값 반올림 자릿수 (금액: 원 단위, 낙찰률/경쟁률: 소수 4자리)
+# 집계 엔진별 부동소수점 합산 순서 차이가 문서 값에 드러나지 않도록 함
+AMOUNT_DIGITS = 0
+RATE_DIGITS = 4
+# 합계 정리 자릿수 (입력값 소수 자릿수 이상, 예: 낙찰률 소수 2~3자리)
+# 평균은 이 자릿수로 정리한 합계에서 계산 → 레코드별 누적/셀 합계 롤업/pandas 합산 결과가 같은 값으로 반올림
+SUM_DIGITS = 6
+
+INSIGHT_INDEX_PATH = './insights/insight_index.db'
+LOCAL_INSIGHTS_PATH = './insights/insights.json'
+
+
+@lru_cache(maxsize=4096)
+def _period_keys(month: str) -> Tuple[Tuple[str, str], ...]:
+    """'YYYY-MM' → ((기간 단위, 기간 키), ...)"""
+    year = month[:4]
+    keys = {
+        'month': month,
+        'quarter': f"{year}-Q{(int(month[5:7]) - 1) // 3 + 1}",
+        'year': year,
+    }
+    return tuple((period_type, keys[period_type]) for period_type in PERIOD_TYPES)
+
+
+def period_month(date: Optional[str]) -> Optional[str]:
+    """ISO 날짜 문자열 → 'YYYY-MM' (날짜가 없거나 형식 불일치면 None)"""
+    if not date or date.__class__ is not str or len(date) < 7 or date[4] != '-':
+        return None
+    month = date[:7]
+    if not (month[:4].isdigit() and month[5:7].isdigit() and '01' <= month[5:7] <= '12'):
+        return None
+    return month
+
+
+def period_keys(date: Optional[str]) -> Tuple[Tuple[str, str], ...]:
+    """ISO 날짜 문자열 → 기간 버킷 키 목록 (날짜가 없거나 형식 불일치면 빈 튜플)"""
+    month = period_month(date)
+    return _period_keys(month) if month else ()
+
+
+def period_type(period: str) -> str:
+    """기간 키 → 기간 단위"""
+    if len(period) == 4:
+        return 'year'
+    return 'quarter' if period[5] == 'Q' else 'month'
+
+
+def previous_period(period: str) -> str:
+    """직전 기간 키 ('2026-01' → '2025-12', '2026-Q1' → '2025-Q4', '2026' → '2025')"""
+    year = int(period[:4])
+    if len(period) == 4:
+        return str(year - 1)
+    if period[5] == 'Q':
+        quarter = int(period[6])
+        return f"{year}-Q{quarter - 1}" if quarter > 1 else f"{year - 1}-Q4"
+    month = int(period[5:7])
+    return f"{year}-{month - 1:02d}" if month > 1 else f"{year - 1}-12"
+
+
+def next_period(period: str) -> str:
+    """다음 기간 키 (previous_period의 역)"""
+    year = int(period[:4])
+    if len(period) == 4:
+        return str(year + 1)
+    if period[5] == 'Q':
+        quarter = int(period[6])
+        return f"{year}-Q{quarter + 1}" if quarter < 4 else f"{year + 1}-Q1"
+    month = int(period[5:7])
+    return f"{year}-{month + 1:02d}" if month < 12 else f"{year + 1}-01"
+
+
+def _round(value: Optional[float], digits: int) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+
+def settle(total: float) -> float:
+    """합계 정리 (합산 순서에 따른 마지막 자리 오차 제거, 평균/표준편차 계산 전에 적용)"""
+    return round(total, SUM_DIGITS)
+
+
+def numeric_value(value) -> Optional[float]:
+    """숫자 필드 (결측/파싱 실패/NaN은 None)"""
+    if value.__class__ is int or value.__class__ is float:
+        return value if value - value == 0 else None
+    return None
+
+
+def bid_month(bid: Dict, award=None) -> Optional[str]:
+    """입찰 기간 기준 월 'YYYY-MM' (기준일: 공고일 → 개찰일 → 마감일, 판단 불가면 None)"""
+    return period_month(bid.get('announcementDate') or (award[2] if award is not None else None)
+                        or bid.get('deadline'))
+
+
+class AwardIndex:
+    """낙찰 이력 조인 인덱스 (bidId → (낙찰률, 참여업체 수, 개찰일), 동일 bidId는 마지막 레코드)"""
     
     def __init__(self):
-        # Firebase 초기화 (이미 초기화되었다면 스킵)
-        try:
-            firebase_admin.get_app()
-        except ValueError:
-            cred = credentials.Certificate('serviceAccountKey.json')
-            firebase_admin.initialize_app(cred)
-        
-        self.db = firestore.client()
+        self.awards: Dict[str, Tuple[Optional[float], Optional[float], Optional[str]]] = {}
+        self.scanned = 0
     
-    def analyze_by_agency(self) -> List[Dict]:
-        """기관별 분석"""
-        print("🏛️ 기관별 분석 시작...")
-        
-        bids_ref = self.db.collection('bids')
-        bids = bids_ref.stream()
+    @staticmethod
+    def entry(award: Dict) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+        return (numeric_value(award.get('winnerRate')), numeric_value(award.get('biddersCount')),
+                award.get('opengDate'))
+    
+    def add(self, award: Dict):
+        self.scanned += 1
+        bid_id = award.get('bidId')
+        if bid_id:
+            self.awards[bid_id] = self.entry(award)
+    
+    def add_many(self, awards: Iterable[Dict]) -> 'AwardIndex':
+        for award in awards:
+            self.add(award)
+        return self
+    
+    def get(self, bid_id: Optional[str]):
+        return self.awards.get(bid_id) if bid_id else None
+    
+    def __len__(self) -> int:
+        return len(self.awards)
+
+
+class GroupStats:
+    """
+    그룹 누적 통계 (입찰 수, 예산 합/제곱합, 낙찰률/참여업체 수 합 - 입찰 원본은 보관하지 않음)
+    
+    합계는 Kahan 보정 합산 (pandas groupby sum과 같은 연산 순서 → 집계 엔진 간 동일한 합계)
+    """
+    
+    FIELDS = ('count', 'budget_count', 'budget_sum', 'budget_sumsq',
+              'awarded', 'rate_count', 'rate_sum', 'bidders_count', 'bidders_sum')
+    SUM_FIELDS = ('budget_sum', 'budget_sumsq', 'rate_sum', 'bidders_sum')
+    # 합계별 Kahan 보정값
+    __slots__ = FIELDS + ('budget_sum_c', 'budget_sumsq_c', 'rate_sum_c', 'bidders_sum_c')
+    
+    def __init__(self):
+        self.count = 0
+        self.budget_count = 0
+        self.budget_sum = 0.0
+        self.budget_sumsq = 0.0
+        self.awarded = 0
+        self.rate_count = 0
+        self.rate_sum = 0.0
+        self.bidders_count = 0
+        self.bidders_sum = 0.0
+        self.budget_sum_c = 0.0
+        self.budget_sumsq_c = 0.0
+        self.rate_sum_c = 0.0
+        self.bidders_sum_c = 0.0
+    
+    def add(self, budget: Optional[float], award=None, sign: int = 1):
+        """입찰 1건 누적 (sign=-1이면 증분 갱신에서 이전 기여분 제거)"""
+        self.count += sign
+        if budget is not None:
+            self.budget_count += sign
+            total = self.budget_sum
+            y = sign * budget - self.budget_sum_c
+            self.budget_sum = t = total + y
+            self.budget_sum_c = (t - total) - y
+            total = self.budget_sumsq
+            y = sign * (budget * budget) - self.budget_sumsq_c
+            self.budget_sumsq = t = total + y
+            self.budget_sumsq_c = (t - total) - y
+        if award is not None:
+            self.awarded += sign
+            rate, bidders = award[0], award[1]
+            if rate is not None:
+                self.rate_count += sign
+                total = self.rate_sum
+                y = sign * rate - self.rate_sum_c
+                self.rate_sum = t = total + y
+                self.rate_sum_c = (t - total) - y
+            if bidders is not None:
+                self.bidders_count += sign
+                total = self.bidders_sum
+                y = sign * bidders - self.bidders_sum_c
+                self.bidders_sum = t = total + y
+                self.bidders_sum_c = (t - total) - y
+    
+    def remove(self, budget: Optional[float], award=None):
+        """add의 역 (증분 갱신에서 이전 기여분 제거)"""
+        self.add(budget, award, -1)
+    
+    def merge(self, other: 'GroupStats') -> 'GroupStats':
+        for field in self.__slots__:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        return self
+    
+    @property
+    def mean_budget(self) -> float:
+        return settle(self.budget_sum) / self.budget_count if self.budget_count else 0
+    
+    @property
+    def budget_stdev(self) -> float:
+        """예산 표본 표준편차 (statistics.stdev와 동일 정의)"""
+        if self.budget_count < 2:
+            return 0.0
+        budget_sum = settle(self.budget_sum)
+        variance = (settle(self.budget_sumsq) - budget_sum * budget_sum / self.budget_count) \
+            / (self.budget_count - 1)
+        return math.sqrt(max(variance, 0.0))
+    
+    @property
+    def mean_win_rate(self) -> Optional[float]:
+        """평균 낙찰률 (조인된 낙찰 이력이 없으면 None)"""
+        return settle(self.rate_sum) / self.rate_count if self.rate_count else None
+    
+    @property
+    def mean_competition(self) -> Optional[float]:
+        """평균 참여업체 수 (조인된 낙찰 이력이 없으면 None)"""
+        return settle(self.bidders_sum) / self.bidders_count if self.bidders_count else None
+
+
+class MultiDimensionAggregator:
+    """
+    입찰 1회 순회로 모든 차원(기관/업종/지역) × 기간(월/분기/연도) 그룹 통계를 동시에 누적
+    
+    낙찰 인덱스가 있으면 입찰마다 bidId로 조회하여 같은 그룹에 낙찰률/참여업체 수를 누적 (스트리밍 조인)
+    """
+    
+    def __init__(self, dimensions: Iterable[str] = DIMENSIONS, awards: Optional[AwardIndex] = None):
+        self.dimensions = list(dimensions)
+        self.awards = awards
+        self.groups: Dict[str, Dict[Tuple[str, str], GroupStats]] = {dim: {} for dim in self.dimensions}
+        self.scanned = 0
+        self.matched = 0
+        self.undated = 0
+        self.touched: Optional[set] = None  # 증분 갱신 시 변경된 (차원, 이름, 기간) 추적
+    
+    def add(self, bid: Dict):
+        self.scanned += 1
+        award = self.awards.get(bid.get('id')) if self.awards is not None else None
+        if award is not None:
+            self.matched += 1
+        if not self.apply(bid, award):
+            self.undated += 1
+    
+    def apply(self, bid: Dict, award=None, sign: int = 1) -> bool:
+        """입찰 1건의 기여분 반영 (sign=-1이면 제거, 기간을 정할 수 없으면 False)"""
+        budget = numeric_value(bid.get('budget'))  # 결측/파싱 실패 예산은 평균에서 제외
         
-        agency_data = defaultdict(lambda: {
-            'bids': [],
-            'budgets': [],
-            'win_rates': []
-        })
+        month = bid_month(bid, award)
+        if month is None:
+            return False
+        periods = _period_keys(month)
         
+        touched = self.touched
+        for dim in self.dimensions:
+            name = bid.get(dim, '')
+            if name:
+                groups = self.groups[dim]
+                for _, period in periods:
+                    key = (name, period)
+                    stats = groups.get(key)
+                    if sign > 0:
+                        if stats is None:
+                            stats = groups[key] = GroupStats()
+                        stats.add(budget, award)
+                    else:
+                        stats.remove(budget, award)
+                        if not stats.count:
+                            del groups[key]
+                    if touched is not None:
+                        touched.add((dim, name, period))
+        return True
+    
+    def add_many(self, bids: Iterable[Dict]) -> 'MultiDimensionAggregator':
         for bid in bids:
-            data = bid.to_dict()
-            agency = data.get('agency', '')
-            if agency:
-                agency_data[agency]['bids'].append(data)
-                agency_data[agency]['budgets'].append(data.get('budget', 0))
-        
-        insights = []
-        for agency, data in agency_data.items():
-            if len(data['bids']) >= 3:  # 최소 3건 이상
-                insight = {
-                    'type': 'agency',
-                    'name': agency,
-                    'totalBids': len(data['bids']),
-                    'averageBudget': statistics.mean(data['budgets']) if data['budgets'] else 0,
-                    'averageWinRate': 88.5,  # Mock data
-                    'averageCompetition': 5.2,  # Mock data
-                    'period': '2024',
-                    'trend': 12.5,  # Mock data
-                    'createdAt': datetime.now().isoformat()
-                }
-                insights.append(insight)
-        
-        print(f"✅ {len(insights)}개 기관 분석 완료")
-        return insights
+            self.add(bid)
+        return self
     
-    def analyze_by_category(self) -> List[Dict]:
-        """업종별 분석"""
-        print("🏷️ 업종별 분석 시작...")
+    def merge(self, other: 'MultiDimensionAggregator') -> 'MultiDimensionAggregator':
+        for dim, groups in other.groups.items():
+            ours = self.groups.setdefault(dim, {})
+            for key, stats in groups.items():
+                ours.setdefault(key, GroupStats()).merge(stats)
+        self.scanned += other.scanned
+        self.matched += other.matched
+        self.undated += other.undated
+        return self
+    
+    def insight(self, dim: str, name: str, period: str, created_at: str,
+                period_types: Iterable[str] = PERIOD_TYPES) -> Optional[Dict]:
+        """
+        그룹/기간 1개의 인사이트 문서 (최소 입찰 수 미만이거나 대상 기간 단위가 아니면 None)
         
-        bids_ref = self.db.collection('bids')
-        bids = bids_ref.stream()
+        trend는 직전 기간 대비 입찰 수 증감률(%), 직전 기간 데이터가 없으면 None
+        """
+        groups = self.groups[dim]
+        stats = groups.get((name, period))
+        kind = period_type(period)
+        if stats is None or kind not in period_types or stats.count < DIMENSIONS[dim]['min_bids']:
+            return None
+        prev_period = previous_period(period)
+        prev = groups.get((name, prev_period))
+        win_rate = _round(stats.mean_win_rate, RATE_DIGITS)
+        prev_rate = _round(prev.mean_win_rate, RATE_DIGITS) if prev else None
+        return {
+            'type': dim,
+            'name': name,
+            'totalBids': stats.count,
+            'awardedBids': stats.awarded,
+            'averageBudget': _round(stats.mean_budget, AMOUNT_DIGITS),
+            'budgetStdDev': _round(stats.budget_stdev, AMOUNT_DIGITS),
+            'averageWinRate': win_rate,
+            'averageCompetition': _round(stats.mean_competition, RATE_DIGITS),
+            'period': period,
+            'periodType': kind,
+            'previousPeriod': prev_period,
+            'trend': round((stats.count - prev.count) / prev.count * 100, 1) if prev else None,
+            'winRateChange': round(win_rate - prev_rate, 2)
+            if win_rate is not None and prev_rate is not None else None,
+            'createdAt': created_at
+        }
+    
+    def insights(self, dim: str, created_at: Optional[str] = None,
+                 period_types: Iterable[str] = PERIOD_TYPES) -> List[Dict]:
+        """차원 1개의 인사이트 문서 (기간 버킷별, 최소 입찰 수 이상 그룹만)"""
+        created_at = created_at or datetime.now().isoformat()
+        period_types = set(period_types)
+        results = []
+        for name, period in self.groups[dim]:
+            insight = self.insight(dim, name, period, created_at, period_types)
+            if insight is not None:
+                results.append(insight)
+        results.sort(key=lambda insight: (insight['name'], insight['period']))
+        return results
+
+
+def _numeric_column(frame: 'pd.DataFrame', column: str) -> 'pd.Series':
+    """숫자 컬럼 → float64 (numeric_value와 동일: 숫자형만 사용, 결측/문자열/bool/무한대는 NaN)"""
+    if column not in frame.columns:
+        return pd.Series(float('nan'), index=frame.index)
+    values = frame[column]
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return pd.Series(float('nan'), index=frame.index)
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        numbers = values.astype('float64')
+    else:
+        numbers = pd.Series([numeric_value(value) for value in values], index=frame.index, dtype='float64')
+    return numbers.where(numbers.abs() != math.inf)
+
+
+def _text_column(frame: 'pd.DataFrame', column: str) -> 'pd.Series':
+    """문자열 컬럼 (결측/빈 문자열은 None)"""
+    if column not in frame.columns:
+        return pd.Series(None, index=frame.index, dtype=object)
+    values = frame[column].astype(object)
+    return values.where(values.notna() & (values != ''), None)
+
+
+def aggregate_frames(bids: 'pd.DataFrame', awards: 'pd.DataFrame',
+                     dimensions: Iterable[str] = DIMENSIONS) -> MultiDimensionAggregator:
+    """
+    컬럼 엔진(pandas) 집계 - MultiDimensionAggregator 스트리밍 집계와 같은 그룹 통계
+    
+    낙찰 조인(bidId 마지막 레코드)/기간 기준일/결측 처리 규칙은 스트리밍 경로와 동일
+    """
+    aggregator = MultiDimensionAggregator(dimensions)
+    aggregator.scanned = len(bids)
+    if not len(bids):
+        return aggregator
+    
+    # 낙찰 조인 (bidId당 마지막 레코드)
+    award_ids = _text_column(awards, 'bidId')
+    joined = pd.DataFrame({
+        'bidId': award_ids,
+        'rate': _numeric_column(awards, 'winnerRate'),
+        'bidders': _numeric_column(awards, 'biddersCount'),
+        'opengDate': _text_column(awards, 'opengDate'),
+    })[award_ids.notna()].drop_duplicates('bidId', keep='last').set_index('bidId')
+    
+    frame = pd.DataFrame({'id': _text_column(bids, 'id')}, index=bids.index)
+    matched = frame['id'].isin(joined.index)
+    award = joined.reindex(frame['id'].where(matched, None))
+    award.index = bids.index
+    frame['awarded'] = matched.astype('int64')
+    frame['rate'] = award['rate']
+    frame['bidders'] = award['bidders']
+    frame['budget'] = _numeric_column(bids, 'budget')
+    frame['budget_sq'] = frame['budget'] * frame['budget']
+    aggregator.matched = int(matched.sum())
+    
+    # 기간 기준일: 공고일 → 개찰일 → 마감일
+    date = _text_column(bids, 'announcementDate') \
+        .fillna(award['opengDate'].where(matched, None)) \
+        .fillna(_text_column(bids, 'deadline'))
+    prefixes = date.str[:7]  # 문자열이 아닌 값은 NaN
+    months = prefixes.map({prefix: period_month(prefix) for prefix in prefixes.dropna().unique()})
+    dated = months.notna()
+    aggregator.undated = int((~dated).sum())
+    frame, months = frame[dated], months[dated]
+    frame['month'] = months
+    frame['year'] = months.str[:4]
+    frame['quarter'] = frame['year'] + '-Q' + ((months.str[5:7].astype(int) - 1) // 3 + 1).astype(str)
+    
+    for dim in aggregator.dimensions:
+        names = _text_column(bids, dim).reindex(frame.index)
+        scoped = frame.assign(name=names)[names.notna()]
+        groups = aggregator.groups[dim]
+        for kind in PERIOD_TYPES:
+            grouped = scoped.groupby(['name', kind], sort=False)
+            sums = grouped[['awarded', 'budget', 'budget_sq', 'rate', 'bidders']].sum()
+            counts = grouped[['budget', 'rate', 'bidders']].count()
+            summary = pd.DataFrame({
+                'count': grouped.size(),
+                'budget_count': counts['budget'],
+                'budget_sum': sums['budget'],
+                'budget_sumsq': sums['budget_sq'],
+                'awarded': sums['awarded'],
+                'rate_count': counts['rate'],
+                'rate_sum': sums['rate'],
+                'bidders_count': counts['bidders'],
+                'bidders_sum': sums['bidders'],
+            })
+            columns = [summary[field].tolist() for field in GroupStats.FIELDS]  # numpy → Python 숫자
+            for (name, period), *values in zip(summary.index, *columns):
+                stats = groups[(name, period)] = GroupStats()
+                for field, value in zip(GroupStats.FIELDS, values):
+                    setattr(stats, field, value)
+    return aggregator
+
+
+def insight_digest(insight: Dict) -> str:
+    """인사이트 값 해시 (createdAt 제외 - 값이 바뀐 문서만 다시 쓰기 위함, 증분 빼기 오차는 무시)"""
+    payload = json.dumps({key: float(f'{value:.10g}') if value.__class__ is float else value
+                          for key, value in insight.items() if key != 'createdAt'},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _chunks(records: Iterable, size: int) -> Iterable[List]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _date_key(value):
+    """기간 기준일 보관값 (앞 7자리 'YYYY-MM'만 남겨도 period_month/bid_month 결과는 같음)"""
+    return value[:7] if value.__class__ is str else value
+
+
+class StoredGroups(dict):
+    """
+    차원 1개의 그룹 통계 (조회한 그룹만 SQLite에서 읽어 둠)
+    
+    MultiDimensionAggregator.groups 자리에 그대로 사용, 삭제된 그룹은 None으로 기억 (save 시 행 삭제)
+    """
+    
+    def __init__(self, conn: sqlite3.Connection, dim: str):
+        super().__init__()
+        self.conn = conn
+        self.dim = dim
+    
+    def get(self, key, default=None):
+        if not dict.__contains__(self, key):
+            row = self.conn.execute('SELECT stats FROM groups WHERE dim = ? AND name = ? AND period = ?',
+                                    (self.dim, key[0], key[1])).fetchone()
+            dict.__setitem__(self, key, self.load(row[0]) if row else None)
+        value = dict.__getitem__(self, key)
+        return default if value is None else value
+    
+    def __delitem__(self, key):
+        dict.__setitem__(self, key, None)
+    
+    @staticmethod
+    def load(values: str) -> GroupStats:
+        stats = GroupStats()
+        for field, value in zip(GroupStats.__slots__, json.loads(values)):
+            setattr(stats, field, value)
+        return stats
+    
+    @staticmethod
+    def dump(stats: GroupStats) -> str:
+        return json.dumps([getattr(stats, field) for field in GroupStats.__slots__])
+
+
+class InsightIndex:
+    """
+    증분 인사이트 인덱스 (실행 간 유지, SQLite 파일 하나)
+    
+    - groups: (차원, 이름, 기간) → GroupStats 누적값 (MultiDimensionAggregator 상태, 필요한 그룹만 조회)
+    - bids: 입찰 id → 집계 키 [기관, 업종, 지역, 예산, 공고월, 마감월] (원본 레코드는 보관하지 않음,
+      변경/재수집 시 이전 기여분을 빼고 새 기여분을 더하기 위함)
+    - awards: 낙찰 조인 키 bidId → [낙찰률, 참여업체 수, 개찰월] (입찰보다 먼저 도착한 낙찰도 보관)
+    - written: 문서 ID → 차원, 이름, 기간, 값 해시 - 값이 바뀐 인사이트 문서만 다시 씀
+    - cursors: 소스별 조회 커서 (InsightReader.changes - 로컬은 파일별 읽은 위치, Firestore는 변경 시각)
+    - 이번 실행 키만 조회/갱신하고 변경은 save() 시 한 트랜잭션으로 커밋 (비용이 누적 이력이 아닌 변경량에 비례)
+    """
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS groups (
+        dim TEXT, name TEXT, period TEXT, stats TEXT, PRIMARY KEY (dim, name, period)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS bids (key TEXT PRIMARY KEY, entry TEXT) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS awards (key TEXT PRIMARY KEY, entry TEXT) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS written (
+        doc_id TEXT PRIMARY KEY, dim TEXT, name TEXT, period TEXT, digest TEXT
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+    """
+    CHUNK_SIZE = 500  # 키 조회 배치 크기
+    BID_FIELDS = ('agency', 'category', 'region', 'budget', 'announcementDate', 'deadline')
+    # 소스 컬렉션별 변경 감지 필드 (Firestore 워터마크 커서)
+    CHANGE_FIELDS = {
+        'bids': ('createdAt', 'updatedAt'),
+        'history': ('completedAt',),
+    }
+    
+    def __init__(self, path: str, dimensions: Iterable[str] = DIMENSIONS):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        is_new = not os.path.exists(path)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(self.SCHEMA)
+        self.aggregator = MultiDimensionAggregator(dimensions)
+        self.aggregator.groups = {dim: StoredGroups(self.conn, dim) for dim in self.aggregator.dimensions}
+        self.bids: Dict[str, Optional[List]] = {}    # 이번 실행에서 조회/갱신한 키만
+        self.awards: Dict[str, Optional[tuple]] = {}
+        self.dirty = {'bids': set(), 'awards': set()}
+        meta = dict(self.conn.execute('SELECT name, value FROM meta'))
+        self.cursors: Dict[str, object] = json.loads(meta['cursors']) if meta.get('cursors') else {}
+        legacy_path = os.path.splitext(path)[0] + '.json'
+        if is_new and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+    
+    def _import_legacy(self, legacy_path: str):
+        """이전 JSON 인덱스(insight_index.json) 1회 이관 (워터마크는 커서로, 입찰/낙찰은 집계 키만)"""
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.conn.executemany('INSERT OR REPLACE INTO groups VALUES (?, ?, ?, ?)', (
+            (dim, name, period, json.dumps(values))
+            for dim, rows in data.get('groups', {}).items() for name, period, *values in rows
+        ))
+        self.conn.executemany('INSERT OR REPLACE INTO bids VALUES (?, ?)', (
+            (bid_id, json.dumps(self.bid_entry(dict(zip(self.BID_FIELDS, entry))), ensure_ascii=False))
+            for bid_id, entry in data.get('bids', {}).items()
+        ))
+        self.conn.executemany('INSERT OR REPLACE INTO awards VALUES (?, ?)', (
+            (bid_id, json.dumps([rate, bidders, _date_key(opened)], ensure_ascii=False))
+            for bid_id, (rate, bidders, opened) in data.get('awards', {}).items()
+        ))
+        self.conn.executemany('INSERT OR REPLACE INTO written VALUES (?, ?, ?, ?, ?)', (
+            (doc_id, *entry) for doc_id, entry in data.get('written', {}).items()
+        ))
+        self.cursors = dict(data.get('watermarks', {}))
+        print(f"📦 인사이트 인덱스 이관: {legacy_path} → {self.path} (입찰 {len(data.get('bids', {}))}건)")
+    
+    @classmethod
+    def bid_entry(cls, bid: Dict) -> List:
+        """입찰 집계 키 (그룹 이름, 숫자 예산, 기간 기준일 앞 7자리)"""
+        return [bid.get('agency'), bid.get('category'), bid.get('region'), numeric_value(bid.get('budget')),
+                _date_key(bid.get('announcementDate')), _date_key(bid.get('deadline'))]
+    
+    @staticmethod
+    def award_entry(award: Dict) -> tuple:
+        """낙찰 조인 값 (낙찰률, 참여업체 수, 개찰일 앞 7자리)"""
+        rate, bidders, opened = AwardIndex.entry(award)
+        return rate, bidders, _date_key(opened)
+    
+    def reset(self):
+        """집계 상태 초기화 (전체 재계산용, 작성된 문서 해시는 유지)"""
+        self.conn.execute('DELETE FROM groups')
+        self.conn.execute('DELETE FROM bids')
+        self.conn.execute('DELETE FROM awards')
+        self.aggregator.groups = {dim: StoredGroups(self.conn, dim) for dim in self.aggregator.dimensions}
+        self.bids, self.awards = {}, {}
+        self.dirty = {'bids': set(), 'awards': set()}
+        self.cursors = {}
+    
+    def _fetch(self, table: str, keys: Iterable[str]):
+        """이번 실행에서 아직 조회하지 않은 키만 SQLite에서 읽어 둠 (없는 키는 None)"""
+        cache = self.bids if table == 'bids' else self.awards
+        missing = list({key for key in keys if key not in cache})
+        for start in range(0, len(missing), self.CHUNK_SIZE):
+            chunk = missing[start:start + self.CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = dict(self.conn.execute(f'SELECT key, entry FROM {table} WHERE key IN ({placeholders})', chunk))
+            for key in chunk:
+                entry = rows.get(key)
+                if entry is None:
+                    cache[key] = None
+                else:
+                    cache[key] = json.loads(entry) if table == 'bids' else tuple(json.loads(entry))
+    
+    def _bid(self, bid_id: str, entry: List) -> Dict:
+        return dict(zip(self.BID_FIELDS, entry), id=bid_id)
+    
+    def iter_bids(self) -> Iterable[Dict]:
+        """인덱스에 보관된 입찰 (집계 키만, Firestore 조회 없이 재집계할 때 사용)"""
+        for bid_id, entry in self.conn.execute('SELECT key, entry FROM bids'):
+            yield self._bid(bid_id, json.loads(entry))
+    
+    def load_awards(self) -> AwardIndex:
+        """보관된 낙찰 조인 키 전체 → AwardIndex (큐브 재생성용)"""
+        awards = AwardIndex()
+        awards.awards = {bid_id: tuple(json.loads(entry))
+                         for bid_id, entry in self.conn.execute('SELECT key, entry FROM awards')}
+        return awards
+    
+    def apply_awards(self, awards: Iterable[Dict]) -> Dict[str, int]:
+        """낙찰 이력 반영 (변경된 낙찰이 이미 집계된 입찰에 조인되어 있으면 해당 입찰 기여분 교체)"""
+        summary = {'input': 0, 'changed': 0, 'rejoined': 0}
+        aggregator, index, bids = self.aggregator, self.awards, self.bids
+        for chunk in _chunks(awards, self.CHUNK_SIZE):
+            keys = [str(award['bidId']) for award in chunk if award.get('bidId')]
+            self._fetch('awards', keys)
+            self._fetch('bids', keys)
+            for award in chunk:
+                summary['input'] += 1
+                if not award.get('bidId'):
+                    continue
+                bid_id = str(award['bidId'])
+                entry = self.award_entry(award)
+                old = index[bid_id]
+                if old == entry:
+                    continue
+                summary['changed'] += 1
+                stored = bids[bid_id]
+                if stored is not None:
+                    bid = self._bid(bid_id, stored)
+                    aggregator.apply(bid, old, -1)
+                    aggregator.apply(bid, entry)
+                    summary['rejoined'] += 1
+                index[bid_id] = entry
+                self.dirty['awards'].add(bid_id)
+        return summary
+    
+    def apply_bids(self, bids: Iterable[Dict]) -> Dict[str, int]:
+        """입찰 반영 (신규는 더하고, 집계 키가 바뀐 입찰은 이전 기여분을 뺀 뒤 다시 더함)"""
+        summary = {'input': 0, 'new': 0, 'changed': 0, 'unchanged': 0, 'skipped': 0}
+        aggregator, awards, index = self.aggregator, self.awards, self.bids
+        for chunk in _chunks(bids, self.CHUNK_SIZE):
+            keys = [str(bid['id']) for bid in chunk if bid.get('id')]
+            self._fetch('bids', keys)
+            self._fetch('awards', keys)
+            for bid in chunk:
+                summary['input'] += 1
+                if not bid.get('id'):
+                    summary['skipped'] += 1
+                    continue
+                bid_id = str(bid['id'])
+                entry = self.bid_entry(bid)
+                stored = index[bid_id]
+                if stored == entry:
+                    summary['unchanged'] += 1
+                    continue
+                award = awards[bid_id]
+                if stored is None:
+                    summary['new'] += 1
+                else:
+                    summary['changed'] += 1
+                    aggregator.apply(self._bid(bid_id, stored), award, -1)
+                aggregator.apply(self._bid(bid_id, entry), award)
+                index[bid_id] = entry
+                self.dirty['bids'].add(bid_id)
+        return summary
+    
+    def _written_digests(self, doc_ids: List[str]) -> Dict[str, str]:
+        digests = {}
+        for start in range(0, len(doc_ids), self.CHUNK_SIZE):
+            chunk = doc_ids[start:start + self.CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            digests.update(self.conn.execute(
+                f'SELECT doc_id, digest FROM written WHERE doc_id IN ({placeholders})', chunk))
+        return digests
+    
+    def written_groups(self) -> List[Tuple[str, str, str]]:
+        """작성된 인사이트 문서의 (차원, 이름, 기간) 전체 (전체 재계산 시 삭제 대상 판단용)"""
+        return self.conn.execute('SELECT dim, name, period FROM written').fetchall()
+    
+    def written_count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM written').fetchone()[0]
+    
+    def changed_insights(self, touched: Iterable[Tuple[str, str, str]], created_at: Optional[str] = None,
+                         period_types: Iterable[str] = PERIOD_TYPES) -> Tuple[List[Dict], List[str]]:
+        """
+        변경된 그룹에서 다시 써야 할 인사이트 문서
         
-        category_data = defaultdict(lambda: {
-            'bids': [],
-            'budgets': []
-        })
+        다음 기간 문서의 trend도 바뀌므로 함께 재계산, 값 해시가 같으면 제외
         
-        for bid in bids:
-            data = bid.to_dict()
-            category = data.get('category', '')
-            if category:
-                category_data[category]['bids'].append(data)
-                category_data[category]['budgets'].append(data.get('budget', 0))
-        
-        insights = []
-        for category, data in category_data.items():
-            if len(data['bids']) >= 5:
-                insight = {
-                    'type': 'category',
-                    'name': category,
-                    'totalBids': len(data['bids']),
-                    'averageBudget': statistics.mean(data['budgets']) if data['budgets'] else 0,
-                    'averageWinRate': 86.8,
-                    'averageCompetition': 6.1,
-                    'period': '2024',
-                    'trend': 8.3,
-                    'createdAt': datetime.now().isoformat()
-                }
-                insights.append(insight)
-        
-        print(f"✅ {len(insights)}개 업종 분석 완료")
+        Returns:
+            (갱신할 인사이트 목록, 삭제할 문서 ID 목록 - 최소 입찰 수 미만으로 떨어진 그룹)
+        """
+        created_at = created_at or datetime.now().isoformat()
+        period_types = set(period_types)
+        candidates = set()
+        for dim, name, period in touched:
+            candidates.add((dim, name, period))
+            candidates.add((dim, name, next_period(period)))
+        candidates = sorted(candidates)
+        written = self._written_digests([f"{dim}_{name}_{period}" for dim, name, period in candidates])
+        
+        upserts, deletes = [], []
+        for dim, name, period in candidates:
+            doc_id = f"{dim}_{name}_{period}"
+            insight = self.aggregator.insight(dim, name, period, created_at, period_types)
+            if insight is None:
+                if doc_id in written:
+                    deletes.append(doc_id)
+            elif written.get(doc_id) != insight_digest(insight):
+                upserts.append(insight)
+        return upserts, deletes
+    
+    def mark_written(self, upserts: List[Dict], deletes: List[str]):
+        self.conn.executemany('INSERT OR REPLACE INTO written VALUES (?, ?, ?, ?, ?)', (
+            (insight_doc_id(insight), insight['type'], insight['name'], insight['period'], insight_digest(insight))
+            for insight in upserts
+        ))
+        self.conn.executemany('DELETE FROM written WHERE doc_id = ?', ((doc_id,) for doc_id in deletes))
+    
+    def save(self):
+        """이번 실행에서 바뀐 그룹/입찰/낙찰 키와 커서를 한 트랜잭션으로 커밋"""
+        for dim, groups in self.aggregator.groups.items():
+            rows = list(dict.items(groups))
+            self.conn.executemany('INSERT OR REPLACE INTO groups VALUES (?, ?, ?, ?)', (
+                (dim, name, period, StoredGroups.dump(stats)) for (name, period), stats in rows if stats is not None
+            ))
+            self.conn.executemany('DELETE FROM groups WHERE dim = ? AND name = ? AND period = ?', (
+                (dim, name, period) for (name, period), stats in rows if stats is None
+            ))
+        for table, cache in (('bids', self.bids), ('awards', self.awards)):
+            self.conn.executemany(f'INSERT OR REPLACE INTO {table} VALUES (?, ?)', (
+                (key, json.dumps(cache[key], ensure_ascii=False)) for key in self.dirty[table]
+            ))
+            self.dirty[table] = set()
+        self.conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)', [
+            ('updated_at', datetime.now().isoformat()),
+            ('cursors', json.dumps(self.cursors, ensure_ascii=False)),
+        ])
+        self.conn.commit()
+    
+    def close(self):
+        self.conn.close()
+
+
+class BidAnalyzer:
+    """입찰 데이터 분석 클래스"""
+    
+    def __init__(self, period_types: Iterable[str] = PERIOD_TYPES, reader: Optional[InsightReader] = None,
+                 writer: Optional[InsightWriter] = None, engine: str = 'stream'):
+        """
+        Args:
+            period_types: 인사이트 기간 단위
+            reader: 입찰/낙찰 소스 (기본: Firestore bids/history)
+            writer: 인사이트 저장소 (기본: Firestore insights)
+            engine: 'stream' (레코드 1회 순회) 또는 'pandas' (컬럼 엔진, 소스가 DataFrame을 지원할 때)
+        """
+        if reader is None or writer is None:
+            db = firestore_client()
+            reader = reader or FirestoreInsightReader(db)
+            writer = writer or FirestoreInsightWriter(db)
+        
+        self.reader = reader
+        self.writer = writer
+        self.engine = engine
+        self.period_types = period_types
+        self.aggregator: Optional[MultiDimensionAggregator] = None
+    
+    def load_awards(self) -> AwardIndex:
+        """낙찰 이력(history) 1회 스캔 → 조인 인덱스"""
+        print("📥 낙찰 이력 스캔 중 (bidId 조인 인덱스)...")
+        awards = AwardIndex().add_many(self.reader.stream('history'))
+        print(f"✅ 낙찰 이력 {awards.scanned}건 스캔 완료 (입찰 {len(awards)}건)")
+        return awards
+    
+    def aggregate(self) -> MultiDimensionAggregator:
+        """낙찰 이력 + bids 컬렉션 각 1회 스캔으로 전 차원/기간 집계 (실행당 1번만 읽음)"""
+        if self.aggregator is None:
+            frames = self.reader.frames() if self.engine == 'pandas' and PANDAS_AVAILABLE else None
+            if frames is not None:
+                print("📥 입찰/낙찰 데이터 컬럼 집계 중 (pandas)...")
+                aggregator = aggregate_frames(*frames)
+            else:
+                awards = self.load_awards()
+                print("📥 입찰 데이터 스캔 중 (기관/업종/지역 × 월/분기/연도 동시 집계)...")
+                aggregator = MultiDimensionAggregator(awards=awards).add_many(self.reader.stream('bids'))
+            groups = ', '.join(f"{DIMENSIONS[dim]['unit']} {len({name for name, _ in aggregator.groups[dim]})}개"
+                               for dim in aggregator.dimensions)
+            print(f"✅ 입찰 {aggregator.scanned}건 스캔 완료 ({groups}, "
+                  f"낙찰 조인 {aggregator.matched}건, 날짜 없음 {aggregator.undated}건)")
+            self.aggregator = aggregator
+        return self.aggregator
+    
+    def analyze(self, dim: str) -> List[Dict]:
+        """차원별 분석 (집계 결과 재사용)"""
+        config = DIMENSIONS[dim]
+        print(f"{config['label']} 분석 시작...")
+        insights = self.aggregate().insights(dim, period_types=self.period_types)
+        print(f"✅ {len(insights)}개 {config['unit']} 분석 완료")
         return insights
     
+    def analyze_by_agency(self) -> List[Dict]:
+        """기관별 분석"""
+        return self.analyze('agency')
+    
+    def analyze_by_category(self) -> List[Dict]:
+        """업종별 분석"""
+        return self.analyze('category')
+    
     def analyze_by_region(self) -> List[Dict]:
         """지역별 분석"""
-        print("📍 지역별 분석 시작...")
-        
-        bids_ref = self.db.collection('bids')
-        bids = bids_ref.stream()
-        
-        region_data = defaultdict(lambda: {
-            'bids': [],
-            'budgets': []
-        })
-        
-        for bid in bids:
-            data = bid.to_dict()
-            region = data.get('region', '')
-            if region:
-                region_data[region]['bids'].append(data)
-                region_data[region]['budgets'].append(data.get('budget', 0))
-        
-        insights = []
-        for region, data in region_data.items():
-            if len(data['bids']) >= 3:
-                insight = {
-                    'type': 'region',
-                    'name': region,
-                    'totalBids': len(data['bids']),
-                    'averageBudget': statistics.mean(data['budgets']) if data['budgets'] else 0,
-                    'averageWinRate': 87.2,
-                    'averageCompetition': 5.8,
-                    'period': '2024',
-                    'trend': 5.7,
-                    'createdAt': datetime.now().isoformat()
-                }
-                insights.append(insight)
-        
-        print(f"✅ {len(insights)}개 지역 분석 완료")
-        return insights
+        return self.analyze('region')
     
     def save_insights(self, insights: List[Dict]):
-        """인사이트를 Firestore에 저장"""
+        """인사이트 저장 (기본: Firestore insights 컬렉션)"""
         print(f"\n💾 {len(insights)}건의 인사이트 저장 중...")
+        self.writer.upsert(insights)
+        print("✅ 인사이트 저장 완료")
+    
+    def delete_insights(self, doc_ids: List[str]):
+        """최소 입찰 수 미만으로 떨어진 그룹의 인사이트 문서 삭제"""
+        print(f"🗑️ {len(doc_ids)}건의 인사이트 삭제 중...")
+        self.writer.delete(doc_ids)
+    
+    def run_incremental(self, index_path: str = INSIGHT_INDEX_PATH, full: bool = False) -> Dict:
+        """
+        증분 분석 (지난 실행 이후 추가/변경된 입찰·낙찰만 반영, 값이 바뀐 인사이트 문서만 다시 씀)
         
-        batch = self.db.batch()
+        Args:
+            index_path: 증분 인사이트 인덱스 파일 (SQLite, 같은 이름의 이전 .json 인덱스는 1회 이관)
+            full: True면 집계 상태를 버리고 전체 재계산 (작성된 문서 해시는 유지하여 바뀐 문서만 씀)
         
-        for insight in insights:
-            doc_id = f"{insight['type']}_{insight['name']}_{insight['period']}"
-            doc_ref = self.db.collection('insights').document(doc_id)
-            batch.set(doc_ref, insight, merge=True)
+        Returns:
+            실행 요약 딕셔너리
+        """
+        start_time = time.time()
+        print("\n" + "="*50)
+        print("📊 입찰 데이터 증분 분석 시작" + (" (전체 재계산)" if full else ""))
+        print("="*50 + "\n")
         
-        batch.commit()
-        print("✅ 인사이트 저장 완료")
+        index = InsightIndex(index_path)
+        try:
+            touched = set()
+            if full:
+                touched.update(index.written_groups())
+                index.reset()
+            index.aggregator.touched = touched
+            
+            records, index.cursors['history'] = self.reader.changes(
+                'history', InsightIndex.CHANGE_FIELDS['history'], index.cursors.get('history'))
+            awards = index.apply_awards(records)
+            print(f"📥 낙찰 이력 {awards['input']}건 조회 (변경 {awards['changed']}건, "
+                  f"기존 입찰 재조인 {awards['rejoined']}건)")
+            records, index.cursors['bids'] = self.reader.changes(
+                'bids', InsightIndex.CHANGE_FIELDS['bids'], index.cursors.get('bids'))
+            bids = index.apply_bids(records)
+            print(f"📥 입찰 {bids['input']}건 조회 (신규 {bids['new']}건, 변경 {bids['changed']}건, "
+                  f"변경 없음 {bids['unchanged']}건, id 없음 {bids['skipped']}건)")
+            
+            upserts, deletes = index.changed_insights(touched, period_types=self.period_types)
+            print(f"🔍 변경 그룹 {len(touched)}개 → 인사이트 갱신 {len(upserts)}건, 삭제 {len(deletes)}건")
+            if upserts:
+                self.save_insights(upserts)
+            if deletes:
+                self.delete_insights(deletes)
+            index.mark_written(upserts, deletes)
+            index.save()
+            total_insights = index.written_count()
+        finally:
+            index.close()
+        
+        summary = {
+            'awards': awards,
+            'bids': bids,
+            'touched_groups': len(touched),
+            'upserted': len(upserts),
+            'deleted': len(deletes),
+            'total_insights': total_insights,
+            'duration_sec': round(time.time() - start_time, 2)
+        }
+        print("\n" + "="*50)
+        print(f"✨ 증분 분석 완료: 인사이트 {summary['total_insights']}건 중 "
+              f"{summary['upserted']}건 갱신 ({summary['duration_sec']}초)")
+        print("="*50 + "\n")
+        return summary
     
     def run(self):
         """전체 분석 프로세스 실행"""
@@ -160,6 +945,9 @@ class BidAnalyzer:
         
         all_insights = []
         
+        # 0. 낙찰 이력 + bids 컬렉션 각 1회 스캔 (이후 차원별 분석은 집계 결과만 사용)
+        self.aggregate()
+        
         # 1. 기관별 분석
         agency_insights = self.analyze_by_agency()
         all_insights.extend(agency_insights)
@@ -181,9 +969,67 @@ class BidAnalyzer:
         print("="*50 + "\n")
 
 
+def benchmark(reader: InsightReader, period_types: Iterable[str] = PERIOD_TYPES):
+    """로컬 소스에서 스트리밍 집계 vs 컬럼 엔진(pandas) 집계 시간 및 인사이트 문서 일치 확인"""
+    created_at = datetime.now().isoformat()
+    documents = {}
+    print("⏱️ 인사이트 집계 벤치마크")
+    for engine in ('stream', 'pandas'):
+        if engine == 'pandas' and not PANDAS_AVAILABLE:
+            print("⚠️ pandas가 설치되어 있지 않아 컬럼 엔진을 건너뜁니다.")
+            continue
+        start = time.perf_counter()
+        if engine == 'pandas':
+            aggregator = aggregate_frames(*reader.frames())
+        else:
+            awards = AwardIndex().add_many(reader.stream('history'))
+            aggregator = MultiDimensionAggregator(awards=awards).add_many(reader.stream('bids'))
+        insights = [insight for dim in aggregator.dimensions
+                    for insight in aggregator.insights(dim, created_at, period_types)]
+        elapsed = time.perf_counter() - start
+        documents[engine] = {insight_doc_id(insight): insight for insight in insights}
+        print(f"   {engine:<8} {elapsed * 1000:9.1f}ms  (입찰 {aggregator.scanned:,}건, 인사이트 {len(insights):,}건)")
+    if len(documents) == 2:
+        same = documents['stream'] == documents['pandas']
+        print(f"{'✅' if same else '❌'} 인사이트 문서 일치: {same}")
+
+
 def main():
-    analyzer = BidAnalyzer()
-    analyzer.run()
+    parser = argparse.ArgumentParser(description='입찰 히스토리 분석 및 인사이트 생성')
+    parser.add_argument('--periods', nargs='+', choices=PERIOD_TYPES, default=list(PERIOD_TYPES),
+                       help='인사이트 기간 단위 (기본: month quarter year)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='지난 실행 이후 추가/변경된 입찰·낙찰만 반영 (증분 인덱스 사용)')
+    parser.add_argument('--index', type=str, default=INSIGHT_INDEX_PATH,
+                       help=f'증분 인사이트 인덱스 파일 (기본: {INSIGHT_INDEX_PATH})')
+    parser.add_argument('--full', action='store_true',
+                       help='증분 모드에서 집계 상태를 버리고 전체 재계산 (바뀐 문서만 씀)')
+    parser.add_argument('--source', choices=['firestore', 'local'], default='firestore',
+                       help='입찰/낙찰 소스 및 인사이트 저장소 (기본: firestore)')
+    parser.add_argument('--data-dir', type=str, default='./',
+                       help='로컬 수집 파일 디렉토리 (기본: ./)')
+    parser.add_argument('--output', type=str, default=LOCAL_INSIGHTS_PATH,
+                       help=f'로컬 인사이트 파일 (기본: {LOCAL_INSIGHTS_PATH})')
+    parser.add_argument('--engine', choices=['stream', 'pandas'], default='stream',
+                       help='전체 집계 엔진 (pandas는 로컬 소스에서만, 기본: stream)')
+    parser.add_argument('--benchmark', action='store_true',
+                       help='로컬 소스에서 stream/pandas 집계 시간 및 결과 일치 비교')
+    
+    args = parser.parse_args()
+    
+    if args.source == 'local':
+        reader = LocalInsightReader(args.data_dir)
+        if args.benchmark:
+            benchmark(reader, args.periods)
+            return
+        analyzer = BidAnalyzer(period_types=args.periods, reader=reader,
+                               writer=JsonInsightWriter(args.output), engine=args.engine)
+    else:
+        analyzer = BidAnalyzer(period_types=args.periods, engine=args.engine)
+    if args.incremental or args.full:
+        analyzer.run_incremental(index_path=args.index, full=args.full)
+    else:
+        analyzer.run()
 
 
 if __name__ == '__main__':
@@ -6,6 +6,7 @@ collect_bids.py와 collect_awards.py를 수정하지 않고 호출만 함
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Literal, Optional
@@ -44,6 +45,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+API_LEASE_WAIT_SEC = 300  # lock=queue 요청의 최대 대기 시간
+
 # ==================== Models ====================
 
 class CollectRequest(BaseModel):
@@ -52,9 +55,10 @@ class CollectRequest(BaseModel):
     pages: int = Field(3, ge=1, le=10, description="수집 페이지 수 (1-10)")
     count: Optional[int] = Field(None, ge=1, le=1000, description="Mock 모드시 레코드 수")
     force: bool = Field(False, description="기존 파일 덮어쓰기 여부")
+    lock: Literal["skip", "queue"] = Field("skip", description="이미 수집 중일 때 정책 (skip: 생략, queue: 대기)")
 
 class CollectResponse(BaseModel):
-    status: Literal["completed", "failed"]
+    status: Literal["completed", "failed", "skipped"]
     run_id: str
     trace_id: str
     fetched_items: int
@@ -76,6 +80,18 @@ class RunStatusResponse(BaseModel):
 class AwardsCollectRequest(CollectRequest):
     bids_file: Optional[str] = Field(None, description="입찰 데이터 파일 경로 (조인키 매칭용)")
 
+class PredictionLookupResponse(BaseModel):
+    bid_id: str
+    model_version: str
+    found: bool
+    prediction: Optional[dict] = None
+
+class CubeQueryResponse(BaseModel):
+    found: bool
+    built_at: Optional[str] = None
+    elapsed_ms: float = 0.0
+    rows: list = []
+
 # ==================== Helper Functions ====================
 
 def generate_trace_id() -> str:
@@ -114,7 +130,8 @@ def execute_collect_script(
     run_id: str,
     pages: int,
     count: Optional[int] = None,
-    bids_file: Optional[str] = None
+    bids_file: Optional[str] = None,
+    lock: str = "skip"
 ) -> dict:
     """
     Step 2 수집 스크립트 실행 (Python import 방식)
@@ -126,12 +143,29 @@ def execute_collect_script(
         pages: 페이지 수
         count: Mock 모드 레코드 수
         bids_file: collect_awards.py용 입찰 파일 경로
+        lock: 실행 리스 정책 (skip: 이미 수집 중이면 생략, queue: 끝날 때까지 대기)
     
     Returns:
         실행 결과 딕셔너리
     """
     start_time = time.time()
     
+    from run_lease import LeaseBusy, RunLease
+    job = "collect_bids" if script_name == "collect_bids.py" else "collect_awards"
+    try:
+        lease = RunLease(job, policy=lock, owner=f"api:{run_id}", wait_timeout=API_LEASE_WAIT_SEC).acquire()
+    except LeaseBusy as e:
+        logger.info(f"수집 생략: {e}")
+        return {
+            "success": False,
+            "skipped": True,
+            "fetched_items": 0,
+            "stored_items": 0,
+            "errors_count": 0,
+            "duration_sec": round(time.time() - start_time, 2),
+            "error_message": str(e)
+        }
+    
     try:
         # Import collect_bids 모듈
         if script_name == "collect_bids.py":
@@ -195,6 +229,41 @@ def execute_collect_script(
             "duration_sec": round(duration_sec, 2),
             "error_message": str(e)
         }
+    finally:
+        lease.release()
+
+_prediction_tables = {}
+
+def load_prediction_table(model_version: str):
+    """사전 예측 테이블 로드 (파일 수정 시각 기준 캐시)"""
+    from prescore import PredictionTable, table_path
+    
+    path = table_path(model_version)
+    if not os.path.exists(path):
+        return None
+    
+    mtime = os.path.getmtime(path)
+    cached = _prediction_tables.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, PredictionTable(path))
+        _prediction_tables[path] = cached
+    return cached[1]
+
+_insight_cubes = {}
+
+def load_insight_cube():
+    """인사이트 롤업 큐브 로드 (파일 수정 시각 기준 캐시)"""
+    from insight_cube import CUBE_PATH, InsightCube
+    
+    if not os.path.exists(CUBE_PATH):
+        return None
+    
+    mtime = os.path.getmtime(CUBE_PATH)
+    cached = _insight_cubes.get(CUBE_PATH)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, InsightCube.load(CUBE_PATH))
+        _insight_cubes[CUBE_PATH] = cached
+    return cached[1]
 
 # ==================== API Endpoints ====================
 
@@ -217,12 +286,15 @@ async def collect_bids(request: CollectRequest):
     
     try:
         # collect_bids.py 실행
-        result = execute_collect_script(
+        # 리스 대기(lock=queue)와 수집은 블로킹 → 스레드풀에서 실행 (이벤트 루프 점유 방지)
+        result = await run_in_threadpool(
+            execute_collect_script,
             script_name="collect_bids.py",
             mode=request.mode,
             run_id=run_id,
             pages=request.pages,
-            count=request.count
+            count=request.count,
+            lock=request.lock
         )
         
         # raw 파일 경로
@@ -230,7 +302,7 @@ async def collect_bids(request: CollectRequest):
         
         # 응답 구성
         response = CollectResponse(
-            status="completed" if result["success"] else "failed",
+            status="completed" if result["success"] else ("skipped" if result.get("skipped") else "failed"),
             run_id=run_id,
             trace_id=trace_id,
             fetched_items=result["fetched_items"],
@@ -266,13 +338,16 @@ async def collect_awards(request: AwardsCollectRequest):
     
     try:
         # collect_awards.py 실행
-        result = execute_collect_script(
+        # 리스 대기(lock=queue)와 수집은 블로킹 → 스레드풀에서 실행 (이벤트 루프 점유 방지)
+        result = await run_in_threadpool(
+            execute_collect_script,
             script_name="collect_awards.py",
             mode=request.mode,
             run_id=run_id,
             pages=request.pages,
             count=request.count,
-            bids_file=request.bids_file
+            bids_file=request.bids_file,
+            lock=request.lock
         )
         
         # raw 파일 경로
@@ -280,7 +355,7 @@ async def collect_awards(request: AwardsCollectRequest):
         
         # 응답 구성
         response = CollectResponse(
-            status="completed" if result["success"] else "failed",
+            status="completed" if result["success"] else ("skipped" if result.get("skipped") else "failed"),
             run_id=run_id,
             trace_id=trace_id,
             fetched_items=result["fetched_items"],
@@ -342,6 +417,80 @@ async def get_run_status(run_id: str, data_type: Literal["bids", "awards"] = "bi
             status="not_found"
         )
 
+@app.get("/v1/leases")
+async def get_leases():
+    """실행 리스/대기열/오늘 API 호출량 조회 (스케줄러, API 서버, CLI 공통)"""
+    from run_lease import lease_status
+    return lease_status()
+
+@app.get("/v1/predictions/{bid_id}", response_model=PredictionLookupResponse)
+async def get_prediction(bid_id: str, model_version: Optional[str] = None):
+    """
+    사전 예측 조회 API
+    
+    prescore.py가 저장한 사전 예측 테이블에서 조회 (요청마다 예측하지 않음)
+    model_version 미지정 시 ml_prediction.MODEL_VERSION (요청 시점에 import - Firebase 의존성은 서버 기동과 무관)
+    """
+    if model_version is None:
+        from ml_prediction import MODEL_VERSION
+        model_version = MODEL_VERSION
+    table = load_prediction_table(model_version)
+    prediction = table.get(bid_id) if table else None
+    
+    return PredictionLookupResponse(
+        bid_id=bid_id,
+        model_version=model_version,
+        found=prediction is not None,
+        prediction=prediction
+    )
+
+@app.get("/v1/insights/cube", response_model=CubeQueryResponse)
+async def query_insight_cube(
+    group_by: str = "",
+    agency: Optional[str] = None,
+    category: Optional[str] = None,
+    region: Optional[str] = None,
+    budget_band: Optional[str] = None,
+    month_from: Optional[str] = None,
+    month_to: Optional[str] = None,
+    order_by: str = "totalBids",
+    limit: int = 100,
+    min_bids: int = 1
+):
+    """
+    인사이트 임의 조회 API
+    
+    insight_cube.py가 저장한 롤업 큐브에서 group-by/필터 조합을 조회 시점에 집계
+    (필터 값은 쉼표로 여러 개 지정, 예: region=서울,경기)
+    """
+    from insight_cube import parse_filters
+    
+    cube = load_insight_cube()
+    if cube is None:
+        return CubeQueryResponse(found=False)
+    
+    specs = [f"{dim}={value}" for dim, value in (
+        ("agency", agency), ("category", category), ("region", region), ("budgetBand", budget_band)
+    ) if value]
+    start = time.perf_counter()
+    try:
+        rows = cube.query(
+            [dim for dim in group_by.split(",") if dim],
+            parse_filters(specs, month_from, month_to),
+            order_by=order_by,
+            limit=limit,
+            min_bids=min_bids
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return CubeQueryResponse(
+        found=True,
+        built_at=cube.meta.get("built_at"),
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+        rows=rows
+    )
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
@@ -353,7 +502,10 @@ async def root():
             "health": "/health",
             "collect_bids": "POST /v1/collect/bids",
             "collect_awards": "POST /v1/collect/awards",
-            "run_status": "GET /v1/runs/{run_id}"
+            "run_status": "GET /v1/runs/{run_id}",
+            "leases": "GET /v1/leases",
+            "prediction": "GET /v1/predictions/{bid_id}",
+            "insight_cube": "GET /v1/insights/cube"
         },
         "docs": "/docs"
     }
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+예측 모델 백테스트 (Walk-Forward Backtest)
+입찰-낙찰 조인 히스토리를 시간순으로 재생하며 예측 품질/속도 측정
+
+- Walk-forward: 히스토리를 시간순 (folds + 1)개 구간으로 나누고,
+  i번째 fold는 [0, i] 구간으로 학습 → i+1 구간 예측
+- 모델 × fold 조합을 프로세스 풀에서 병렬 평가
+- 지표: MAE, 신뢰구간 적중률(coverage), 신뢰도 구간별 보정(calibration), 처리량, 예측 지연
+
+실행 예시:
+    python backtest.py --bids collected_bids.json --awards collected_awards_mock_step2_test.json
+    python backtest.py --history history.ndjson --folds 5 --models baseline segment_median --workers 4
+"""
+
+import os
+import json
+import time
+import argparse
+import statistics
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from history_data import load_history
+from win_rate_curves import build_curves
+from ml_prediction import BaselinePredictionModel
+
+
+# ==================== 평가 대상 모델 ====================
+
+class BaselineAdapter:
+    """BaselinePredictionModel (학습 구간 통계 사용)"""
+
+    def fit(self, history: List[Dict]):
+        self.model = BaselinePredictionModel(mock_mode=True, verbose=False).fit(history)
+        return self
+
+    def predict(self, bid_data: Dict) -> Dict:
+        return self.model.predict(bid_data)['prediction']
+
+
+class BaselineRawAdapter(BaselineAdapter):
+    """BaselinePredictionModel (통계적 이상치 필터 없이 학습, 필터 효과 비교용)"""
+
+    def fit(self, history: List[Dict]):
+        self.model = BaselinePredictionModel(mock_mode=True, verbose=False).fit(history, exclude_outliers=False)
+        return self
+
+
+class SegmentMedianModel:
+    """세그먼트 낙찰률 중앙값 + 사분위 구간 (win_rate_curves)"""
+
+    CONFIDENCE = 0.5  # 사분위 구간의 명목 적중률
+
+    def fit(self, history: List[Dict]):
+        self.curves = build_curves(history)
+        return self
+
+    def predict(self, bid_data: Dict) -> Dict:
+        _, sketch = self.curves.lookup(bid_data)
+        if sketch is None:
+            sketch = self.curves.segments.get('*')
+        if sketch is None:
+            rate = BaselinePredictionModel.DEFAULT_RATE
+            return {'predicted_rate': rate, 'range_min': rate - 3.0, 'range_max': rate + 3.0,
+                    'confidence': BaselinePredictionModel.DEFAULT_CONFIDENCE}
+        return {
+            'predicted_rate': sketch.quantile(0.5),
+            'range_min': sketch.quantile(0.25),
+            'range_max': sketch.quantile(0.75),
+            'confidence': self.CONFIDENCE
+        }
+
+
+class GlobalMeanModel:
+    """전체 평균 낙찰률 (비교 기준선)"""
+
+    def fit(self, history: List[Dict]):
+        rates = [row['winnerRate'] for row in history if row.get('winnerRate') is not None]
+        self.mean = statistics.mean(rates) if rates else BaselinePredictionModel.DEFAULT_RATE
+        return self
+
+    def predict(self, bid_data: Dict) -> Dict:
+        return {'predicted_rate': self.mean, 'range_min': self.mean - 3.0,
+                'range_max': self.mean + 3.0, 'confidence': BaselinePredictionModel.DEFAULT_CONFIDENCE}
+
+
+MODELS = {
+    'baseline': BaselineAdapter,
+    'baseline_raw': BaselineRawAdapter,
+    'segment_median': SegmentMedianModel,
+    'global_mean': GlobalMeanModel,
+}
+
+
+# ==================== Walk-Forward ====================
+
+def _event_time(row: Dict) -> str:
+    return row.get('opengDate') or row.get('announcementDate') or ''
+
+
+def walk_forward_windows(n_rows: int, folds: int) -> List[Dict]:
+    """시간순 정렬된 n_rows에 대한 (train_end, test_start, test_end) 목록"""
+    chunk = n_rows // (folds + 1)
+    if chunk == 0:
+        return []
+    return [
+        {'fold': i + 1, 'train_end': chunk * (i + 1), 'test_start': chunk * (i + 1),
+         'test_end': n_rows if i == folds - 1 else chunk * (i + 2)}
+        for i in range(folds)
+    ]
+
+
+_WORKER_HISTORY: List[Dict] = []
+
+
+def _init_worker(history: List[Dict]):
+    global _WORKER_HISTORY
+    _WORKER_HISTORY = history
+
+
+def _evaluate(task: Dict) -> Dict:
+    """모델 1개 × fold 1개 평가 (워커 프로세스)"""
+    history = _WORKER_HISTORY
+    train = history[:task['train_end']]
+    test = history[task['test_start']:task['test_end']]
+
+    fit_start = time.perf_counter()
+    model = MODELS[task['model']]().fit(train)
+    fit_sec = time.perf_counter() - fit_start
+
+    errors, latencies = [], []
+    calibration = {}
+    covered = 0
+
+    for row in test:
+        start = time.perf_counter()
+        pred = model.predict(row)
+        latencies.append(time.perf_counter() - start)
+
+        actual = row['winnerRate']
+        errors.append(abs(pred['predicted_rate'] - actual))
+        hit = pred['range_min'] <= actual <= pred['range_max']
+        covered += hit
+
+        bucket = calibration.setdefault(f"{pred['confidence']:.2f}", {'count': 0, 'covered': 0})
+        bucket['count'] += 1
+        bucket['covered'] += hit
+
+    return {
+        'model': task['model'],
+        'fold': task['fold'],
+        'train_size': len(train),
+        'test_size': len(test),
+        'test_period': [_event_time(test[0]), _event_time(test[-1])] if test else None,
+        'fit_sec': fit_sec,
+        'abs_errors_sum': sum(errors),
+        'covered': covered,
+        'calibration': calibration,
+        'predict_sec': sum(latencies),
+        'latencies': latencies
+    }
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def summarize(results: List[Dict]) -> Dict:
+    """fold별 결과 → 모델별 지표"""
+    models = {}
+    for result in results:
+        models.setdefault(result['model'], []).append(result)
+
+    summary = {}
+    for name, folds in models.items():
+        n = sum(f['test_size'] for f in folds)
+        predict_sec = sum(f['predict_sec'] for f in folds)
+        latencies = sorted(lat for f in folds for lat in f['latencies'])
+
+        calibration = {}
+        for fold in folds:
+            for conf, bucket in fold['calibration'].items():
+                agg = calibration.setdefault(conf, {'count': 0, 'covered': 0})
+                agg['count'] += bucket['count']
+                agg['covered'] += bucket['covered']
+
+        summary[name] = {
+            'predictions': n,
+            'mae': round(sum(f['abs_errors_sum'] for f in folds) / n, 4) if n else None,
+            'coverage': round(sum(f['covered'] for f in folds) / n * 100, 2) if n else None,
+            'calibration': {
+                conf: {
+                    'count': bucket['count'],
+                    'coverage': round(bucket['covered'] / bucket['count'] * 100, 2),
+                    'gap': round(bucket['covered'] / bucket['count'] * 100 - float(conf) * 100, 2)
+                }
+                for conf, bucket in sorted(calibration.items())
+            },
+            'throughput_per_sec': round(n / predict_sec, 1) if predict_sec else None,
+            'latency_ms': {
+                'p50': round(_percentile(latencies, 0.50) * 1000, 4),
+                'p95': round(_percentile(latencies, 0.95) * 1000, 4),
+                'p99': round(_percentile(latencies, 0.99) * 1000, 4)
+            },
+            'fit_sec': round(sum(f['fit_sec'] for f in folds), 4),
+            'folds': [
+                {
+                    'fold': f['fold'],
+                    'train_size': f['train_size'],
+                    'test_size': f['test_size'],
+                    'test_period': f['test_period'],
+                    'mae': round(f['abs_errors_sum'] / f['test_size'], 4) if f['test_size'] else None,
+                    'coverage': round(f['covered'] / f['test_size'] * 100, 2) if f['test_size'] else None
+                }
+                for f in sorted(folds, key=lambda x: x['fold'])
+            ]
+        }
+    return summary
+
+
+def run_backtest(history: List[Dict], models: List[str], folds: int = 5, workers: int = 1) -> Dict:
+    """
+    Walk-forward 백테스트 실행
+
+    Args:
+        history: 조인된 히스토리 레코드 (history_data.join_bids_awards)
+        models: MODELS 키 목록
+        folds: walk-forward fold 수
+        workers: 병렬 프로세스 수
+    """
+    history = sorted((row for row in history if row.get('winnerRate') is not None), key=_event_time)
+    windows = walk_forward_windows(len(history), folds)
+    tasks = [dict(window, model=name) for name in models for window in windows]
+
+    print(f"🧪 백테스트: {len(history)}건, {len(windows)} folds × {len(models)} 모델 (workers={workers})")
+    start = time.perf_counter()
+
+    if workers <= 1:
+        _init_worker(history)
+        results = [_evaluate(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(history,)) as executor:
+            results = list(executor.map(_evaluate, tasks))
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'history_size': len(history),
+        'folds': len(windows),
+        'workers': workers,
+        'elapsed_sec': round(time.perf_counter() - start, 3),
+        'models': summarize(results)
+    }
+
+
+# ==================== 리포트 ====================
+
+def generate_markdown_report(report: Dict, output_path: str):
+    """Markdown 백테스트 리포트 생성"""
+    lines = [
+        "# 예측 모델 백테스트 리포트 (Walk-Forward Backtest)",
+        "",
+        f"**생성일시**: {report['generated_at']}",
+        f"**히스토리**: {report['history_size']:,}건 / {report['folds']} folds / workers={report['workers']}",
+        f"**소요 시간**: {report['elapsed_sec']}초",
+        "",
+        "## 📊 모델 비교",
+        "",
+        "| 모델 | 예측 수 | MAE (%p) | 구간 적중률 | 처리량 (건/초) | p50 지연 (ms) | p95 지연 (ms) |",
+        "|------|--------|----------|------------|---------------|--------------|--------------|",
+    ]
+    for name, m in report['models'].items():
+        lines.append(
+            f"| {name} | {m['predictions']:,} | {m['mae']} | {m['coverage']}% | "
+            f"{m['throughput_per_sec']} | {m['latency_ms']['p50']} | {m['latency_ms']['p95']} |"
+        )
+
+    for name, m in report['models'].items():
+        lines += [
+            "",
+            f"## 🎯 {name}",
+            "",
+            "### 신뢰도 보정 (Calibration)",
+            "",
+            "| 신뢰도 | 건수 | 실제 적중률 | 차이 (%p) |",
+            "|--------|------|------------|-----------|",
+        ]
+        for conf, bucket in m['calibration'].items():
+            lines.append(f"| {conf} | {bucket['count']} | {bucket['coverage']}% | {bucket['gap']:+.2f} |")
+
+        lines += [
+            "",
+            "### Fold별 결과",
+            "",
+            "| Fold | 학습 | 평가 | 평가 기간 | MAE | 적중률 |",
+            "|------|------|------|----------|-----|--------|",
+        ]
+        for fold in m['folds']:
+            period = ' ~ '.join(p[:10] for p in fold['test_period']) if fold['test_period'] else '-'
+            lines.append(
+                f"| {fold['fold']} | {fold['train_size']} | {fold['test_size']} | {period} | "
+                f"{fold['mae']} | {fold['coverage']}% |"
+            )
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    print(f"📝 Markdown 리포트 생성: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='예측 모델 walk-forward 백테스트')
+    parser.add_argument('--bids', type=str, help='입찰 데이터 파일 (collected_bids_*.json)')
+    parser.add_argument('--awards', type=str, help='낙찰 데이터 파일 (collected_awards_*.json)')
+    parser.add_argument('--history', type=str, help='조인된 히스토리 파일 (JSON/NDJSON)')
+    parser.add_argument('--models', nargs='+', choices=list(MODELS), default=list(MODELS),
+                       help='평가할 모델 (기본: 전체)')
+    parser.add_argument('--folds', type=int, default=5, help='walk-forward fold 수 (기본: 5)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                       help='병렬 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--output-dir', type=str, default='./reports',
+                       help='리포트 출력 디렉토리 (기본: ./reports)')
+    parser.add_argument('--run-id', type=str,
+                       help='실행 ID (없으면 timestamp 자동 생성, 파일명에 포함)')
+
+    args = parser.parse_args()
+
+    if args.history:
+        history = load_history(args.history)
+    elif args.bids and args.awards:
+        history = load_history(args.bids, args.awards)
+    else:
+        parser.error('--history 또는 --bids/--awards가 필요합니다')
+
+    report = run_backtest(history, args.models, folds=args.folds, workers=args.workers)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    run_id = args.run_id if args.run_id else datetime.now().strftime('%Y%m%d_%H%M%S')
+    json_path = os.path.join(args.output_dir, f'backtest_report_{run_id}.json')
+    md_path = os.path.join(args.output_dir, f'backtest_report_{run_id}.md')
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📄 JSON 리포트 생성: {json_path}")
+    generate_markdown_report(report, md_path)
+
+    print("\n" + "="*60)
+    print("🧪 백테스트 결과")
+    print("="*60)
+    for name, m in report['models'].items():
+        print(f"{name:>15}: MAE {m['mae']}%p | 적중률 {m['coverage']}% | "
+              f"{m['throughput_per_sec']}건/초 | p95 {m['latency_ms']['p95']}ms")
+    print("="*60 + "\n")
+
+
+if __name__ == '__main__':
+    main()
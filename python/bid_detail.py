@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+입찰 상세 보강 (Enrichment)
+목록 API(_normalize_bids)에 없는 자격 요건(면허/참가가능지역), 첨부파일, 기초금액을
+공고별 상세 오퍼레이션으로 조회해 입찰 레코드에 병합 → document_generator 체크리스트에 사용
+
+- 신규/변경 입찰만 조회: 목록 필드 지문(fingerprint)이 캐시와 같으면 API 호출 없이 캐시 사용
+- 영구 응답 캐시 (SQLite, ./state/bid_detail_cache.db): 오퍼레이션별 ETag + 응답 본문 해시
+  - 변경 입찰 재조회 시 If-None-Match 조건부 요청 → 304면 캐시된 파싱 결과 재사용
+  - ETag가 없는 응답은 본문 해시로 변경 여부 판단 (같으면 파싱 생략)
+- 기초금액은 공고 업종(용역/공사/물품 목록 오퍼레이션)에 맞는 상세 오퍼레이션으로 조회
+- 문서 생성(DocumentGenerator.generate_document)은 attach_details로 캐시된 보강 필드를 병합
+- 동시 조회 수 제한 (기본 4) + 공유 연결 풀 + 서비스 호출 예산 (run_lease.ApiBudget)
+- 일부 오퍼레이션이 실패한 입찰은 지문을 기록하지 않음 → 다음 실행에서 다시 조회
+- 실행 비용 (API 호출/304/본문 동일/오류/캐시 적중/소요 시간)을 통계로 반환
+
+실행 예시:
+    python bid_detail.py --bids-file collected_bids_mock_test001.json
+    python bid_detail.py --bids-file collected_bids_real_prod001.json --source real --concurrency 8
+    python bid_detail.py --bids-file collected_bids_real_prod001.json --source real --refresh
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import sqlite3
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from collect_bids import API_KEY, BASE_URL
+from g2b_parsers import parse_number
+from run_lease import ApiBudget, BudgetExhausted
+
+
+DETAIL_CACHE_PATH = './state/bid_detail_cache.db'
+
+# 보강 필드 → 상세 오퍼레이션 (입찰공고번호 기준 조회, 기초금액은 용역 기준)
+DETAIL_OPERATIONS = {
+    'licenseLimits': 'getBidPblancListInfoLicenseLimit01',
+    'regionLimits': 'getBidPblancListInfoPrtcptPsblRgn01',
+    'basePrice': 'getBidPblancListInfoServcBsisAmount01',
+    'attachments': 'getBidPblancListInfoEorderAtchFileInfo01',
+}
+# 업종 → 기초금액 오퍼레이션 (공사/물품 공고는 목록 오퍼레이션별 업종이 고정 - collect_bids.OPERATION_CATEGORIES)
+BASE_PRICE_OPERATIONS = {
+    '건설': 'getBidPblancListInfoCnstwkBsisAmount01',
+    '물품': 'getBidPblancListInfoThngBsisAmount01',
+}
+
+# 변경 감지 대상 목록 필드 (createdAt 등 수집 시각 필드 제외)
+FINGERPRINT_FIELDS = ('title', 'agency', 'budget', 'estimatedPrice', 'deadline',
+                      'announcementDate', 'bidMethod', 'detailUrl')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bids (
+    bid_id TEXT PRIMARY KEY, fingerprint TEXT, detail TEXT, fetched_at TEXT
+);
+CREATE TABLE IF NOT EXISTS responses (
+    bid_id TEXT, operation TEXT, etag TEXT, body_hash TEXT, parsed TEXT,
+    PRIMARY KEY (bid_id, operation)
+);
+"""
+
+
+def fingerprint(bid: Dict[str, Any]) -> str:
+    """목록 필드 지문 (값이 바뀌면 상세 재조회)"""
+    payload = json.dumps({field: bid.get(field) for field in FINGERPRINT_FIELDS},
+                         ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def detail_operations(bid: Dict[str, Any]) -> Dict[str, str]:
+    """입찰 1건의 보강 필드 → 상세 오퍼레이션 (기초금액은 수집 오퍼레이션(업종)에 맞춤)"""
+    base_price = BASE_PRICE_OPERATIONS.get(bid.get('category'))
+    return dict(DETAIL_OPERATIONS, basePrice=base_price) if base_price else DETAIL_OPERATIONS
+
+
+def parse_detail(field: str, items: List[Dict]) -> Any:
+    """상세 오퍼레이션 응답 items → 보강 필드 값"""
+    if field == 'licenseLimits':
+        return [item.get('lcnsLmtNm', '').strip() for item in items if item.get('lcnsLmtNm', '').strip()]
+    if field == 'regionLimits':
+        return [item.get('prtcptPsblRgnNm', '').strip() for item in items
+                if item.get('prtcptPsblRgnNm', '').strip()]
+    if field == 'basePrice':
+        return parse_number(items[0].get('bssamt')) if items else None
+    if field == 'attachments':
+        return [{'name': item.get('eorderAtchFileNm', '').strip(), 'url': item.get('eorderAtchFileUrl', '').strip()}
+                for item in items if item.get('eorderAtchFileNm', '').strip()]
+    raise ValueError(f"알 수 없는 보강 필드: {field}")
+
+
+class DetailCache:
+    """상세 응답 영구 캐시 (조회/저장은 호출 스레드에서만)"""
+
+    def __init__(self, path: str = DETAIL_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(SCHEMA)
+
+    def lookup(self, bid_id: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """(지문, 보강 필드) - 없으면 (None, None)"""
+        row = self.conn.execute('SELECT fingerprint, detail FROM bids WHERE bid_id = ?', (bid_id,)).fetchone()
+        return (row[0], json.loads(row[1])) if row else (None, None)
+
+    def validators(self, bid_id: str) -> Dict[str, Tuple[Optional[str], Optional[str], Any]]:
+        """오퍼레이션별 (ETag, 본문 해시, 파싱 결과)"""
+        rows = self.conn.execute('SELECT operation, etag, body_hash, parsed FROM responses WHERE bid_id = ?',
+                                 (bid_id,)).fetchall()
+        return {operation: (etag, body_hash, json.loads(parsed)) for operation, etag, body_hash, parsed in rows}
+
+    def store(self, bid_id: str, responses: Dict[str, Tuple[Optional[str], Optional[str], Any]],
+              bid_fingerprint: Optional[str] = None, detail: Optional[Dict] = None):
+        """응답 검증값 저장 (지문/보강 필드는 모든 오퍼레이션 성공 시에만)"""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                [(bid_id, operation, etag, body_hash, json.dumps(parsed, ensure_ascii=False))
+                 for operation, (etag, body_hash, parsed) in responses.items()])
+            if bid_fingerprint:
+                self.conn.execute('INSERT OR REPLACE INTO bids VALUES (?, ?, ?, ?)',
+                                  (bid_id, bid_fingerprint, json.dumps(detail, ensure_ascii=False),
+                                   datetime.now().isoformat()))
+
+    def close(self):
+        self.conn.close()
+
+
+class BidDetailEnricher:
+    """입찰 상세 보강 (신규/변경 입찰만 제한된 동시성으로 조회)"""
+
+    def __init__(self, source: str = 'mock', concurrency: int = 4, cache_path: str = DETAIL_CACHE_PATH,
+                 session=None):
+        """
+        Args:
+            source: 'mock' (샘플 상세) 또는 'real' (실제 API)
+            concurrency: 동시 상세 조회 입찰 수
+            cache_path: 영구 응답 캐시 경로
+            session: 공유 requests.Session (없으면 real 모드에서 연결 풀 생성)
+        """
+        if source == 'real' and not API_KEY:
+            raise ValueError("❌ API 키가 없습니다. 환경 변수 DATA_PORTAL_API_KEY를 설정하세요.")
+        self.source = source
+        self.concurrency = max(1, concurrency)
+        self.cache_path = cache_path
+        self.api_key = API_KEY
+        self.base_url = BASE_URL
+        self.budget = ApiBudget(BASE_URL.rsplit('/', 1)[-1])  # 목록 수집기와 같은 서비스 예산
+        self.session = session
+        if source == 'real' and session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=self.concurrency)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+
+    def enrich(self, bids: Iterable[Dict], refresh: bool = False) -> Tuple[List[Dict], Dict[str, Any]]:
+        """
+        입찰 상세 보강
+
+        Args:
+            bids: 입찰 레코드 (목록 수집 결과)
+            refresh: True면 지문이 같아도 조건부 요청으로 재검증
+
+        Returns:
+            (보강 필드가 병합된 입찰 복사본, 실행 통계)
+        """
+        start = time.time()
+        stats = {'bids': 0, 'cached': 0, 'fetched': 0, 'failed': 0, 'api_calls': 0,
+                 'modified': 0, 'not_modified': 0, 'unchanged': 0, 'error': 0, 'skipped': 0}
+        cache = DetailCache(self.cache_path)
+        enriched, pending, seen = [], {}, set()
+        try:
+            for bid in bids:
+                bid_id = bid.get('id')
+                if not bid_id or bid_id in seen:
+                    continue
+                seen.add(bid_id)
+                stats['bids'] += 1
+                bid_fingerprint = fingerprint(bid)
+                cached_fingerprint, detail = cache.lookup(bid_id)
+                if cached_fingerprint == bid_fingerprint and not refresh:
+                    stats['cached'] += 1
+                    enriched.append({**bid, **detail})
+                else:
+                    pending[bid_id] = (bid, bid_fingerprint, cache.validators(bid_id), detail)
+
+            if pending:
+                print(f"🔎 상세 조회: {len(pending)}건 (캐시 적중 {stats['cached']}건, 동시 {self.concurrency})")
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                futures = {executor.submit(self._fetch_bid, bid_id, detail_operations(bid), validators): bid_id
+                           for bid_id, (bid, _, validators, _) in pending.items()}
+                for future in as_completed(futures):
+                    bid_id = futures[future]
+                    bid, bid_fingerprint, _, previous = pending[bid_id]
+                    responses, outcomes = future.result()
+                    for outcome in outcomes:
+                        stats[outcome] += 1
+                    stats['api_calls'] += sum(1 for outcome in outcomes if outcome != 'skipped')
+
+                    operations = detail_operations(bid)
+                    if len(responses) == len(operations):
+                        detail = {field: responses[operation][2] for field, operation in operations.items()}
+                        detail['detailFetchedAt'] = datetime.now().isoformat()
+                        cache.store(bid_id, responses, bid_fingerprint, detail)
+                        stats['fetched'] += 1
+                        enriched.append({**bid, **detail})
+                    else:
+                        cache.store(bid_id, responses)
+                        stats['failed'] += 1
+                        enriched.append({**bid, **(previous or {})})  # 이전 보강 결과 유지
+        finally:
+            cache.close()
+
+        stats['duration_sec'] = round(time.time() - start, 2)
+        print(f"✅ 상세 보강 완료: 조회 {stats['fetched']}건, 캐시 {stats['cached']}건, 실패 {stats['failed']}건 "
+              f"(API {stats['api_calls']}회, 304 {stats['not_modified']}회, {stats['duration_sec']}초)")
+        return enriched, stats
+
+    def _fetch_bid(self, bid_id: str, operations: Dict[str, str],
+                   validators: Dict) -> Tuple[Dict, List[str]]:
+        """입찰 1건 상세 오퍼레이션 조회 (실행 스레드) → ({오퍼레이션: 검증값}, 결과 목록: modified | not_modified | unchanged | error | skipped)"""
+        responses, outcomes = {}, []
+        for field, operation in operations.items():
+            if self.source == 'mock':
+                responses[operation] = (None, None, self._mock_detail(bid_id, field))
+                continue
+            response, outcome = self._fetch_operation(bid_id, field, operation, validators.get(operation))
+            outcomes.append(outcome)
+            if response:
+                responses[operation] = response
+        return responses, outcomes
+
+    def _fetch_operation(self, bid_id: str, field: str, operation: str,
+                         validator: Optional[Tuple]) -> Tuple[Optional[Tuple], str]:
+        """상세 오퍼레이션 1회 조건부 요청 → ((ETag, 본문 해시, 파싱 결과), 결과)"""
+        etag, body_hash, parsed = validator or (None, None, None)
+        params = {
+            'serviceKey': self.api_key,
+            'numOfRows': 100,
+            'pageNo': 1,
+            'inqryDiv': '2',  # 입찰공고번호 기준
+            'bidNtceNo': bid_id,
+            'type': 'json'
+        }
+        headers = {'If-None-Match': etag} if etag else {}
+        try:
+            self.budget.acquire()
+            response = self.session.get(f'{self.base_url}/{operation}', params=params, headers=headers, timeout=30)
+        except BudgetExhausted as e:
+            print(f"🛑 {e} - 상세 조회 생략 ({bid_id})")
+            return None, 'skipped'
+        except Exception as e:
+            print(f"⚠️ 상세 조회 실패 ({bid_id} {operation}): {e}")
+            return None, 'error'
+
+        if response.status_code == 304 and validator:
+            return (etag, body_hash, parsed), 'not_modified'
+        if response.status_code != 200:
+            if response.status_code == 429:
+                self.budget.defer(30 + random.uniform(0, 10))  # 다른 수집기도 함께 대기
+            print(f"⚠️ [{response.status_code}] 상세 조회 실패 ({bid_id} {operation})")
+            return None, 'error'
+
+        new_hash = hashlib.sha1(response.content).hexdigest()
+        new_etag = response.headers.get('ETag')
+        if validator and new_hash == body_hash:
+            return (new_etag, new_hash, parsed), 'unchanged'
+        try:
+            items = response.json().get('response', {}).get('body', {}).get('items', []) or []
+            return (new_etag, new_hash, parse_detail(field, items)), 'modified'
+        except Exception as e:
+            print(f"⚠️ 상세 응답 파싱 실패 ({bid_id} {operation}): {e}")
+            return None, 'error'
+
+    def _mock_detail(self, bid_id: str, field: str) -> Any:
+        """Mock 상세 (입찰 ID 기준 결정적 샘플)"""
+        rng = random.Random(f'{bid_id}:{field}')
+        if field == 'licenseLimits':
+            return rng.sample(['소프트웨어사업자', '정보통신공사업', '엔지니어링사업자', '전기공사업'], rng.randint(1, 2))
+        if field == 'regionLimits':
+            return rng.choice([[], ['서울특별시'], ['경기도', '인천광역시']])
+        if field == 'basePrice':
+            return rng.randint(30, 800) * 1000000
+        return [{'name': name, 'url': f'https://www.g2b.go.kr/attach/{bid_id}/{index}'}
+                for index, name in enumerate(['입찰공고서.hwp', '과업지시서.pdf', '제안요청서.hwp'][:rng.randint(1, 3)])]
+
+
+def attach_details(bids: Iterable[Dict], cache_path: str = DETAIL_CACHE_PATH) -> List[Dict]:
+    """캐시된 보강 필드만 병합 (API 호출 없음, 지문이 달라도 마지막 조회 결과 사용)"""
+    if not os.path.exists(cache_path):
+        return list(bids)
+    cache = DetailCache(cache_path)
+    try:
+        return [{**bid, **(cache.lookup(bid.get('id'))[1] or {})} for bid in bids]
+    finally:
+        cache.close()
+
+
+def main():
+    from data_quality import RecordSource
+
+    parser = argparse.ArgumentParser(description='입찰 상세 보강 (자격 요건/첨부파일/기초금액)')
+    parser.add_argument('--bids-file', type=str, nargs='+', required=True,
+                       help='입찰 수집 파일 (collected_bids_*.json, 여러 개 가능)')
+    parser.add_argument('--source', choices=['mock', 'real'], default='mock',
+                       help='데이터 소스: mock (샘플) 또는 real (실제 API)')
+    parser.add_argument('--concurrency', type=int, default=4,
+                       help='동시 상세 조회 입찰 수 (기본: 4)')
+    parser.add_argument('--refresh', action='store_true',
+                       help='변경 없는 입찰도 조건부 요청(ETag/본문 해시)으로 재검증')
+    parser.add_argument('--cache', type=str, default=DETAIL_CACHE_PATH,
+                       help=f'응답 캐시 경로 (기본: {DETAIL_CACHE_PATH})')
+    parser.add_argument('--output', type=str,
+                       help='보강 결과 저장 경로 (JSON, 없으면 통계만 출력)')
+
+    args = parser.parse_args()
+
+    enricher = BidDetailEnricher(source=args.source, concurrency=args.concurrency, cache_path=args.cache)
+    enriched, stats = enricher.enrich(RecordSource(args.bids_file), refresh=args.refresh)
+
+    print("\n📊 상세 보강 통계")
+    for key, value in stats.items():
+        print(f"  {key:14s} {value}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(enriched, f, ensure_ascii=False, indent=2)
+        print(f"💾 저장 완료: {args.output} ({len(enriched)}건)")
+
+
+if __name__ == '__main__':
+    main()
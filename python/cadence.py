@@ -0,0 +1,246 @@
+"""
+적응형 수집 주기 (Adaptive Collection Cadence)
+요일 × 시간대별 신규 공고 도착률을 학습하고, API 호출 예산 안에서 도착이 많은 시간대에 더 자주 수집
+
+- ArrivalRateModel: 수집 간격 동안 새로 들어온 공고 수(증분 품질 인덱스의 신규 건수)를
+  구간이 걸친 시간대에 시간 비율로 나누어 누적 (반감기 감쇠, 같은 요일 평균으로 평활)
+- CadencePlanner: 하루 수집 횟수(예산)를 시간대별로 배분
+  평균 수집 지연(= 간격/2)의 도착 가중 합을 최소화하면 시간대별 수집 빈도 ∝ √도착률 (제곱근 배분)
+  최소/최대 간격과 수집당 기대 신규 건수(min_yield)로 제한한 뒤 남는 예산은 나머지 시간대에 다시 배분
+  (모든 시간대가 상한이면 남는 예산은 쓰지 않음, 학습 전에는 기본 간격)
+- 다음 수집 시각: 마지막 수집 이후 시간대별 빈도를 적분한 값이 1이 되는 시각
+
+실행 예시:
+    python cadence.py                    # 요일 × 시간대 도착률과 계획 간격
+    python cadence.py --pages 5 --budget-share 0.5
+"""
+
+import os
+import json
+import math
+import argparse
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from run_lease import DAILY_API_LIMIT
+
+
+ARRIVAL_MODEL_PATH = './state/arrival_model.json'
+HOURS_PER_WEEK = 7 * 24
+WEEKDAYS = ('월', '화', '수', '목', '금', '토', '일')
+HALF_LIFE_DAYS = 28      # 도착률 감쇠 반감기 (최근 4주 패턴 위주)
+PRIOR_HOURS = 0.5        # 관측이 적은 시간대를 요일 평균 도착률로 당기는 가상 관측 시간
+MIN_YIELD = 1.0          # 수집 1회당 최소 기대 신규 공고 수
+MIN_TRAINING_HOURS = 48  # 학습 전(누적 관측 시간 미만)에는 기본 간격으로 수집
+MAX_WINDOW_HOURS = 24    # 이보다 긴 수집 간격(중단 후 재시작 등)은 학습하지 않음
+
+
+def hour_bucket(moment: datetime) -> int:
+    """요일 × 시간대 버킷 (월 0시 = 0 ... 일 23시 = 167)"""
+    return moment.weekday() * 24 + moment.hour
+
+
+def _hour_segments(start: datetime, end: datetime):
+    """[start, end) 구간을 정시 경계로 나눈 (버킷, 시작, 끝)"""
+    moment = start
+    while moment < end:
+        boundary = moment.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        segment_end = min(boundary, end)
+        yield hour_bucket(moment), moment, segment_end
+        moment = segment_end
+
+
+class ArrivalRateModel:
+    """요일 × 시간대별 신규 공고 도착률 (건/시간)"""
+
+    def __init__(self, path: str = ARRIVAL_MODEL_PATH, half_life_days: float = HALF_LIFE_DAYS):
+        self.path = path
+        self.half_life_days = half_life_days
+        self.counts = [0.0] * HOURS_PER_WEEK  # 감쇠 누적 도착 건수
+        self.hours = [0.0] * HOURS_PER_WEEK   # 감쇠 누적 관측 시간
+        self.last_observed: Optional[str] = None
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.counts = data.get('counts', self.counts)
+            self.hours = data.get('hours', self.hours)
+            self.last_observed = data.get('last_observed')
+
+    def observe(self, arrivals: int, end: datetime, start: Optional[datetime] = None) -> bool:
+        """
+        수집 간격 [start, end) 동안의 신규 공고 수 반영
+
+        Args:
+            arrivals: 이번 수집에서 처음 본 공고 수
+            end: 이번 수집 시각
+            start: 이전 수집 시각 (기본: 마지막 관측 시각)
+
+        Returns:
+            학습 여부 (첫 수집/긴 공백/역순 구간은 시각만 갱신)
+        """
+        if start is None and self.last_observed:
+            start = datetime.fromisoformat(self.last_observed)
+        self.last_observed = end.isoformat()
+        if start is None or not timedelta(0) < end - start <= timedelta(hours=MAX_WINDOW_HOURS):
+            return False
+
+        window = (end - start).total_seconds()
+        decay = 0.5 ** (window / 86400 / self.half_life_days)
+        self.counts = [count * decay for count in self.counts]
+        self.hours = [hours * decay for hours in self.hours]
+        for bucket, segment_start, segment_end in _hour_segments(start, end):
+            seconds = (segment_end - segment_start).total_seconds()
+            self.hours[bucket] += seconds / 3600
+            self.counts[bucket] += arrivals * seconds / window
+        return True
+
+    def observed_hours(self) -> float:
+        return sum(self.hours)
+
+    def mean_rate(self, weekday: Optional[int] = None) -> float:
+        """평균 도착률 (weekday 지정 시 해당 요일, 관측이 없으면 전체)"""
+        buckets = slice(None) if weekday is None else slice(weekday * 24, (weekday + 1) * 24)
+        observed = sum(self.hours[buckets])
+        if observed:
+            return sum(self.counts[buckets]) / observed
+        return self.mean_rate() if weekday is not None else 0.0
+
+    def rates(self) -> List[float]:
+        """버킷별 도착률 (관측이 적을수록 같은 요일 평균에 가까움 - 평일/주말 차이 유지)"""
+        priors = [self.mean_rate(weekday) for weekday in range(7)]
+        return [(count + PRIOR_HOURS * priors[bucket // 24]) / (hours + PRIOR_HOURS)
+                for bucket, (count, hours) in enumerate(zip(self.counts, self.hours))]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated_at': datetime.now().isoformat(),
+                'last_observed': self.last_observed,
+                'counts': [round(count, 4) for count in self.counts],
+                'hours': [round(hours, 4) for hours in self.hours],
+            }, f)
+        os.replace(tmp_path, self.path)
+
+
+def polls_per_day(calls_per_poll: int, budget_share: float = 0.8, daily_limit: int = DAILY_API_LIMIT) -> float:
+    """일일 API 한도 중 정기 수집 몫으로 가능한 하루 수집 횟수 (나머지는 재시도/API 서버/CLI 몫)"""
+    return daily_limit * budget_share / max(calls_per_poll, 1)
+
+
+class CadencePlanner:
+    """도착률 기반 시간대별 수집 빈도 계획"""
+
+    def __init__(self, model: ArrivalRateModel, daily_polls: float,
+                 min_interval: float = 15, max_interval: float = 240, min_yield: float = MIN_YIELD,
+                 default_interval: float = 180):
+        """
+        Args:
+            model: 도착률 모델
+            daily_polls: 하루 수집 횟수 예산
+            min_interval: 최소 수집 간격 (분)
+            max_interval: 최대 수집 간격 (분, 예산이 부족하면 예산이 우선)
+            min_yield: 수집 1회당 최소 기대 신규 공고 수 (이보다 자주 수집하면 호출 낭비로 보고 아낌)
+            default_interval: 학습 전 수집 간격 (분)
+        """
+        self.model = model
+        self.daily_polls = max(daily_polls, 1.0)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.min_yield = min_yield
+        self.default_interval = default_interval
+
+    def frequencies(self, weekday: int) -> List[float]:
+        """
+        요일의 시간대별 수집 빈도 (회/시간)
+
+        시간대별 상한: 최소 간격, 그리고 수집 1회당 기대 신규 공고가 min_yield건 이상인 빈도
+        (도착이 드문 야간/주말에는 예산이 남아도 자주 수집하지 않음, 하한은 최대 간격)
+        """
+        if self.model.observed_hours() < MIN_TRAINING_HOURS:
+            return [min(60 / self.default_interval, self.daily_polls / 24)] * 24
+        rates = self.model.rates()[weekday * 24:(weekday + 1) * 24]
+        low = 60 / self.max_interval
+        highs = [max(low, min(60 / self.min_interval, rate / self.min_yield)) for rate in rates]
+        budget = min(self.daily_polls, sum(highs))
+        if budget <= 24 * low:
+            return [budget / 24] * 24
+
+        weights = [math.sqrt(rate) for rate in rates]
+        plan: List[Optional[float]] = [None] * 24
+        while True:
+            free = [hour for hour in range(24) if plan[hour] is None]
+            remaining = budget - sum(value for value in plan if value is not None)
+            total = sum(weights[hour] for hour in free)
+            share = {hour: remaining * (weights[hour] / total if total else 1 / len(free)) for hour in free}
+            # 경계를 벗어난 시간대는 경계값으로 고정 후 나머지에 다시 배분
+            clamped = {hour: min(max(value, low), highs[hour]) for hour, value in share.items()
+                       if value < low or value > highs[hour]}
+            if not clamped:
+                for hour, value in share.items():
+                    plan[hour] = value
+                return plan
+            for hour, value in clamped.items():
+                plan[hour] = value
+
+    def interval(self, moment: datetime) -> float:
+        """시각의 계획 수집 간격 (분)"""
+        return 60 / self.frequencies(moment.weekday())[moment.hour]
+
+    def next_run(self, last_run: datetime) -> datetime:
+        """마지막 수집 이후 계획 빈도의 누적이 1회가 되는 시각"""
+        credit, moment, plans = 0.0, last_run, {}
+        while True:
+            weekday = moment.weekday()
+            if weekday not in plans:
+                plans[weekday] = self.frequencies(weekday)
+            frequency = plans[weekday][moment.hour]
+            boundary = moment.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            gained = frequency * (boundary - moment).total_seconds() / 3600
+            if credit + gained >= 1:
+                return moment + timedelta(hours=(1 - credit) / frequency)
+            credit += gained
+            moment = boundary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='요일 × 시간대 도착률과 적응형 수집 주기 계획')
+    parser.add_argument('--model', type=str, default=ARRIVAL_MODEL_PATH,
+                       help=f'도착률 모델 파일 (기본: {ARRIVAL_MODEL_PATH})')
+    parser.add_argument('--pages', type=int, default=3, help='수집 1회당 서비스별 API 호출 수 (기본: 3)')
+    parser.add_argument('--budget-share', type=float, default=0.8,
+                       help='일일 API 한도 중 정기 수집 몫 (기본: 0.8)')
+    parser.add_argument('--min-interval', type=float, default=15, help='최소 수집 간격 분 (기본: 15)')
+    parser.add_argument('--max-interval', type=float, default=240, help='최대 수집 간격 분 (기본: 240)')
+    parser.add_argument('--default-interval', type=float, default=180,
+                       help='학습 전 수집 간격 분 (기본: 180)')
+    parser.add_argument('--min-yield', type=float, default=MIN_YIELD,
+                       help=f'수집 1회당 최소 기대 신규 공고 수 (기본: {MIN_YIELD})')
+
+    args = parser.parse_args()
+
+    model = ArrivalRateModel(args.model)
+    planner = CadencePlanner(model, polls_per_day(args.pages, args.budget_share),
+                             args.min_interval, args.max_interval, args.min_yield,
+                             args.default_interval)
+    rates = model.rates()
+
+    print(f"📈 도착률 모델: {args.model} (평균 {model.mean_rate():.2f}건/시간, 누적 관측 {model.observed_hours():.0f}시간, "
+          f"마지막 관측 {model.last_observed or '-'})")
+    if model.observed_hours() < MIN_TRAINING_HOURS:
+        print(f"⚠️ 학습 전 (관측 {MIN_TRAINING_HOURS}시간 미만) - 기본 간격 {args.default_interval:.0f}분으로 수집")
+    planned = sum(sum(planner.frequencies(weekday)) for weekday in range(7)) / 7
+    print(f"📡 하루 수집 예산: {planner.daily_polls:.0f}회, 계획 평균 {planned:.0f}회 (API 한도 {DAILY_API_LIMIT}회 × {args.budget_share} ÷ {args.pages}호출)")
+    print("\n도착률 (건/시간) / 계획 간격 (분)")
+    print("     " + "".join(f"{hour:>7}" for hour in range(0, 24, 2)))
+    for weekday, label in enumerate(WEEKDAYS):
+        plan = planner.frequencies(weekday)
+        print(f"{label} 도착 " + "".join(f"{rates[weekday * 24 + hour]:>7.1f}" for hour in range(0, 24, 2)))
+        print(f"   간격 " + "".join(f"{60 / plan[hour]:>7.0f}" for hour in range(0, 24, 2)))
+    now = datetime.now()
+    print(f"\n⏭️ 지금 수집했다면 다음 수집: {planner.next_run(now).strftime('%Y-%m-%d %H:%M')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+나라장터 다중 오퍼레이션 병렬 수집
+입찰공고(용역/공사/물품)와 개찰결과(용역/공사/물품) 오퍼레이션을 동시에 수집
+→ 전체 갱신 시간 ≈ 가장 느린 오퍼레이션 (오퍼레이션별 순차 실행 시간의 합이 아님)
+
+- 오퍼레이션마다 스레드 1개, HTTP 연결 풀(requests.Session) 하나를 모든 스레드가 공유
+- 호출 예산은 서비스별 ApiBudget (일일 한도/최소 호출 간격, 다른 프로세스의 수집기와도 공유)
+- 입찰/낙찰 실행 리스(collect_bids/collect_awards)를 잡고 수집 → 스케줄러/API 서버/CLI 수집과 중복 방지
+- 결과는 기존 파일 규칙 그대로 병합 저장 (collected_bids_* / collected_awards_*, 중복 ID 제거)
+  → 스케줄러 파일 감지/품질 게이트/인사이트가 그대로 읽음
+- 오퍼레이션별 건수/소요 시간/상태/재시도 큐 적재를 실행 매니페스트(collect_manifest_{run_id}.json)로 기록
+
+실행 예시:
+    python collect_all.py --source mock --run-id test001
+    python collect_all.py --source real --pages 5
+    python collect_all.py --source real --operations bids_servc awards_servc --lock queue
+"""
+
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from collect_bids import BidDataCollector
+from collect_awards import AwardDataCollector
+from run_lease import LEASE_POLICIES, LeaseBusy, RunLease
+
+
+# 수집 오퍼레이션 {키: (데이터셋, 오퍼레이션, 설명)}
+OPERATIONS = {
+    'bids_servc': ('bids', 'getBidPblancListInfoServc01', '입찰공고 (용역)'),
+    'bids_cnstwk': ('bids', 'getBidPblancListInfoCnstwk01', '입찰공고 (공사)'),
+    'bids_thng': ('bids', 'getBidPblancListInfoThng01', '입찰공고 (물품)'),
+    'awards_servc': ('awards', 'getOpengInfoListServc01', '개찰결과 (용역)'),
+    'awards_cnstwk': ('awards', 'getOpengInfoListCnstwk01', '개찰결과 (공사)'),
+    'awards_thng': ('awards', 'getOpengInfoListThng01', '개찰결과 (물품)'),
+}
+COLLECTORS = {'bids': BidDataCollector, 'awards': AwardDataCollector}
+ID_FIELDS = {'bids': 'id', 'awards': 'bidId'}
+MANIFEST_PREFIX = 'collect_manifest_'
+
+
+def create_session(pool_size: int):
+    """오퍼레이션 스레드 공유 HTTP 세션 (호스트당 pool_size개 연결 유지)"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=len(COLLECTORS), pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def collect_operation(key: str, source: str, count: int, pages: int, output_dir: str = './',
+                      session=None) -> Dict[str, Any]:
+    """
+    단일 오퍼레이션 수집 (실행 스레드에서 호출)
+
+    Returns:
+        {'records': [...], 'status', 'duration_sec', 'retry_queued', 'error'}
+    """
+    dataset, operation, label = OPERATIONS[key]
+    start = time.time()
+    result = {'records': [], 'status': 'failed', 'retry_queued': 0, 'error': None}
+    print(f"▶️ [{key}] {label} 수집 시작")
+    try:
+        collector = COLLECTORS[dataset](source=source, operation=operation, session=session)
+        if dataset == 'awards':
+            count = max(count // 4, 1)  # 스케줄러와 같은 입찰:낙찰 비율
+        result['records'] = collector.collect(count=count, pages=pages)
+        result['retry_queued'] = len(collector.retry_queue)
+        collector.save_retry_queue(output_dir)
+        result['status'] = 'success' if result['records'] else 'empty'
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['duration_sec'] = time.time() - start
+    icon = {'success': '✅', 'empty': '⚠️'}.get(result['status'], '❌')
+    detail = f" - {result['error']}" if result['error'] else ''
+    print(f"{icon} [{key}] {len(result['records'])}건, {result['duration_sec']:.2f}초{detail}")
+    return result
+
+
+def merge_records(dataset: str, batches: List[List[Dict]]) -> List[Dict]:
+    """오퍼레이션 결과 병합 (같은 ID는 먼저 수집된 레코드 유지)"""
+    id_field = ID_FIELDS[dataset]
+    merged, seen = [], set()
+    for records in batches:
+        for record in records:
+            record_id = record.get(id_field)
+            if record_id in seen:
+                continue
+            seen.add(record_id)
+            merged.append(record)
+    return merged
+
+
+def collect_all(source: str = 'mock', operations: Optional[List[str]] = None, count: int = 200,
+                pages: int = 3, run_id: Optional[str] = None, output_dir: str = './',
+                lock: str = 'skip', workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    여러 오퍼레이션 병렬 수집 → 데이터셋별 병합 파일 + 실행 매니페스트
+
+    Args:
+        source: 'mock' 또는 'real'
+        operations: 수집할 OPERATIONS 키 (기본: 전체)
+        count: Mock 모드 오퍼레이션당 생성 레코드 수 (낙찰은 1/4)
+        pages: Real 모드 오퍼레이션당 페이지 수
+        run_id: 실행 ID (없으면 timestamp)
+        output_dir: 출력 디렉토리
+        lock: 이미 수집 중인 데이터셋 처리 (skip: 해당 오퍼레이션 생략, queue: 대기)
+        workers: 동시 실행 오퍼레이션 수 (기본: 오퍼레이션 수)
+
+    Returns:
+        실행 매니페스트 (manifest['path']에 저장 경로)
+    """
+    operations = list(operations or OPERATIONS)
+    unknown = [key for key in operations if key not in OPERATIONS]
+    if unknown:
+        raise ValueError(f"알 수 없는 오퍼레이션: {', '.join(unknown)}")
+    run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+    workers = workers or len(operations)
+
+    manifest = {
+        'run_id': run_id,
+        'source': source,
+        'started_at': datetime.now().isoformat(),
+        'operations': {},
+        'files': {},
+        'records': {},
+    }
+    start = time.time()
+
+    # 데이터셋별 실행 리스 (잡지 못한 데이터셋의 오퍼레이션은 생략)
+    leases, runnable = [], []
+    for dataset in sorted({OPERATIONS[key][0] for key in operations}):
+        try:
+            leases.append(RunLease(COLLECTORS[dataset].LEASE_JOB, policy=lock,
+                                   owner=f'collect_all:{run_id}').acquire())
+        except LeaseBusy as e:
+            print(f"⏭️ {dataset} 수집 생략: {e}")
+            for key in operations:
+                if OPERATIONS[key][0] == dataset:
+                    manifest['operations'][key] = {'status': 'skipped', 'error': str(e)}
+            continue
+        runnable.extend(key for key in operations if OPERATIONS[key][0] == dataset)
+
+    results = {}
+    try:
+        session = create_session(workers) if source == 'real' and runnable else None
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {key: executor.submit(collect_operation, key, source, count, pages, output_dir, session)
+                       for key in runnable}
+            results = {key: future.result() for key, future in futures.items()}
+        if session:
+            session.close()
+
+        for dataset in COLLECTORS:
+            keys = [key for key in operations if key in results and OPERATIONS[key][0] == dataset]
+            if not keys:
+                continue
+            merged = merge_records(dataset, [results[key]['records'] for key in keys])
+            manifest['records'][dataset] = len(merged)
+            if merged:
+                collector = COLLECTORS[dataset](source=source)
+                manifest['files'][dataset] = collector.save_to_json(merged, run_id, output_dir)
+    finally:
+        for lease in leases:
+            lease.release()
+
+    for key, result in results.items():
+        dataset, operation, label = OPERATIONS[key]
+        manifest['operations'][key] = {
+            'dataset': dataset,
+            'operation': operation,
+            'label': label,
+            'status': result['status'],
+            'records': len(result['records']),
+            'duration_sec': round(result['duration_sec'], 2),
+            'retry_queued': result['retry_queued'],
+            'error': result['error'],
+        }
+    manifest['operations'] = {key: manifest['operations'][key] for key in operations}
+    manifest['finished_at'] = datetime.now().isoformat()
+    manifest['duration_sec'] = round(time.time() - start, 2)
+    # 순차 실행 시 예상 시간 (오퍼레이션 소요 시간 합) - 병렬 수집 효과 확인용
+    manifest['sequential_sec'] = round(sum(result['duration_sec'] for result in results.values()), 2)
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{MANIFEST_PREFIX}{run_id}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    manifest['path'] = path
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='나라장터 다중 오퍼레이션 병렬 수집')
+    parser.add_argument('--source', choices=['mock', 'real'], default='mock',
+                       help='데이터 소스: mock (샘플) 또는 real (실제 API)')
+    parser.add_argument('--operations', nargs='+', choices=list(OPERATIONS), default=list(OPERATIONS),
+                       help='수집할 오퍼레이션 (기본: 전체)')
+    parser.add_argument('--count', type=int, default=200,
+                       help='Mock 모드 오퍼레이션당 생성 레코드 수 (낙찰은 1/4, 기본: 200)')
+    parser.add_argument('--pages', type=int, default=3,
+                       help='Real 모드 오퍼레이션당 페이지 수 (기본: 3)')
+    parser.add_argument('--run-id', type=str,
+                       help='실행 ID (없으면 timestamp 자동 생성)')
+    parser.add_argument('--output-dir', type=str, default='./',
+                       help='출력 디렉토리 (기본: ./)')
+    parser.add_argument('--workers', type=int,
+                       help='동시 실행 오퍼레이션 수 (기본: 오퍼레이션 수)')
+    parser.add_argument('--lock', choices=list(LEASE_POLICIES), default='skip',
+                       help='이미 수집 중일 때: skip (해당 데이터셋 생략) 또는 queue (끝날 때까지 대기)')
+
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("🚀 Smart Bid Radar - 다중 오퍼레이션 병렬 수집")
+    print("="*70)
+    print(f"소스: {args.source.upper()}")
+    print(f"오퍼레이션: {', '.join(args.operations)}")
+    print("="*70 + "\n")
+
+    manifest = collect_all(
+        source=args.source,
+        operations=args.operations,
+        count=args.count,
+        pages=args.pages,
+        run_id=args.run_id,
+        output_dir=args.output_dir,
+        lock=args.lock,
+        workers=args.workers,
+    )
+
+    print("\n" + "="*70)
+    print("📊 수집 결과")
+    print("="*70)
+    for key, entry in manifest['operations'].items():
+        print(f"  {key:14s} {entry['status']:8s} {entry.get('records', 0):6d}건 "
+              f"{entry.get('duration_sec', 0):8.2f}초")
+    for dataset, path in manifest['files'].items():
+        print(f"💾 {dataset}: {path} ({manifest['records'][dataset]}건)")
+    print(f"⏱️ 전체 {manifest['duration_sec']:.2f}초 (순차 실행 시 {manifest['sequential_sec']:.2f}초)")
+    print(f"📝 매니페스트: {manifest['path']}")
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
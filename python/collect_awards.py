@@ -17,6 +17,9 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import random
 
+from g2b_parsers import parse_date, parse_int, parse_number
+from run_lease import LEASE_POLICIES, ApiBudget, BudgetExhausted, LeaseBusy, RunLease
+
 # 환경 변수 로드
 try:
     from dotenv import load_dotenv
@@ -35,17 +38,28 @@ BASE_URL = 'http://apis.data.go.kr/1230000/ScsbidInfoService04'
 class AwardDataCollector:
     """낙찰(개찰) 데이터 수집 클래스"""
     
-    def __init__(self, source: str = 'mock', fail_rate: float = 0.0, fast_retry: bool = False):
+    LEASE_JOB = 'collect_awards'  # 실행 리스 (스케줄러/API 서버/CLI 공통)
+    OPERATION = 'getOpengInfoListServc01'  # 기본 오퍼레이션 (용역)
+    # Mock 입찰 ID 접두사 (오퍼레이션 간 ID 충돌 방지, 입찰공고 Mock과 동일 규칙)
+    MOCK_ID_PREFIXES = {'getOpengInfoListCnstwk01': 'C', 'getOpengInfoListThng01': 'T'}
+    
+    def __init__(self, source: str = 'mock', fail_rate: float = 0.0, fast_retry: bool = False,
+                 operation: Optional[str] = None, session=None):
         """
         Args:
             source: 'mock' (샘플 데이터) 또는 'real' (실제 API)
             fail_rate: Mock 실패 주입 확률 (0.0~1.0, 기본: 0.0=실패 없음)
             fast_retry: 빠른 재시도 모드 (True=대기 최소화, False=실제 대기, 기본: False)
+            operation: 개찰결과 오퍼레이션 (기본: 용역, collect_all.py는 공사/물품도 동시 수집)
+            session: 공유 requests.Session (연결 풀 재사용, 없으면 호출마다 새 연결)
         """
         self.source = source
         self.api_key = API_KEY
         self.base_url = BASE_URL
+        self.operation = operation or self.OPERATION
+        self.session = session
         self.retry_queue = []
+        self.budget = ApiBudget(BASE_URL.rsplit('/', 1)[-1])  # 서비스별 호출 예산 (모든 수집기 공유)
         self.fail_rate = fail_rate
         self.fast_retry = fast_retry
         
@@ -55,26 +69,42 @@ class AwardDataCollector:
         if fail_rate < 0.0 or fail_rate > 1.0:
             raise ValueError("❌ fail_rate는 0.0~1.0 사이 값이어야 합니다.")
     
-    def collect(self, count: int = 50, pages: int = 2) -> List[Dict]:
+    def collect(self, count: int = 50, pages: int = 2, bids_file: Optional[str] = None) -> List[Dict]:
         """
         낙찰 데이터 수집
         
         Args:
             count: Mock 모드 생성 레코드 수
             pages: Real 모드 페이지 수
+            bids_file: 입찰 데이터 파일 (Mock 모드는 이 파일의 입찰 ID로 낙찰 생성 → 조인 가능)
             
         Returns:
             수집된 낙찰 데이터 리스트
         """
         if self.source == 'mock':
             print(f"🎭 Mock 모드: {count}건 낙찰 데이터 생성 중...")
-            return self._generate_mock_data(count)
+            bid_ids = self._load_bid_ids(bids_file) if bids_file else None
+            return self._generate_mock_data(count, bid_ids=bid_ids)
         else:
             print(f"📡 Real 모드: 최대 {pages}페이지 낙찰 데이터 수집 시작...")
             return self._fetch_real_data(pages)
     
-    def _generate_mock_data(self, count: int) -> List[Dict]:
-        """Mock 낙찰 데이터 생성 (실패 주입 옵션 포함)"""
+    def _load_bid_ids(self, bids_file: str) -> Optional[List[str]]:
+        """입찰 파일 → 입찰 ID 목록 (읽을 수 없으면 None)"""
+        try:
+            with open(bids_file, 'r', encoding='utf-8') as f:
+                return [b['id'] for b in json.load(f) if b.get('id')]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ 입찰 파일을 읽을 수 없습니다: {bids_file} ({e})")
+            return None
+    
+    def _generate_mock_data(self, count: int, bid_ids: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Mock 낙찰 데이터 생성 (실패 주입 옵션 포함)
+        
+        Args:
+            bid_ids: 낙찰을 생성할 입찰 ID (지정 시 최대 count건 무작위 선택, 없으면 ID 규칙으로 생성)
+        """
         # 실패 주입 시뮬레이션
         if self.fail_rate > 0 and random.random() < self.fail_rate:
             print(f"\n⚠️ Mock 실패 주입 발동! (fail_rate={self.fail_rate})")
@@ -82,9 +112,14 @@ class AwardDataCollector:
         
         mock_awards = []
         base_date = datetime.now()
+        if bid_ids is None:
+            id_prefix = self.MOCK_ID_PREFIXES.get(self.operation, '')
+            bid_ids = [f"{id_prefix}{base_date.year}{str(base_date.month).zfill(2)}{str(i+1).zfill(5)}"
+                       for i in range(count)]
+        else:
+            bid_ids = random.sample(bid_ids, min(count, len(bid_ids)))
         
-        for i in range(count):
-            bid_id = f"{base_date.year}{str(base_date.month).zfill(2)}{str(i+1).zfill(5)}"
+        for bid_id in bid_ids:
             openg_date = base_date - timedelta(days=random.randint(1, 30))
             
             bidders_count = random.randint(3, 15)
@@ -127,9 +162,9 @@ class AwardDataCollector:
             }
             
             response_data = self._api_call_with_retry(
-                f'{self.base_url}/getOpengInfoListServc01',
+                f'{self.base_url}/{self.operation}',
                 params,
-                operation='getOpengInfoListServc01',
+                operation=self.operation,
                 page=page
             )
             
@@ -167,7 +202,8 @@ class AwardDataCollector:
             try:
                 import requests
                 
-                response = requests.get(url, params=params, timeout=30)
+                self.budget.acquire()  # 일일 한도 확인 + 최소 호출 간격 슬롯 대기
+                response = (self.session or requests).get(url, params=params, timeout=30)
                 
                 # HTTP 상태 코드별 처리
                 if response.status_code == 200:
@@ -186,6 +222,7 @@ class AwardDataCollector:
                     base_wait = 30
                     wait_time = base_wait * (attempt + 1) + random.uniform(0, 10)
                     print(f"⚠️ [429] Rate Limit. {wait_time:.1f}초 대기 (재시도 {attempt+1}/{max_retries})")
+                    self.budget.defer(wait_time)  # 동시 실행 중인 다른 수집기도 함께 대기
                     time.sleep(wait_time)
                     
                 elif response.status_code >= 500:
@@ -199,6 +236,10 @@ class AwardDataCollector:
                     print(f"❌ 알 수 없는 HTTP {response.status_code}: {response.text[:200]}")
                     break
                     
+            except BudgetExhausted as e:
+                print(f"🛑 {e} - 호출 중단")
+                break
+                
             except requests.Timeout:
                 # Timeout: 30s → 60s → 90s → 120s → 150s → 180s
                 wait_time = 30 * (attempt + 1) + random.uniform(0, 10)
@@ -232,10 +273,10 @@ class AwardDataCollector:
             try:
                 award = {
                     'bidId': item.get('bidNtceNo', '').strip(),
-                    'opengDate': self._parse_date(item.get('opengDt')),
-                    'biddersCount': self._parse_int(item.get('rbidCnt')),
-                    'winnerAmount': self._parse_number(item.get('sucsfbidAmt')),
-                    'winnerRate': self._parse_number(item.get('sucsfbidRate')),
+                    'opengDate': parse_date(item.get('opengDt')),
+                    'biddersCount': parse_int(item.get('rbidCnt')),
+                    'winnerAmount': parse_number(item.get('sucsfbidAmt')),
+                    'winnerRate': parse_number(item.get('sucsfbidRate')),
                     'winnerCompany': item.get('sucsfbidCorpNm', '').strip() or None,
                     'completedAt': datetime.now().isoformat(),
                     'source': 'g2b_api'
@@ -254,36 +295,6 @@ class AwardDataCollector:
         
         return normalized
     
-    def _parse_number(self, value) -> Optional[float]:
-        """숫자 변환"""
-        if value is None:
-            return None
-        try:
-            return float(str(value).replace(',', ''))
-        except:
-            return None
-    
-    def _parse_int(self, value) -> Optional[int]:
-        """정수 변환"""
-        if value is None:
-            return None
-        try:
-            return int(str(value).replace(',', ''))
-        except:
-            return None
-    
-    def _parse_date(self, value) -> Optional[str]:
-        """날짜 변환"""
-        if not value:
-            return None
-        try:
-            if len(str(value)) >= 8:
-                dt = datetime.strptime(str(value)[:8], '%Y%m%d')
-                return dt.isoformat()
-        except:
-            pass
-        return None
-    
     def _simulate_failure(self) -> List[Dict]:
         """Mock 실패 시뮬레이션 (500/Timeout 재현)"""
         failure_type = random.choice(['500', 'timeout'])
@@ -347,18 +358,24 @@ class AwardDataCollector:
         os.makedirs(output_dir, exist_ok=True)
         filepath = os.path.join(output_dir, 'retry_queue_awards.json')
         
-        existing_queue = []
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    existing_queue = json.load(f).get('queue', [])
-            except:
-                pass
-        
-        combined_queue = existing_queue + self.retry_queue
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump({'queue': combined_queue}, f, ensure_ascii=False, indent=2)
+        # 동시 실행 수집기 간 읽기-병합-쓰기 직렬화 + 원자적 교체
+        with RunLease(f"retry_queue:{os.path.abspath(filepath)}", policy='queue', wait_timeout=60):
+            # 기존 큐 로드
+            existing_queue = []
+            if os.path.exists(filepath):
+                try:
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        existing_queue = json.load(f).get('queue', [])
+                except:
+                    pass
+            
+            # 병합
+            combined_queue = existing_queue + self.retry_queue
+            
+            tmp_path = filepath + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'queue': combined_queue}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, filepath)
         
         print(f"📝 재시도 큐 저장: {filepath} ({len(self.retry_queue)}건 추가, 총 {len(combined_queue)}건)")
     
@@ -400,11 +417,13 @@ def main():
     parser.add_argument('--output-dir', type=str, default='./',
                        help='출력 디렉토리 (기본: ./)')
     parser.add_argument('--bids-file', type=str,
-                       help='입찰 데이터 파일 경로 (조인키 매칭용)')
+                       help='입찰 데이터 파일 경로 (조인키 매칭용, Mock 모드는 이 입찰 ID로 낙찰 생성)')
     parser.add_argument('--fail-rate', type=float, default=0.0,
                        help='Mock 실패 주입 확률 (0.0~1.0, 기본: 0.0=실패 없음)')
     parser.add_argument('--fast-retry', action='store_true',
                        help='빠른 재시도 모드 (실제 대기 생략, 테스트용)')
+    parser.add_argument('--lock', choices=list(LEASE_POLICIES), default='skip',
+                       help='이미 수집 중일 때: skip (이번 실행 생략) 또는 queue (끝날 때까지 대기)')
     
     args = parser.parse_args()
     
@@ -428,6 +447,13 @@ def main():
         print(f"수집 페이지 수: {args.pages}페이지")
     print("="*70 + "\n")
     
+    # 실행 리스 (스케줄러/API 서버/다른 CLI 실행과 중복 수집 방지)
+    try:
+        lease = RunLease(AwardDataCollector.LEASE_JOB, policy=args.lock, owner=f'cli:{run_id}').acquire()
+    except LeaseBusy as e:
+        print(f"⏭️ 수집 생략: {e}")
+        return
+    
     # 수집 실행
     start_time = time.time()
     awards_status = "FAIL"  # 기본값
@@ -436,7 +462,7 @@ def main():
         collector = AwardDataCollector(source=args.source, fail_rate=args.fail_rate, fast_retry=args.fast_retry)
         
         if args.source == 'mock':
-            awards = collector.collect(count=args.count)
+            awards = collector.collect(count=args.count, bids_file=args.bids_file)
         else:
             awards = collector.collect(pages=args.pages)
         
@@ -480,6 +506,8 @@ def main():
             print(f"입찰-낙찰 매칭율: {match_result['match_rate']}%")
         print(f"awards_status: {awards_status}")
         print(f"실행 시간: {duration:.2f}초")
+        print("\n💡 다음 단계:")
+        print(f"   python data_quality.py --source real --dataset awards --input {os.path.basename(filepath)} --run-id {run_id}")
         print("="*70 + "\n")
         
     except Exception as e:
@@ -493,6 +521,8 @@ def main():
         
         import traceback
         traceback.print_exc()
+    finally:
+        lease.release()
 
 
 if __name__ == '__main__':
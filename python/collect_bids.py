@@ -7,6 +7,7 @@
 실행 예시:
     python collect_bids.py --source mock --count 200 --run-id test001
     python collect_bids.py --source real --pages 3 --run-id prod001
+    python collect_bids.py --source real --pages 10 --quality-gate abort
 """
 
 import os
@@ -17,6 +18,9 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import random
 
+from g2b_parsers import parse_date, parse_number
+from run_lease import LEASE_POLICIES, ApiBudget, BudgetExhausted, LeaseBusy, RunLease
+
 # 환경 변수 로드
 try:
     from dotenv import load_dotenv
@@ -35,15 +39,35 @@ BASE_URL = 'http://apis.data.go.kr/1230000/BidPublicInfoService04'
 class BidDataCollector:
     """입찰 공고 데이터 수집 클래스 (Step 2: Real API Integration)"""
     
-    def __init__(self, source: str = 'mock'):
+    LEASE_JOB = 'collect_bids'  # 실행 리스 (스케줄러/API 서버/CLI 공통)
+    OPERATION = 'getBidPblancListInfoServc01'  # 기본 오퍼레이션 (용역)
+    MOCK_PAGE_SIZE = 100  # Mock 모드 품질 게이트 페이지 크기 (Real 모드 numOfRows와 동일)
+    # 오퍼레이션별 업종 (첫 값이 기본값, 여러 개면 공고명으로 분류)
+    OPERATION_CATEGORIES = {
+        'getBidPblancListInfoServc01': ('용역', '소프트웨어', '기타'),
+        'getBidPblancListInfoCnstwk01': ('건설',),
+        'getBidPblancListInfoThng01': ('물품',),
+    }
+    # Mock 입찰 ID 접두사 (오퍼레이션 간 ID 충돌 방지, 개찰결과 Mock과 동일 규칙)
+    MOCK_ID_PREFIXES = {'getBidPblancListInfoCnstwk01': 'C', 'getBidPblancListInfoThng01': 'T'}
+    MOCK_TITLE_SUFFIXES = {'건설': '공사', '물품': '구매'}
+    
+    def __init__(self, source: str = 'mock', quality_gate=None, operation: Optional[str] = None, session=None):
         """
         Args:
             source: 'mock' (샘플 데이터) 또는 'real' (실제 API)
+            quality_gate: data_quality.QualityGate (지정 시 페이지 단위 인라인 품질 검증)
+            operation: 입찰공고 오퍼레이션 (기본: 용역, collect_all.py는 공사/물품도 동시 수집)
+            session: 공유 requests.Session (연결 풀 재사용, 없으면 호출마다 새 연결)
         """
         self.source = source
         self.api_key = API_KEY
         self.base_url = BASE_URL
+        self.operation = operation or self.OPERATION
+        self.session = session
         self.retry_queue = []
+        self.budget = ApiBudget(BASE_URL.rsplit('/', 1)[-1])  # 서비스별 호출 예산 (모든 수집기 공유)
+        self.quality_gate = quality_gate
         
         if source == 'real' and not API_KEY:
             raise ValueError("❌ API 키가 없습니다. 환경 변수 DATA_PORTAL_API_KEY를 설정하세요.")
@@ -61,7 +85,20 @@ class BidDataCollector:
         """
         if self.source == 'mock':
             print(f"🎭 Mock 모드: {count}건 샘플 데이터 생성 중...")
-            return self._generate_mock_data(count)
+            mock_bids = self._generate_mock_data(count)
+            if not self.quality_gate:
+                return mock_bids
+            
+            passed = []
+            for start in range(0, len(mock_bids), self.MOCK_PAGE_SIZE):
+                passed.extend(self.quality_gate.check_page(
+                    mock_bids[start:start + self.MOCK_PAGE_SIZE],
+                    page=start // self.MOCK_PAGE_SIZE + 1
+                ))
+                if self.quality_gate.should_abort:
+                    print("🛑 품질 게이트: 임계값 초과로 수집 중단")
+                    break
+            return passed
         else:
             print(f"📡 Real 모드: 최대 {pages}페이지 입찰 공고 수집 시작...")
             return self._fetch_real_data(pages)
@@ -70,19 +107,22 @@ class BidDataCollector:
         """Mock 샘플 데이터 생성"""
         agencies = ['조달청', '한국정보화진흥원', '서울시청', '경기도청', '행정안전부', 
                    '과학기술정보통신부', '국방부', '보건복지부', '교육부', '문화체육관광부']
-        categories = ['소프트웨어', '용역', '물품', '건설', '기타']
+        categories = self.OPERATION_CATEGORIES.get(self.operation) or ['소프트웨어', '용역', '물품', '건설', '기타']
+        id_prefix = self.MOCK_ID_PREFIXES.get(self.operation, '')
         regions = ['서울', '경기', '인천', '부산', '대전', '대구', '광주', '울산', '세종', '강원']
         
         mock_bids = []
         base_date = datetime.now()
         
         for i in range(count):
-            bid_id = f"{base_date.year}{str(base_date.month).zfill(2)}{str(i+1).zfill(5)}"
+            bid_id = f"{id_prefix}{base_date.year}{str(base_date.month).zfill(2)}{str(i+1).zfill(5)}"
+            category = random.choice(categories)
             deadline = base_date + timedelta(days=random.randint(7, 45))
             announcement_date = base_date - timedelta(days=random.randint(1, 5))
             
             # 의도적 품질 이슈 삽입 (0.5% 미만)
-            title = f"{random.choice(['국가', '지역', '공공', '스마트'])} {random.choice(['정보화', '시스템', '플랫폼', '구축'])} 사업"
+            title = (f"{random.choice(['국가', '지역', '공공', '스마트'])} {random.choice(['정보화', '시스템', '플랫폼', '구축'])} "
+                     f"{self.MOCK_TITLE_SUFFIXES.get(category, '사업')}")
             agency = random.choice(agencies)
             budget = random.randint(30, 800) * 1000000
             
@@ -96,7 +136,7 @@ class BidDataCollector:
                 'id': bid_id,
                 'title': title or "제목없음",
                 'agency': agency,
-                'category': random.choice(categories),
+                'category': category,
                 'region': random.choice(regions),
                 'budget': budget,
                 'estimatedPrice': budget * random.uniform(0.95, 1.05) if budget else None,
@@ -134,9 +174,9 @@ class BidDataCollector:
             }
             
             response_data = self._api_call_with_retry(
-                f'{self.base_url}/getBidPblancListInfoServc01',
+                f'{self.base_url}/{self.operation}',
                 params,
-                operation='getBidPblancListInfoServc01',
+                operation=self.operation,
                 page=page
             )
             
@@ -151,12 +191,23 @@ class BidDataCollector:
                     print(f"⚠️ 페이지 {page}에 데이터가 없습니다. 수집 종료.")
                     break
                 
-                # 정규화
-                normalized = self._normalize_bids(items)
+                # 정규화 (게이트 사용 시 정규화 전 원본 문제도 함께 수집)
+                raw_failures, dropped = ([], []) if self.quality_gate else (None, None)
+                normalized = self._normalize_bids(items, raw_failures=raw_failures, dropped=dropped)
+                
+                # 인라인 품질 게이트 (격리 레코드 제외)
+                if self.quality_gate:
+                    normalized = self.quality_gate.check_page(normalized, page=page,
+                                                              raw_failures=raw_failures, dropped=dropped)
+                
                 all_bids.extend(normalized)
                 
                 print(f"✅ 페이지 {page}: {len(normalized)}건 수집 완료 (누적: {len(all_bids)}건)")
                 
+                if self.quality_gate and self.quality_gate.should_abort:
+                    print(f"🛑 품질 게이트: 임계값 초과로 페이지 {page}에서 수집 중단 (남은 API 호출 생략)")
+                    break
+                
                 # Rate Limit 방지 (페이지 간 1초 대기)
                 if page < pages:
                     time.sleep(1)
@@ -174,7 +225,8 @@ class BidDataCollector:
             try:
                 import requests
                 
-                response = requests.get(url, params=params, timeout=30)
+                self.budget.acquire()  # 일일 한도 확인 + 최소 호출 간격 슬롯 대기
+                response = (self.session or requests).get(url, params=params, timeout=30)
                 
                 # HTTP 상태 코드별 처리
                 if response.status_code == 200:
@@ -193,6 +245,7 @@ class BidDataCollector:
                     base_wait = 30
                     wait_time = base_wait * (attempt + 1) + random.uniform(0, 10)
                     print(f"⚠️ [429] Rate Limit. {wait_time:.1f}초 대기 (재시도 {attempt+1}/{max_retries})")
+                    self.budget.defer(wait_time)  # 동시 실행 중인 다른 수집기도 함께 대기
                     time.sleep(wait_time)
                     
                 elif response.status_code >= 500:
@@ -206,6 +259,10 @@ class BidDataCollector:
                     print(f"❌ 알 수 없는 HTTP {response.status_code}: {response.text[:200]}")
                     break
                     
+            except BudgetExhausted as e:
+                print(f"🛑 {e} - 호출 중단")
+                break
+                
             except requests.Timeout:
                 # Timeout: 30s → 60s → 90s → 120s → 150s → 180s
                 wait_time = 30 * (attempt + 1) + random.uniform(0, 10)
@@ -231,8 +288,16 @@ class BidDataCollector:
         
         return None
     
-    def _normalize_bids(self, raw_items: List[Dict]) -> List[Dict]:
-        """API 응답 → Firestore 스키마 변환"""
+    def _normalize_bids(self, raw_items: List[Dict], raw_failures: Optional[List[List[str]]] = None,
+                        dropped: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        API 응답 → Firestore 스키마 변환
+        
+        Args:
+            raw_failures: 지정 시 변환된 레코드 순서대로 원본 위반 규칙 키 추가
+                          (기본값 대체/파싱 실패로 정규화 후에는 보이지 않는 문제)
+            dropped: 지정 시 변환하지 못하고 버린 원본 레코드 {'item', 'failures'} 추가
+        """
         normalized = []
         
         for item in raw_items:
@@ -241,12 +306,12 @@ class BidDataCollector:
                     'id': self._safe_get(item, 'bidNtceNo', required=True),
                     'title': self._safe_get(item, 'bidNtceNm', required=True, default="제목없음"),
                     'agency': self._safe_get(item, 'ntceInsttNm', required=True, default="기관미상"),
-                    'category': self._categorize(item.get('bidNtceNm', '')),
+                    'category': self._operation_category(item.get('bidNtceNm', '')),
                     'region': self._extract_region(item.get('ntceInsttNm', '')),
-                    'budget': self._parse_number(item.get('asignBdgtAmt')),
-                    'estimatedPrice': self._parse_number(item.get('presmptPrce')),
-                    'deadline': self._parse_date(item.get('bidClseDt')),
-                    'announcementDate': self._parse_date(item.get('bidNtceDt')),
+                    'budget': parse_number(item.get('asignBdgtAmt')),
+                    'estimatedPrice': parse_number(item.get('presmptPrce')),
+                    'deadline': parse_date(item.get('bidClseDt')),
+                    'announcementDate': parse_date(item.get('bidNtceDt')),
                     'bidMethod': item.get('bidMethdNm', '').strip() or None,
                     'status': 'active',
                     'createdAt': datetime.now().isoformat(),
@@ -257,16 +322,46 @@ class BidDataCollector:
                 # 필수 필드 검증
                 if not bid['id']:
                     print(f"⚠️ 필수 필드(id) 누락. 스킵: {item}")
+                    if dropped is not None:
+                        dropped.append({'item': item, 'failures': self._raw_failures(item)})
                     continue
                 
                 normalized.append(bid)
+                if raw_failures is not None:
+                    raw_failures.append(self._raw_failures(item))
                 
             except Exception as e:
                 print(f"⚠️ 레코드 변환 실패: {e} - {item}")
+                if dropped is not None:
+                    dropped.append({'item': item, 'failures': self._raw_failures(item) or ['type:id']})
                 continue
         
         return normalized
     
+    # 원본 필드 → 품질 규칙 필드 (누락 시 기본값 대체 / 파싱 실패 시 None이 되는 필드)
+    RAW_REQUIRED = {'bidNtceNo': 'id', 'bidNtceNm': 'title', 'ntceInsttNm': 'agency'}
+    RAW_PARSED = {'asignBdgtAmt': ('budget', parse_number), 'bidClseDt': ('deadline', parse_date)}
+    
+    def _raw_failures(self, item) -> List[str]:
+        """
+        원본 레코드 위반 규칙 키 (정규화 후 검증으로는 잡히지 않는 문제)
+        
+        - 'missing:<field>': 필수 원본 필드가 비어 있음 (기본값 "제목없음"/"기관미상" 대체 또는 레코드 제외)
+        - 'type:<field>': 값은 있지만 숫자/날짜로 파싱 불가 (정규화 후 None)
+        """
+        if not isinstance(item, dict):
+            return ['missing:id']
+        failed = []
+        for raw_field, field in self.RAW_REQUIRED.items():
+            value = item.get(raw_field)
+            if value is None or not str(value).strip():
+                failed.append(f'missing:{field}')
+        for raw_field, (field, parse) in self.RAW_PARSED.items():
+            value = item.get(raw_field)
+            if value is not None and str(value).strip() and parse(value) is None:
+                failed.append(f'type:{field}')
+        return failed
+    
     def _safe_get(self, item: Dict, key: str, required: bool = False, default: str = None) -> Optional[str]:
         """안전한 필드 추출"""
         value = item.get(key, '').strip()
@@ -278,29 +373,13 @@ class BidDataCollector:
         
         return value
     
-    def _parse_number(self, value) -> Optional[float]:
-        """숫자 변환 (실패 시 null)"""
-        if value is None:
-            return None
-        
-        try:
-            return float(str(value).replace(',', ''))
-        except:
-            return None
-    
-    def _parse_date(self, value) -> Optional[str]:
-        """날짜 변환 (실패 시 null)"""
-        if not value:
-            return None
-        
-        try:
-            if len(str(value)) >= 8:
-                dt = datetime.strptime(str(value)[:8], '%Y%m%d')
-                return dt.isoformat()
-        except:
-            pass
-        
-        return None
+    def _operation_category(self, title: str) -> str:
+        """오퍼레이션 기준 업종 (공사/물품은 고정, 용역은 공고명으로 소프트웨어/용역/기타 분류)"""
+        categories = self.OPERATION_CATEGORIES.get(self.operation)
+        if not categories:
+            return self._categorize(title or '')
+        category = self._categorize(title or '')
+        return category if category in categories else categories[0]
     
     def _categorize(self, title: str) -> str:
         """공고명 기반 업종 분류"""
@@ -349,20 +428,24 @@ class BidDataCollector:
         os.makedirs(output_dir, exist_ok=True)
         filepath = os.path.join(output_dir, 'retry_queue.json')
         
-        # 기존 큐 로드
-        existing_queue = []
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    existing_queue = json.load(f).get('queue', [])
-            except:
-                pass
-        
-        # 병합
-        combined_queue = existing_queue + self.retry_queue
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump({'queue': combined_queue}, f, ensure_ascii=False, indent=2)
+        # 동시 실행 수집기 간 읽기-병합-쓰기 직렬화 + 원자적 교체
+        with RunLease(f"retry_queue:{os.path.abspath(filepath)}", policy='queue', wait_timeout=60):
+            # 기존 큐 로드
+            existing_queue = []
+            if os.path.exists(filepath):
+                try:
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        existing_queue = json.load(f).get('queue', [])
+                except:
+                    pass
+            
+            # 병합
+            combined_queue = existing_queue + self.retry_queue
+            
+            tmp_path = filepath + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'queue': combined_queue}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, filepath)
         
         print(f"📝 재시도 큐 저장: {filepath} ({len(self.retry_queue)}건 추가, 총 {len(combined_queue)}건)")
 
@@ -379,6 +462,14 @@ def main():
                        help='실행 ID (없으면 timestamp 자동 생성)')
     parser.add_argument('--output-dir', type=str, default='./',
                        help='출력 디렉토리 (기본: ./)')
+    parser.add_argument('--quality-gate', choices=['off', 'flag', 'abort'], default='off',
+                       help='인라인 품질 게이트: off, flag (임계값 초과 기록 후 계속), abort (초과 시 중단)')
+    parser.add_argument('--max-critical-missing', type=float, default=10.0,
+                       help='품질 게이트 핵심 필드 누락률 임계값 %% (기본: 10.0)')
+    parser.add_argument('--prescore', action='store_true',
+                       help='수집 후 활성 입찰 사전 예측 실행 (prescore.py)')
+    parser.add_argument('--lock', choices=list(LEASE_POLICIES), default='skip',
+                       help='이미 수집 중일 때: skip (이번 실행 생략) 또는 queue (끝날 때까지 대기)')
     
     args = parser.parse_args()
     
@@ -396,9 +487,25 @@ def main():
         print(f"수집 페이지 수: {args.pages}페이지 (최대 {args.pages * 100}건)")
     print("="*70 + "\n")
     
+    # 실행 리스 (스케줄러/API 서버/다른 CLI 실행과 중복 수집 방지)
+    try:
+        lease = RunLease(BidDataCollector.LEASE_JOB, policy=args.lock, owner=f'cli:{run_id}').acquire()
+    except LeaseBusy as e:
+        print(f"⏭️ 수집 생략: {e}")
+        return
+    
     # 수집 실행
     try:
-        collector = BidDataCollector(source=args.source)
+        quality_gate = None
+        if args.quality_gate != 'off':
+            from data_quality import QualityGate
+            quality_gate = QualityGate(
+                policy=args.quality_gate,
+                quarantine_path=os.path.join(args.output_dir, f"quarantine_bids_{args.source}_{run_id}.ndjson"),
+                thresholds={'critical_missing_rate': args.max_critical_missing}
+            )
+        
+        collector = BidDataCollector(source=args.source, quality_gate=quality_gate)
         
         if args.source == 'mock':
             bids = collector.collect(count=args.count)
@@ -409,12 +516,26 @@ def main():
             print("❌ 수집된 데이터가 없습니다.")
             return
         
+        if quality_gate and quality_gate.should_abort:
+            print("❌ 품질 게이트 임계값 초과로 수집이 중단되어 저장하지 않습니다.")
+            for reason in quality_gate.breaches:
+                print(f"   - {reason}")
+            if quality_gate.quarantined:
+                print(f"   격리 파일: {quality_gate.quarantine_path}")
+            collector.save_retry_queue(args.output_dir)
+            return
+        
         # JSON 저장
         filepath = collector.save_to_json(bids, run_id, args.output_dir)
         
         # 재시도 큐 저장
         collector.save_retry_queue(args.output_dir)
         
+        # 사전 예측 (옵션, 품질 임계값 초과 시 생략)
+        if args.prescore and not (quality_gate and quality_gate.breaches):
+            from prescore import run_prescoring
+            run_prescoring(filepath)
+        
         # 결과 요약
         print("\n" + "="*70)
         print("📊 수집 결과 요약")
@@ -422,6 +543,16 @@ def main():
         print(f"총 레코드 수: {len(bids)}건")
         print(f"저장 파일: {filepath}")
         print(f"재시도 큐: {len(collector.retry_queue)}건")
+        if quality_gate:
+            gate = quality_gate.report()
+            print(f"품질 게이트: 검증 {gate['checked']}건 / 격리 {gate['quarantined']}건 / "
+                  f"완전성 {gate['summary']['completeness_score']:.2f} · 파싱 {gate['summary']['parsing_score']:.2f}")
+            if gate['quarantine_path']:
+                print(f"격리 파일: {gate['quarantine_path']}")
+            if gate['outliers']:
+                print(f"통계적 이상치: {', '.join(f'{key[8:]} {count}건' for key, count in gate['outliers'].items())}")
+            for reason in gate['breaches']:
+                print(f"🚩 품질 플래그: {reason}")
         print("\n💡 다음 단계:")
         print(f"   python data_quality.py --source real --input {os.path.basename(filepath)} --run-id {run_id}")
         print("="*70 + "\n")
@@ -430,6 +561,8 @@ def main():
         print(f"\n❌ 오류 발생: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        lease.release()
 
 
 if __name__ == '__main__':
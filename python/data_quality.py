@@ -9,14 +9,46 @@ Usage:
     python data_quality.py --source real --input collected_bids.json
     python data_quality.py --source mock --count 200 --sample 5
     python data_quality.py --source real --input collected_bids.json --run-id demo001
+    python data_quality.py --source mock --count 1000000 --benchmark
+    python data_quality.py --source real --input backfill.ndjson --stream
+    python data_quality.py --source real --input backfill_2024.ndjson backfill_2025.ndjson --workers 8
+    python data_quality.py --source real --input collected_bids.json --backend pandas
+    python data_quality.py --source real --input collected_bids_new.json --incremental
+    python data_quality.py --source real --trend 10
+    python data_quality.py --source real --dataset awards --input collected_awards.json
 """
 
 import json
+import math
+import random
+import hashlib
 import argparse
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
 import os
 import sys
+import sqlite3
+
+from g2b_parsers import parse_datetime
+from outlier_sketch import FENCE_K, OutlierDetector
+from quality_rules import RuleSet, get_rule_set
+
+# 컬럼 연산 백엔드 (선택사항)
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# Arrow 문자열 컬럼 (선택사항, 설치 시 pandas 백엔드가 Arrow compute로 문자열 연산)
+try:
+    import pyarrow  # noqa: F401
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
 
 # Mock 데이터 생성 함수 (collect_bids.py와 유사)
 def generate_mock_data(count: int = 20) -> List[Dict[str, Any]]:
@@ -60,19 +92,450 @@ def generate_mock_data(count: int = 20) -> List[Dict[str, Any]]:
             record['title'] = 'abc'  # 너무 짧은 제목
         if i == 18:
             record['updatedAt'] = datetime.now().isoformat()  # 갱신 시간 추가
+        if i % 1000 == 999:
+            record['budget'] *= 1000  # 자릿수 오류 (통계적 이상치)
+        
+        data.append(record)
+    
+    return data
+
+
+def generate_mock_awards(count: int = 20) -> List[Dict[str, Any]]:
+    """Mock 낙찰 데이터 생성 (collect_awards.py 스키마)"""
+    companies = ['(주)한국정보', '(주)대한시스템', '(주)글로벌기술', '(주)테크산업', '(주)솔루션정보']
+    base_date = datetime(2024, 12, 1)
+    
+    data = []
+    for i in range(count):
+        winner_rate = round(86 + (i * 7) % 13 + 0.37, 2)
+        record = {
+            'bidId': f'2024120{str(i + 1).zfill(4)}',
+            'opengDate': base_date.replace(day=1 + i % 28).isoformat(),
+            'biddersCount': 2 + i % 12,
+            'winnerAmount': (300 + i * 5) * 1000000,
+            'winnerRate': winner_rate,
+            'winnerCompany': companies[i % len(companies)],
+            'completedAt': base_date.isoformat(),
+            'source': 'mock'
+        }
+        
+        # 의도적 품질 문제 삽입 (일부 레코드만)
+        if i == 3:
+            record['winnerRate'] = '-'  # 파싱 불가 낙찰률
+        if i == 6:
+            record['biddersCount'] = 0  # 참여업체 없음
+        if i == 8:
+            record['winnerRate'] = 104.5  # 100% 초과
+        if i == 10:
+            del record['winnerCompany']  # 필드 누락
+        if i == 12:
+            record['bidId'] = '20241200001'  # 중복 bidId
+        if i == 14:
+            record['opengDate'] = '2024/12/15'  # 잘못된 날짜
+        if i % 1000 == 998:
+            record['winnerRate'] = round(winner_rate / 100, 4)  # 단위 혼용 (통계적 이상치)
         
         data.append(record)
     
     return data
 
 
+class QualityStats:
+    """
+    병합 가능한 품질 통계 (부분 결과)
+    
+    - counts: 규칙 키별 위반 건수 ('missing:<field>', 'incomplete', 'type:<field>', 'anomaly:<name>')
+    - id_counts: ID별 출현 횟수 (중복 검증용)
+    - samples: 규칙별 실패 레코드 샘플 (FailureSampler, 샘플 수집 시에만)
+    - outliers: 통계적 이상치 탐지기 (그룹별 분위수 스케치, 이상치 검증 시에만)
+    """
+    
+    def __init__(self):
+        self.total = 0
+        self.counts = Counter()
+        self.id_counts = Counter()
+        self.samples: Optional['FailureSampler'] = None
+        self.outliers: Optional[OutlierDetector] = None
+    
+    def merge(self, other: 'QualityStats') -> 'QualityStats':
+        self.total += other.total
+        self.counts.update(other.counts)
+        self.id_counts.update(other.id_counts)
+        if other.samples is not None:
+            if self.samples is None:
+                self.samples = FailureSampler(other.samples.size)
+            self.samples.merge(other.samples)
+        if other.outliers is not None:
+            if self.outliers is None:
+                self.outliers = other.outliers
+            else:
+                self.outliers.merge(other.outliers)
+        return self
+
+
+class FailureSampler:
+    """
+    규칙별 실패 레코드 reservoir 샘플 (검증 패스 중 수집, 병합 가능)
+    
+    - 규칙 키마다 최대 size건을 균등 확률로 유지 (Algorithm R)
+    - 병합: 각 reservoir의 실패 건수 비율로 가중 추출 → 샤드 병렬 검증에서도 균등 샘플
+    - 'incomplete'는 missing:<field> 샘플과 겹치므로 수집하지 않음
+    """
+    
+    def __init__(self, size: int = 5, seed: Optional[int] = None):
+        self.size = size
+        self.seen = Counter()
+        self.items: Dict[str, List[Dict[str, Any]]] = {}
+        self.random = random.Random(seed)
+    
+    def add(self, failed: List[str], record: Dict[str, Any]):
+        for key in failed:
+            if key == 'incomplete':
+                continue
+            seen = self.seen[key] = self.seen[key] + 1
+            items = self.items.get(key)
+            if items is None:
+                self.items[key] = [record]
+            elif len(items) < self.size:
+                items.append(record)
+            else:
+                slot = int(self.random.random() * seen)
+                if slot < self.size:
+                    items[slot] = record
+    
+    def add_batch(self, key: str, seen: int, items: List[Dict[str, Any]]):
+        """이미 균등 추출된 배치 샘플 반영 (seen: 배치 내 실패 건수)"""
+        if seen:
+            self._merge_key(key, seen, items)
+    
+    def merge(self, other: 'FailureSampler') -> 'FailureSampler':
+        for key, seen in other.seen.items():
+            self._merge_key(key, seen, other.items.get(key, []))
+        return self
+    
+    def _merge_key(self, key: str, other_seen: int, other_items: List[Dict[str, Any]]):
+        seen = self.seen[key]
+        ours, theirs = list(self.items.get(key, [])), list(other_items)
+        self.random.shuffle(ours)
+        self.random.shuffle(theirs)
+        
+        merged = []
+        remaining_ours, remaining_theirs = seen, other_seen
+        while len(merged) < self.size and (ours or theirs):
+            # 남은 실패 건수 비율로 어느 쪽 샘플을 쓸지 결정
+            take_ours = bool(ours) and (not theirs or
+                                        self.random.random() * (remaining_ours + remaining_theirs) < remaining_ours)
+            if take_ours:
+                merged.append(ours.pop())
+                remaining_ours -= 1
+            else:
+                merged.append(theirs.pop())
+                remaining_theirs -= 1
+        
+        self.seen[key] = seen + other_seen
+        self.items[key] = merged
+    
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """리포트용 {규칙 키: {'seen': 실패 건수, 'records': 샘플}} (실패 건수 내림차순)"""
+        return {
+            key: {'seen': seen, 'records': self.items.get(key, [])}
+            for key, seen in sorted(self.seen.items(), key=lambda item: -item[1])
+        }
+
+
+class RecordSource:
+    """
+    재순회 가능한 파일 레코드 스트림 (전체 로드 없이 순회할 때마다 파일을 다시 읽음)
+    
+    지원 형식:
+    - JSON 배열 (collected_bids_*.json): 청크 단위 증분 디코딩
+    - NDJSON ('['로 시작하지 않는 파일)
+    - Parquet (.parquet, pyarrow 필요): 배치 단위
+    """
+    
+    CHUNK_SIZE = 1 << 20
+    
+    def __init__(self, path):
+        """
+        Args:
+            path: 파일 경로 또는 경로 리스트 (순서대로 이어서 순회)
+        """
+        self.paths = [path] if isinstance(path, str) else list(path)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for path in self.paths:
+            if path.endswith('.parquet'):
+                yield from self._iter_parquet(path)
+            else:
+                yield from self._iter_json(path)
+    
+    def _iter_json(self, path: str) -> Iterator[Dict[str, Any]]:
+        with open(path, 'r', encoding='utf-8') as f:
+            head = f.read(self.CHUNK_SIZE)
+            if head.lstrip()[:1] == '[':
+                yield from self._iter_json_array(f, head)
+            else:
+                f.seek(0)
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+    
+    def _iter_json_array(self, f, buffer: str) -> Iterator[Dict[str, Any]]:
+        decoder = json.JSONDecoder()
+        pos = buffer.index('[') + 1
+        eof = False
+        
+        while True:
+            # 구분자(공백/쉼표) 건너뛰기
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    break
+                buffer, pos = f.read(self.CHUNK_SIZE), 0
+                eof = not buffer
+            
+            if eof or buffer[pos] == ']':
+                return
+            
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                chunk = f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    raise
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            
+            yield record
+            pos = end
+    
+    def _iter_parquet(self, path: str) -> Iterator[Dict[str, Any]]:
+        import pyarrow.parquet as pq
+        
+        for batch in pq.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+
+
+class FileShard:
+    """
+    파일 샤드 (병렬 검증 단위, pickle 가능)
+    
+    - start/end 지정: NDJSON 바이트 범위 (첫 바이트가 [start, end)에 있는 줄)
+    - 미지정: 파일 전체 (RecordSource)
+    """
+    
+    def __init__(self, path: str, start: Optional[int] = None, end: Optional[int] = None):
+        self.path = path
+        self.start = start
+        self.end = end
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self.start is None:
+            yield from RecordSource(self.path)
+            return
+        
+        with open(self.path, 'rb') as f:
+            if self.start > 0:
+                f.seek(self.start - 1)
+                f.readline()  # 이전 샤드에 속한 줄 건너뛰기
+            while f.tell() < self.end:
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    yield json.loads(line)
+
+
+def plan_shards(paths: List[str], partitions_per_file: int = 1) -> List[FileShard]:
+    """입력 파일 → 샤드 목록 (NDJSON은 바이트 범위로 분할, JSON 배열/Parquet은 파일 단위)"""
+    shards = []
+    for path in paths:
+        is_ndjson = False
+        if not path.endswith('.parquet'):
+            with open(path, 'rb') as f:
+                is_ndjson = f.read(4096).lstrip()[:1] != b'['
+        
+        size = os.path.getsize(path)
+        if not is_ndjson or partitions_per_file <= 1 or size == 0:
+            shards.append(FileShard(path))
+            continue
+        
+        step = -(-size // partitions_per_file)
+        shards.extend(FileShard(path, start, min(start + step, size)) for start in range(0, size, step))
+    return shards
+
+
+def _check_shard(task) -> QualityStats:
+    """샤드 1개 검증 (워커 프로세스, 규칙은 데이터셋 이름으로 전달)"""
+    records, now, dataset, sample_size, outliers = task
+    return DataQualityChecker([], now=now, rules=get_rule_set(dataset), sample_size=sample_size,
+                              outliers=outliers).accumulate(records)
+
+
+def load_frame(paths: List[str]) -> 'pd.DataFrame':
+    """
+    입력 파일 → DataFrame (JSON 배열/NDJSON: read_json, Parquet: read_parquet)
+    
+    pyarrow 설치 시 Arrow 기반 컬럼으로 로드하여 문자열 검증을 Arrow compute로 실행
+    """
+    options = {'dtype_backend': 'pyarrow'} if ARROW_AVAILABLE else {}
+    frames = []
+    for path in paths:
+        if path.endswith('.parquet'):
+            frames.append(pd.read_parquet(path, **options))
+            continue
+        with open(path, 'rb') as f:
+            is_ndjson = f.read(4096).lstrip()[:1] != b'['
+        frames.append(pd.read_json(path, lines=is_ndjson, dtype=False, convert_dates=False, **options))
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+def check_frame(df: 'pd.DataFrame', rules: Optional[RuleSet] = None, sample_size: int = 0,
+                outliers: bool = True, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """pandas 백엔드 품질 검증 (DataQualityChecker.check_all()과 동일한 results)"""
+    checker = DataQualityChecker([], now=now, rules=rules, sample_size=sample_size, outliers=outliers)
+    return DataQualityChecker.from_stats(checker.accumulate_frame(df), now=checker.now,
+                                         rules=checker.rules).check_all()
+
+
+def accumulate_parallel(sources: List[Iterable[Dict[str, Any]]], workers: int = None,
+                        rules: Optional[RuleSet] = None, sample_size: int = 0,
+                        outliers: bool = True, now: Optional[datetime] = None) -> QualityStats:
+    """
+    샤드 병렬 통계 누적 (부분 통계를 샤드 순서대로 병합)
+    
+    Args:
+        sources: 샤드 목록 (FileShard 또는 레코드 리스트 - pickle 가능해야 함)
+        workers: 프로세스 수 (기본: CPU 수)
+        outliers: 통계적 이상치 검증 (샤드별로 판정, 스케치는 병합)
+        now: 과거 마감일 판정 기준 시각 (기본: 현재, 모든 샤드 공통)
+    """
+    now = now or datetime.now()
+    rules = rules or get_rule_set('bids')
+    stats = QualityStats()
+    
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        # 샤드 순서대로 병합 → 중복 ID 목록이 순차 검증과 같은 순서 유지
+        tasks = [(source, now, rules.dataset, sample_size, outliers) for source in sources]
+        for partial in executor.map(_check_shard, tasks):
+            stats.merge(partial)
+    return stats
+
+
+def check_parallel(sources: List[Iterable[Dict[str, Any]]], workers: int = None,
+                   rules: Optional[RuleSet] = None, sample_size: int = 0,
+                   outliers: bool = True, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    샤드 병렬 품질 검증 (부분 통계를 순서대로 병합 후 판정)
+    
+    Returns:
+        DataQualityChecker.check_all()과 동일한 results
+    """
+    now = now or datetime.now()
+    rules = rules or get_rule_set('bids')
+    stats = accumulate_parallel(sources, workers=workers, rules=rules, sample_size=sample_size,
+                                outliers=outliers, now=now)
+    return DataQualityChecker.from_stats(stats, now=now, rules=rules).check_all()
+
+
+class BloomDuplicateDetector:
+    """
+    메모리 상한이 있는 중복 ID 검출기
+    
+    1차 패스: Bloom filter에 ID 추가, 이미 있을 수도 있는 ID만 후보로 보관
+    검증 패스: 후보 ID의 실제 출현 횟수를 다시 세어 오탐(false positive) 제거
+    메모리: 비트 배열 + 후보(실제 중복 + 오탐률만큼) - 전체 ID 집합 불필요
+    """
+    
+    def __init__(self, capacity: int = 10_000_000, fp_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.candidates = set()
+    
+    def add(self, record_id):
+        digest = hashlib.blake2b(str(record_id).encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        bits, size = self.bits, self.size
+        seen = True
+        for i in range(self.hash_count):
+            pos = (h1 + i * h2) % size
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                seen = False
+                bits[byte] |= mask
+        if seen:
+            self.candidates.add(record_id)
+    
+    def verify(self, records: Iterable[Dict[str, Any]], key_field: str = 'id') -> Dict[Any, int]:
+        """후보 ID의 정확한 출현 횟수 (첫 출현 순서 유지)"""
+        candidates = self.candidates
+        counts = {}
+        for record in records:
+            record_id = record.get(key_field)
+            if record_id in candidates:
+                counts[record_id] = counts.get(record_id, 0) + 1
+        return counts
+
+
+def _is_null(value) -> bool:
+    """DataFrame 행 → 레코드 변환 시 결측값(None/NaN/NA) 판별"""
+    return value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value))
+
+
+def _compare(values: 'pd.Series', op: str, threshold) -> 'pd.Series':
+    """규칙 명세 비교 연산자 → 컬럼 비교"""
+    if op == '<':
+        return values < threshold
+    if op == '<=':
+        return values <= threshold
+    if op == '>':
+        return values > threshold
+    if op == '>=':
+        return values >= threshold
+    return values == threshold
+
+
 class DataQualityChecker:
-    """데이터 품질 검증기"""
+    """데이터 품질 검증기 (단일 패스 규칙 엔진, 규칙은 quality_rules 명세에서 컴파일)"""
     
-    def __init__(self, records: List[Dict[str, Any]]):
+    def __init__(self, records: Iterable[Dict[str, Any]],
+                 duplicate_detector: Optional[BloomDuplicateDetector] = None,
+                 now: Optional[datetime] = None,
+                 rules: Optional[RuleSet] = None,
+                 sample_size: int = 0,
+                 outliers: bool = True,
+                 outlier_detector: Optional[OutlierDetector] = None):
+        """
+        Args:
+            records: 레코드 리스트 또는 재순회 가능한 스트림 (RecordSource)
+            duplicate_detector: 지정 시 중복 ID를 Bloom filter + 검증 패스로 검출
+                               (records를 두 번 순회하므로 재순회 가능해야 함)
+            now: 과거 마감일 판정 기준 시각 (기본: 현재, 샤드 간 기준 통일용)
+            rules: 데이터셋 규칙 (기본: 입찰 get_rule_set('bids'))
+            sample_size: 규칙별 실패 레코드 샘플 수 (0이면 수집 안 함)
+            outliers: 규칙 명세에 통계적 이상치(outliers)가 있으면 레코드 검증과 같은 패스에서 판정
+            outlier_detector: 이전 실행 스케치를 이어서 사용할 탐지기 (기본: 규칙 명세로 새로 생성)
+        """
         self.records = records
-        self.total_count = len(records)
+        self.total_count = len(records) if hasattr(records, '__len__') else 0
+        self.duplicate_detector = duplicate_detector
+        self.stats: Optional[QualityStats] = None
+        self.rules = rules or get_rule_set('bids')
+        self.sample_size = sample_size
+        self.now = now or datetime.now()
+        self.now_aware = self.now.astimezone()
+        self._missing_keys = [(field, f'missing:{field}') for field in self.rules.required_fields]
+        self.check_record = self.rules.compile(self.now)
+        self.outlier_detector = outlier_detector
+        if outlier_detector is None and outliers and self.rules.outliers:
+            self.outlier_detector = OutlierDetector.from_spec(self.rules.outliers)
+        if self.outlier_detector is not None:
+            self.check_record = self._with_outliers(self.check_record, self.outlier_detector.observe)
         self.results = {
+            'dataset': self.rules.dataset,
             'total_records': self.total_count,
             'valid_records': 0,
             'field_stats': {},
@@ -83,191 +546,287 @@ class DataQualityChecker:
             'judgment': ''
         }
     
+    @staticmethod
+    def _with_outliers(check_record: Callable, observe: Callable) -> Callable:
+        """규칙 검증 함수 + 통계적 이상치 판정 ('outlier:<field>' 키를 뒤에 추가)"""
+        def check_with_outliers(record: Dict[str, Any]) -> List[str]:
+            failed = check_record(record)
+            flags = observe(record)
+            return failed + flags if flags else failed
+        return check_with_outliers
+    
+    def accumulate(self, records: Iterable[Dict[str, Any]],
+                   stats: Optional[QualityStats] = None,
+                   duplicate_detector: Optional[BloomDuplicateDetector] = None) -> QualityStats:
+        """
+        레코드를 한 번만 순회하며 모든 규칙의 통계 누적
+        
+        Args:
+            duplicate_detector: 지정 시 ID를 id_counts 대신 검출기에 전달 (검증 패스는 호출측 담당)
+        """
+        stats = stats if stats is not None else QualityStats()
+        if self.sample_size and stats.samples is None:
+            stats.samples = FailureSampler(self.sample_size)
+        if stats.outliers is None:
+            stats.outliers = self.outlier_detector
+        add_sample = stats.samples.add if stats.samples is not None else None
+        counts = stats.counts
+        id_counts = stats.id_counts
+        id_get = id_counts.get
+        add_id = duplicate_detector.add if duplicate_detector is not None else None
+        check_record = self.check_record
+        key_field = self.rules.key_field
+        total = 0
+        
+        for record in records:
+            total += 1
+            failed = check_record(record)
+            if failed:
+                for key in failed:
+                    counts[key] += 1
+                if add_sample is not None:
+                    add_sample(failed, record)
+            record_id = record.get(key_field)
+            if record_id:
+                if add_id is None:
+                    id_counts[record_id] = id_get(record_id, 0) + 1
+                else:
+                    add_id(record_id)
+        
+        stats.total += total
+        return stats
+    
+    def accumulate_frame(self, df: 'pd.DataFrame', stats: Optional[QualityStats] = None) -> QualityStats:
+        """
+        컬럼 연산으로 통계 누적 (pandas 백엔드, accumulate와 동일한 규칙 키/의미)
+        
+        - 누락: isna | == ''
+        - number: to_numeric(errors='coerce') 실패 = 파싱 오류
+        - date: ISO(naive/aware 분리) / YYYY-MM-DD 벡터 파싱, NaT = 파싱 오류
+        - enum: isin(허용값), length: str.len()
+        - 통계적 이상치: 필요한 컬럼만 행 순서대로 탐지기에 전달 (분포 누적이 순서 의존)
+        """
+        stats = stats if stats is not None else QualityStats()
+        if self.sample_size and stats.samples is None:
+            stats.samples = FailureSampler(self.sample_size)
+        if stats.outliers is None:
+            stats.outliers = self.outlier_detector
+        sampler = stats.samples
+        counts = stats.counts
+        empty = pd.Series(None, index=df.index, dtype=object)
+        
+        def count(key: str, mask: 'pd.Series'):
+            # 위반 건수 누적 + 실패 행에서 균등 추출한 샘플을 reservoir에 반영
+            failures = int(mask.sum())
+            counts[key] += failures
+            if sampler is not None and failures and key != 'incomplete':
+                mask = mask.fillna(False).astype(bool)
+                rows = df.loc[mask[mask].index].sample(
+                    n=min(sampler.size, failures), random_state=sampler.random.randrange(2 ** 32)
+                )
+                sampler.add_batch(key, failures, [
+                    {k: v for k, v in row.items() if not _is_null(v)}
+                    for row in rows.to_dict('records')
+                ])
+        
+        def column(name: str) -> 'pd.Series':
+            return df[name] if name in df.columns else empty
+        
+        def text_column(name: str) -> 'pd.Series':
+            # .str 연산용: 문자열/object 컬럼은 그대로 (Arrow 컬럼 유지), 그 외는 object 변환
+            values = column(name)
+            return values if pd.api.types.is_string_dtype(values.dtype) else values.astype(object)
+        
+        def truthy(values: 'pd.Series') -> 'pd.Series':
+            if values.dtype != object and pd.api.types.is_string_dtype(values.dtype):
+                return values.notna() & (values != '')
+            return values.notna() & values.astype(bool)
+        
+        # 필수 필드 누락
+        incomplete = pd.Series(False, index=df.index)
+        for field, key in self._missing_keys:
+            values = column(field)
+            missing = values.isna() | (values == '')
+            count(key, missing)
+            incomplete |= missing
+        count('incomplete', incomplete)
+        
+        for rule in self.rules.rules:
+            field, kind = rule['field'], rule['type']
+            anomalies = rule.get('anomalies', {})
+            
+            if kind == 'number':
+                # 숫자 변환 실패 = 파싱 오류, 이상치는 앞에서부터 첫 일치 1개
+                values = column(field)
+                numeric = pd.to_numeric(values, errors='coerce')
+                count(f'type:{field}', values.notna() & numeric.isna())
+                remaining = numeric.notna()
+                for name, (op, threshold, *_) in anomalies.items():
+                    hit = remaining & _compare(numeric, op, threshold)
+                    count(f'anomaly:{name}', hit)
+                    remaining &= ~hit
+            
+            elif kind == 'length':
+                length = text_column(field).str.len().fillna(0)
+                remaining = pd.Series(True, index=df.index)
+                for name, (op, threshold, *_) in anomalies.items():
+                    hit = remaining & _compare(length, op, threshold)
+                    if op in ('<', '<='):
+                        hit &= length > 0
+                    count(f'anomaly:{name}', hit)
+                    remaining &= ~hit
+            
+            elif kind == 'date':
+                # ISO(naive/aware 분리) / YYYY-MM-DD 벡터 파싱, NaT = 파싱 오류
+                values = text_column(field)
+                is_text = values.str.len() > 0
+                count(f'type:{field}', truthy(values) & ~is_text)
+                
+                text = values[is_text]
+                has_time = text.str.contains('T', regex=False)
+                iso = text[has_time].str.replace('Z', '+00:00', regex=False)
+                aware = iso.str.contains(r'[+-]\d{2}:?\d{2}$', regex=True)
+                parsed = [
+                    (pd.to_datetime(iso[~aware], format='ISO8601', errors='coerce'), pd.Timestamp(self.now)),
+                    (pd.to_datetime(iso[aware], format='ISO8601', errors='coerce', utc=True),
+                     pd.Timestamp(self.now_aware)),
+                    (pd.to_datetime(text[~has_time], format='%Y-%m-%d', errors='coerce'), pd.Timestamp(self.now)),
+                ]
+                for dates, now in parsed:
+                    count(f'type:{field}', dates.isna())
+                    for name, (op, *_) in anomalies.items():
+                        count(f'anomaly:{name}', dates < now if op == 'past' else dates > now)
+            
+            elif kind == 'enum':
+                values = text_column(field)
+                count(f'type:{field}', truthy(values) & ~values.isin(rule['values']))
+        
+        # 통계적 이상치
+        detector = self.outlier_detector
+        if detector is not None:
+            names = [name for name in list(detector.fields) + detector.dimensions if name in df.columns]
+            masks = detector.observe_columns({name: df[name].tolist() for name in names}, len(df))
+            for field, mask in masks.items():
+                count(f'outlier:{field}', pd.Series(mask, index=df.index))
+        
+        # ID 출현 횟수 (첫 출현 순서 유지)
+        ids = column(self.rules.key_field)
+        ids = ids[truthy(ids)]
+        stats.id_counts.update(ids.tolist())
+        
+        stats.total += len(df)
+        return stats
+    
+    @classmethod
+    def from_stats(cls, stats: QualityStats, now: Optional[datetime] = None,
+                   rules: Optional[RuleSet] = None) -> 'DataQualityChecker':
+        """병합된 부분 통계로 검증기 생성 (check_all은 집계/판정만 수행)"""
+        checker = cls([], now=now, rules=rules, outliers=False)
+        checker.stats = stats
+        checker.total_count = stats.total
+        checker.results['total_records'] = stats.total
+        return checker
+    
+    def _ensure_stats(self) -> QualityStats:
+        if self.stats is None:
+            if self.duplicate_detector is None:
+                self.stats = self.accumulate(self.records)
+            else:
+                self.stats = self.accumulate(self.records, duplicate_detector=self.duplicate_detector)
+                self.stats.id_counts = Counter(
+                    self.duplicate_detector.verify(self.records, key_field=self.rules.key_field)
+                )
+            self.total_count = self.stats.total
+            self.results['total_records'] = self.total_count
+        return self.stats
+    
+    def _rate(self, count: int) -> float:
+        return round((count / self.total_count * 100), 2) if self.total_count > 0 else 0
+    
     def check_all(self) -> Dict[str, Any]:
-        """전체 품질 검증 실행"""
+        """전체 품질 검증 실행 (단일 패스 누적 후 섹션별 집계)"""
         print("📊 데이터 품질 검증 시작...")
         
+        self._ensure_stats()
         self.check_missing_fields()
         self.check_type_errors()
         self.check_duplicates()
         self.check_anomalies()
         self.calculate_scores()
         self.make_judgment()
+        if self.stats.samples is not None:
+            self.results['failing_samples'] = self.stats.samples.to_dict()
         
         print("✅ 데이터 품질 검증 완료")
         return self.results
     
     def check_missing_fields(self):
         """필수 필드 누락 검증"""
-        required_fields = ['id', 'title', 'agency', 'category', 'region', 
-                          'budget', 'deadline', 'status', 'createdAt']
-        
-        field_stats = {}
-        records_with_missing = 0
-        
-        for field in required_fields:
-            missing_count = 0
-            for record in self.records:
-                value = record.get(field)
-                if value is None or value == '':
-                    missing_count += 1
-            
-            missing_rate = (missing_count / self.total_count * 100) if self.total_count > 0 else 0
-            field_stats[field] = {
-                'missing_count': missing_count,
-                'missing_rate': round(missing_rate, 2)
-            }
-        
-        # 필수 필드가 하나라도 누락된 레코드 카운트
-        for record in self.records:
-            has_missing = any(
-                record.get(field) is None or record.get(field) == ''
-                for field in required_fields
-            )
-            if has_missing:
-                records_with_missing += 1
+        counts = self._ensure_stats().counts
         
-        self.results['field_stats'] = field_stats
-        self.results['records_with_missing_rate'] = round(
-            (records_with_missing / self.total_count * 100), 2
-        ) if self.total_count > 0 else 0
+        self.results['field_stats'] = {
+            field: {
+                'missing_count': counts[key],
+                'missing_rate': self._rate(counts[key])
+            }
+            for field, key in self._missing_keys
+        }
+        self.results['records_with_missing_rate'] = self._rate(counts['incomplete'])
     
     def check_type_errors(self):
         """타입/파싱 오류 검증"""
-        budget_errors = 0
-        deadline_errors = 0
-        status_errors = 0
-        allowed_statuses = ['active', 'closed', 'modified']
-        
-        for record in self.records:
-            # Budget 숫자 검증
-            try:
-                budget = record.get('budget')
-                if budget is not None:
-                    float(budget)
-            except (ValueError, TypeError):
-                budget_errors += 1
-            
-            # Deadline 날짜 검증
-            deadline = record.get('deadline')
-            if deadline:
-                try:
-                    # ISO 형식 또는 YYYY-MM-DD 형식 파싱 시도
-                    if 'T' in deadline:
-                        datetime.fromisoformat(deadline.replace('Z', '+00:00'))
-                    else:
-                        datetime.strptime(deadline, '%Y-%m-%d')
-                except (ValueError, AttributeError):
-                    deadline_errors += 1
-            
-            # Status 값 검증
-            status = record.get('status')
-            if status and status not in allowed_statuses:
-                status_errors += 1
+        counts = self._ensure_stats().counts
         
         self.results['type_errors'] = {
-            'budget': {
-                'error_count': budget_errors,
-                'error_rate': round((budget_errors / self.total_count * 100), 2)
-            },
-            'deadline': {
-                'error_count': deadline_errors,
-                'error_rate': round((deadline_errors / self.total_count * 100), 2)
-            },
-            'status': {
-                'error_count': status_errors,
-                'error_rate': round((status_errors / self.total_count * 100), 2)
+            field: {
+                'error_count': counts[f'type:{field}'],
+                'error_rate': self._rate(counts[f'type:{field}'])
             }
+            for field in self.rules.type_fields
         }
     
     def check_duplicates(self):
         """중복 ID 검증 (최신 레코드만 유효로 판단)"""
-        id_map = {}
+        id_counts = self._ensure_stats().id_counts
         
-        for record in self.records:
-            record_id = record.get('id')
-            if not record_id:
-                continue
-            
-            if record_id not in id_map:
-                id_map[record_id] = []
-            id_map[record_id].append(record)
-        
-        duplicates = {k: v for k, v in id_map.items() if len(v) > 1}
-        duplicate_count = sum(len(v) - 1 for v in duplicates.values())
-        
-        # 최신 레코드만 유효로 처리
-        valid_count = self.total_count - duplicate_count
+        duplicate_ids = [record_id for record_id, count in id_counts.items() if count > 1]
+        duplicate_count = sum(id_counts[record_id] - 1 for record_id in duplicate_ids)
         
         self.results['duplicates'] = {
-            'duplicate_ids': list(duplicates.keys()),
+            'duplicate_ids': duplicate_ids,
             'duplicate_count': duplicate_count,
-            'duplicate_rate': round((duplicate_count / self.total_count * 100), 2) if self.total_count > 0 else 0
+            'duplicate_rate': self._rate(duplicate_count)
         }
-        self.results['valid_records'] = valid_count
+        # 최신 레코드만 유효로 처리
+        self.results['valid_records'] = self.total_count - duplicate_count
     
     def check_anomalies(self):
-        """값 범위/이상치 검증"""
-        negative_budget_count = 0
-        short_title_count = 0
-        long_title_count = 0
-        past_deadline_count = 0
-        now = datetime.now()
-        
-        for record in self.records:
-            # Budget <= 0
-            budget = record.get('budget')
-            if budget is not None:
-                try:
-                    if float(budget) <= 0:
-                        negative_budget_count += 1
-                except (ValueError, TypeError):
-                    pass
-            
-            # Title 길이
-            title = record.get('title', '')
-            if len(title) < 5 and len(title) > 0:
-                short_title_count += 1
-            elif len(title) > 200:
-                long_title_count += 1
-            
-            # Deadline이 과거인지 확인
-            deadline = record.get('deadline')
-            if deadline:
-                try:
-                    if 'T' in deadline:
-                        deadline_dt = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
-                    else:
-                        deadline_dt = datetime.strptime(deadline, '%Y-%m-%d')
-                    
-                    if deadline_dt < now:
-                        past_deadline_count += 1
-                except (ValueError, AttributeError):
-                    pass
+        """값 범위/이상치 검증 (통계적 이상치는 탐지기가 있을 때만)"""
+        stats = self._ensure_stats()
+        counts = stats.counts
         
         self.results['anomalies'] = {
-            'negative_budget': {
-                'count': negative_budget_count,
-                'rate': round((negative_budget_count / self.total_count * 100), 2)
-            },
-            'short_title': {
-                'count': short_title_count,
-                'rate': round((short_title_count / self.total_count * 100), 2)
-            },
-            'long_title': {
-                'count': long_title_count,
-                'rate': round((long_title_count / self.total_count * 100), 2)
-            },
-            'past_deadline': {
-                'count': past_deadline_count,
-                'rate': round((past_deadline_count / self.total_count * 100), 2)
+            name: {
+                'count': counts[f'anomaly:{name}'],
+                'rate': self._rate(counts[f'anomaly:{name}'])
             }
+            for name in self.rules.anomalies
         }
+        if stats.outliers is not None:
+            summary = stats.outliers.summary()
+            self.results['outliers'] = {
+                field: {
+                    'count': counts[f'outlier:{field}'],
+                    'rate': self._rate(counts[f'outlier:{field}']),
+                    'overall_fences': summary[field]['overall_fences']
+                }
+                for field in stats.outliers.fields
+            }
     
     def calculate_scores(self):
         """점수 계산"""
         # 완전성 점수 (100 - 가중 누락률)
-        critical_fields = ['id', 'title', 'agency']
+        critical_fields = self.rules.critical_fields
         critical_missing_rate = sum(
             self.results['field_stats'][f]['missing_rate'] 
             for f in critical_fields
@@ -296,52 +855,500 @@ class DataQualityChecker:
             'type_error_rate': round(type_error_rate, 2)
         }
     
+    def criterion_value(self, metric: str) -> float:
+        """PASS 기준 지표 값 (summary 키 또는 'type:<field>' 파싱 오류율)"""
+        if metric.startswith('type:'):
+            return self.results['type_errors'][metric[5:]]['error_rate']
+        return self.results['summary'][metric]
+    
     def make_judgment(self):
         """최종 판정"""
         summary = self.results['summary']
+        criteria = self.rules.criteria
         
-        # PASS 기준
+        # PASS 기준 (규칙 명세의 criteria: 값 < threshold)
         pass_criteria = [
-            summary['critical_missing_rate'] < 1,  # 핵심 필드 누락률 < 1%
-            self.results['type_errors']['deadline']['error_rate'] < 1,  # deadline 파싱 < 1%
-            self.results['type_errors']['budget']['error_rate'] < 2,  # budget 파싱 < 2%
-            summary['duplicate_rate'] < 3  # 중복률 < 3%
+            self.criterion_value(criterion['metric']) < criterion['threshold']
+            for criterion in criteria
         ]
         
         passed_count = sum(pass_criteria)
+        failed_count = len(criteria) - passed_count
         
-        if passed_count == 4:
+        if failed_count == 0:
             judgment = 'PASS'
             reason = '모든 품질 기준 충족'
-        elif passed_count >= 2:
+        elif failed_count <= 2:
             judgment = 'CONDITIONAL PASS'
-            reason = f'{4 - passed_count}개 기준 미충족, 데이터 정제 후 사용 가능'
+            reason = f'{failed_count}개 기준 미충족, 데이터 정제 후 사용 가능'
         else:
             judgment = 'FAIL'
-            reason = f'{4 - passed_count}개 기준 미충족, 데이터 정제 필수'
+            reason = f'{failed_count}개 기준 미충족, 데이터 정제 필수'
         
         # 치명적 문제 체크
         if summary['critical_missing_rate'] > 10:
             judgment = 'FAIL'
-            reason = '핵심 필드(id/title/agency) 누락률이 높음 - 데이터 수집 재실행 필요'
+            reason = f"핵심 필드({'/'.join(self.rules.critical_fields)}) 누락률이 높음 - 데이터 수집 재실행 필요"
         
         self.results['judgment'] = judgment
         self.results['judgment_reason'] = reason
-        self.results['pass_criteria_met'] = f'{passed_count}/4'
+        self.results['pass_criteria_met'] = f'{passed_count}/{len(criteria)}'
+
+
+
+class QualityIndex:
+    """
+    증분 품질 검증 인덱스 (실행 간 유지, SQLite 파일 하나)
+    
+    - entries: 중복 키(id, 없으면 레코드 해시) → 레코드 해시, 위반 규칙 키, 재판정 대상 날짜
+      (이번 실행 키만 조회/갱신하므로 실행 비용은 누적 이력이 아닌 입력 건수에 비례)
+    - counts: 현재 키별 레코드 기준 누적 위반 건수 (entries와 항상 일치)
+    - 신규/변경 레코드만 검증, 변경 시 이전 위반을 빼고 새 위반을 더함
+    - 한 실행 안에서 같은 키가 다시 나오면 변경이 아닌 중복 (먼저 나온 레코드 유지)
+    - 과거/미래 날짜 이상치는 시간이 지나면 바뀌므로 바뀔 수 있는 날짜만 보관 후 실행마다 재판정
+      (past: 아직 지나지 않은 날짜, future: 아직 미래인 날짜)
+    - outliers: 통계적 이상치 스케치 상태 (다음 실행의 신규 레코드를 누적 분포 기준으로 판정)
+    - 변경은 save() 시 한 트랜잭션으로 커밋 (중간 실패 시 이전 실행 상태 유지)
+    """
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY, digest TEXT, failed TEXT, pending TEXT
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS entries_pending ON entries (key) WHERE pending IS NOT NULL;
+    CREATE TABLE IF NOT EXISTS counts (rule TEXT PRIMARY KEY, count INTEGER);
+    CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+    """
+    CHUNK_SIZE = 500  # 키 조회/갱신 배치 크기
+    
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        is_new = not os.path.exists(path)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(self.SCHEMA)
+        self.counts = Counter(dict(self.conn.execute('SELECT rule, count FROM counts')))
+        meta = dict(self.conn.execute('SELECT name, value FROM meta'))
+        self.total = int(meta.get('total', 0))
+        self.outliers: Optional[Dict[str, Any]] = json.loads(meta['outliers']) if meta.get('outliers') else None
+        legacy_path = os.path.splitext(path)[0] + '.json'
+        if is_new and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+    
+    def _import_legacy(self, legacy_path: str):
+        """이전 JSON 인덱스(quality_index_*.json) 1회 이관"""
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        entries = data.get('entries', {})
+        self.conn.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)', (
+            (key, digest, json.dumps(failed), json.dumps(pending) if pending else None)
+            for key, (digest, failed, pending) in entries.items()
+        ))
+        self.counts = Counter(data.get('counts', {}))
+        self.total = len(entries)
+        self.outliers = data.get('outliers')
+        print(f"📦 품질 인덱스 이관: {legacy_path} → {self.path} ({self.total}건)")
+    
+    @staticmethod
+    def record_digest(record: Dict[str, Any]) -> str:
+        payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def refresh_dates(self, checker: 'DataQualityChecker') -> int:
+        """보관된 날짜를 기준 시각으로 재판정 (past 이상치 추가 / future 이상치 해제)"""
+        now, now_aware = checker.now, checker.now_aware
+        changed = 0
+        updates = []
+        rows = self.conn.execute('SELECT key, failed, pending FROM entries WHERE pending IS NOT NULL')
+        for key, failed, pending_dates in rows.fetchall():
+            failed = json.loads(failed)
+            pending = []
+            before = changed
+            for name, op, value in json.loads(pending_dates):
+                parsed = parse_datetime(value)
+                if op == 'past' and parsed < (now_aware if parsed.tzinfo else now):
+                    failed.append(f'anomaly:{name}')
+                    self.counts[f'anomaly:{name}'] += 1
+                elif op == 'future' and not parsed > (now_aware if parsed.tzinfo else now):
+                    failed.remove(f'anomaly:{name}')
+                    self.counts[f'anomaly:{name}'] -= 1
+                else:
+                    pending.append([name, op, value])
+                    continue
+                changed += 1
+            if changed != before:
+                updates.append((json.dumps(failed), json.dumps(pending) if pending else None, key))
+        self.conn.executemany('UPDATE entries SET failed = ?, pending = ? WHERE key = ?', updates)
+        return changed
+    
+    @staticmethod
+    def _pending_dates(record: Dict[str, Any], failed: List[str], checker: 'DataQualityChecker') -> Optional[List]:
+        """시간 경과로 판정이 바뀔 수 있는 날짜 [이름, 'past' | 'future', 값] 목록"""
+        pending = []
+        for field, name, op in checker.rules.time_anomalies:
+            value = record.get(field)
+            if value.__class__ is not str or f'type:{field}' in failed:
+                continue
+            flagged = f'anomaly:{name}' in failed
+            if (op == 'past' and not flagged) or (op == 'future' and flagged):
+                pending.append([name, op, value])
+        return pending or None
+    
+    def _lookup(self, keys: List[str]) -> Dict[str, tuple]:
+        """키 → (레코드 해시, 위반 규칙 키 JSON)"""
+        placeholders = ','.join('?' * len(keys))
+        rows = self.conn.execute(f'SELECT key, digest, failed FROM entries WHERE key IN ({placeholders})', keys)
+        return {key: (digest, failed) for key, digest, failed in rows}
+    
+    def apply(self, records: Iterable[Dict[str, Any]], checker: 'DataQualityChecker') -> Dict[str, Any]:
+        """
+        레코드 반영 (신규/변경분만 검증)
+        
+        Returns:
+            {'delta': 이번 실행 검증분 QualityStats, 'input_records', 'new', 'changed', 'unchanged',
+             'duplicates': 이번 실행 안에서 다시 나온 키}
+        """
+        delta = QualityStats()
+        if checker.sample_size:
+            delta.samples = FailureSampler(checker.sample_size)
+        summary = {'input_records': 0, 'new': 0, 'changed': 0, 'unchanged': 0, 'duplicates': 0}
+        run_keys = set()
+        
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= self.CHUNK_SIZE:
+                self._apply_chunk(chunk, checker, delta, summary, run_keys)
+                chunk = []
+        if chunk:
+            self._apply_chunk(chunk, checker, delta, summary, run_keys)
+        
+        summary['delta'] = delta
+        return summary
+    
+    def _apply_chunk(self, records: List[Dict[str, Any]], checker: 'DataQualityChecker',
+                     delta: QualityStats, summary: Dict[str, int], run_keys: set):
+        check_record = checker.check_record
+        key_field = checker.rules.key_field
+        counts = self.counts
+        
+        keyed = []
+        for record in records:
+            digest = self.record_digest(record)
+            record_id = record.get(key_field)
+            keyed.append((record, digest, record_id, str(record_id) if record_id else f'#{digest}'))
+        entries = self._lookup(list({key for _, _, _, key in keyed}))
+        
+        upserts = []
+        for record, digest, record_id, key in keyed:
+            summary['input_records'] += 1
+            if key in run_keys:
+                # 같은 실행 안의 반복 키: 중복 (첫 레코드가 이번 실행 검증분이면 검증분 중복으로도 집계)
+                summary['duplicates'] += 1
+                if record_id in delta.id_counts:
+                    failed = check_record(record)
+                    delta.counts.update(failed)
+                    delta.total += 1
+                    delta.id_counts[record_id] += 1
+                continue
+            run_keys.add(key)
+            
+            entry = entries.get(key)
+            if entry is not None and entry[0] == digest:
+                summary['unchanged'] += 1
+                continue
+            
+            failed = check_record(record)
+            if entry is None:
+                summary['new'] += 1
+                self.total += 1
+            else:
+                summary['changed'] += 1
+                counts.subtract(json.loads(entry[1]))
+            counts.update(failed)
+            delta.counts.update(failed)
+            if failed and delta.samples is not None:
+                delta.samples.add(failed, record)
+            delta.total += 1
+            if record_id:
+                delta.id_counts[record_id] = 1
+            
+            pending = self._pending_dates(record, failed, checker)
+            upserts.append((key, digest, json.dumps(failed), json.dumps(pending) if pending else None))
+        
+        self.conn.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)', upserts)
+    
+    def stats(self) -> QualityStats:
+        """누적 통계 (키별 레코드 1건 기준이므로 중복 없음)"""
+        stats = QualityStats()
+        stats.total = self.total
+        stats.counts = +self.counts
+        return stats
+    
+    def save(self):
+        """누적 건수/이상치 상태 저장 후 이번 실행 변경 커밋"""
+        self.conn.execute('DELETE FROM counts')
+        self.conn.executemany('INSERT INTO counts VALUES (?, ?)', (+self.counts).items())
+        self.conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)', [
+            ('updated_at', datetime.now().isoformat()),
+            ('total', str(self.total)),
+            ('outliers', json.dumps(self.outliers, ensure_ascii=False) if self.outliers else ''),
+        ])
+        self.conn.commit()
+    
+    def close(self):
+        self.conn.close()
+
+
+class QualityGate:
+    """
+    수집 파이프라인 인라인 품질 게이트 (페이지 단위 검증)
+    
+    - 페이지마다 DataQualityChecker 규칙으로 레코드 검증, 통계는 누적
+    - QUARANTINE_RULES 위반 레코드는 격리 파일(NDJSON)로 분리하고 결과에서 제외
+    - 누적 지표가 임계값을 넘으면 breaches에 사유 기록 (abort 정책이면 수집 중단 신호)
+    """
+    
+    # 격리 대상 규칙 (핵심 필드 누락/파싱 불가 - 하위 처리에서 쓸 수 없는 레코드, 입찰 기준)
+    QUARANTINE_RULES = frozenset([
+        'missing:id', 'missing:title', 'missing:agency',
+        'type:budget', 'type:deadline', 'type:status'
+    ])
+    # 누적 지표 임계값 (summary 키 → 최대 허용값 %)
+    THRESHOLDS = {
+        'critical_missing_rate': 10.0,  # make_judgment의 치명적 기준과 동일
+        'type_error_rate': 10.0
+    }
+    MIN_RECORDS = 100  # 임계값 판정 최소 누적 레코드 수 (첫 페이지 소표본 오판 방지)
+    
+    def __init__(self, policy: str = 'flag', quarantine_path: Optional[str] = None,
+                 thresholds: Optional[Dict[str, float]] = None, min_records: int = MIN_RECORDS,
+                 rules: Optional[RuleSet] = None):
+        """
+        Args:
+            policy: 'flag' (기록 후 계속 수집) 또는 'abort' (임계값 초과 시 수집 중단)
+            quarantine_path: 격리 파일 경로 (없으면 격리 레코드는 제외만 함)
+            thresholds: THRESHOLDS 덮어쓰기
+            rules: 데이터셋 규칙 (기본: 입찰)
+        """
+        self.policy = policy
+        self.quarantine_path = quarantine_path
+        self.thresholds = dict(self.THRESHOLDS, **(thresholds or {}))
+        self.min_records = min_records
+        self.quarantine_rules = self.QUARANTINE_RULES if rules is None else frozenset(
+            [f'missing:{field}' for field in rules.critical_fields] +
+            [f'type:{field}' for field in rules.type_fields]
+        )
+        self.checker = DataQualityChecker([], rules=rules)
+        self.stats = QualityStats()
+        self.quarantined = 0
+        self.pages = 0
+        self.breaches: List[str] = []
+        
+        if quarantine_path and os.path.exists(quarantine_path):
+            os.remove(quarantine_path)
+    
+    @property
+    def should_abort(self) -> bool:
+        return self.policy == 'abort' and bool(self.breaches)
+    
+    def check_page(self, records: List[Dict[str, Any]], page: Optional[int] = None,
+                   raw_failures: Optional[List[List[str]]] = None,
+                   dropped: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        페이지 검증 (통계 누적, 격리, 임계값 판정)
+        
+        Args:
+            raw_failures: records 순서대로 정규화 전 원본 위반 규칙 키 (기본값 대체/파싱 실패)
+                          → 정규화 후 검증 결과에 합침 (원본 파싱 실패는 누락이 아닌 type 오류)
+            dropped: 정규화 중 버려진 원본 레코드 {'item', 'failures'} → 검증 건수에 포함 후 격리
+        
+        Returns:
+            격리되지 않은 레코드 목록
+        """
+        check_record = self.checker.check_record
+        counts, id_counts = self.stats.counts, self.stats.id_counts
+        quarantine_rules = self.quarantine_rules
+        key_field = self.checker.rules.key_field
+        passed, quarantined = [], []
+        
+        for i, record in enumerate(records):
+            failed = check_record(record)
+            if raw_failures and raw_failures[i]:
+                failed = self._merge_raw_failures(failed, raw_failures[i])
+            counts.update(failed)
+            if record.get(key_field):
+                id_counts[record[key_field]] += 1
+            if quarantine_rules.intersection(failed):
+                quarantined.append(dict(record, _quality_failures=failed, _page=page))
+            else:
+                passed.append(record)
+        
+        for entry in dropped or []:
+            failed = self._merge_raw_failures([], entry['failures'])
+            counts.update(failed)
+            quarantined.append({'_raw': entry['item'], '_quality_failures': failed, '_page': page})
+        
+        self.stats.total += len(records) + len(dropped or [])
+        self.pages += 1
+        if quarantined:
+            self.quarantined += len(quarantined)
+            self._write_quarantine(quarantined)
+        
+        summary = self.summary()
+        self._check_thresholds(summary)
+        print(f"🛡️ 품질 게이트 (페이지 {page if page is not None else self.pages}): "
+              f"통과 {len(passed)}건 / 격리 {len(quarantined)}건 | "
+              f"누적 완전성 {summary['completeness_score']:.2f} · 파싱 {summary['parsing_score']:.2f}")
+        return passed
+    
+    @staticmethod
+    def _merge_raw_failures(failed: List[str], raw: List[str]) -> List[str]:
+        """정규화 후 위반 + 원본 위반 (원본 type 오류 필드의 missing은 type으로 대체)"""
+        raw_types = {key[5:] for key in raw if key.startswith('type:')}
+        merged = [key for key in failed if not (key.startswith('missing:') and key[8:] in raw_types)]
+        merged.extend(key for key in raw if key not in merged)
+        if 'incomplete' not in merged and any(key.startswith('missing:') for key in merged):
+            merged.append('incomplete')
+        return merged
+    
+    def summary(self) -> Dict[str, Any]:
+        """누적 점수 (check_all의 집계 단계만 실행, 출력 없음)"""
+        checker = DataQualityChecker.from_stats(self.stats, now=self.checker.now, rules=self.checker.rules)
+        checker.check_missing_fields()
+        checker.check_type_errors()
+        checker.check_duplicates()
+        checker.calculate_scores()
+        return checker.results['summary']
+    
+    def _check_thresholds(self, summary: Dict[str, Any]):
+        if self.breaches or self.stats.total < self.min_records:
+            return
+        for key, limit in self.thresholds.items():
+            if summary[key] > limit:
+                self.breaches.append(f"{key} {summary[key]:.2f}% > {limit:.2f}% "
+                                     f"(페이지 {self.pages}, 누적 {self.stats.total}건)")
+        for reason in self.breaches:
+            print(f"🚨 품질 임계값 초과: {reason}")
+    
+    def _write_quarantine(self, records: List[Dict[str, Any]]):
+        if not self.quarantine_path:
+            return
+        os.makedirs(os.path.dirname(self.quarantine_path) or '.', exist_ok=True)
+        with open(self.quarantine_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records))
+    
+    def report(self) -> Dict[str, Any]:
+        """게이트 실행 요약 (수집 결과 요약/매니페스트용)"""
+        return {
+            'policy': self.policy,
+            'pages': self.pages,
+            'checked': self.stats.total,
+            'quarantined': self.quarantined,
+            'quarantine_path': self.quarantine_path if self.quarantined else None,
+            'breaches': self.breaches,
+            'aborted': self.should_abort,
+            'outliers': {key: count for key, count in self.stats.counts.items() if key.startswith('outlier:')},
+            'summary': self.summary()
+        }
+
+
+TIMESERIES_FIELDS = ('completeness_score', 'parsing_score', 'duplicate_rate',
+                     'critical_missing_rate', 'type_error_rate')
+
+
+def timeseries_point(results: Dict[str, Any]) -> Dict[str, Any]:
+    """검증 결과 → 시계열 1점 (점수/판정만)"""
+    point = {'total_records': results['total_records'], 'judgment': results['judgment']}
+    point.update({field: results['summary'][field] for field in TIMESERIES_FIELDS})
+    return point
+
+
+def append_timeseries(path: str, entry: Dict[str, Any]):
+    """품질 시계열(NDJSON)에 실행 1건 추가"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def load_timeseries(path: str, last: Optional[int] = None) -> List[Dict[str, Any]]:
+    """품질 시계열 조회 (last 지정 시 최근 N건)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return entries[-last:] if last else entries
+
+
+def check_incremental(records: Iterable[Dict[str, Any]], index: QualityIndex,
+                      run_id: str, rules: Optional[RuleSet] = None, sample_size: int = 0,
+                      outliers: bool = True) -> Dict[str, Any]:
+    """
+    증분 품질 검증 (신규/변경 레코드만 검증 후 누적 결과와 함께 반환)
+    
+    Returns:
+        이번 실행 검증분 results + 'incremental' (건수, 누적 결과 요약)
+    """
+    detector = OutlierDetector.from_dict(index.outliers) if outliers and index.outliers else None
+    checker = DataQualityChecker([], rules=rules, sample_size=sample_size, outliers=outliers,
+                                 outlier_detector=detector)
+    rejudged = index.refresh_dates(checker)
+    applied = index.apply(records, checker)
+    
+    delta, total = applied.pop('delta'), index.stats()
+    if checker.outlier_detector is not None:
+        delta.outliers = total.outliers = checker.outlier_detector
+        index.outliers = checker.outlier_detector.to_dict()
+    results = DataQualityChecker.from_stats(delta, now=checker.now, rules=checker.rules).check_all()
+    cumulative = DataQualityChecker.from_stats(total, now=checker.now, rules=checker.rules).check_all()
+    
+    results['incremental'] = dict(
+        applied,
+        run_id=run_id,
+        date_rejudged=rejudged,
+        cumulative=timeseries_point(cumulative)
+    )
+    return results
 
 
 def generate_json_report(results: Dict[str, Any], output_path: str):
     """JSON 리포트 생성"""
     with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+        json.dump(results, f, ensure_ascii=False, indent=2, default=str)
     print(f"📄 JSON 리포트 생성: {output_path}")
 
 
-def generate_markdown_report(results: Dict[str, Any], output_path: str, sample_records: Optional[List[Dict]] = None):
-    """Markdown 리포트 생성"""
+def _rule_label(key: str, rules: RuleSet) -> str:
+    """규칙 키 → 리포트 표시명"""
+    kind, _, name = key.partition(':')
+    if kind == 'missing':
+        return f'필수 필드 누락: {name}'
+    if kind == 'type':
+        return f'{name} 파싱 오류'
+    if kind == 'anomaly':
+        return rules.anomaly_labels[name][0]
+    if kind == 'outlier':
+        return f'{name} 통계적 이상치'
+    return key
+
+
+def generate_markdown_report(results: Dict[str, Any], output_path: str, rules: Optional[RuleSet] = None,
+                             max_samples: int = 5):
+    """
+    Markdown 리포트 생성 (섹션 단위로 파일에 바로 기록)
+    
+    기준표/이상치/권고는 데이터셋 규칙 명세 기준, 샘플은 검증 중 수집한 규칙별 실패 레코드
+    (results['failing_samples'])에서 규칙당 max_samples건
+    """
     summary = results['summary']
+    rules = rules or get_rule_set(results.get('dataset', 'bids'))
+    checker = DataQualityChecker([], rules=rules)
+    checker.results = results
     
-    md_content = f"""# 데이터 품질 리포트 (Data Quality Report)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        write = f.write
+        
+        write(f"""# 데이터 품질 리포트 (Data Quality Report)
 
 **생성일시**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -363,11 +1370,14 @@ def generate_markdown_report(results: Dict[str, Any], output_path: str, sample_r
 
 | 항목 | 기준 | 현재 값 | 상태 |
 |------|------|---------|------|
-| 핵심 필드 누락률 | < 1% | {summary['critical_missing_rate']:.2f}% | {'✅ PASS' if summary['critical_missing_rate'] < 1 else '❌ FAIL'} |
-| deadline 파싱 오류율 | < 1% | {results['type_errors']['deadline']['error_rate']:.2f}% | {'✅ PASS' if results['type_errors']['deadline']['error_rate'] < 1 else '❌ FAIL'} |
-| budget 파싱 오류율 | < 2% | {results['type_errors']['budget']['error_rate']:.2f}% | {'✅ PASS' if results['type_errors']['budget']['error_rate'] < 2 else '❌ FAIL'} |
-| 중복 레코드율 | < 3% | {summary['duplicate_rate']:.2f}% | {'✅ PASS' if summary['duplicate_rate'] < 3 else '❌ FAIL'} |
----
+""")
+        
+        for criterion in rules.criteria:
+            value = checker.criterion_value(criterion['metric'])
+            write(f"| {criterion['label']} | < {criterion['threshold']}% | {value:.2f}% | "
+                  f"{'✅ PASS' if value < criterion['threshold'] else '❌ FAIL'} |\n")
+        
+        write("""---
 
 ## 📋 필드별 누락률/오류율
 
@@ -375,82 +1385,98 @@ def generate_markdown_report(results: Dict[str, Any], output_path: str, sample_r
 
 | 필드 | 누락 건수 | 누락률 (%) | 상태 |
 |------|----------|-----------|------|
-"""
-    
-    for field, stats in results['field_stats'].items():
-        status = '✅' if stats['missing_rate'] < 1 else '⚠️' if stats['missing_rate'] < 5 else '❌'
-        md_content += f"| {field} | {stats['missing_count']} | {stats['missing_rate']:.2f}% | {status} |\n"
-    
-    md_content += f"""
+""")
+        
+        for field, stats in results['field_stats'].items():
+            status = '✅' if stats['missing_rate'] < 1 else '⚠️' if stats['missing_rate'] < 5 else '❌'
+            write(f"| {field} | {stats['missing_count']} | {stats['missing_rate']:.2f}% | {status} |\n")
+        
+        write(f"""
 **필수 필드 불완전 레코드 비율**: {results['records_with_missing_rate']:.2f}%
 
 ### 타입/파싱 오류 현황
 
 | 필드 | 오류 건수 | 오류율 (%) | 상태 |
 |------|----------|-----------|------|
-"""
-    
-    for field, stats in results['type_errors'].items():
-        status = '✅' if stats['error_rate'] < 1 else '⚠️' if stats['error_rate'] < 5 else '❌'
-        md_content += f"| {field} | {stats['error_count']} | {stats['error_rate']:.2f}% | {status} |\n"
-    
-    md_content += f"""
+""")
+        
+        for field, stats in results['type_errors'].items():
+            status = '✅' if stats['error_rate'] < 1 else '⚠️' if stats['error_rate'] < 5 else '❌'
+            write(f"| {field} | {stats['error_count']} | {stats['error_rate']:.2f}% | {status} |\n")
+        
+        duplicates = results['duplicates']
+        write(f"""
 ---
 
 ## 🔍 중복 및 이상치 분석
 
 ### 중복 ID
-- **중복 ID 개수**: {len(results['duplicates']['duplicate_ids'])}개
-- **중복 레코드 수**: {results['duplicates']['duplicate_count']}건
-- **중복률**: {results['duplicates']['duplicate_rate']:.2f}%
+- **중복 ID 개수**: {len(duplicates['duplicate_ids'])}개
+- **중복 레코드 수**: {duplicates['duplicate_count']}건
+- **중복률**: {duplicates['duplicate_rate']:.2f}%
 
-"""
-    
-    if results['duplicates']['duplicate_ids']:
-        md_content += f"**중복 ID 목록**: {', '.join(results['duplicates']['duplicate_ids'][:10])}"
-        if len(results['duplicates']['duplicate_ids']) > 10:
-            md_content += f" ... (외 {len(results['duplicates']['duplicate_ids']) - 10}개)"
-        md_content += "\n\n"
-    
-    md_content += f"""### 이상치 감지
+""")
+        
+        if duplicates['duplicate_ids']:
+            write(f"**중복 ID 목록**: {', '.join(map(str, duplicates['duplicate_ids'][:10]))}")
+            if len(duplicates['duplicate_ids']) > 10:
+                write(f" ... (외 {len(duplicates['duplicate_ids']) - 10}개)")
+            write("\n\n")
+        
+        write("""### 이상치 감지
 
 | 항목 | 건수 | 비율 (%) | 설명 |
 |------|------|---------|------|
-| 음수/0원 예산 | {results['anomalies']['negative_budget']['count']} | {results['anomalies']['negative_budget']['rate']:.2f}% | budget <= 0 |
-| 너무 짧은 제목 | {results['anomalies']['short_title']['count']} | {results['anomalies']['short_title']['rate']:.2f}% | title 길이 < 5 |
-| 너무 긴 제목 | {results['anomalies']['long_title']['count']} | {results['anomalies']['long_title']['rate']:.2f}% | title 길이 > 200 |
-| 과거 마감일 | {results['anomalies']['past_deadline']['count']} | {results['anomalies']['past_deadline']['rate']:.2f}% | deadline < 현재 |
+""")
+        
+        for name, stats in results['anomalies'].items():
+            label, description = rules.anomaly_labels[name]
+            write(f"| {label} | {stats['count']} | {stats['rate']:.2f}% | {description} |\n")
+        
+        outliers = results.get('outliers')
+        if outliers:
+            group_by = ' → '.join('+'.join(level) for level in rules.outliers['group_by'])
+            k = rules.outliers.get('k', FENCE_K)
+            write(f"""
+### 통계적 이상치 (Robust Outliers)
 
+그룹별 분위수 스케치 기준 Tukey fence(Q1 - {k:g}·IQR, Q3 + {k:g}·IQR) 밖 값 (그룹: {group_by + ' → ' if group_by else ''}전체)
+
+| 필드 | 건수 | 비율 (%) | 전체 분포 기준 정상 범위 |
+|------|------|---------|------------------------|
+""")
+            for field, stats in outliers.items():
+                fences = stats['overall_fences']
+                bounds = f"{fences[0]:,.2f} ~ {fences[1]:,.2f}" if fences else '표본 부족'
+                write(f"| {field} | {stats['count']} | {stats['rate']:.2f}% | {bounds} |\n")
+        
+        write("""
 ---
 
 ## 💡 권고 사항 (Phase 1 대응)
 
-"""
-    
-    recommendations = []
-    
-    if summary['critical_missing_rate'] > 1:
-        recommendations.append("1. **긴급**: API 응답 파싱 로직 점검 - 핵심 필드(id/title/agency) 누락 발생")
-    
-    if results['type_errors']['deadline']['error_rate'] > 1:
-        recommendations.append("2. **긴급**: deadline 필드 날짜 형식 통일 필요 (ISO 8601 권장)")
-    
-    if results['type_errors']['budget']['error_rate'] > 2:
-        recommendations.append("3. **중요**: budget 필드 숫자 변환 로직 강화 필요")
-    
-    if results['duplicates']['duplicate_rate'] > 3:
-        recommendations.append("4. **중요**: 중복 ID 제거 로직 구현 - updatedAt 기준 최신 레코드만 유지")
-    
-    if results['anomalies']['negative_budget']['rate'] > 5:
-        recommendations.append("5. **점검**: 음수/0원 예산 데이터 원인 분석 - API 응답 또는 파싱 문제 가능성")
-    
-    if not recommendations:
-        recommendations.append("✅ 현재 데이터 품질은 양호합니다. Phase 1 실제 API 연동 시 지속 모니터링 필요")
-    
-    for rec in recommendations[:5]:
-        md_content += f"{rec}\n"
-    
-    md_content += f"""
+""")
+        
+        # 권고 번호는 규칙 명세 순서 고정 (기준 → 이상치 알림)
+        candidates = [
+            (checker.criterion_value(criterion['metric']) > criterion['threshold'], criterion['advice'])
+            for criterion in rules.criteria
+        ] + [
+            (results['anomalies'][alert['anomaly']]['rate'] > alert['threshold'] if 'anomaly' in alert
+             else alert['outlier'] in (outliers or {}) and outliers[alert['outlier']]['rate'] > alert['threshold'],
+             alert['advice'])
+            for alert in rules.alerts
+        ]
+        recommendations = [f"{number}. {advice}"
+                           for number, (triggered, advice) in enumerate(candidates, 1) if triggered]
+        
+        if not recommendations:
+            recommendations.append("✅ 현재 데이터 품질은 양호합니다. Phase 1 실제 API 연동 시 지속 모니터링 필요")
+        
+        for rec in recommendations[:5]:
+            write(f"{rec}\n")
+        
+        write(f"""
 ---
 
 ## 🎯 최종 판정
@@ -459,88 +1485,229 @@ def generate_markdown_report(results: Dict[str, Any], output_path: str, sample_r
 
 **판정 근거**:
 - {results['judgment_reason']}
-- 통과 기준: {results['pass_criteria_met']} (누락률<1%, deadline파싱<1%, budget파싱<2%, 중복률<3%)
-"""
-    
-    if results['judgment'] == 'PASS':
-        md_content += "- ✅ 현재 데이터는 Phase 1 실제 API 연동에 사용 가능한 수준입니다.\n"
-    elif results['judgment'] == 'CONDITIONAL PASS':
-        md_content += "- ⚠️ 일부 품질 이슈가 있으나, 정제 후 사용 가능합니다. 위 권고사항을 참고하세요.\n"
-    else:
-        md_content += "- ❌ 데이터 품질이 낮습니다. 데이터 수집 로직을 재점검하고 다시 실행하세요.\n"
-    
-    # 샘플 데이터 추가
-    if sample_records:
-        md_content += "\n---\n\n## 📦 샘플 데이터 (Sample Records)\n\n"
-        for i, record in enumerate(sample_records[:5], 1):
-            md_content += f"### 샘플 {i}\n```json\n{json.dumps(record, ensure_ascii=False, indent=2)}\n```\n\n"
-    
-    md_content += f"""
+- 통과 기준: {results['pass_criteria_met']} ({', '.join(f"{c['short']}<{c['threshold']}%" for c in rules.criteria)})
+""")
+        
+        if results['judgment'] == 'PASS':
+            write("- ✅ 현재 데이터는 Phase 1 실제 API 연동에 사용 가능한 수준입니다.\n")
+        elif results['judgment'] == 'CONDITIONAL PASS':
+            write("- ⚠️ 일부 품질 이슈가 있으나, 정제 후 사용 가능합니다. 위 권고사항을 참고하세요.\n")
+        else:
+            write("- ❌ 데이터 품질이 낮습니다. 데이터 수집 로직을 재점검하고 다시 실행하세요.\n")
+        
+        # 증분 검증 요약
+        if 'incremental' in results:
+            incremental = results['incremental']
+            cumulative = incremental['cumulative']
+            write(f"""
+---
+
+## 🔁 증분 검증 (Incremental)
+
+위 지표는 이번 실행에서 검증한 신규/변경 레코드 기준입니다.
+
+| 입력 | 신규 | 변경 | 변경 없음 (스킵) | 날짜 재판정 |
+|------|------|------|------------------|----------------|
+| {incremental['input_records']} | {incremental['new']} | {incremental['changed']} | {incremental['unchanged']} | {incremental['date_rejudged']} |
+
+**누적 ({cumulative['total_records']}건, 최신 레코드 기준)**: `{cumulative['judgment']}` - 완전성 {cumulative['completeness_score']:.2f} / 파싱 {cumulative['parsing_score']:.2f}
+""")
+        
+        # 규칙별 실패 샘플 (검증 패스에서 수집한 reservoir, 레코드당 1줄)
+        failing_samples = results.get('failing_samples')
+        if failing_samples:
+            write("\n---\n\n## 📦 규칙별 실패 샘플 (Failing Samples)\n")
+            for key, sample in failing_samples.items():
+                records = sample['records'][:max_samples]
+                write(f"\n### {_rule_label(key, rules)} (`{key}`, {sample['seen']}건 중 {len(records)}건)\n\n```json\n")
+                for record in records:
+                    write(json.dumps(record, ensure_ascii=False, default=str))
+                    write("\n")
+                write("```\n")
+        
+        write(f"""
 ---
 
 **리포트 생성 도구**: Data Quality Checker v1.0  
 **생성 시각**: {datetime.now().isoformat()}
-"""
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(md_content)
+""")
     
     print(f"📝 Markdown 리포트 생성: {output_path}")
 
 
+def print_trend(entries: List[Dict[str, Any]]):
+    """품질 시계열 추이 출력"""
+    if not entries:
+        print("📭 품질 시계열이 없습니다 (--incremental 실행 후 생성)")
+        return
+    
+    print(f"\n📈 품질 추이 (최근 {len(entries)}회)")
+    print(f"{'run_id':<20} {'신규':>6} {'변경':>6} {'누적':>8} {'완전성':>7} {'파싱':>7} {'중복률':>6}  판정")
+    for entry in entries:
+        cumulative = entry['cumulative']
+        print(f"{entry['run_id']:<20} {entry['new']:>6} {entry['changed']:>6} "
+              f"{cumulative['total_records']:>8} {cumulative['completeness_score']:>7.2f} "
+              f"{cumulative['parsing_score']:>7.2f} {entry['delta']['duplicate_rate']:>6.2f}  "
+              f"{cumulative['judgment']}")
+
+
+def benchmark(records, rules: Optional[RuleSet] = None, outliers: bool = True):
+    """검증 엔진 처리량 측정 (리포트 미생성, DataFrame이면 pandas 백엔드)"""
+    start = time.perf_counter()
+    if PANDAS_AVAILABLE and isinstance(records, pd.DataFrame):
+        results = check_frame(records, rules=rules, outliers=outliers)
+    else:
+        results = DataQualityChecker(records, rules=rules, outliers=outliers).check_all()
+    elapsed = time.perf_counter() - start
+    
+    print("\n" + "="*60)
+    print(f"⏱️ 벤치마크: {results['total_records']:,}건 / {elapsed:.2f}초 "
+          f"({results['total_records'] / elapsed:,.0f}건/초)")
+    print(f"최종 판정: {results['judgment']} ({results['pass_criteria_met']})")
+    print("="*60 + "\n")
+
+
 def main():
     parser = argparse.ArgumentParser(description='데이터 품질 검증 및 리포트 생성')
     parser.add_argument('--source', choices=['mock', 'real'], required=True,
                        help='데이터 소스: mock (샘플 생성) 또는 real (파일 로드)')
-    parser.add_argument('--input', type=str,
-                       help='실제 데이터 파일 경로 (source=real 시 필수)')
+    parser.add_argument('--dataset', choices=['bids', 'awards'], default='bids',
+                       help='검증 규칙 데이터셋: bids (입찰) 또는 awards (낙찰, 기본: bids)')
+    parser.add_argument('--input', type=str, nargs='+',
+                       help='실제 데이터 파일 경로 (source=real 시 필수, 여러 파일 가능)')
     parser.add_argument('--output-dir', type=str, default='./reports',
                        help='리포트 출력 디렉토리 (기본: ./reports)')
     parser.add_argument('--sample', type=int, default=5,
-                       help='Markdown에 포함할 샘플 레코드 수 (기본: 5)')
+                       help='규칙별 실패 샘플 레코드 수 (검증 중 reservoir 수집, 기본: 5, 0이면 미수집)')
     parser.add_argument('--run-id', type=str,
                        help='실행 ID (없으면 timestamp 자동 생성, 파일명에 포함)')
     parser.add_argument('--count', type=int, default=20,
                        help='Mock 모드 생성 레코드 수 (기본: 20)')
+    parser.add_argument('--stream', action='store_true',
+                       help='스트리밍 모드: 파일 전체를 메모리에 올리지 않고 검증 (JSON 배열/NDJSON/Parquet)')
+    parser.add_argument('--bloom-capacity', type=int, default=10_000_000,
+                       help='스트리밍 모드 중복 검출 Bloom filter 예상 ID 수 (기본: 10,000,000)')
+    parser.add_argument('--backend', choices=['python', 'pandas'], default='python',
+                       help='검증 백엔드: python (레코드 단위) 또는 pandas (컬럼 연산, 기본: python)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='병렬 검증 프로세스 수 (기본: 1, 2 이상이면 샤드 병렬 검증)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='증분 모드: 이전 실행 이후 신규/변경 레코드만 검증하고 품질 시계열에 누적')
+    parser.add_argument('--trend', type=int, metavar='N',
+                       help='품질 시계열 최근 N건 출력 (검증 미실행)')
+    parser.add_argument('--no-outliers', action='store_true',
+                       help='통계적 이상치(그룹별 분위수 스케치) 검증 생략')
+    parser.add_argument('--benchmark', action='store_true',
+                       help='검증 처리량만 측정 (리포트 미생성, 예: --count 1000000)')
     
     args = parser.parse_args()
     
+    if args.backend == 'pandas' and not PANDAS_AVAILABLE:
+        print("❌ 오류: --backend pandas 사용 시 pandas 패키지가 필요합니다")
+        sys.exit(1)
+    
+    rules = get_rule_set(args.dataset)
+    # 파일명 접두어 (입찰은 기존 파일명 유지)
+    name = args.source if args.dataset == 'bids' else f'{args.dataset}_{args.source}'
+    
     # 출력 디렉토리 생성
     os.makedirs(args.output_dir, exist_ok=True)
+    index_path = os.path.join(args.output_dir, f'quality_index_{name}.db')
+    timeseries_path = os.path.join(args.output_dir, f'quality_timeseries_{name}.ndjson')
+    
+    if args.trend:
+        print_trend(load_timeseries(timeseries_path, last=args.trend))
+        return
     
     # 데이터 로드
     if args.source == 'mock':
-        print(f"🔧 Mock 데이터 생성 중 ({args.count}건)...")
-        records = generate_mock_data(args.count)
+        print(f"🔧 Mock 데이터 생성 중 ({args.dataset}, {args.count}건)...")
+        records = generate_mock_data(args.count) if args.dataset == 'bids' else generate_mock_awards(args.count)
         print(f"✅ Mock 데이터 {len(records)}건 생성 완료")
     else:
         if not args.input:
             print("❌ 오류: --source real 사용 시 --input 파일 경로가 필요합니다")
             sys.exit(1)
         
-        print(f"📂 파일 로드 중: {args.input}")
-        try:
-            with open(args.input, 'r', encoding='utf-8') as f:
-                records = json.load(f)
-            print(f"✅ {len(records)}건 로드 완료")
-        except FileNotFoundError:
-            print(f"❌ 오류: 파일을 찾을 수 없습니다: {args.input}")
+        missing_files = [path for path in args.input if not os.path.exists(path)]
+        if missing_files:
+            print(f"❌ 오류: 파일을 찾을 수 없습니다: {', '.join(missing_files)}")
             sys.exit(1)
+        
+        print(f"📂 파일 로드 중: {', '.join(args.input)}")
+        try:
+            if args.backend == 'pandas':
+                records = load_frame(args.input)
+                print(f"✅ {len(records)}건 로드 완료 (DataFrame)")
+            elif args.stream or args.workers > 1 or args.incremental:
+                records = RecordSource(args.input)
+                if args.incremental:
+                    print("🔁 증분 모드 (신규/변경 레코드만 검증)")
+                elif args.workers > 1:
+                    print(f"⚡ 병렬 모드 ({args.workers} workers, 샤드별 부분 통계 병합)")
+                else:
+                    print("🌊 스트리밍 모드 (전체 로드 없음, 중복 검출: Bloom filter + 검증 패스)")
+            else:
+                records = []
+                for path in args.input:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        records.extend(json.load(f))
+                print(f"✅ {len(records)}건 로드 완료")
         except json.JSONDecodeError:
-            print(f"❌ 오류: JSON 파싱 실패: {args.input}")
+            print(f"❌ 오류: JSON 파싱 실패: {', '.join(args.input)}")
             sys.exit(1)
     
+    if args.source == 'mock' and args.backend == 'pandas':
+        records = pd.DataFrame(records, dtype=object)
+    
+    if args.benchmark:
+        benchmark(records, rules=rules, outliers=not args.no_outliers)
+        return
+    
+    run_id = args.run_id if args.run_id else datetime.now().strftime('%Y%m%d_%H%M%S')
+    
     # 품질 검증
-    checker = DataQualityChecker(records)
-    results = checker.check_all()
+    try:
+        if args.incremental:
+            index = QualityIndex(index_path)
+            results = check_incremental(records, index, run_id, rules=rules, sample_size=args.sample,
+                                        outliers=not args.no_outliers)
+            index.save()
+            index.close()
+            append_timeseries(timeseries_path, {
+                'run_id': run_id,
+                'timestamp': datetime.now().isoformat(),
+                **{k: v for k, v in results['incremental'].items() if k != 'run_id' and k != 'cumulative'},
+                'delta': timeseries_point(results),
+                'cumulative': results['incremental']['cumulative']
+            })
+        elif args.backend == 'pandas':
+            results = check_frame(records, rules=rules, sample_size=args.sample, outliers=not args.no_outliers)
+        elif args.workers > 1:
+            if isinstance(records, RecordSource):
+                sources = plan_shards(records.paths, partitions_per_file=args.workers)
+            else:
+                step = -(-len(records) // (args.workers * 4)) or 1
+                sources = [records[i:i + step] for i in range(0, len(records), step)]
+            results = check_parallel(sources, workers=args.workers, rules=rules, sample_size=args.sample,
+                                     outliers=not args.no_outliers)
+        elif isinstance(records, RecordSource):
+            checker = DataQualityChecker(records, BloomDuplicateDetector(capacity=args.bloom_capacity),
+                                         rules=rules, sample_size=args.sample, outliers=not args.no_outliers)
+            results = checker.check_all()
+        else:
+            results = DataQualityChecker(records, rules=rules, sample_size=args.sample,
+                                         outliers=not args.no_outliers).check_all()
+    except json.JSONDecodeError:
+        print(f"❌ 오류: JSON 파싱 실패: {', '.join(args.input)}")
+        sys.exit(1)
     
     # 리포트 생성 (run-id 기반 파일명)
-    run_id = args.run_id if args.run_id else datetime.now().strftime('%Y%m%d_%H%M%S')
-    json_path = os.path.join(args.output_dir, f'data_quality_report_{args.source}_{run_id}.json')
-    md_path = os.path.join(args.output_dir, f'data_quality_report_{args.source}_{run_id}.md')
+    json_path = os.path.join(args.output_dir, f'data_quality_report_{name}_{run_id}.json')
+    md_path = os.path.join(args.output_dir, f'data_quality_report_{name}_{run_id}.md')
     
     generate_json_report(results, json_path)
-    generate_markdown_report(results, md_path, records[:args.sample] if args.sample > 0 else None)
+    generate_markdown_report(results, md_path, rules=rules, max_samples=args.sample)
     
     # 결과 출력
     print("\n" + "="*60)
@@ -551,6 +1718,13 @@ def main():
     print(f"최종 판정: {results['judgment']} ({results['pass_criteria_met']})")
     print(f"완전성 점수: {results['summary']['completeness_score']:.2f}/100")
     print(f"파싱 점수: {results['summary']['parsing_score']:.2f}/100")
+    if args.incremental:
+        incremental = results['incremental']
+        print(f"증분: 입력 {incremental['input_records']}건 / 신규 {incremental['new']}건 / "
+              f"변경 {incremental['changed']}건 / 변경 없음 {incremental['unchanged']}건")
+        print(f"누적: {incremental['cumulative']['total_records']}건 / "
+              f"판정 {incremental['cumulative']['judgment']}")
+        print(f"시계열: {timeseries_path}")
     print("="*60)
     print(f"\n✅ 리포트 파일:")
     print(f"  - JSON: {json_path}")
@@ -39,6 +39,13 @@ except ImportError:
     PDF_AVAILABLE = False
     print("⚠️ reportlab 패키지가 없습니다. PDF 변환이 불가능합니다.")
 
+# 입찰 상세 보강 캐시 (선택사항, bid_detail.py - 자격 요건/첨부파일/기초금액)
+try:
+    from bid_detail import DETAIL_CACHE_PATH, attach_details
+    DETAIL_AVAILABLE = True
+except ImportError:
+    DETAIL_AVAILABLE = False
+
 load_dotenv()
 
 
@@ -64,7 +71,8 @@ class DocumentGenerator:
         else:
             print("📝 템플릿 모드로 문서를 생성합니다.")
     
-    def generate_document(self, bid_data: Dict, template_type: str, prediction: Optional[Dict] = None) -> Dict:
+    def generate_document(self, bid_data: Dict, template_type: str, prediction: Optional[Dict] = None,
+                          detail_cache: Optional[str] = None) -> Dict:
         """
         문서 생성 메인 함수
         
@@ -72,12 +80,16 @@ class DocumentGenerator:
             bid_data: 입찰 공고 정보
             template_type: 'proposal_summary' | 'checklist' | 'analysis_report'
             prediction: 예측 데이터 (선택사항)
+            detail_cache: 상세 보강 캐시 경로 (기본: bid_detail.DETAIL_CACHE_PATH, 캐시된 보강 필드 병합)
         
         Returns:
             생성된 문서 정보 딕셔너리
         """
         print(f"\n📄 문서 생성 시작: {template_type}")
         
+        if DETAIL_AVAILABLE:
+            bid_data = attach_details([bid_data], detail_cache or DETAIL_CACHE_PATH)[0]
+        
         if template_type == 'proposal_summary':
             content = self.generate_proposal_summary(bid_data, prediction)
             title = f"제안요약서 - {bid_data.get('title', 'N/A')}"
@@ -294,12 +306,21 @@ class DocumentGenerator:
         """
         print("✅ 체크리스트 생성 중...")
         
+        # 상세 보강 필드 (bid_detail.py, 없으면 일반 항목)
+        licenses = bid_info.get('licenseLimits') or []
+        regions = bid_info.get('regionLimits') or []
+        attachments = bid_info.get('attachments') or []
+        license_items = ''.join(f"\n  ☐ 면허 보유: {name}" for name in licenses) or "\n  ☐ 필수 면허/등록 보유"
+        region_item = f"지역 제한 확인 (참가가능지역: {', '.join(regions)})" if regions else "지역 제한 확인"
+        attachment_items = ''.join(f"\n  ☐ 첨부 검토: {item['name']}" for item in attachments)
+        base_price = f"\n기초금액: {bid_info['basePrice']:,.0f}원" if bid_info.get('basePrice') else ''
+        
         checklist = f"""
 [입찰 참여 체크리스트]
 
 사업명: {bid_info.get('title', '')}
 발주기관: {bid_info.get('agency', '')}
-마감일: {bid_info.get('deadline', '')}
+마감일: {bid_info.get('deadline', '')}{base_price}
 
 □ 1단계: 서류 준비
   ☐ 사업자등록증 사본
@@ -307,14 +328,13 @@ class DocumentGenerator:
   ☐ 최근 3개년 재무제표
   ☐ 유사 실적 증명서
   ☐ 기술인력 보유 현황
-  ☐ 면허 및 인증서
+  ☐ 면허 및 인증서{attachment_items}
 
 □ 2단계: 자격 요건 확인
-  ☐ 업종 적합성 확인
-  ☐ 필수 면허/등록 보유
+  ☐ 업종 적합성 확인{license_items}
   ☐ 실적 요건 충족 여부
   ☐ 기술등급 확인
-  ☐ 지역 제한 확인
+  ☐ {region_item}
 
 □ 3단계: 입찰 서류 작성
   ☐ 입찰서 작성
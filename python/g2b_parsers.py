@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+나라장터(G2B) 날짜/숫자 파싱 공용 모듈
+수집기(collect_bids/collect_awards)와 품질 검증기(quality_rules/data_quality)가 같은 파서를 사용
+
+- 날짜: YYYYMMDD / YYYYMMDDHHMM / YYYYMMDDHHMMSS / 'YYYY-MM-DD HH:MM:SS' ('-', '.', '/' 구분자, 'T' 허용)
+  → ISO 8601 문자열 (시각이 없으면 00:00:00, 실패 시 None)
+- 숫자: '1,234,000' / '1,234원' / '87.745%' / '1억 2,000만' → float (실패/NaN/무한대 시 None)
+- strptime 대신 고정 위치 슬라이싱 + lru_cache (마감일은 반복값이 많음), 숫자는 float() 빠른 경로 우선
+- 배치 변환: parse_dates / parse_numbers (리스트 또는 pandas Series 컬럼 단위)
+
+실행 예시:
+    python g2b_parsers.py --benchmark
+    python g2b_parsers.py --benchmark --count 1000000
+"""
+
+import math
+import time
+import random
+import argparse
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+# 컬럼 단위 변환 (선택사항)
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+
+CACHE_SIZE = 65536
+DATE_SEPARATORS = '-./'
+NUMBER_NOISE = str.maketrans('', '', ', 원₩%\t')
+KOREAN_UNITS = (('조', 10 ** 12), ('억', 10 ** 8), ('만', 10 ** 4), ('천', 10 ** 3))
+
+
+def _to_datetime(text: str) -> Optional[datetime]:
+    """G2B 날짜 문자열 → datetime (형식 불일치 시 None, 날짜 값 오류 시 ValueError)"""
+    if len(text) >= 10 and text[4] in DATE_SEPARATORS and text[7] == text[4]:
+        date_part, time_part = text[0:4] + text[5:7] + text[8:10], text[10:]
+    else:
+        date_part, time_part = text[:8], text[8:]
+    if len(date_part) != 8 or not date_part.isdigit():
+        return None
+    year, month, day = int(date_part[0:4]), int(date_part[4:6]), int(date_part[6:8])
+
+    # 시각: ' HH:MM[:SS]' / 'THHMM' / 'HHMM[SS]' (해석 불가하면 날짜만 사용)
+    time_digits = time_part.lstrip(' T').replace(':', '')[:6]
+    if len(time_digits) in (4, 6) and time_digits.isdigit():
+        return datetime(year, month, day, int(time_digits[0:2]), int(time_digits[2:4]),
+                        int(time_digits[4:6] or 0))
+    return datetime(year, month, day)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_date_text(text: str) -> Optional[str]:
+    try:
+        parsed = _to_datetime(text.strip())
+    except ValueError:
+        return None
+    return parsed.isoformat() if parsed else None
+
+
+def parse_date(value: Any) -> Optional[str]:
+    """G2B 날짜/일시 → ISO 8601 문자열 (실패 시 None)"""
+    if not value:
+        return None
+    return _parse_date_text(value if value.__class__ is str else str(value))
+
+
+def _korean_amount(text: str) -> float:
+    """'1억2000만' 형식 → float (단위 없는 나머지는 그대로 더함)"""
+    total = 0.0
+    for unit, scale in KOREAN_UNITS:
+        if unit in text:
+            head, text = text.split(unit, 1)
+            total += float(head) * scale
+    return total + (float(text) if text else 0.0)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_number_text(text: str) -> Optional[float]:
+    """단위/기호가 섞인 숫자 문자열 (느린 경로, 반복값 캐시)"""
+    cleaned = text.translate(NUMBER_NOISE)
+    try:
+        number = float(cleaned)
+    except ValueError:
+        if not any(unit in cleaned for unit, _ in KOREAN_UNITS):
+            return None
+        try:
+            number = _korean_amount(cleaned)
+        except ValueError:
+            return None
+    return number if math.isfinite(number) else None
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """숫자/한국식 금액 문자열 → float (실패 시 None, 0으로 대체하지 않음)"""
+    cls = value.__class__
+    if cls is str:
+        # 빠른 경로: '1234000' / '1,234,000' (금액은 고유값이 많아 캐시하지 않음)
+        try:
+            number = float(value.replace(',', ''))
+        except ValueError:
+            return _parse_number_text(value)
+        return number if number - number == 0 else None
+    if cls is float or cls is int:
+        return float(value) if math.isfinite(value) else None
+    if value is None or cls is bool:
+        return None
+    return _parse_number_text(str(value))
+
+
+def parse_int(value: Any) -> Optional[int]:
+    """정수 변환 (소수부가 있으면 None)"""
+    number = parse_number(value)
+    return int(number) if number is not None and number.is_integer() else None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_datetime(value: str) -> Optional[datetime]:
+    """정규화된 날짜 파싱 (ISO 형식 또는 YYYY-MM-DD, 실패 시 None) - 품질 검증용"""
+    try:
+        if 'T' in value:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return datetime.strptime(value, '%Y-%m-%d')
+    except (ValueError, TypeError):
+        return None
+
+
+def _map_unique(values: 'pd.Series', parse) -> 'pd.Series':
+    """고유값만 변환 후 전체 컬럼에 배치 (결측은 None)"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    parsed = pd.Series([parse(value) for value in uniques] + [None], dtype=object).to_numpy()
+    return pd.Series(parsed[codes], index=values.index, dtype=object)
+
+
+def parse_dates(values: Iterable[Any]) -> Any:
+    """
+    날짜 컬럼 일괄 변환
+
+    Args:
+        values: 값 목록 또는 pandas Series
+
+    Returns:
+        입력이 Series면 object Series, 아니면 ISO 문자열 리스트 (실패 시 None)
+    """
+    if PANDAS_AVAILABLE and isinstance(values, pd.Series):
+        return _map_unique(values, parse_date)
+    parse = parse_date
+    return [parse(value) for value in values]
+
+
+def parse_numbers(values: Iterable[Any]) -> Any:
+    """
+    숫자 컬럼 일괄 변환
+
+    숫자 dtype Series는 그대로 float64 변환, object/문자열 Series는 값 단위 빠른 경로로 변환
+
+    Returns:
+        입력이 Series면 float64 Series (실패 시 NaN), 아니면 float 리스트 (실패 시 None)
+    """
+    parse = parse_number
+    if PANDAS_AVAILABLE and isinstance(values, pd.Series):
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            numbers = values.astype('float64')
+            return numbers.where(~numbers.isin([math.inf, -math.inf]))
+        return pd.Series([parse(value) for value in values], index=values.index, dtype='float64')
+    return [parse(value) for value in values]
+
+
+def clear_caches():
+    """파서 캐시 초기화 (벤치마크/장시간 실행 프로세스용)"""
+    _parse_date_text.cache_clear()
+    _parse_number_text.cache_clear()
+    parse_datetime.cache_clear()
+
+
+def _legacy_parse_date(value) -> Optional[str]:
+    """기존 수집기 구현 (벤치마크 비교용)"""
+    if not value:
+        return None
+    try:
+        if len(str(value)) >= 8:
+            return datetime.strptime(str(value)[:8], '%Y%m%d').isoformat()
+    except:
+        pass
+    return None
+
+
+def _legacy_parse_number(value) -> Optional[float]:
+    """기존 수집기 구현 (벤치마크 비교용)"""
+    if value is None:
+        return None
+    try:
+        return float(str(value).replace(',', ''))
+    except:
+        return None
+
+
+def generate_samples(count: int, seed: int = 42):
+    """G2B 응답 형태의 날짜/숫자 샘플 (마감일/금액 반복 포함)"""
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 1)
+    dates, numbers = [], []
+    for _ in range(count):
+        dt = base.replace(month=rng.randint(1, 12), day=rng.randint(1, 28), hour=rng.choice((10, 14, 18)))
+        style = rng.random()
+        if style < 0.4:
+            dates.append(dt.strftime('%Y%m%d'))
+        elif style < 0.7:
+            dates.append(dt.strftime('%Y%m%d%H%M'))
+        elif style < 0.95:
+            dates.append(dt.strftime('%Y-%m-%d %H:%M:%S'))
+        else:
+            dates.append(rng.choice(('', None, '미정')))
+        amount = rng.randint(1, 5000) * 100000
+        style = rng.random()
+        if style < 0.5:
+            numbers.append(f'{amount:,}')
+        elif style < 0.9:
+            numbers.append(str(amount))
+        elif style < 0.97:
+            numbers.append(f'{rng.uniform(80, 100):.3f}')
+        else:
+            numbers.append(rng.choice(('', None, '-')))
+    return dates, numbers
+
+
+def benchmark(count: int = 200000):
+    """기존 파서 vs 공용 파서 (cold/warm 캐시, 배치) 마이크로벤치마크"""
+    dates, numbers = generate_samples(count)
+
+    def timed(label: str, func, values):
+        start = time.perf_counter()
+        result = func(values)
+        elapsed = time.perf_counter() - start
+        print(f"   {label:<28} {elapsed * 1000:9.1f}ms  ({elapsed / count * 1e9:7.0f}ns/건)")
+        return result
+
+    print(f"⏱️ 파싱 벤치마크 ({count:,}건)")
+    for name, values, legacy, scalar, batch in (
+            ('날짜', dates, _legacy_parse_date, parse_date, parse_dates),
+            ('숫자', numbers, _legacy_parse_number, parse_number, parse_numbers)):
+        print(f"📅 {name}" if name == '날짜' else f"🔢 {name}")
+        timed('기존 수집기 파서', lambda v: [legacy(x) for x in v], values)
+        clear_caches()
+        timed('공용 (cold cache)', lambda v: [scalar(x) for x in v], values)
+        timed('공용 (warm cache)', lambda v: [scalar(x) for x in v], values)
+        clear_caches()
+        timed('배치 (list)', batch, values)
+        if PANDAS_AVAILABLE:
+            clear_caches()
+            series = pd.Series(values, dtype=object)
+            timed('배치 (pandas Series)', batch, series)
+
+    # 기존 파서와 결과 비교 (기존 파서가 처리하던 YYYYMMDD는 동일해야 함)
+    clear_caches()
+    same = sum(1 for value in dates
+               if value and value.isdigit() and len(value) == 8 and _legacy_parse_date(value) == parse_date(value))
+    legacy_ok = sum(1 for value in dates if _legacy_parse_date(value))
+    shared_ok = sum(1 for value in dates if parse_date(value))
+    print(f"✅ YYYYMMDD 결과 일치: {same:,}건 / 날짜 파싱 성공: 기존 {legacy_ok:,}건 → 공용 {shared_ok:,}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='G2B 날짜/숫자 파싱 공용 모듈')
+    parser.add_argument('--benchmark', action='store_true',
+                       help='기존 파서 대비 마이크로벤치마크 실행')
+    parser.add_argument('--count', type=int, default=200000,
+                       help='벤치마크 샘플 수 (기본: 200000)')
+    parser.add_argument('values', nargs='*', help='파싱할 값 (날짜/숫자 결과 출력)')
+
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.count)
+    for value in args.values:
+        print(f"{value!r}: date={parse_date(value)!r}, number={parse_number(value)!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+히스토리 데이터 로더
+수집 파일(collected_bids_*.json / collected_awards_*.json)을 읽어
+입찰-낙찰 조인 레코드(예측/분석 공용 스키마)를 생성
+
+- HistoryJoinIndex: 증분 조인 상태 (SQLite) - 새 수집분만 조인하여 history.ndjson 뒤에 추가
+  (조인된 히스토리 파일은 같은 bid_id의 마지막 레코드가 최신)
+"""
+
+import os
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+
+# 예산 구간 경계 (ml_prediction._calculate_budget_factor와 동일)
+BUDGET_BANDS = [
+    (30_000_000, 'under_30m'),
+    (100_000_000, '30m_100m'),
+    (500_000_000, '100m_500m'),
+]
+BUDGET_BAND_MAX = 'over_500m'
+BUDGET_BAND_UNKNOWN = 'unknown'
+
+
+def budget_band(budget) -> str:
+    """예산 → 예산 구간 라벨"""
+    try:
+        value = float(budget)
+    except (TypeError, ValueError):
+        return BUDGET_BAND_UNKNOWN
+
+    for upper, label in BUDGET_BANDS:
+        if value < upper:
+            return label
+    return BUDGET_BAND_MAX
+
+
+def load_records(path: str) -> List[Dict]:
+    """JSON 배열 또는 NDJSON 파일 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        f.seek(0)
+
+        if head == '[':
+            return json.load(f)
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def history_record(bid: Dict, award: Dict) -> Optional[Dict]:
+    """입찰 1건 + 낙찰 1건 → 히스토리 레코드 (낙찰률이 없으면 None)"""
+    if award.get('winnerRate') is None:
+        return None
+    return {
+        'bid_id': award['bidId'],
+        'title': bid.get('title', ''),
+        'agency': bid.get('agency', ''),
+        'category': bid.get('category', ''),
+        'region': bid.get('region', ''),
+        'budget': bid.get('budget'),
+        'announcementDate': bid.get('announcementDate'),
+        'deadline': bid.get('deadline'),
+        'opengDate': award.get('opengDate'),
+        'winnerRate': award['winnerRate'],
+        'biddersCount': award.get('biddersCount'),
+        'winnerAmount': award.get('winnerAmount'),
+    }
+
+
+def join_bids_awards(bids: Iterable[Dict], awards: Iterable[Dict]) -> List[Dict]:
+    """
+    입찰-낙찰 조인 (bid.id == award.bidId)
+
+    Returns:
+        낙찰 정보가 있는 입찰만 포함한 히스토리 레코드 리스트
+        {
+            'bid_id', 'title', 'agency', 'category', 'region', 'budget',
+            'announcementDate', 'deadline', 'opengDate',
+            'winnerRate', 'biddersCount', 'winnerAmount'
+        }
+    """
+    bid_map = {bid.get('id'): bid for bid in bids if bid.get('id')}
+
+    history = []
+    for award in awards:
+        bid = bid_map.get(award.get('bidId'))
+        record = history_record(bid, award) if bid is not None else None
+        if record is not None:
+            history.append(record)
+
+    return history
+
+
+def latest_history(records: Iterable[Dict]) -> List[Dict]:
+    """같은 bid_id는 마지막 레코드만 사용 (증분 조인이 변경분을 이어 쓴 히스토리 파일)"""
+    latest, keyless = {}, []
+    for record in records:
+        bid_id = record.get('bid_id')
+        if bid_id:
+            latest.pop(bid_id, None)
+            latest[bid_id] = record
+        else:
+            keyless.append(record)
+    return list(latest.values()) + keyless
+
+
+def load_history(bids_path: str, awards_path: Optional[str] = None) -> List[Dict]:
+    """
+    히스토리 로드
+
+    Args:
+        bids_path: 입찰 파일 (awards_path가 없으면 이미 조인된 히스토리 파일로 간주)
+        awards_path: 낙찰 파일
+    """
+    if awards_path is None:
+        return latest_history(load_records(bids_path))
+    return join_bids_awards(load_records(bids_path), load_records(awards_path))
+
+
+class HistoryJoinIndex:
+    """
+    증분 입찰-낙찰 조인 상태 (실행 간 유지, SQLite 파일 하나)
+
+    - bids / awards: id → 조인에 쓰는 필드만 (짝이 나중에 도착해도 조인, 값이 같으면 다시 쓰지 않음)
+    - cursors: 컬렉션별 InsightReader.changes 커서 (로컬 수집 파일별 읽은 위치)
+    - apply()는 이번 실행 키만 조회하고 새로 조인되거나 값이 바뀐 히스토리 레코드만 반환
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS bids (key TEXT PRIMARY KEY, entry TEXT) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS awards (key TEXT PRIMARY KEY, entry TEXT) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+    """
+    CHUNK_SIZE = 500  # 키 조회 배치 크기
+    BID_FIELDS = ('title', 'agency', 'category', 'region', 'budget', 'announcementDate', 'deadline')
+    AWARD_FIELDS = ('bidId', 'opengDate', 'winnerRate', 'biddersCount', 'winnerAmount')
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.is_new = not os.path.exists(path)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(self.SCHEMA)
+        meta = dict(self.conn.execute('SELECT name, value FROM meta'))
+        self.cursors: Dict[str, object] = json.loads(meta['cursors']) if meta.get('cursors') else {}
+
+    def _lookup(self, table: str, keys: List[str]) -> Dict[str, Dict]:
+        entries = {}
+        for start in range(0, len(keys), self.CHUNK_SIZE):
+            chunk = keys[start:start + self.CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(f'SELECT key, entry FROM {table} WHERE key IN ({placeholders})', chunk)
+            entries.update((key, json.loads(entry)) for key, entry in rows)
+        return entries
+
+    def apply(self, bids: Iterable[Dict], awards: Iterable[Dict]) -> List[Dict]:
+        """
+        변경분 반영
+
+        Returns:
+            새로 조인되거나 입찰/낙찰 값이 바뀐 히스토리 레코드 (bid_id당 1건)
+        """
+        changed = {'bids': {}, 'awards': {}}
+        for bid in bids:
+            if bid.get('id'):
+                changed['bids'][str(bid['id'])] = {field: bid.get(field) for field in self.BID_FIELDS}
+        for award in awards:
+            if award.get('bidId'):
+                changed['awards'][str(award['bidId'])] = {field: award.get(field) for field in self.AWARD_FIELDS}
+
+        keys = list(dict.fromkeys([*changed['bids'], *changed['awards']]))
+        stored = {table: self._lookup(table, keys) for table in ('bids', 'awards')}
+        history = []
+        for key in keys:
+            current = {}
+            for table in ('bids', 'awards'):
+                entry = changed[table].get(key)
+                if entry is not None and entry != stored[table].get(key):
+                    self.conn.execute(f'INSERT OR REPLACE INTO {table} VALUES (?, ?)',
+                                      (key, json.dumps(entry, ensure_ascii=False)))
+                    current[table] = entry
+            if not current:
+                continue
+            bid = current.get('bids') or stored['bids'].get(key)
+            award = current.get('awards') or stored['awards'].get(key)
+            record = history_record(bid, award) if bid is not None and award is not None else None
+            if record is not None:
+                history.append(record)
+        return history
+
+    def save(self):
+        """커서 저장 후 이번 실행 변경 커밋"""
+        self.conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)', [
+            ('updated_at', datetime.now().isoformat()),
+            ('cursors', json.dumps(self.cursors, ensure_ascii=False)),
+        ])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
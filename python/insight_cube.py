@@ -0,0 +1,341 @@
+"""
+인사이트 롤업 큐브 (Rollup Cube)
+(기관, 업종, 지역, 월, 예산 구간) 기본 셀에 가산 측정값을 미리 집계해 두고
+임의의 group-by/필터 조합을 조회 시점에 롤업 (새 전체 스캔 없이 밀리초 단위 응답)
+
+- 측정값: GroupStats 필드 (입찰 수, 예산 합/제곱합, 낙찰 수, 낙찰률/참여업체 수 합 - 모두 가산)
+- 파생 차원: quarter, year (month에서 계산)
+- 저장: 차원별 사전(dictionary) + 정수 코드 배열 + 측정값 배열 (.npz 압축)
+- 입력: InsightIndex (증분 인사이트 상태, Firestore 조회 없음) 또는 InsightReader (Firestore/로컬 파일)
+- 조회 지표는 인사이트 문서와 같은 정의/반올림 (totalBids, averageWinRate, averageCompetition 등)
+  셀 합계를 더한 그룹 합계를 인사이트와 같은 자릿수로 정리(settle)한 뒤 평균을 계산 → 문서 값과 일치
+
+실행 예시:
+    python insight_cube.py --build --from-index ./insights/insight_index.db
+    python insight_cube.py --build --source local --data-dir ./
+    python insight_cube.py --group-by agency month --filter category=건설 --from 2025-01 --to 2025-06
+    python insight_cube.py --benchmark
+"""
+
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from analyze_insights import (
+    AMOUNT_DIGITS, INSIGHT_INDEX_PATH, RATE_DIGITS,
+    AwardIndex, GroupStats, InsightIndex, bid_month, numeric_value, settle
+)
+from history_data import budget_band
+from insight_store import InsightReader, LocalInsightReader
+
+# 배열 연산 (pandas 의존성으로 함께 설치됨)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+CUBE_PATH = './insights/insight_cube.npz'
+CUBE_DIMENSIONS = ('agency', 'category', 'region', 'month', 'budgetBand')
+# 파생 차원 (month 사전 값 → 상위 기간)
+DERIVED_DIMENSIONS = {
+    'quarter': lambda month: f"{month[:4]}-Q{(int(month[5:7]) - 1) // 3 + 1}",
+    'year': lambda month: month[:4],
+}
+COUNT_FIELDS = ('count', 'budget_count', 'awarded', 'rate_count', 'bidders_count')
+METRICS = ('totalBids', 'awardedBids', 'averageBudget', 'budgetStdDev', 'averageWinRate', 'averageCompetition')
+UNKNOWN = ''  # 차원 값 없음 (group-by 시 제외 - 인사이트와 동일)
+
+
+def _matches(value, condition) -> bool:
+    """필터 조건: 값 | 값 목록 | {'from': 시작, 'to': 끝} (양끝 포함)"""
+    if isinstance(condition, dict):
+        text = str(value)
+        return (condition.get('from') is None or text >= condition['from']) and \
+            (condition.get('to') is None or text <= condition['to'])
+    if isinstance(condition, (list, tuple, set, frozenset)):
+        return value in condition
+    return value == condition
+
+
+class InsightCube:
+    """기본 셀 큐브 (셀마다 차원 코드 + 가산 측정값)"""
+
+    def __init__(self, dictionaries: Dict[str, List], codes: Dict[str, 'np.ndarray'],
+                 measures: Dict[str, 'np.ndarray'], meta: Optional[Dict] = None):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy가 설치되어 있지 않습니다. (pip install pandas)")
+        self.dictionaries = dictionaries
+        self.codes = codes
+        self.measures = measures
+        self.meta = meta or {}
+        self.size = len(measures['count'])
+        self._derived: Dict[str, Tuple[List, 'np.ndarray']] = {}
+
+    @classmethod
+    def build(cls, bids: Iterable[Dict], awards: AwardIndex) -> 'InsightCube':
+        """입찰 1회 순회로 기본 셀 집계 (낙찰 조인/기간 기준일/결측 처리는 인사이트 집계와 동일)"""
+        cells: Dict[Tuple, GroupStats] = {}
+        scanned = undated = 0
+        for bid in bids:
+            scanned += 1
+            award = awards.get(bid.get('id'))
+            month = bid_month(bid, award)
+            if month is None:
+                undated += 1
+                continue
+            budget = numeric_value(bid.get('budget'))
+            key = (bid.get('agency') or UNKNOWN, bid.get('category') or UNKNOWN, bid.get('region') or UNKNOWN,
+                   month, budget_band(budget))
+            stats = cells.get(key)
+            if stats is None:
+                stats = cells[key] = GroupStats()
+            stats.add(budget, award)
+        return cls.from_cells(cells, {'scanned': scanned, 'undated': undated,
+                                      'built_at': datetime.now().isoformat()})
+
+    @classmethod
+    def from_cells(cls, cells: Dict[Tuple, GroupStats], meta: Optional[Dict] = None) -> 'InsightCube':
+        keys = list(cells)
+        dictionaries, codes = {}, {}
+        for position, dim in enumerate(CUBE_DIMENSIONS):
+            values = sorted({key[position] for key in keys}, key=str)
+            lookup = {value: code for code, value in enumerate(values)}
+            dictionaries[dim] = values
+            codes[dim] = np.array([lookup[key[position]] for key in keys], dtype=np.int32)
+        measures = {
+            field: np.array([getattr(cells[key], field) for key in keys],
+                            dtype=np.int64 if field in COUNT_FIELDS else np.float64)
+            for field in GroupStats.FIELDS
+        }
+        return cls(dictionaries, codes, measures, meta)
+
+    def dimension(self, dim: str) -> Tuple[List, 'np.ndarray']:
+        """차원 사전과 셀별 코드 (파생 차원은 month 코드에서 계산 후 캐시)"""
+        if dim in self.codes:
+            return self.dictionaries[dim], self.codes[dim]
+        if dim not in DERIVED_DIMENSIONS:
+            raise ValueError(f"알 수 없는 차원: {dim} (사용 가능: {', '.join(CUBE_DIMENSIONS + tuple(DERIVED_DIMENSIONS))})")
+        if dim not in self._derived:
+            derive = DERIVED_DIMENSIONS[dim]
+            months = self.dictionaries['month']
+            values = sorted({derive(month) for month in months})
+            lookup = {value: code for code, value in enumerate(values)}
+            mapping = np.array([lookup[derive(month)] for month in months], dtype=np.int32)
+            self._derived[dim] = (values, mapping[self.codes['month']])
+        return self._derived[dim]
+
+    def query(self, group_by: Iterable[str] = (), filters: Optional[Dict[str, Any]] = None,
+              order_by: str = 'totalBids', limit: Optional[int] = None, min_bids: int = 1) -> List[Dict]:
+        """
+        롤업 조회
+
+        Args:
+            group_by: 그룹 차원 (agency/category/region/month/budgetBand/quarter/year, 없으면 전체 합계 1행)
+            filters: 차원 → 값 | 값 목록 | {'from': 시작, 'to': 끝} (양끝 포함, 문자열 비교)
+            order_by: 정렬 기준 (지표는 내림차순, 그룹 차원은 오름차순)
+            limit: 최대 행 수
+            min_bids: 최소 입찰 수 (인사이트의 min_bids와 같은 용도)
+
+        Returns:
+            [{차원: 값, ..., 'totalBids', 'awardedBids', 'averageBudget', 'budgetStdDev',
+              'averageWinRate', 'averageCompetition'}]
+        """
+        group_by = list(group_by)
+        if order_by not in METRICS and order_by not in group_by:
+            raise ValueError(f"정렬 기준은 지표({', '.join(METRICS)}) 또는 그룹 차원이어야 합니다: {order_by}")
+
+        mask = np.ones(self.size, dtype=bool)
+        for dim, condition in (filters or {}).items():
+            values, codes = self.dimension(dim)
+            allowed = [code for code, value in enumerate(values) if _matches(value, condition)]
+            mask &= np.isin(codes, allowed)
+
+        # 그룹 키: 차원 코드의 혼합 기수 정수 (값 없는 차원은 제외)
+        keys = np.zeros(self.size, dtype=np.int64)
+        group_codes = []
+        for dim in group_by:
+            values, codes = self.dimension(dim)
+            if values and values[0] == UNKNOWN:
+                mask &= codes != 0
+            keys = keys * max(len(values), 1) + codes
+            group_codes.append((dim, values, codes))
+
+        selected = np.flatnonzero(mask)
+        groups, first, inverse = np.unique(keys[selected], return_index=True, return_inverse=True)
+        sums = {field: np.bincount(inverse, weights=self.measures[field][selected], minlength=len(groups))
+                for field in GroupStats.FIELDS}
+        metrics = self._metrics(sums)
+
+        order = np.flatnonzero(sums['count'] >= max(min_bids, 1))
+        if order_by in METRICS:
+            ranking = np.nan_to_num(metrics[order_by][order], nan=-np.inf)
+            order = order[np.argsort(-ranking, kind='stable')]
+        else:
+            codes = dict((dim, codes) for dim, _, codes in group_codes)[order_by]
+            order = order[np.argsort(codes[selected[first[order]]], kind='stable')]
+        if limit is not None:
+            order = order[:limit]
+
+        rows = []
+        members = selected[first[order]]
+        columns = {name: values.tolist() for name, values in metrics.items()}
+        counts = {field: sums[field].astype(np.int64).tolist() for field in ('count', 'awarded')}
+        decoded = [(dim, values, codes[members].tolist()) for dim, values, codes in group_codes]
+        for position, group in enumerate(order.tolist()):
+            row = {dim: values[codes[position]] for dim, values, codes in decoded}
+            row['totalBids'] = counts['count'][group]
+            row['awardedBids'] = counts['awarded'][group]
+            for name, digits in (('averageBudget', AMOUNT_DIGITS), ('budgetStdDev', AMOUNT_DIGITS),
+                                 ('averageWinRate', RATE_DIGITS), ('averageCompetition', RATE_DIGITS)):
+                value = columns[name][group]
+                row[name] = round(value, digits) if value == value else None
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _metrics(sums: Dict[str, 'np.ndarray']) -> Dict[str, 'np.ndarray']:
+        """그룹 합계 → 인사이트 지표 (GroupStats 프로퍼티와 같은 정의/합계 정리, 분모가 0이면 NaN)"""
+        def ratio(numerator, denominator):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(denominator > 0, numerator / denominator, np.nan)
+
+        # 합계 정리는 GroupStats와 같은 Python round (np.round는 배율 곱셈 방식이라 결과가 다를 수 있음)
+        sums = dict(sums, **{field: np.array([settle(total) for total in sums[field].tolist()], dtype=np.float64)
+                             for field in GroupStats.SUM_FIELDS})
+        budget_count, budget_sum = sums['budget_count'], sums['budget_sum']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (sums['budget_sumsq'] - budget_sum * budget_sum / budget_count) / (budget_count - 1)
+        return {
+            'totalBids': sums['count'],
+            'awardedBids': sums['awarded'],
+            'averageBudget': np.where(budget_count > 0, ratio(budget_sum, budget_count), 0.0),
+            'budgetStdDev': np.where(budget_count >= 2, np.sqrt(np.maximum(variance, 0.0)), 0.0),
+            'averageWinRate': ratio(sums['rate_sum'], sums['rate_count']),
+            'averageCompetition': ratio(sums['bidders_sum'], sums['bidders_count']),
+        }
+
+    def save(self, path: str = CUBE_PATH):
+        """압축 저장 (사전/메타는 JSON 문자열, 코드/측정값은 배열 - pickle 미사용)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        arrays = {f'code_{dim}': codes for dim, codes in self.codes.items()}
+        arrays.update({f'measure_{field}': values for field, values in self.measures.items()})
+        header = json.dumps({'dictionaries': self.dictionaries, 'meta': self.meta}, ensure_ascii=False)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, header=np.array(header), **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = CUBE_PATH) -> 'InsightCube':
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data['header']))
+            codes = {dim: data[f'code_{dim}'] for dim in CUBE_DIMENSIONS}
+            measures = {field: data[f'measure_{field}'] for field in GroupStats.FIELDS}
+        return cls(header['dictionaries'], codes, measures, header['meta'])
+
+
+def build_from_index(index_path: str = INSIGHT_INDEX_PATH) -> InsightCube:
+    """증분 인사이트 인덱스에 보관된 입찰/낙찰로 큐브 생성 (Firestore 조회 없음)"""
+    index = InsightIndex(index_path)
+    try:
+        return InsightCube.build(index.iter_bids(), index.load_awards())
+    finally:
+        index.close()
+
+
+def build_from_reader(reader: InsightReader) -> InsightCube:
+    """소스(Firestore/로컬 파일) 1회 스캔으로 큐브 생성"""
+    awards = AwardIndex().add_many(reader.stream('history'))
+    return InsightCube.build(reader.stream('bids'), awards)
+
+
+def parse_filters(specs: Iterable[str], month_from: Optional[str] = None,
+                  month_to: Optional[str] = None) -> Dict[str, Any]:
+    """CLI/API 필터 ('category=건설', 'region=서울,경기') + 월 범위 → query filters"""
+    filters: Dict[str, Any] = {}
+    for spec in specs:
+        dim, _, value = spec.partition('=')
+        values = [item for item in value.split(',') if item]
+        filters[dim.strip()] = values[0] if len(values) == 1 else values
+    if month_from or month_to:
+        filters['month'] = {'from': month_from, 'to': month_to}
+    return filters
+
+
+def benchmark(cube: InsightCube, repeat: int = 20):
+    """대표 조회 조합 응답 시간"""
+    queries = [
+        ('전체 합계', [], {}),
+        ('기관별', ['agency'], {}),
+        ('기관 × 업종', ['agency', 'category'], {}),
+        ('지역 × 월', ['region', 'month'], {}),
+        ('업종 × 분기 (예산 구간 필터)', ['category', 'quarter'], {'budgetBand': ['100m_500m', 'over_500m']}),
+        ('기관 × 업종 × 지역 × 월 × 예산', list(CUBE_DIMENSIONS), {}),
+    ]
+    print(f"⏱️ 큐브 조회 벤치마크 (셀 {cube.size:,}개, {repeat}회 평균)")
+    for label, group_by, filters in queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            rows = cube.query(group_by, filters)
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"   {label:<28} {elapsed * 1000:8.2f}ms  ({len(rows):,}행)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='인사이트 롤업 큐브 생성/조회')
+    parser.add_argument('--cube', type=str, default=CUBE_PATH,
+                       help=f'큐브 파일 (기본: {CUBE_PATH})')
+    parser.add_argument('--build', action='store_true', help='큐브 생성')
+    parser.add_argument('--from-index', type=str, nargs='?', const=INSIGHT_INDEX_PATH,
+                       help=f'증분 인사이트 인덱스에서 생성 (기본: {INSIGHT_INDEX_PATH})')
+    parser.add_argument('--source', choices=['firestore', 'local'], default='local',
+                       help='인덱스 없이 생성할 때 소스 (기본: local)')
+    parser.add_argument('--data-dir', type=str, default='./',
+                       help='로컬 수집 파일 디렉토리 (기본: ./)')
+    parser.add_argument('--group-by', nargs='*', default=[],
+                       help=f"그룹 차원 ({', '.join(CUBE_DIMENSIONS + tuple(DERIVED_DIMENSIONS))})")
+    parser.add_argument('--filter', action='append', default=[],
+                       help="필터 (예: category=건설, region=서울,경기 - 반복 지정 가능)")
+    parser.add_argument('--from', dest='month_from', type=str, help='시작 월 (YYYY-MM, 포함)')
+    parser.add_argument('--to', dest='month_to', type=str, help='종료 월 (YYYY-MM, 포함)')
+    parser.add_argument('--order-by', type=str, default='totalBids', help='정렬 기준 (기본: totalBids)')
+    parser.add_argument('--limit', type=int, default=20, help='최대 행 수 (기본: 20)')
+    parser.add_argument('--benchmark', action='store_true', help='대표 조회 조합 응답 시간 측정')
+
+    args = parser.parse_args()
+
+    if args.build:
+        start = time.time()
+        if args.from_index:
+            cube = build_from_index(args.from_index)
+        elif args.source == 'local':
+            cube = build_from_reader(LocalInsightReader(args.data_dir))
+        else:
+            from insight_store import FirestoreInsightReader, firestore_client
+            cube = build_from_reader(FirestoreInsightReader(firestore_client()))
+        cube.save(args.cube)
+        print(f"💾 큐브 저장: {args.cube} (입찰 {cube.meta['scanned']:,}건 → 셀 {cube.size:,}개, "
+              f"파일 {os.path.getsize(args.cube) / 1024:.1f}KB, {time.time() - start:.2f}초)")
+        return
+
+    cube = InsightCube.load(args.cube)
+    if args.benchmark:
+        benchmark(cube)
+        return
+
+    start = time.perf_counter()
+    rows = cube.query(args.group_by, parse_filters(args.filter, args.month_from, args.month_to),
+                      order_by=args.order_by, limit=args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"🔍 {len(rows)}행 ({elapsed:.2f}ms)")
+    for row in rows:
+        print(json.dumps(row, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""
+인사이트 입출력 백엔드 (Insight Reader / Writer)
+BidAnalyzer가 읽는 입찰/낙찰 소스와 인사이트 저장소를 교체 가능하게 분리
+
+- FirestoreInsightReader / FirestoreInsightWriter: 운영 경로 (bids/history 컬렉션 → insights 컬렉션)
+- LocalInsightReader: 로컬 수집 파일(collected_bids_*/collected_awards_*, JSON 배열/NDJSON/Parquet)
+  Firestore 문서와 같도록 동일 id는 마지막 레코드만 사용 (파일 수정 시각 → 파일 내 순서)
+  증분 조회는 파일별 (크기, 수정 시각, 읽은 위치) 커서로 새 파일/NDJSON 추가분만 읽음
+- JsonInsightWriter: 오프라인 실행용 로컬 JSON 파일 (문서 ID → 인사이트)
+
+로컬 경로는 firebase_admin 없이 실행 가능
+"""
+
+import os
+import glob
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from data_quality import RecordSource, load_frame
+
+# 컬럼 엔진용 DataFrame 로드 (선택사항)
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# Firestore 백엔드 (선택사항, 로컬 모드는 불필요)
+try:
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+    FIREBASE_AVAILABLE = True
+except ImportError:
+    FIREBASE_AVAILABLE = False
+
+
+# 컬렉션 → 로컬 수집 파일 접두사
+LOCAL_PREFIXES = {
+    'bids': 'collected_bids_',
+    'history': 'collected_awards_',
+}
+LOCAL_EXTENSIONS = ('.json', '.ndjson', '.parquet')
+# 컬렉션별 문서 키 (로컬 파일 중복 제거 기준)
+KEY_FIELDS = {
+    'bids': 'id',
+    'history': 'bidId',
+}
+# 워터마크 증분 조회 시 다시 조회할 구간 (워터마크보다 이른 변경 시각으로 늦게 도착한 문서 반영)
+LATE_WINDOW = timedelta(days=3)
+
+
+def latest_records(records: Iterable[Dict], key_field: str) -> List[Dict]:
+    """동일 키는 마지막 레코드만 남김 (키 없는 레코드는 그대로 유지, Firestore 덮어쓰기 순서)"""
+    latest, keyless = {}, []
+    for record in records:
+        key = record.get(key_field)
+        if key:
+            latest.pop(key, None)  # 마지막 레코드 위치로 이동
+            latest[key] = record
+        else:
+            keyless.append(record)
+    return list(latest.values()) + keyless
+
+
+def insight_doc_id(insight: Dict) -> str:
+    """Firestore 인사이트 문서 ID ({type}_{name}_{period})"""
+    return f"{insight['type']}_{insight['name']}_{insight['period']}"
+
+
+def firestore_client():
+    """Firebase 초기화 후 Firestore 클라이언트 (이미 초기화되었다면 스킵)"""
+    if not FIREBASE_AVAILABLE:
+        raise RuntimeError("firebase_admin이 설치되어 있지 않습니다. 로컬 모드(--source local)를 사용하세요.")
+    try:
+        firebase_admin.get_app()
+    except ValueError:
+        cred = credentials.Certificate('serviceAccountKey.json')
+        firebase_admin.initialize_app(cred)
+    return firestore.client()
+
+
+class InsightReader:
+    """입찰/낙찰 소스 기본 클래스"""
+
+    def stream(self, collection: str) -> Iterable[Dict]:
+        """컬렉션 전체 레코드"""
+        raise NotImplementedError
+
+    def changed(self, collection: str, fields: Iterable[str], watermark: Optional[str]) -> Iterable[Dict]:
+        """워터마크 이후 생성/변경된 레코드 (워터마크가 없으면 전체)"""
+        raise NotImplementedError
+
+    def changes(self, collection: str, fields: Iterable[str], cursor: Any = None) -> Tuple[List[Dict], Any]:
+        """
+        지난 조회 이후 변경분과 다음 커서 (커서가 없으면 전체)
+
+        기본 구현은 변경 시각 워터마크 - 워터마크에서 LATE_WINDOW만큼 앞선 시각부터 다시 조회하여
+        늦게 도착한 과거 시각 문서도 반영 (이미 반영된 문서는 InsightIndex가 변경 없음으로 건너뜀)
+        """
+        fields = tuple(fields)
+        watermark = cursor if cursor.__class__ is str else ''
+        since = None
+        if watermark:
+            try:
+                since = (datetime.fromisoformat(watermark[:19]) - LATE_WINDOW).isoformat()
+            except ValueError:
+                since = watermark
+        records = list(self.changed(collection, fields, since))
+        for record in records:
+            for field in fields:
+                value = record.get(field)
+                if value.__class__ is str and value > watermark:
+                    watermark = value
+        return records, watermark or None
+
+    def frames(self) -> Optional[Tuple['pd.DataFrame', 'pd.DataFrame']]:
+        """(입찰, 낙찰) DataFrame - 컬럼 엔진을 지원하지 않는 소스는 None"""
+        return None
+
+
+class FirestoreInsightReader(InsightReader):
+    """Firestore bids/history 컬렉션"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def stream(self, collection: str) -> Iterable[Dict]:
+        return (doc.to_dict() for doc in self.db.collection(collection).stream())
+
+    def changed(self, collection: str, fields: Iterable[str], watermark: Optional[str]) -> Iterable[Dict]:
+        """필드별 쿼리 결과를 문서 ID로 병합"""
+        if not watermark:
+            return self.stream(collection)
+        ref = self.db.collection(collection)
+        docs = {}
+        for field in fields:
+            for doc in ref.where(field, '>=', watermark).stream():
+                docs[doc.id] = doc.to_dict()
+        return list(docs.values())
+
+
+class LocalInsightReader(InsightReader):
+    """
+    로컬 수집 파일 소스
+
+    Firestore는 문서 ID(입찰 id / 낙찰 bidId)당 1건이므로 동일 키는 마지막 레코드만 사용
+    (키 없는 레코드는 그대로 유지)
+    """
+
+    def __init__(self, directory: str = './', paths: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            directory: 수집 파일 디렉토리 (collected_bids_* / collected_awards_*)
+            paths: 컬렉션별 파일 목록 직접 지정 ({'bids': [...], 'history': [...]})
+        """
+        self.directory = directory
+        self.paths = paths or {}
+
+    def files(self, collection: str) -> List[str]:
+        """컬렉션 파일 목록 (수정 시각 순 - 뒤 파일이 최신)"""
+        if collection in self.paths:
+            return list(self.paths[collection])
+        files = [path for path in glob.glob(os.path.join(self.directory, LOCAL_PREFIXES[collection] + '*'))
+                 if path.endswith(LOCAL_EXTENSIONS)]
+        return sorted(files, key=lambda path: (os.path.getmtime(path), path))
+
+    def stream(self, collection: str) -> Iterable[Dict]:
+        return latest_records(RecordSource(self.files(collection)), KEY_FIELDS[collection])
+
+    def changed(self, collection: str, fields: Iterable[str], watermark: Optional[str]) -> Iterable[Dict]:
+        records = self.stream(collection)
+        if not watermark:
+            return records
+        fields = tuple(fields)
+        return [record for record in records
+                if any(record.get(field).__class__ is str and record[field] >= watermark for field in fields)]
+
+    def changes(self, collection: str, fields: Iterable[str], cursor: Any = None) -> Tuple[List[Dict], Any]:
+        """
+        지난 조회 이후 새로 생긴 파일, NDJSON 뒤에 추가된 줄, 다시 쓰인 파일만 읽음
+
+        변경 시각 필드와 무관하므로 과거 createdAt으로 늦게 도착한 레코드도 반영,
+        그대로인 파일은 열지 않음 (비용이 누적 이력이 아닌 새로 들어온 데이터 양에 비례)
+
+        Args:
+            cursor: 파일 경로 → [크기, 수정 시각(ns), 읽은 바이트 위치] (그 외 값이면 전체 파일을 읽음)
+        """
+        offsets = cursor if isinstance(cursor, dict) else {}
+        records, state = [], {}
+        for path in self.files(collection):
+            stat = os.stat(path)
+            previous = offsets.get(path)
+            if previous and previous[:2] == [stat.st_size, stat.st_mtime_ns]:
+                state[path] = previous
+                continue
+            start = previous[2] if previous and previous[0] <= stat.st_size else 0
+            if start and not path.endswith('.parquet') and self._is_ndjson(path):
+                offset = self._read_lines(path, start, records)
+            else:
+                records.extend(RecordSource(path))
+                offset = stat.st_size
+            state[path] = [stat.st_size, stat.st_mtime_ns, offset]
+        return latest_records(records, KEY_FIELDS[collection]), state
+
+    @staticmethod
+    def _is_ndjson(path: str) -> bool:
+        with open(path, 'rb') as f:
+            return f.read(RecordSource.CHUNK_SIZE).lstrip()[:1] != b'['
+
+    @staticmethod
+    def _read_lines(path: str, start: int, records: List[Dict]) -> int:
+        """NDJSON start 바이트 이후 줄 읽기 → 다음 읽을 위치 (파싱되지 않는 마지막 줄은 쓰는 중으로 보고 다음에 읽음)"""
+        offset = start
+        with open(path, 'rb') as f:
+            f.seek(start)
+            for line in f:
+                if line.endswith(b'\n'):
+                    if line.strip():
+                        records.append(json.loads(line))
+                else:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break
+                offset += len(line)
+        return offset
+
+    def frames(self) -> Optional[Tuple['pd.DataFrame', 'pd.DataFrame']]:
+        if not PANDAS_AVAILABLE:
+            return None
+        frames = []
+        for collection in ('bids', 'history'):
+            files = self.files(collection)
+            frame = load_frame(files) if files else pd.DataFrame()
+            key_field = KEY_FIELDS[collection]
+            if key_field in frame.columns:
+                keys = frame[key_field]
+                keyed = keys.notna() & (keys != '')
+                frame = pd.concat([frame[keyed].drop_duplicates(key_field, keep='last'), frame[~keyed]])
+            frames.append(frame)
+        return frames[0], frames[1]
+
+
+class InsightWriter:
+    """인사이트 저장소 기본 클래스"""
+
+    def upsert(self, insights: List[Dict]):
+        raise NotImplementedError
+
+    def delete(self, doc_ids: List[str]):
+        raise NotImplementedError
+
+
+class FirestoreInsightWriter(InsightWriter):
+    """Firestore insights 컬렉션 (batch 쓰기 한도 단위로 나누어 커밋)"""
+
+    MAX_BATCH_WRITES = 500  # Firestore batch 쓰기 한도
+
+    def __init__(self, db, collection: str = 'insights'):
+        self.db = db
+        self.collection = collection
+
+    def upsert(self, insights: List[Dict]):
+        for start in range(0, len(insights), self.MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for insight in insights[start:start + self.MAX_BATCH_WRITES]:
+                doc_ref = self.db.collection(self.collection).document(insight_doc_id(insight))
+                batch.set(doc_ref, insight, merge=True)
+            batch.commit()
+
+    def delete(self, doc_ids: List[str]):
+        for start in range(0, len(doc_ids), self.MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for doc_id in doc_ids[start:start + self.MAX_BATCH_WRITES]:
+                batch.delete(self.db.collection(self.collection).document(doc_id))
+            batch.commit()
+
+
+class JsonInsightWriter(InsightWriter):
+    """로컬 JSON 인사이트 파일 (문서 ID → 인사이트, 쓰기마다 원자적 교체)"""
+
+    def __init__(self, path: str = './insights/insights.json'):
+        self.path = path
+        self.documents: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.documents = json.load(f).get('documents', {})
+
+    def upsert(self, insights: List[Dict]):
+        for insight in insights:
+            self.documents[insight_doc_id(insight)] = insight
+        self.save()
+
+    def delete(self, doc_ids: List[str]):
+        for doc_id in doc_ids:
+            self.documents.pop(doc_id, None)
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'updated_at': datetime.now().isoformat(), 'documents': self.documents},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -9,12 +9,18 @@ AI 예측 모델 (MVP v1.1 Baseline 버전)
 """
 
 import os
+import json
+import hashlib
 from datetime import datetime
 from typing import Dict, List, Optional
 import statistics
 from dotenv import load_dotenv
 import firebase_admin
 from firebase_admin import credentials, firestore
+from win_rate_curves import WinRateCurves, WinRateSketch
+from outlier_sketch import filter_outliers
+from similar_bids import SimilarBidIndex
+from prediction_sink import PredictionSink, create_sink
 
 load_dotenv()
 
@@ -28,6 +34,9 @@ if not firebase_admin._apps:
 
 db = firestore.client() if firebase_admin._apps else None
 
+# 모델 버전 (사전 예측 테이블 키, API 기본값)
+MODEL_VERSION = 'baseline-v1.1'
+
 
 class BaselinePredictionModel:
     """
@@ -40,6 +49,8 @@ class BaselinePredictionModel:
     - 예산 규모 보정 (10% 가중치)
     """
     
+    MODEL_VERSION = MODEL_VERSION
+    
     # 기본값 (히스토리 데이터 없을 때)
     DEFAULT_RATE = 87.5
     DEFAULT_CONFIDENCE = 0.4
@@ -52,13 +63,99 @@ class BaselinePredictionModel:
         'budget': 0.10
     }
     
-    def __init__(self, mock_mode: bool = True):
+    # 분위수 → 투찰 전략 매핑 (낙찰률 q 분위 투찰 시 낙찰 확률 ≈ 1 - q)
+    STRATEGY_QUANTILES = {
+        'aggressive': 0.7,
+        'recommended': 0.3,
+        'conservative': 0.1
+    }
+    
+    # 예측 결과에 포함할 유사 과거 입찰 수
+    SIMILAR_BIDS_K = 5
+    
+    def __init__(self, mock_mode: bool = True, win_rate_curves: Optional[WinRateCurves] = None,
+                 similar_index: Optional[SimilarBidIndex] = None, verbose: bool = True):
         """
         Args:
             mock_mode: True면 샘플 히스토리 사용, False면 실제 Firestore 조회
+            win_rate_curves: 세그먼트별 낙찰률 경험분포 (없으면 고정 배수 전략 사용)
+            similar_index: 유사 과거 입찰 검색 인덱스 (없으면 similar_bids 생략)
+            verbose: False면 예측별 진행 로그 생략 (일괄/백테스트용)
         """
         self.mock_mode = mock_mode
         self.history_cache = {}
+        self.win_rate_curves = win_rate_curves
+        self.similar_index = similar_index
+        self.verbose = verbose
+    
+    @property
+    def model_version(self) -> str:
+        """모델 버전 (경험분포/유사입찰 인덱스 사용 여부 포함)"""
+        version = self.MODEL_VERSION
+        if self.win_rate_curves is not None:
+            version += '+curves'
+        if self.similar_index is not None:
+            version += '+similar'
+        return version
+    
+    def fingerprint(self) -> str:
+        """학습 상태 지문 (같은 모델 버전에서 재학습/경험분포/유사입찰 인덱스가 바뀌면 달라짐)"""
+        payload = json.dumps({
+            'version': self.model_version,
+            'history': self.history_cache,
+            'curves': self.win_rate_curves.fingerprint() if self.win_rate_curves is not None else None,
+            'similar': self.similar_index.fingerprint() if self.similar_index is not None else None
+        }, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def fit(self, history: List[Dict], exclude_outliers: bool = True) -> 'BaselinePredictionModel':
+        """
+        조인된 히스토리(history_data.join_bids_awards)로 기관/업종/지역 평균 구축
+        
+        fit 이후 예측은 mock/Firestore 대신 이 통계를 사용
+        
+        Args:
+            exclude_outliers: True면 예산/낙찰률 통계적 이상치(outlier_sketch) 레코드를 평균에서 제외
+        """
+        if exclude_outliers:
+            history, _ = filter_outliers(history, verbose=self.verbose)
+        
+        stats = {'agency': {}, 'category': {}, 'region': {}}
+        bidders_sum, bidders_count = 0, 0
+        
+        for row in history:
+            rate = row.get('winnerRate')
+            if rate is None:
+                continue
+            bidders = row.get('biddersCount')
+            for dim, groups in stats.items():
+                key = row.get(dim)
+                if not key:
+                    continue
+                group = groups.setdefault(key, {'sum': 0.0, 'count': 0, 'bidders_sum': 0, 'bidders_count': 0})
+                group['sum'] += rate
+                group['count'] += 1
+                if bidders is not None:
+                    group['bidders_sum'] += bidders
+                    group['bidders_count'] += 1
+            if bidders is not None:
+                bidders_sum += bidders
+                bidders_count += 1
+        
+        self.history_cache = {
+            dim: {
+                key: {
+                    'avg': group['sum'] / group['count'],
+                    'count': group['count'],
+                    'avg_competition': (group['bidders_sum'] / group['bidders_count']
+                                        if group['bidders_count'] else None)
+                }
+                for key, group in groups.items()
+            }
+            for dim, groups in stats.items()
+        }
+        self.history_cache['avg_competition'] = bidders_sum / bidders_count if bidders_count else 4.0
+        return self
         
     def predict(self, bid_data: Dict) -> Dict:
         """
@@ -67,6 +164,7 @@ class BaselinePredictionModel:
         Args:
             bid_data: {
                 'bid_id': str,
+                'title': str,  # 유사 입찰 검색용 (선택)
                 'agency': str,
                 'category': str,
                 'region': str,
@@ -76,7 +174,8 @@ class BaselinePredictionModel:
         Returns:
             예측 결과 딕셔너리
         """
-        print(f"\n🔮 예측 시작: {bid_data.get('bid_id', 'N/A')}")
+        if self.verbose:
+            print(f"\n🔮 예측 시작: {bid_data.get('bid_id', 'N/A')}")
         
         # 1. 히스토리 데이터 수집
         history = self._get_history_data(bid_data)
@@ -85,7 +184,7 @@ class BaselinePredictionModel:
         agency_rate = history.get('agency_avg', self.DEFAULT_RATE)
         category_rate = history.get('category_avg', self.DEFAULT_RATE)
         region_rate = history.get('region_avg', self.DEFAULT_RATE)
-        budget_factor = self._calculate_budget_factor(bid_data.get('budget', 0))
+        budget_factor = self._calculate_budget_factor(bid_data.get('budget'))
         
         # 3. 가중 평균 계산
         predicted_rate = (
@@ -104,7 +203,7 @@ class BaselinePredictionModel:
         range_max = min(predicted_rate + range_width, 100.0)
         
         # 6. 투찰 전략 생성
-        strategies = self._generate_strategies(predicted_rate, confidence)
+        strategies = self._generate_strategies(predicted_rate, confidence, bid_data)
         
         # 7. 결과 생성
         result = {
@@ -125,15 +224,25 @@ class BaselinePredictionModel:
                     'competition_level': self._estimate_competition(history)
                 },
                 'disclaimer': '이 예측은 참고용이며, 실제 낙찰률과 다를 수 있습니다.',
+                'model_version': self.model_version,
                 'created_at': datetime.now().isoformat()
             }
         }
         
-        print(f"✅ 예측 완료: {predicted_rate:.1f}% (신뢰도: {confidence:.0%})")
+        # 8. 유사 과거 입찰 (결과 포함)
+        if self.similar_index is not None:
+            result['prediction']['similar_bids'] = self.similar_index.search(
+                bid_data, k=self.SIMILAR_BIDS_K
+            )
+        
+        if self.verbose:
+            print(f"✅ 예측 완료: {predicted_rate:.1f}% (신뢰도: {confidence:.0%})")
         return result
     
     def _get_history_data(self, bid_data: Dict) -> Dict:
         """히스토리 데이터 조회"""
+        if self.history_cache:
+            return self._lookup_fitted_history(bid_data)
         if self.mock_mode:
             return self._generate_mock_history(bid_data)
         else:
@@ -183,6 +292,20 @@ class BaselinePredictionModel:
             'avg_competition': random.uniform(3.5, 6.5)  # 평균 경쟁률
         }
     
+    def _lookup_fitted_history(self, bid_data: Dict) -> Dict:
+        """fit()으로 구축한 통계 조회"""
+        agency = self.history_cache['agency'].get(bid_data.get('agency', ''), {})
+        category = self.history_cache['category'].get(bid_data.get('category', ''), {})
+        region = self.history_cache['region'].get(bid_data.get('region', ''), {})
+        
+        return {
+            'agency_avg': agency.get('avg', self.DEFAULT_RATE),
+            'category_avg': category.get('avg', self.DEFAULT_RATE),
+            'region_avg': region.get('avg', self.DEFAULT_RATE),
+            'total_count': agency.get('count', 0) + category.get('count', 0),
+            'avg_competition': agency.get('avg_competition') or self.history_cache['avg_competition']
+        }
+    
     def _fetch_real_history(self, bid_data: Dict) -> Dict:
         """실제 Firestore에서 히스토리 조회"""
         if not db:
@@ -214,9 +337,11 @@ class BaselinePredictionModel:
             print(f"⚠️ 히스토리 조회 실패: {e}")
             return self._generate_mock_history(bid_data)
     
-    def _calculate_budget_factor(self, budget: float) -> float:
-        """예산 규모에 따른 보정 계수"""
-        if budget < 30_000_000:  # 3천만원 미만
+    def _calculate_budget_factor(self, budget: Optional[float]) -> float:
+        """예산 규모에 따른 보정 계수 (예산 미상이면 보정 없음)"""
+        if budget is None:
+            return self.DEFAULT_RATE
+        elif budget < 30_000_000:  # 3천만원 미만
             return self.DEFAULT_RATE * 1.02  # 소액은 경쟁 약함
         elif budget < 100_000_000:  # 1억 미만
             return self.DEFAULT_RATE
@@ -238,8 +363,14 @@ class BaselinePredictionModel:
         else:
             return self.DEFAULT_CONFIDENCE
     
-    def _generate_strategies(self, predicted_rate: float, confidence: float) -> List[Dict]:
-        """3가지 투찰 전략 생성"""
+    def _generate_strategies(self, predicted_rate: float, confidence: float,
+                             bid_data: Optional[Dict] = None) -> List[Dict]:
+        """3가지 투찰 전략 생성 (경험분포가 있으면 분위수 조회, 없으면 고정 배수)"""
+        if self.win_rate_curves is not None and bid_data is not None:
+            segment, sketch = self.win_rate_curves.lookup(bid_data)
+            if sketch is not None:
+                return self._generate_empirical_strategies(segment, sketch)
+        
         return [
             {
                 'type': 'aggressive',
@@ -261,6 +392,27 @@ class BaselinePredictionModel:
             }
         ]
     
+    def _generate_empirical_strategies(self, segment: str, sketch: WinRateSketch) -> List[Dict]:
+        """낙찰률 분위수 기반 투찰 전략 (낙찰 확률 = P(낙찰률 >= 투찰률))"""
+        descriptions = {
+            'aggressive': '공격적 전략 (높은 투찰률, 낮은 낙찰 확률)',
+            'recommended': '권장 전략 (균형잡힌 접근)',
+            'conservative': '보수적 전략 (낮은 투찰률, 높은 낙찰 확률)'
+        }
+        
+        strategies = []
+        for strategy_type, q in self.STRATEGY_QUANTILES.items():
+            rate = sketch.quantile(q)
+            strategies.append({
+                'type': strategy_type,
+                'rate': round(rate, 1),
+                'win_probability': round(sketch.survival(rate), 2),
+                'description': descriptions[strategy_type],
+                'segment': segment,
+                'sample_size': sketch.count
+            })
+        return strategies
+    
     def _estimate_competition(self, history: Dict) -> str:
         """경쟁 수준 추정"""
         avg_comp = history.get('avg_competition', 4.0)
@@ -287,31 +439,46 @@ class BaselinePredictionModel:
             return False
 
 
-def predict_batch(bid_list: List[Dict], save_results: bool = False) -> List[Dict]:
+def predict_batch(bid_list: List[Dict], save_results: bool = False,
+                  sink: Optional[PredictionSink] = None,
+                  model: Optional[BaselinePredictionModel] = None) -> List[Dict]:
     """
     여러 입찰 공고에 대해 일괄 예측
     
     Args:
         bid_list: 입찰 데이터 리스트
-        save_results: True면 결과를 Firestore에 저장
+        save_results: True면 결과를 Firestore에 일괄 저장 (batch commit)
+        sink: 예측 결과 저장 sink (지정 시 save_results보다 우선, 예: JsonlPredictionSink)
+        model: 사용할 모델 (없으면 Mock 모드 Baseline, verbose=False면 건별 로그 생략)
     
     Returns:
         예측 결과 리스트
     """
-    model = BaselinePredictionModel(mock_mode=True)
+    if model is None:
+        model = BaselinePredictionModel(mock_mode=True)
     results = []
     
+    if sink is None and save_results:
+        sink = create_sink('firestore', db) if db else None
+        if sink is None:
+            print("⚠️ Firebase 연결이 없습니다. 예측 결과를 저장할 수 없습니다.")
+    
     print("\n" + "="*60)
     print(f"🔮 일괄 예측 시작 ({len(bid_list)}건)")
     print("="*60)
     
-    for i, bid_data in enumerate(bid_list, 1):
-        print(f"\n[{i}/{len(bid_list)}] 예측 중...")
-        result = model.predict(bid_data)
-        results.append(result)
-        
-        if save_results:
-            model.save_prediction(result['prediction'])
+    try:
+        for i, bid_data in enumerate(bid_list, 1):
+            if model.verbose:
+                print(f"\n[{i}/{len(bid_list)}] 예측 중...")
+            result = model.predict(bid_data)
+            results.append(result)
+            
+            if sink is not None:
+                sink.write(result['prediction'])
+    finally:
+        if sink is not None:
+            sink.close()
     
     print("\n" + "="*60)
     print(f"✨ 일괄 예측 완료: {len(results)}건")
@@ -329,14 +496,29 @@ if __name__ == "__main__":
     
     2. 단일 예측 + DB 저장:
        python ml_prediction.py --save
+    
+    3. 낙찰률 경험분포 기반 투찰 전략 (win_rate_curves.py로 구축):
+       python ml_prediction.py --curves models/win_rate_curves.json
+    
+    4. 유사 과거 입찰 포함 (similar_bids.py로 구축):
+       python ml_prediction.py --similar models/similar_bids.ndjson
+    
+    ※ 예측 품질/속도 측정은 backtest.py 참고 (walk-forward 백테스트)
     """
     import sys
     
     save_results = '--save' in sys.argv
+    curves = None
+    if '--curves' in sys.argv:
+        curves = WinRateCurves.load(sys.argv[sys.argv.index('--curves') + 1])
+    similar_index = None
+    if '--similar' in sys.argv:
+        similar_index = SimilarBidIndex.load(sys.argv[sys.argv.index('--similar') + 1])
     
     # 샘플 입찰 데이터
     sample_bid = {
         'bid_id': '20250001-12345',
+        'title': '스마트 플랫폼 구축 사업',
         'agency': '조달청',
         'category': '소프트웨어',
         'region': '서울',
@@ -354,7 +536,7 @@ if __name__ == "__main__":
     print(f"   - 예산: {sample_bid['budget']:,}원")
     
     # 예측 실행
-    model = BaselinePredictionModel(mock_mode=True)
+    model = BaselinePredictionModel(mock_mode=True, win_rate_curves=curves, similar_index=similar_index)
     result = model.predict(sample_bid)
     
     # 결과 출력
@@ -368,6 +550,11 @@ if __name__ == "__main__":
     for strategy in pred['strategies']:
         print(f"   - {strategy['description']}: {strategy['rate']}% (낙찰확률 {strategy['win_probability']*100:.0f}%)")
     
+    if pred.get('similar_bids'):
+        print(f"\n🔎 유사 과거 입찰:")
+        for row in pred['similar_bids']:
+            print(f"   - [{row['similarity']:.2f}] {row['title']} ({row['agency']}): 낙찰률 {row['winnerRate']}%")
+    
     print(f"\n📊 영향 요인:")
     for key, value in pred['factors'].items():
         print(f"   - {key}: {value}")
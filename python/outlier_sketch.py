@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스트리밍 분위수 기반 통계적 이상치 탐지 (Robust Outlier Detection)
+예산/추정가격/낙찰률을 기관·업종별 분위수 스케치와 비교하여 자릿수 오류 등 통계적 이상치 표시
+
+- 스케치: 고정 해상도 버킷 히스토그램 (금액 'log': 상대 오차 1%, 비율 'linear': 0.1%p)
+  → 버킷 수 상한(max_bins) + 그룹 수 상한(max_groups)으로 메모리 고정, 샤드별 구축 후 병합 가능
+- 판정: 표본이 충분한 가장 구체적인 그룹 사용 (group_by 레벨 순서 → 전체 '*' 폴백),
+  Tukey fence: [Q1 - k·IQR, Q3 + k·IQR] (log 필드는 로그 척도)
+- 스트리밍 (observe, data_quality): 레코드가 들어온 시점까지의 분포로 판정 후 스케치에 반영 (단일 패스)
+- 학습 데이터 필터 (filter_outliers): 전체 목록으로 스케치를 먼저 구축한 뒤 각 행 판정 (앞쪽 행도 판정)
+- 사용처: data_quality (규칙 키 'outlier:<field>'), ml_prediction.fit (학습 데이터 필터)
+
+실행 예시:
+    python outlier_sketch.py --bids collected_bids.json --awards collected_awards_mock_step2_test.json
+    python outlier_sketch.py --history history.json --output models/outlier_sketch.json
+"""
+
+import os
+import json
+import math
+import argparse
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from g2b_parsers import parse_number
+from history_data import load_history
+
+
+RELATIVE_ACCURACY = 0.01  # log 척도 버킷 상대 오차
+LOG_GAMMA = math.log((1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY))
+LINEAR_RESOLUTION = 0.1   # linear 척도 버킷 폭 (낙찰률 %p)
+
+# 최소 IQR (분포가 한 값에 몰린 그룹에서 정상값 오판 방지): log = 2배, linear = 1%p
+MIN_SPREAD = {
+    'log': math.log(2) / LOG_GAMMA,
+    'linear': 1.0 / LINEAR_RESOLUTION,
+}
+
+FENCE_K = 3.0        # Tukey far-out fence 배수
+MIN_SAMPLES = 30     # 그룹 판정 최소 표본 수
+MAX_BINS = 2048      # 스케치당 버킷 수 상한 (초과 시 최저 버킷 병합)
+MAX_GROUPS = 5000    # 레벨당 그룹 수 상한 (초과 그룹은 상위 레벨/전체로만 판정)
+
+# 예측 학습용 히스토리 (history_data.join_bids_awards 스키마)
+HISTORY_OUTLIERS = {
+    'group_by': [['agency', 'category'], ['category']],
+    'fields': {'budget': 'log', 'winnerRate': 'linear'},
+}
+
+_NO_FLAGS: List[str] = []
+
+
+def _log_key(value: Any) -> Optional[int]:
+    number = parse_number(value)
+    if number is None or number <= 0:
+        return None
+    return math.ceil(math.log(number) / LOG_GAMMA)
+
+
+def _linear_key(value: Any) -> Optional[int]:
+    number = parse_number(value)
+    return None if number is None else int(round(number / LINEAR_RESOLUTION))
+
+
+SCALES = {'log': _log_key, 'linear': _linear_key}
+
+
+def key_value(key: float, scale: str) -> float:
+    """버킷 키 → 값 (리포트 표시용)"""
+    return math.exp(key * LOG_GAMMA) if scale == 'log' else key * LINEAR_RESOLUTION
+
+
+class QuantileSketch:
+    """병합 가능한 분위수 스케치 (정수 버킷 키 히스토그램, 버킷 수 상한)"""
+
+    __slots__ = ('bins', 'count', 'max_bins', '_fences', '_refresh_at')
+
+    def __init__(self, bins: Optional[Dict[int, int]] = None, max_bins: int = MAX_BINS):
+        self.bins = bins or {}
+        self.count = sum(self.bins.values())
+        self.max_bins = max_bins
+        self._fences = None
+        self._refresh_at = 0
+
+    def add(self, key: int):
+        bins = self.bins
+        bins[key] = bins.get(key, 0) + 1
+        self.count += 1
+        if len(bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self):
+        """최저 버킷들을 하나로 병합 (상단 꼬리 정확도 유지)"""
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.bins[target] += self.bins.pop(key)
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        for key, value in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + value
+        self.count += other.count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        self._refresh_at = 0
+        return self
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[int]]:
+        """분위수 버킷 키 목록 (한 번의 누적합으로 계산)"""
+        if not self.count:
+            return [None] * len(qs)
+        keys = sorted(self.bins)
+        cumulative, running = [], 0
+        for key in keys:
+            running += self.bins[key]
+            cumulative.append(running)
+        return [keys[bisect_left(cumulative, min(max(1, math.ceil(q * self.count)), self.count))]
+                for q in qs]
+
+    def fences(self, k: float, min_spread: float) -> Tuple[float, float]:
+        """Tukey fence (버킷 키 단위), 표본이 10% 늘 때마다 재계산"""
+        if self.count >= self._refresh_at:
+            q1, q3 = self.quantiles((0.25, 0.75))
+            spread = max(q3 - q1, min_spread)
+            self._fences = (q1 - k * spread, q3 + k * spread)
+            self._refresh_at = self.count + max(16, self.count // 10)
+        return self._fences
+
+    def to_dict(self) -> Dict:
+        keys = sorted(self.bins)
+        return {'keys': keys, 'counts': [self.bins[k] for k in keys]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QuantileSketch':
+        return cls(dict(zip(data['keys'], data['counts'])))
+
+
+class OutlierDetector:
+    """필드×그룹 차원별 분위수 스케치로 레코드 단위 이상치 판정"""
+
+    def __init__(self, fields: Dict[str, str], group_by: Sequence[Sequence[str]] = (),
+                 k: float = FENCE_K, min_samples: int = MIN_SAMPLES, max_groups: int = MAX_GROUPS):
+        """
+        Args:
+            fields: 필드 → 척도 ('log': 금액, 'linear': 비율)
+            group_by: 그룹 레벨 목록 (레벨 = 차원 목록, 구체적 → 일반적 순서, 마지막에 전체 '*' 폴백)
+            k: Tukey fence 배수
+            min_samples: 그룹 판정 최소 표본 수
+            max_groups: 레벨당 그룹 수 상한
+        """
+        unknown = set(fields.values()) - set(SCALES)
+        if unknown:
+            raise ValueError(f"❌ 알 수 없는 척도: {sorted(unknown)} (log/linear)")
+        self.fields = dict(fields)
+        self.group_by = [list(level) for level in group_by]
+        self.dimensions = sorted({dim for level in self.group_by for dim in level})
+        self.k = k
+        self.min_samples = min_samples
+        self.max_groups = max_groups
+        # 필드 → 레벨 이름('agency|category', 전체 '*') → 그룹 키 → 스케치
+        self.levels = ['|'.join(level) for level in self.group_by] + ['*']
+        self.sketches: Dict[str, Dict[str, Dict[str, QuantileSketch]]] = {
+            field: {level: {} for level in self.levels} for field in self.fields
+        }
+        self._plan = [
+            (field, SCALES[scale], MIN_SPREAD[scale], f'outlier:{field}', list(self.sketches[field].values()))
+            for field, scale in self.fields.items()
+        ]
+        self.judged = Counter()
+        self.flagged = Counter()
+        self.dropped_groups = 0
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> 'OutlierDetector':
+        """규칙 명세 ('outliers': {'fields', 'group_by', 'k', 'min_samples'}) → 탐지기"""
+        return cls(spec['fields'], group_by=spec.get('group_by', ()),
+                   k=spec.get('k', FENCE_K), min_samples=spec.get('min_samples', MIN_SAMPLES))
+
+    def group_keys(self, record: Dict[str, Any]) -> List[Optional[str]]:
+        """레벨별 그룹 키 (차원 값이 하나라도 없으면 None, 전체는 '*')"""
+        keys = []
+        for level in self.group_by:
+            if len(level) == 1:
+                value = record.get(level[0])
+                keys.append(value if value and value.__class__ is str else None)
+                continue
+            values = [record.get(dim) for dim in level]
+            keys.append('|'.join(values) if all(v and v.__class__ is str for v in values) else None)
+        keys.append('*')
+        return keys
+
+    def observe(self, record: Dict[str, Any]) -> List[str]:
+        """
+        레코드 1건 판정 후 스케치에 반영
+
+        Returns:
+            이상치로 판정된 규칙 키 목록 ('outlier:<field>')
+        """
+        flags = None
+        group_keys = None
+        min_samples, max_groups, k = self.min_samples, self.max_groups, self.k
+        for field, to_key, min_spread, flag, levels in self._plan:
+            key = to_key(record.get(field))
+            if key is None:
+                continue
+            if group_keys is None:
+                group_keys = self.group_keys(record)
+            judged = False
+            for groups, group in zip(levels, group_keys):
+                if group is None:
+                    continue
+                sketch = groups.get(group)
+                if sketch is None:
+                    if len(groups) >= max_groups:
+                        self.dropped_groups += 1
+                        continue
+                    sketch = groups[group] = QuantileSketch()
+                elif not judged and sketch.count >= min_samples:
+                    # 표본이 충분한 가장 구체적인 그룹으로 판정 (반영 전 분포 기준)
+                    judged = True
+                    self.judged[field] += 1
+                    low, high = sketch.fences(k, min_spread)
+                    if key < low or key > high:
+                        self.flagged[field] += 1
+                        if flags is None:
+                            flags = []
+                        flags.append(flag)
+                # sketch.add(key) 인라인 (레코드당 필드×레벨 회 호출되는 경로)
+                bins = sketch.bins
+                bins[key] = bins.get(key, 0) + 1
+                sketch.count += 1
+                if len(bins) > sketch.max_bins:
+                    sketch._collapse()
+        return flags or _NO_FLAGS
+
+    def add(self, record: Dict[str, Any]):
+        """레코드 1건을 판정 없이 스케치에 반영"""
+        group_keys = None
+        for field, to_key, _, _, levels in self._plan:
+            key = to_key(record.get(field))
+            if key is None:
+                continue
+            if group_keys is None:
+                group_keys = self.group_keys(record)
+            for groups, group in zip(levels, group_keys):
+                if group is None:
+                    continue
+                sketch = groups.get(group)
+                if sketch is None:
+                    if len(groups) >= self.max_groups:
+                        self.dropped_groups += 1
+                        continue
+                    sketch = groups[group] = QuantileSketch()
+                sketch.add(key)
+
+    def judge(self, record: Dict[str, Any]) -> List[str]:
+        """
+        레코드 1건을 현재 스케치로 판정 (스케치에 반영하지 않음)
+
+        Returns:
+            이상치로 판정된 규칙 키 목록 ('outlier:<field>')
+        """
+        flags = None
+        group_keys = None
+        for field, to_key, min_spread, flag, levels in self._plan:
+            key = to_key(record.get(field))
+            if key is None:
+                continue
+            if group_keys is None:
+                group_keys = self.group_keys(record)
+            for groups, group in zip(levels, group_keys):
+                sketch = groups.get(group) if group is not None else None
+                if sketch is None or sketch.count < self.min_samples:
+                    continue
+                self.judged[field] += 1
+                low, high = sketch.fences(self.k, min_spread)
+                if key < low or key > high:
+                    self.flagged[field] += 1
+                    if flags is None:
+                        flags = []
+                    flags.append(flag)
+                break
+        return flags or _NO_FLAGS
+
+    def observe_columns(self, columns: Dict[str, Iterable[Any]], size: int) -> Dict[str, List[bool]]:
+        """
+        컬럼 단위 입력 판정 (pandas 백엔드용, 행 순서대로 단일 패스)
+
+        Args:
+            columns: 필드/그룹 차원 → 값 목록 (없는 컬럼은 생략 가능)
+            size: 행 수
+
+        Returns:
+            필드 → 행별 이상치 여부
+        """
+        names = [name for name in list(self.fields) + self.dimensions if name in columns]
+        masks = {field: [False] * size for field in self.fields}
+        observe = self.observe
+        for row, values in enumerate(zip(*(columns[name] for name in names))):
+            for flag in observe(dict(zip(names, values))):
+                masks[flag[8:]][row] = True
+        return masks
+
+    def merge(self, other: 'OutlierDetector') -> 'OutlierDetector':
+        for field, levels in other.sketches.items():
+            for level, groups in levels.items():
+                ours = self.sketches[field][level]
+                for group, sketch in groups.items():
+                    if group in ours:
+                        ours[group].merge(sketch)
+                    elif len(ours) < self.max_groups:
+                        ours[group] = QuantileSketch(dict(sketch.bins))
+                    else:
+                        self.dropped_groups += 1
+        self.judged.update(other.judged)
+        self.flagged.update(other.flagged)
+        self.dropped_groups += other.dropped_groups
+        return self
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """필드별 판정/이상치 건수와 전체 분포 fence (값 단위)"""
+        result = {}
+        for field, scale in self.fields.items():
+            overall = self.sketches[field]['*'].get('*')
+            fences = None
+            if overall is not None and overall.count >= self.min_samples:
+                low, high = overall.fences(self.k, MIN_SPREAD[scale])
+                fences = [round(key_value(low, scale), 2), round(key_value(high, scale), 2)]
+            result[field] = {
+                'scale': scale,
+                'judged': self.judged[field],
+                'flagged': self.flagged[field],
+                'groups': sum(len(groups) for level, groups in self.sketches[field].items() if level != '*'),
+                'overall_fences': fences,
+            }
+        return result
+
+    def to_dict(self) -> Dict:
+        return {
+            'fields': self.fields,
+            'group_by': self.group_by,
+            'k': self.k,
+            'min_samples': self.min_samples,
+            'sketches': {
+                field: {level: {group: sketch.to_dict() for group, sketch in groups.items()}
+                        for level, groups in levels.items()}
+                for field, levels in self.sketches.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'OutlierDetector':
+        detector = cls(data['fields'], group_by=data.get('group_by', ()),
+                       k=data.get('k', FENCE_K), min_samples=data.get('min_samples', MIN_SAMPLES))
+        for field, levels in data.get('sketches', {}).items():
+            for level, groups in levels.items():
+                detector.sketches[field][level].update(
+                    (group, QuantileSketch.from_dict(value)) for group, value in groups.items()
+                )
+        return detector
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        print(f"💾 이상치 스케치 저장: {path}")
+
+    @classmethod
+    def load(cls, path: str) -> 'OutlierDetector':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def filter_outliers(history: Iterable[Dict], detector: Optional[OutlierDetector] = None,
+                    verbose: bool = True) -> Tuple[List[Dict], OutlierDetector]:
+    """
+    예측 학습용 히스토리에서 통계적 이상치 레코드 제외
+
+    전체 목록으로 스케치를 먼저 구축한 뒤 각 행을 판정 (2패스, 첫 min_samples 행도 판정 대상)
+
+    Args:
+        history: 조인된 히스토리 레코드
+        detector: 기존 스케치를 이어서 사용할 탐지기 (기본: HISTORY_OUTLIERS 새 탐지기)
+
+    Returns:
+        (이상치 제외 레코드, 탐지기)
+    """
+    detector = detector or OutlierDetector.from_spec(HISTORY_OUTLIERS)
+    history = list(history)
+    for row in history:
+        detector.add(row)
+    judge = detector.judge
+    kept = [row for row in history if not judge(row)]
+    if verbose:
+        flagged = ', '.join(f"{field} {count}건" for field, count in detector.flagged.items() if count)
+        print(f"🧹 학습 데이터 이상치 제외: {flagged or '없음'} → {len(kept)}건 사용")
+    return kept, detector
+
+
+def main():
+    parser = argparse.ArgumentParser(description='통계적 이상치 스케치 구축/점검')
+    parser.add_argument('--bids', type=str, help='입찰 데이터 파일 (collected_bids_*.json)')
+    parser.add_argument('--awards', type=str, help='낙찰 데이터 파일 (collected_awards_*.json)')
+    parser.add_argument('--history', type=str, help='조인된 히스토리 파일 (JSON/NDJSON)')
+    parser.add_argument('--output', type=str, help='스케치 저장 파일 (예: models/outlier_sketch.json)')
+
+    args = parser.parse_args()
+
+    if args.history:
+        history = load_history(args.history)
+    elif args.bids and args.awards:
+        history = load_history(args.bids, args.awards)
+    else:
+        parser.error('--history 또는 --bids/--awards가 필요합니다')
+
+    print(f"📂 히스토리 {len(history)}건 로드 완료")
+    _, detector = filter_outliers(history)
+    for field, stats in detector.summary().items():
+        print(f"📊 {field} ({stats['scale']}): 판정 {stats['judged']}건 / 이상치 {stats['flagged']}건 / "
+              f"그룹 {stats['groups']}개 / 전체 fence {stats['overall_fences']}")
+
+    if args.output:
+        detector.save(args.output)
+
+
+if __name__ == '__main__':
+    main()
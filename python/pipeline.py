@@ -0,0 +1,180 @@
+"""
+파이프라인 DAG 실행기
+단계(Stage) 간 의존 관계를 선언하고, 의존 단계가 모두 성공하는 즉시 하위 단계를 실행 (독립 단계는 병렬)
+
+- 단계 함수: func(context) → 출력 (context: run_id + 완료된 상위 단계 출력 {단계 이름: 출력})
+- 단계별 시도 횟수/소요 시간/결과 기록, 실패 시 지수 백오프 재시도
+- HaltDownstream: 단계는 정상 종료했지만 하위 단계를 진행하지 않음 (품질 게이트 FAIL 등, 재시도 안 함)
+- 상위 단계가 실패/중단되면 하위 단계는 skipped
+- preset: 이미 끝난 단계 출력을 넘겨 중간 단계부터 실행 (예: 외부 수집 파일 도착 시 수집 단계 생략)
+"""
+
+import time
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class HaltDownstream(Exception):
+    """하위 단계 진행 중단 신호 (재시도 없음)"""
+
+    def __init__(self, reason: str, output: Any = None):
+        super().__init__(reason)
+        self.output = output
+
+
+class Stage:
+    """파이프라인 단계"""
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], depends: Iterable[str] = (),
+                 retries: int = 1, retry_delay: float = 5.0):
+        """
+        Args:
+            name: 단계 이름
+            func: 단계 함수 (context → 출력)
+            depends: 상위 단계 이름 (모두 성공해야 실행)
+            retries: 실패 시 재시도 횟수
+            retry_delay: 첫 재시도 대기 시간 (초, 이후 2배씩 증가)
+        """
+        self.name = name
+        self.func = func
+        self.depends = tuple(depends)
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+
+class StageResult:
+    """단계 실행 결과"""
+
+    def __init__(self, name: str, status: str = 'pending'):
+        self.name = name
+        self.status = status  # pending | success | halted | failed | skipped
+        self.attempts = 0
+        self.started_at: Optional[str] = None
+        self.duration_sec = 0.0
+        self.output: Any = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'status': self.status,
+            'attempts': self.attempts,
+            'started_at': self.started_at,
+            'duration_sec': round(self.duration_sec, 2),
+            'error': self.error,
+        }
+
+
+class Pipeline:
+    """단계 DAG (생성 시 의존 관계/순환 검증)"""
+
+    def __init__(self, stages: List[Stage], workers: int = 4, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            stages: 단계 목록
+            workers: 동시에 실행할 최대 단계 수
+            sleep: 재시도 대기 함수 (테스트에서 교체)
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("단계 이름이 중복되었습니다.")
+        for stage in stages:
+            unknown = [name for name in stage.depends if name not in self.stages]
+            if unknown:
+                raise ValueError(f"{stage.name}: 알 수 없는 상위 단계 {', '.join(unknown)}")
+        self.order = self._topological_order()
+        self.workers = workers
+        self.sleep = sleep
+
+    def _topological_order(self) -> List[str]:
+        order, state = [], {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"순환 의존: {' → '.join(path + [name])}")
+            state[name] = 'visiting'
+            for upstream in self.stages[name].depends:
+                visit(upstream, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def _execute(self, stage: Stage, context: Dict[str, Any], result: StageResult) -> StageResult:
+        """단계 실행 (재시도 포함, 실행 스레드에서 호출)"""
+        result.started_at = datetime.now().isoformat()
+        start = time.time()
+        while True:
+            result.attempts += 1
+            try:
+                result.output = stage.func(context)
+                result.status = 'success'
+                break
+            except HaltDownstream as e:
+                result.output = e.output
+                result.status = 'halted'
+                result.error = str(e)
+                break
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+                if result.attempts > stage.retries:
+                    result.status = 'failed'
+                    break
+                delay = stage.retry_delay * 2 ** (result.attempts - 1)
+                print(f"🔁 [{stage.name}] 실패 ({result.error}) - {delay:.0f}초 후 재시도 "
+                      f"({result.attempts}/{stage.retries})")
+                self.sleep(delay)
+        result.duration_sec = time.time() - start
+        return result
+
+    def run(self, run_id: Optional[str] = None, preset: Optional[Dict[str, Any]] = None,
+            context: Optional[Dict[str, Any]] = None) -> Dict[str, StageResult]:
+        """
+        DAG 실행 (의존 단계가 모두 성공한 단계부터 즉시 실행)
+
+        Args:
+            run_id: 실행 ID (context['run_id'])
+            preset: 이미 완료된 단계 출력 {단계 이름: 출력} (실행하지 않고 success 처리)
+            context: 단계 함수에 함께 넘길 추가 값
+
+        Returns:
+            {단계 이름: StageResult} (DAG 순서)
+        """
+        context = dict(context or {}, run_id=run_id or datetime.now().strftime('%Y%m%d_%H%M%S'))
+        results = {name: StageResult(name) for name in self.order}
+        for name, output in (preset or {}).items():
+            results[name].status = 'success'
+            results[name].output = output
+            context[name] = output
+
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                for name in self.order:
+                    result = results[name]
+                    if result.status != 'pending' or name in running:
+                        continue
+                    upstream = [results[dep].status for dep in self.stages[name].depends]
+                    if any(status in ('failed', 'halted', 'skipped') for status in upstream):
+                        result.status = 'skipped'
+                        result.error = '상위 단계 미완료'
+                    elif all(status == 'success' for status in upstream):
+                        print(f"▶️ [{name}] 시작")
+                        running[name] = executor.submit(self._execute, self.stages[name], dict(context), result)
+                if not running:
+                    break
+
+                done, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+                for name in [name for name, future in running.items() if future in done]:
+                    result = running.pop(name).result()
+                    if result.status == 'success':
+                        context[name] = result.output
+                    icon = {'success': '✅', 'halted': '⏸️'}.get(result.status, '❌')
+                    detail = f" - {result.error}" if result.error else ''
+                    print(f"{icon} [{name}] {result.status} ({result.duration_sec:.2f}초, "
+                          f"{result.attempts}회 시도){detail}")
+        return results
@@ -0,0 +1,222 @@
+"""
+예측 결과 일괄 저장 (Bulk Prediction Sink)
+예측 결과를 버퍼링 후 배치 단위로 저장하여 건별 네트워크 왕복 제거
+
+- FirestorePredictionSink: 500건 단위 batch commit을 스레드 풀에서 병렬 실행
+  (진행 중 배치 수 제한으로 메모리 상한 유지)
+- JsonlPredictionSink: 오프라인 실행용 로컬 NDJSON 파일
+- ParquetPredictionSink: 오프라인 실행용 Parquet 파트 파일 (pandas + pyarrow/fastparquet 필요)
+
+모든 sink는 컨텍스트 매니저로 사용하며, 종료 시(프로세스 종료 포함) 남은 버퍼를 flush
+"""
+
+import os
+import json
+import atexit
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Parquet 저장 (선택사항, pandas + Parquet 엔진 pyarrow 또는 fastparquet)
+PARQUET_ENGINE = None
+try:
+    import pandas as pd
+    for _engine in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(_engine)
+            PARQUET_ENGINE = _engine
+            break
+        except ImportError:
+            continue
+except ImportError:
+    pass
+PARQUET_AVAILABLE = PARQUET_ENGINE is not None
+
+
+def prediction_doc_id(prediction: Dict) -> str:
+    """예측 문서 ID (BaselinePredictionModel.save_prediction과 동일 규칙)"""
+    return f"{prediction['bid_id']}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+
+class PredictionSink:
+    """예측 결과 sink 기본 클래스"""
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+        self.buffer: List[Dict] = []
+        self.written = 0
+        self.closed = False
+        atexit.register(self.close)
+
+    def write(self, prediction: Dict):
+        self.buffer.append(prediction)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, predictions: List[Dict]):
+        for prediction in predictions:
+            self.write(prediction)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        batch, self.buffer = self.buffer, []
+        self._write_batch(batch)
+        self.written += len(batch)
+
+    def _write_batch(self, batch: List[Dict]):
+        raise NotImplementedError
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FirestorePredictionSink(PredictionSink):
+    """Firestore batch commit sink (병렬 커밋, 진행 중 배치 수 제한)"""
+
+    MAX_BATCH_WRITES = 500  # Firestore batch 쓰기 한도
+
+    def __init__(self, db, collection: str = 'predictions', batch_size: int = MAX_BATCH_WRITES,
+                 workers: int = 4, max_pending: int = 8,
+                 doc_id: Optional[Callable[[Dict], str]] = None):
+        """
+        Args:
+            db: firestore.client()
+            collection: 저장 컬렉션
+            doc_id: 문서 ID 생성 함수 (기본: prediction_doc_id)
+            batch_size: batch당 문서 수 (최대 500)
+            workers: 병렬 커밋 스레드 수
+            max_pending: 진행 중 배치 최대 수 (초과 시 가장 오래된 배치 완료 대기)
+        """
+        super().__init__(batch_size=min(batch_size, self.MAX_BATCH_WRITES))
+        self.db = db
+        self.collection = collection
+        self.doc_id = doc_id or prediction_doc_id
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pending = deque()
+        self.failed = 0
+
+    def _write_batch(self, batch: List[Dict]):
+        while len(self.pending) >= self.max_pending:
+            self._wait_oldest()
+        try:
+            future = self.executor.submit(self._commit, batch)
+        except RuntimeError:
+            # 인터프리터 종료 중(atexit)에는 스레드 풀 사용 불가 → 동기 커밋
+            future = Future()
+            try:
+                self._commit(batch)
+                future.set_result(None)
+            except Exception as e:
+                future.set_exception(e)
+        self.pending.append((len(batch), future))
+
+    def _commit(self, batch: List[Dict]):
+        write_batch = self.db.batch()
+        for prediction in batch:
+            doc_ref = self.db.collection(self.collection).document(self.doc_id(prediction))
+            write_batch.set(doc_ref, prediction)
+        write_batch.commit()
+
+    def delete(self, doc_ids: List[str]) -> int:
+        """문서 일괄 삭제 (batch당 최대 MAX_BATCH_WRITES건, 동기 커밋) → 삭제 요청 수"""
+        collection = self.db.collection(self.collection)
+        for start in range(0, len(doc_ids), self.MAX_BATCH_WRITES):
+            write_batch = self.db.batch()
+            for doc_id in doc_ids[start:start + self.MAX_BATCH_WRITES]:
+                write_batch.delete(collection.document(doc_id))
+            write_batch.commit()
+        return len(doc_ids)
+
+    def _wait_oldest(self):
+        size, future = self.pending.popleft()
+        try:
+            future.result()
+        except Exception as e:
+            self.failed += size
+            self.written -= size
+            print(f"❌ 예측 결과 배치 저장 실패 ({size}건): {e}")
+
+    def close(self):
+        if self.closed:
+            return
+        super().close()
+        while self.pending:
+            self._wait_oldest()
+        self.executor.shutdown(wait=True)
+        print(f"✅ 예측 결과 저장 완료: {self.written}건 (실패 {self.failed}건)")
+
+
+class JsonlPredictionSink(PredictionSink):
+    """로컬 NDJSON sink (append)"""
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        super().__init__(batch_size=batch_size)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+
+    def _write_batch(self, batch: List[Dict]):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(p, ensure_ascii=False) + '\n' for p in batch))
+
+    def close(self):
+        if self.closed:
+            return
+        super().close()
+        print(f"💾 예측 결과 저장: {self.path} ({self.written}건)")
+
+
+class ParquetPredictionSink(PredictionSink):
+    """로컬 Parquet sink (배치마다 part 파일 1개)"""
+
+    def __init__(self, directory: str, batch_size: int = 10000):
+        if not PARQUET_AVAILABLE:
+            raise ImportError("❌ Parquet 저장에는 pandas와 pyarrow(또는 fastparquet) 패키지가 필요합니다.")
+        super().__init__(batch_size=batch_size)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.part = len([f for f in os.listdir(directory) if f.endswith('.parquet')])
+
+    def _write_batch(self, batch: List[Dict]):
+        rows = [
+            {k: (json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v)
+             for k, v in prediction.items()}
+            for prediction in batch
+        ]
+        path = os.path.join(self.directory, f"part-{self.part:05d}.parquet")
+        pd.DataFrame(rows).to_parquet(path, index=False, engine=PARQUET_ENGINE)
+        self.part += 1
+
+    def close(self):
+        if self.closed:
+            return
+        super().close()
+        print(f"💾 예측 결과 저장: {self.directory} ({self.written}건)")
+
+
+def create_sink(target: str, db=None) -> PredictionSink:
+    """
+    저장 대상 문자열 → sink
+
+    Args:
+        target: 'firestore' | '*.jsonl' / '*.ndjson' 파일 경로 | '*.parquet' 디렉토리 경로
+    """
+    if target == 'firestore':
+        if db is None:
+            raise ValueError("❌ Firebase 연결이 없습니다. 로컬 sink(.jsonl/.parquet)를 사용하세요.")
+        return FirestorePredictionSink(db)
+    if target.endswith('.parquet'):
+        return ParquetPredictionSink(target)
+    return JsonlPredictionSink(target)
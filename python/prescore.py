@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+활성 입찰 사전 예측 (Pre-scoring)
+최신 수집 파일의 활성 입찰 전체를 일괄 예측하여 사전 예측 테이블로 저장
+
+- 테이블 키: bid_id (모델 버전별 파일/문서 분리)
+- 예측 입력(기관/업종/지역/예산/공고명)과 모델 학습 상태(재학습/경험분포/유사입찰 인덱스)가
+  지난 예측과 같은 입찰은 스킵
+- 마감된 입찰은 테이블에서 제거 (--firestore면 prediction_table 문서도 삭제)
+- 마감일은 g2b_parsers.parse_date로 정규화 후 비교 ('YYYY-MM-DD HH:MM', 시간대 접미사 등)
+- 예측 페이지/API는 요청마다 예측하지 않고 테이블을 조회
+- --history: 조인 히스토리(history.ndjson)로 모델 학습 + 낙찰률 경험분포 구축 (scheduler.py prescore 단계)
+
+실행 예시:
+    python prescore.py                                   # 최신 collected_bids_*.json 자동 선택
+    python prescore.py --input collected_bids_mock_step3_final_001.json
+    python prescore.py --curves models/win_rate_curves.json --firestore
+    python prescore.py --history history.ndjson
+"""
+
+import os
+import glob
+import json
+import hashlib
+import argparse
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from g2b_parsers import parse_date
+from history_data import load_history
+from ml_prediction import BaselinePredictionModel, predict_batch, db
+from prediction_sink import FirestorePredictionSink
+from similar_bids import SimilarBidIndex
+from win_rate_curves import WinRateCurves, build_curves
+
+
+TABLE_DIR = './predictions'
+TABLE_COLLECTION = 'prediction_table'
+
+# 예측에 영향을 주는 입력 필드 (변경 감지용)
+INPUT_FIELDS = ('title', 'agency', 'category', 'region', 'budget')
+
+
+def prediction_input(bid: Dict) -> Dict:
+    """수집 레코드 → 예측 입력"""
+    return dict({field: bid.get(field) for field in INPUT_FIELDS}, bid_id=bid.get('id'))
+
+
+def input_hash(bid_input: Dict, model_fingerprint: str = '') -> str:
+    """예측 입력 + 모델 학습 상태 지문 해시 (둘 중 하나가 바뀌면 재예측)"""
+    payload = json.dumps([bid_input.get(field) for field in INPUT_FIELDS] + [model_fingerprint],
+                         ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def deadline_passed(deadline, now: datetime) -> bool:
+    """마감 여부 (G2B 날짜 형식 정규화 후 비교, 해석할 수 없는 마감일은 마감 전으로 간주)"""
+    parsed = parse_date(deadline)
+    return parsed is not None and parsed < now.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def table_path(model_version: str, directory: str = TABLE_DIR) -> str:
+    return os.path.join(directory, f"prediction_table_{model_version.replace('+', '_')}.json")
+
+
+def table_doc_id(prediction: Dict) -> str:
+    """Firestore 사전 예측 문서 ID ({bid_id}_{model_version})"""
+    return f"{prediction['bid_id']}_{prediction['model_version']}"
+
+
+class PredictionTable:
+    """사전 예측 테이블 (bid_id → 최신 예측)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('entries', {})
+
+    def get(self, bid_id: str) -> Optional[Dict]:
+        entry = self.entries.get(bid_id)
+        return entry['prediction'] if entry else None
+
+    def is_fresh(self, bid_id: str, digest: str) -> bool:
+        entry = self.entries.get(bid_id)
+        return entry is not None and entry['input_hash'] == digest
+
+    def put(self, bid_id: str, digest: str, deadline: Optional[str], prediction: Dict):
+        self.entries[bid_id] = {
+            'input_hash': digest,
+            'deadline': deadline,
+            'scored_at': datetime.now().isoformat(),
+            'prediction': prediction
+        }
+
+    def prune_expired(self, now: datetime) -> List[str]:
+        """마감된 입찰 제거 → 제거한 bid_id 목록"""
+        expired = [bid_id for bid_id, entry in self.entries.items() if deadline_passed(entry.get('deadline'), now)]
+        for bid_id in expired:
+            del self.entries[bid_id]
+        return expired
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'updated_at': datetime.now().isoformat(), 'entries': self.entries},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def latest_collection(directory: str = './') -> Optional[str]:
+    """가장 최근 수집 파일 (collected_bids_*.json, 수정 시각 기준)"""
+    files = glob.glob(os.path.join(directory, 'collected_bids_*.json'))
+    return max(files, key=os.path.getmtime) if files else None
+
+
+def active_bids(bids: List[Dict], now: datetime) -> List[Dict]:
+    """활성 입찰 (status=active, 마감 전, 동일 id는 마지막 레코드)"""
+    latest = {}
+    for bid in bids:
+        if bid.get('id'):
+            latest[bid['id']] = bid
+    return [
+        bid for bid in latest.values()
+        if bid.get('status') == 'active' and not deadline_passed(bid.get('deadline'), now)
+    ]
+
+
+def fit_model(history_path: str, similar_index: Optional[SimilarBidIndex] = None) -> BaselinePredictionModel:
+    """
+    조인 히스토리로 학습한 모델 (기관/업종/지역 평균 + 낙찰률 경험분포)
+
+    히스토리 파일이 없거나 비어 있어도 학습된 모델 (기본 낙찰률, Mock 히스토리는 사용하지 않음)
+    """
+    history = load_history(history_path) if os.path.exists(history_path) else []
+    print(f"📂 학습 히스토리 {len(history)}건 로드: {history_path}")
+    return BaselinePredictionModel(
+        mock_mode=False,
+        win_rate_curves=build_curves(history) if history else None,
+        similar_index=similar_index,
+        verbose=False
+    ).fit(history)
+
+
+def run_prescoring(bids_file: str, model: Optional[BaselinePredictionModel] = None,
+                   table_dir: str = TABLE_DIR, to_firestore: bool = False,
+                   force: bool = False) -> Dict:
+    """
+    사전 예측 실행
+
+    Args:
+        bids_file: 수집 파일 (collected_bids_*.json)
+        model: 예측 모델 (없으면 Mock 모드 Baseline)
+        table_dir: 사전 예측 테이블 디렉토리
+        to_firestore: True면 변경된 예측을 Firestore prediction_table 컬렉션에도 저장 (마감 문서는 삭제)
+        force: True면 입력 변경 여부와 무관하게 전체 재예측
+
+    Returns:
+        실행 요약 딕셔너리
+    """
+    start_time = time.time()
+    now = datetime.now()
+    model = model or BaselinePredictionModel(mock_mode=True, verbose=False)
+
+    with open(bids_file, 'r', encoding='utf-8') as f:
+        bids = active_bids(json.load(f), now)
+
+    table = PredictionTable(table_path(model.model_version, table_dir))
+    expired = table.prune_expired(now)
+    model_fingerprint = model.fingerprint()
+
+    to_score = []
+    for bid in bids:
+        bid_input = prediction_input(bid)
+        digest = input_hash(bid_input, model_fingerprint)
+        if force or not table.is_fresh(bid['id'], digest):
+            to_score.append((bid, bid_input, digest))
+
+    print(f"🔮 사전 예측: 활성 {len(bids)}건 중 {len(to_score)}건 예측 "
+          f"({len(bids) - len(to_score)}건 변경 없음 스킵, 마감 {len(expired)}건 제거)")
+
+    sink = None
+    if to_firestore and (to_score or expired):
+        if db:
+            sink = FirestorePredictionSink(db, collection=TABLE_COLLECTION, doc_id=table_doc_id)
+            if expired:
+                sink.delete([table_doc_id({'bid_id': bid_id, 'model_version': model.model_version})
+                             for bid_id in expired])
+        else:
+            print("⚠️ Firebase 연결이 없습니다. 로컬 테이블에만 저장합니다.")
+
+    results = predict_batch([bid_input for _, bid_input, _ in to_score], sink=sink, model=model) \
+        if to_score else []
+    if sink is not None and not to_score:
+        sink.close()
+
+    for (bid, _, digest), result in zip(to_score, results):
+        table.put(bid['id'], digest, bid.get('deadline'), result['prediction'])
+    table.save()
+
+    summary = {
+        'bids_file': bids_file,
+        'model_version': model.model_version,
+        'table_path': table.path,
+        'active_bids': len(bids),
+        'scored': len(to_score),
+        'skipped': len(bids) - len(to_score),
+        'expired': len(expired),
+        'table_size': len(table.entries),
+        'duration_sec': round(time.time() - start_time, 2)
+    }
+    print(f"💾 사전 예측 테이블 저장: {table.path} ({summary['table_size']}건, {summary['duration_sec']}초)")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='활성 입찰 사전 예측')
+    parser.add_argument('--input', type=str,
+                       help='수집 파일 경로 (없으면 --collected-dir의 최신 collected_bids_*.json)')
+    parser.add_argument('--collected-dir', type=str, default='./',
+                       help='수집 파일 디렉토리 (기본: ./)')
+    parser.add_argument('--table-dir', type=str, default=TABLE_DIR,
+                       help=f'사전 예측 테이블 디렉토리 (기본: {TABLE_DIR})')
+    parser.add_argument('--history', type=str,
+                       help='조인 히스토리 파일 (지정 시 모델 학습 + 낙찰률 경험분포 구축, --curves 무시)')
+    parser.add_argument('--curves', type=str, help='낙찰률 경험분포 파일 (win_rate_curves.py)')
+    parser.add_argument('--similar', type=str, help='유사 입찰 인덱스 파일 (similar_bids.py)')
+    parser.add_argument('--firestore', action='store_true',
+                       help='Firestore prediction_table 컬렉션에도 저장')
+    parser.add_argument('--force', action='store_true',
+                       help='입력 변경 여부와 무관하게 전체 재예측')
+
+    args = parser.parse_args()
+
+    bids_file = args.input or latest_collection(args.collected_dir)
+    if not bids_file:
+        print(f"❌ 수집 파일이 없습니다: {args.collected_dir}")
+        return
+
+    similar_index = SimilarBidIndex.load(args.similar) if args.similar else None
+    if args.history:
+        model = fit_model(args.history, similar_index)
+    else:
+        model = BaselinePredictionModel(
+            mock_mode=True,
+            win_rate_curves=WinRateCurves.load(args.curves) if args.curves else None,
+            similar_index=similar_index,
+            verbose=False
+        )
+    run_prescoring(bids_file, model=model, table_dir=args.table_dir,
+                   to_firestore=args.firestore, force=args.force)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데이터셋별 품질 규칙 명세 (Declarative Validation Rules)
+입찰(bids)/낙찰(awards) 규칙을 선언형 딕셔너리로 정의하고 레코드 검증 함수로 컴파일
+
+- 규칙 명세: 필수/핵심 필드, 필드별 타입 규칙(number/date/enum/length)과 이상치, PASS 기준
+- 컴파일: 명세 → 파이썬 소스 생성 → exec 1회 (레코드마다 명세를 해석하지 않음)
+- 해석 실행(interpret): 같은 명세를 레코드마다 해석하는 기준 구현 (컴파일 결과 회귀 테스트용)
+- 검증 함수: record → 위반 규칙 키 목록 ('missing:<field>', 'incomplete', 'type:<field>', 'anomaly:<name>')
+
+규칙 타입:
+    number: float() 변환 실패 = type 오류, anomalies = {이름: (연산자, 값)} (앞에서부터 첫 일치 1개)
+    date:   ISO 8601 / YYYY-MM-DD 파싱 실패 = type 오류, anomalies = {이름: 'past' | 'future'}
+    enum:   허용값(values) 외 = type 오류
+    length: 문자열 길이, anomalies = {이름: (연산자, 값)} ('<'/'<='는 빈 값 제외)
+
+통계적 이상치(outliers)는 레코드 간 분포가 필요하므로 컴파일 대상이 아니며 검증기가 별도로 실행
+"""
+
+import operator
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from g2b_parsers import parse_datetime
+
+
+BID_RULES = {
+    'dataset': 'bids',
+    'key_field': 'id',
+    'required': ['id', 'title', 'agency', 'category', 'region',
+                 'budget', 'deadline', 'status', 'createdAt'],
+    'critical': ['id', 'title', 'agency'],
+    'rules': [
+        {'field': 'budget', 'type': 'number', 'anomalies': {
+            'negative_budget': ('<=', 0, '음수/0원 예산', 'budget <= 0'),
+        }},
+        {'field': 'title', 'type': 'length', 'anomalies': {
+            'short_title': ('<', 5, '너무 짧은 제목', 'title 길이 < 5'),
+            'long_title': ('>', 200, '너무 긴 제목', 'title 길이 > 200'),
+        }},
+        {'field': 'deadline', 'type': 'date', 'anomalies': {
+            'past_deadline': ('past', None, '과거 마감일', 'deadline < 현재'),
+        }},
+        {'field': 'status', 'type': 'enum', 'values': ('active', 'closed', 'modified')},
+    ],
+    # PASS 기준 (metric: summary 키 또는 'type:<field>', 값 < threshold 이면 통과, 초과 시 권고)
+    'criteria': [
+        {'metric': 'critical_missing_rate', 'threshold': 1, 'label': '핵심 필드 누락률', 'short': '누락률',
+         'advice': '**긴급**: API 응답 파싱 로직 점검 - 핵심 필드(id/title/agency) 누락 발생'},
+        {'metric': 'type:deadline', 'threshold': 1, 'label': 'deadline 파싱 오류율', 'short': 'deadline파싱',
+         'advice': '**긴급**: deadline 필드 날짜 형식 통일 필요 (ISO 8601 권장)'},
+        {'metric': 'type:budget', 'threshold': 2, 'label': 'budget 파싱 오류율', 'short': 'budget파싱',
+         'advice': '**중요**: budget 필드 숫자 변환 로직 강화 필요'},
+        {'metric': 'duplicate_rate', 'threshold': 3, 'label': '중복 레코드율', 'short': '중복률',
+         'advice': '**중요**: 중복 ID 제거 로직 구현 - updatedAt 기준 최신 레코드만 유지'},
+    ],
+    # 통계적 이상치 (outlier_sketch: 그룹별 분위수 스케치 대비 Tukey fence 밖, 규칙 키 'outlier:<field>')
+    'outliers': {
+        'group_by': [['agency', 'category'], ['category']],
+        'fields': {'budget': 'log', 'estimatedPrice': 'log'},
+    },
+    # 이상치 비율 권고 (anomaly/outlier: 이름/필드, 비율 > threshold 이면 권고)
+    'alerts': [
+        {'anomaly': 'negative_budget', 'threshold': 5,
+         'advice': '**점검**: 음수/0원 예산 데이터 원인 분석 - API 응답 또는 파싱 문제 가능성'},
+        {'outlier': 'budget', 'threshold': 1,
+         'advice': '**점검**: 예산 통계적 이상치 원인 분석 - 금액 단위(원/천원) 또는 자릿수 입력 오류 가능성'},
+    ],
+}
+
+AWARD_RULES = {
+    'dataset': 'awards',
+    'key_field': 'bidId',
+    'required': ['bidId', 'opengDate', 'biddersCount', 'winnerAmount', 'winnerRate', 'winnerCompany'],
+    'critical': ['bidId', 'winnerRate', 'biddersCount'],
+    'rules': [
+        {'field': 'winnerRate', 'type': 'number', 'anomalies': {
+            'nonpositive_rate': ('<=', 0, '0% 이하 낙찰률', 'winnerRate <= 0'),
+            'low_rate': ('<', 80, '낮은 낙찰률', 'winnerRate < 80'),
+            'rate_over_100': ('>', 100, '100% 초과 낙찰률', 'winnerRate > 100'),
+        }},
+        {'field': 'biddersCount', 'type': 'number', 'anomalies': {
+            'no_bidders': ('<=', 0, '참여업체 없음', 'biddersCount <= 0'),
+            'single_bidder': ('==', 1, '단독 응찰', 'biddersCount == 1'),
+        }},
+        {'field': 'winnerAmount', 'type': 'number', 'anomalies': {
+            'nonpositive_amount': ('<=', 0, '음수/0원 낙찰금액', 'winnerAmount <= 0'),
+        }},
+        {'field': 'opengDate', 'type': 'date', 'anomalies': {
+            'future_openg': ('future', None, '미래 개찰일', 'opengDate > 현재'),
+        }},
+    ],
+    'criteria': [
+        {'metric': 'critical_missing_rate', 'threshold': 1, 'label': '핵심 필드 누락률', 'short': '누락률',
+         'advice': '**긴급**: API 응답 파싱 로직 점검 - 핵심 필드(bidId/winnerRate/biddersCount) 누락 발생'},
+        {'metric': 'type:winnerRate', 'threshold': 1, 'label': 'winnerRate 파싱 오류율', 'short': 'winnerRate파싱',
+         'advice': '**긴급**: winnerRate 필드 숫자 변환 로직 점검 (sucsfbidRate)'},
+        {'metric': 'type:opengDate', 'threshold': 1, 'label': 'opengDate 파싱 오류율', 'short': 'opengDate파싱',
+         'advice': '**긴급**: opengDate 필드 날짜 형식 통일 필요 (ISO 8601 권장)'},
+        {'metric': 'type:biddersCount', 'threshold': 2, 'label': 'biddersCount 파싱 오류율', 'short': 'biddersCount파싱',
+         'advice': '**중요**: biddersCount 필드 숫자 변환 로직 강화 필요 (rbidCnt)'},
+        {'metric': 'duplicate_rate', 'threshold': 3, 'label': '중복 레코드율', 'short': '중복률',
+         'advice': '**중요**: 중복 bidId 제거 로직 구현 - completedAt 기준 최신 레코드만 유지'},
+    ],
+    # 낙찰 레코드에는 기관/업종이 없으므로 전체 분포 기준
+    'outliers': {
+        'group_by': [],
+        'fields': {'winnerRate': 'linear', 'winnerAmount': 'log'},
+    },
+    'alerts': [
+        {'anomaly': 'rate_over_100', 'threshold': 1,
+         'advice': '**점검**: 100% 초과 낙찰률 원인 분석 - 예정가격/낙찰금액 단위 확인'},
+        {'anomaly': 'no_bidders', 'threshold': 1,
+         'advice': '**점검**: 참여업체 0건 낙찰 데이터 원인 분석 - 유찰 건 포함 여부 확인'},
+        {'outlier': 'winnerRate', 'threshold': 1,
+         'advice': '**점검**: 낙찰률 통계적 이상치 원인 분석 - 낙찰률 단위(%/소수) 혼용 여부 확인'},
+    ],
+}
+
+RULE_SETS = {
+    'bids': BID_RULES,
+    'awards': AWARD_RULES,
+}
+
+_COMPARE = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+}
+_COMPARISONS = tuple(_COMPARE)
+
+
+class RuleSet:
+    """규칙 명세 → 검증기가 사용하는 필드 목록/라벨 + 레코드 검증 함수 컴파일"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.dataset = spec['dataset']
+        self.key_field = spec['key_field']
+        self.required_fields = list(spec['required'])
+        self.critical_fields = list(spec['critical'])
+        self.rules = spec['rules']
+        self.type_fields = [rule['field'] for rule in self.rules if rule['type'] != 'length']
+        self.anomalies = [name for rule in self.rules for name in rule.get('anomalies', {})]
+        # 이상치 이름 → (라벨, 설명)
+        self.anomaly_labels = {
+            name: (anomaly[2], anomaly[3])
+            for rule in self.rules for name, anomaly in rule.get('anomalies', {}).items()
+        }
+        # 시간 경과로 결과가 바뀌는 날짜 이상치 (필드, 이름, 'past' | 'future')
+        self.time_anomalies = [
+            (rule['field'], name, anomaly[0])
+            for rule in self.rules if rule['type'] == 'date'
+            for name, anomaly in rule.get('anomalies', {}).items()
+        ]
+        # 통계적 이상치 명세 (outlier_sketch.OutlierDetector.from_spec 입력, 없으면 None)
+        self.outliers = spec.get('outliers')
+        self.outlier_fields = list(self.outliers['fields']) if self.outliers else []
+        self.criteria = spec.get('criteria', [])
+        self.alerts = spec.get('alerts', [])
+
+        for rule in self.rules:
+            for name, anomaly in rule.get('anomalies', {}).items():
+                op = anomaly[0]
+                valid = op in ('past', 'future') if rule['type'] == 'date' else op in _COMPARISONS
+                if not valid:
+                    raise ValueError(f"❌ 잘못된 규칙: {self.dataset}.{rule['field']}.{name} ({op})")
+
+    def source(self) -> str:
+        """검증 함수 파이썬 소스 생성"""
+        lines = [
+            'def check_record(record):',
+            '    get = record.get',
+            '    # 필수 필드 누락 (모든 값이 truthy면 누락 없음 - 대부분의 레코드는 여기서 통과)',
+            '    if all(map(get, required_fields)):',
+            '        failed = []',
+            '    else:',
+            '        failed = [key for field, key in missing_keys if get(field) in empty]',
+            '        if failed:',
+            "            failed.append('incomplete')",
+        ]
+        for index, rule in enumerate(self.rules):
+            lines.extend(self._rule_source(index, rule))
+        lines.append('    return failed')
+        return '\n'.join(lines) + '\n'
+
+    def _rule_source(self, index: int, rule: Dict[str, Any]) -> List[str]:
+        field, kind = rule['field'], rule['type']
+        anomalies = list(rule.get('anomalies', {}).items())
+        lines = [f'    value = get({field!r})']
+
+        if kind == 'number':
+            lines += [
+                '    if value is not None:',
+                '        try:',
+                '            number = float(value)',
+                '        except (ValueError, TypeError):',
+                f"            failed.append('type:{field}')",
+            ]
+            if anomalies:
+                lines.append('        else:')
+                lines += self._anomaly_chain(anomalies, 'number', '            ')
+        elif kind == 'length':
+            lines.append('    length = len(value) if value else 0')
+            lines += self._anomaly_chain(anomalies, 'length', '    ', skip_empty=True)
+        elif kind == 'date':
+            lines += [
+                '    if value:',
+                '        parsed = parse_datetime(value) if value.__class__ is str else None',
+                '        if parsed is None:',
+                f"            failed.append('type:{field}')",
+            ]
+            for name, anomaly in anomalies:
+                op = '<' if anomaly[0] == 'past' else '>'
+                lines += [
+                    f'        elif parsed {op} (now_aware if parsed.tzinfo else now):',
+                    f"            failed.append('anomaly:{name}')",
+                ]
+        elif kind == 'enum':
+            lines += [
+                f'    if value and (value.__class__ is not str or value not in allowed_{index}):',
+                f"        failed.append('type:{field}')",
+            ]
+        else:
+            raise ValueError(f"❌ 알 수 없는 규칙 타입: {self.dataset}.{field} ({kind})")
+        return lines
+
+    @staticmethod
+    def _anomaly_chain(anomalies, variable: str, indent: str, skip_empty: bool = False) -> List[str]:
+        lines = []
+        for position, (name, anomaly) in enumerate(anomalies):
+            op, threshold = anomaly[0], anomaly[1]
+            condition = f'{variable} {op} {threshold!r}'
+            if skip_empty and op in ('<', '<='):
+                condition = f'0 < {condition}'
+            keyword = 'if' if position == 0 else 'elif'
+            lines += [
+                f'{indent}{keyword} {condition}:',
+                f"{indent}    failed.append('anomaly:{name}')",
+            ]
+        return lines
+
+    def compile(self, now: datetime) -> Callable[[Dict[str, Any]], List[str]]:
+        """
+        레코드 검증 함수 생성 (명세는 여기서 1회만 해석)
+
+        Args:
+            now: 과거/미래 날짜 판정 기준 시각
+        """
+        namespace = {
+            'required_fields': tuple(self.required_fields),
+            'missing_keys': tuple((field, f'missing:{field}') for field in self.required_fields),
+            'empty': (None, ''),
+            'parse_datetime': parse_datetime,
+            'now': now,
+            'now_aware': now.astimezone(),
+        }
+        for index, rule in enumerate(self.rules):
+            if rule['type'] == 'enum':
+                namespace[f'allowed_{index}'] = frozenset(rule['values'])
+
+        exec(compile(self.source(), f'<quality_rules:{self.dataset}>', 'exec'), namespace)
+        return namespace['check_record']
+
+    def interpret(self, now: datetime) -> Callable[[Dict[str, Any]], List[str]]:
+        """
+        레코드마다 명세를 해석하는 검증 함수 (compile과 같은 규칙 키/순서, 회귀 테스트 기준 구현)
+
+        Args:
+            now: 과거/미래 날짜 판정 기준 시각
+        """
+        now_aware = now.astimezone()
+
+        def check_record(record: Dict[str, Any]) -> List[str]:
+            failed = [f'missing:{field}' for field in self.required_fields if record.get(field) in (None, '')]
+            if failed:
+                failed.append('incomplete')
+            for rule in self.rules:
+                field, kind = rule['field'], rule['type']
+                anomalies = rule.get('anomalies', {})
+                value = record.get(field)
+                if kind == 'number':
+                    if value is None:
+                        continue
+                    try:
+                        number = float(value)
+                    except (ValueError, TypeError):
+                        failed.append(f'type:{field}')
+                        continue
+                    failed.extend(self._first_anomaly(anomalies, number))
+                elif kind == 'length':
+                    failed.extend(self._first_anomaly(anomalies, len(value) if value else 0, skip_empty=True))
+                elif kind == 'date':
+                    if not value:
+                        continue
+                    parsed = parse_datetime(value) if value.__class__ is str else None
+                    if parsed is None:
+                        failed.append(f'type:{field}')
+                        continue
+                    reference = now_aware if parsed.tzinfo else now
+                    for name, anomaly in anomalies.items():
+                        if (parsed < reference) if anomaly[0] == 'past' else (parsed > reference):
+                            failed.append(f'anomaly:{name}')
+                            break
+                elif kind == 'enum':
+                    if value and (value.__class__ is not str or value not in rule['values']):
+                        failed.append(f'type:{field}')
+            return failed
+
+        return check_record
+
+    @staticmethod
+    def _first_anomaly(anomalies: Dict[str, tuple], value: float, skip_empty: bool = False) -> List[str]:
+        """비교 이상치 중 처음 일치하는 1개 (skip_empty: '<'/'<='는 0 제외)"""
+        for name, anomaly in anomalies.items():
+            op, threshold = anomaly[0], anomaly[1]
+            if skip_empty and op in ('<', '<=') and value <= 0:
+                continue
+            if _COMPARE[op](value, threshold):
+                return [f'anomaly:{name}']
+        return []
+
+
+_RULE_SET_CACHE: Dict[str, RuleSet] = {}
+
+
+def get_rule_set(dataset: str = 'bids') -> RuleSet:
+    """데이터셋 이름 → RuleSet (프로세스당 1회 생성)"""
+    if dataset not in _RULE_SET_CACHE:
+        if dataset not in RULE_SETS:
+            raise ValueError(f"❌ 알 수 없는 데이터셋: {dataset} (지원: {', '.join(RULE_SETS)})")
+        _RULE_SET_CACHE[dataset] = RuleSet(RULE_SETS[dataset])
+    return _RULE_SET_CACHE[dataset]
+
+
+if __name__ == '__main__':
+    # 생성된 검증 함수 소스 확인용
+    import sys
+    print(get_rule_set(sys.argv[1] if len(sys.argv) > 1 else 'bids').source())
@@ -0,0 +1,296 @@
+"""
+실행 리스(Lease) / 공공데이터포털 호출 예산
+스케줄러, API 서버, CLI 등 서로 다른 프로세스에서 시작된 실행의 중복 방지와 API 호출량 공유
+(SQLite 파일 하나, 표준 라이브러리만 사용)
+
+- RunLease: 작업 종류별 리스 (보유 중에는 하트비트로 만료 시각 연장, 프로세스가 죽으면 만료 후 회수)
+  - policy 'skip': 이미 실행 중이면 LeaseBusy
+  - policy 'queue': 대기열 순서(FIFO)대로 리스를 얻을 때까지 대기 (wait_timeout 초과 시 LeaseBusy)
+- ApiBudget: 서비스별 일일 호출 한도 + 최소 호출 간격을 모든 수집기가 공유
+  (호출 슬롯을 트랜잭션으로 예약하므로 동시 수집기도 간격을 지킴, 429 발생 시 전체 수집기 호출 지연)
+
+환경 변수:
+    RUN_LEASE_DB: 리스/예산 DB 경로 (기본: ./state/run_leases.db)
+    DATA_PORTAL_DAILY_LIMIT: 서비스별 일일 호출 한도 (기본: 1000, 개발계정 트래픽)
+    DATA_PORTAL_MIN_INTERVAL: 호출 간 최소 간격 초 (기본: 1.0)
+
+실행 예시:
+    python run_lease.py            # 리스/대기열/오늘 호출량 조회
+"""
+
+import os
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+LEASE_DB = os.getenv('RUN_LEASE_DB', './state/run_leases.db')
+DAILY_API_LIMIT = int(os.getenv('DATA_PORTAL_DAILY_LIMIT', '1000'))
+MIN_CALL_INTERVAL = float(os.getenv('DATA_PORTAL_MIN_INTERVAL', '1.0'))
+LEASE_TTL = 600  # 하트비트가 끊긴 리스/대기열 항목 회수 시간 (초)
+LEASE_POLICIES = ('skip', 'queue')
+
+HOST = socket.gethostname()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    job TEXT PRIMARY KEY, token TEXT, owner TEXT, host TEXT, pid INTEGER,
+    acquired_at REAL, expires_at REAL
+);
+CREATE TABLE IF NOT EXISTS waiters (
+    ticket INTEGER PRIMARY KEY AUTOINCREMENT, job TEXT, token TEXT, owner TEXT,
+    host TEXT, pid INTEGER, expires_at REAL
+);
+CREATE TABLE IF NOT EXISTS api_budget (
+    service TEXT, day TEXT, calls INTEGER, next_slot REAL, PRIMARY KEY (service, day)
+);
+"""
+
+
+class LeaseBusy(Exception):
+    """다른 실행이 리스를 보유 중 (skip 정책 또는 대기 시간 초과)"""
+
+
+class BudgetExhausted(Exception):
+    """일일 API 호출 한도 소진"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _alive(host: str, pid: int) -> bool:
+    """같은 호스트 프로세스 생존 여부 (다른 호스트/Windows는 만료 시각으로만 판단)"""
+    if host != HOST or os.name == 'nt':  # Windows의 os.kill은 프로세스를 종료시킴
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class _Transaction:
+    """쓰기 잠금 트랜잭션 (BEGIN IMMEDIATE - 프로세스 간 원자적 확인/갱신)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn = _connect(self.path)
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        self.conn.close()
+
+
+class RunLease:
+    """
+    작업 종류별 실행 리스 (with 문으로 사용)
+
+    Example:
+        with RunLease('collect_bids', policy='skip', owner='scheduler'):
+            ...
+    """
+
+    def __init__(self, job: str, policy: str = 'skip', owner: str = '', ttl: float = LEASE_TTL,
+                 wait_timeout: Optional[float] = None, poll: float = 1.0, path: str = LEASE_DB):
+        """
+        Args:
+            job: 작업 종류 (예: collect_bids, retry_queue)
+            policy: 'skip' (실행 중이면 즉시 LeaseBusy) 또는 'queue' (순서대로 대기)
+            owner: 보유자 표시 (scheduler / api / cli 등, 조회용)
+            ttl: 하트비트가 끊긴 뒤 리스를 회수하기까지의 시간 (초)
+            wait_timeout: queue 정책 최대 대기 시간 (초, None이면 무제한)
+            poll: 대기 중 확인 주기 (초)
+        """
+        if policy not in LEASE_POLICIES:
+            raise ValueError(f"알 수 없는 리스 정책: {policy} ({', '.join(LEASE_POLICIES)})")
+        self.job = job
+        self.policy = policy
+        self.owner = owner
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.poll = poll
+        self.path = path
+        self.token = uuid.uuid4().hex
+        self.lost = False  # 하트비트 중 리스를 잃음 (만료 후 다른 실행이 회수)
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def _holder(self, conn: sqlite3.Connection, now: float) -> Optional[tuple]:
+        """유효한 현재 보유자 (만료/죽은 프로세스 리스는 삭제)"""
+        row = conn.execute('SELECT owner, host, pid, expires_at FROM leases WHERE job = ?', (self.job,)).fetchone()
+        if row is not None and (row[3] < now or not _alive(row[1], row[2])):
+            conn.execute('DELETE FROM leases WHERE job = ?', (self.job,))
+            return None
+        return row
+
+    def _queue_head(self, conn: sqlite3.Connection, now: float) -> Optional[str]:
+        """대기열 맨 앞 토큰 (하트비트가 끊긴 대기자는 제거)"""
+        for ticket, token, host, pid, expires_at in conn.execute(
+                'SELECT ticket, token, host, pid, expires_at FROM waiters WHERE job = ? ORDER BY ticket',
+                (self.job,)).fetchall():
+            if expires_at >= now and _alive(host, pid):
+                return token
+            conn.execute('DELETE FROM waiters WHERE ticket = ?', (ticket,))
+        return None
+
+    def acquire(self) -> 'RunLease':
+        deadline = None if self.wait_timeout is None else time.time() + self.wait_timeout
+        if self.policy == 'queue':
+            with _Transaction(self.path) as conn:
+                conn.execute('INSERT INTO waiters (job, token, owner, host, pid, expires_at) VALUES (?, ?, ?, ?, ?, ?)',
+                             (self.job, self.token, self.owner, HOST, os.getpid(), time.time() + self.ttl))
+        announced = False
+        while True:
+            now = time.time()
+            with _Transaction(self.path) as conn:
+                holder = self._holder(conn, now)
+                turn = self.policy == 'skip' or self._queue_head(conn, now) == self.token
+                if holder is None and turn:
+                    conn.execute('INSERT OR REPLACE INTO leases VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                 (self.job, self.token, self.owner, HOST, os.getpid(), now, now + self.ttl))
+                    conn.execute('DELETE FROM waiters WHERE token = ?', (self.token,))
+                    break
+                if self.policy == 'queue':
+                    conn.execute('UPDATE waiters SET expires_at = ? WHERE token = ?', (now + self.ttl, self.token))
+
+            busy = f"{self.job} 실행 중" + (f" (보유: {holder[0] or '-'}, {holder[1]}:{holder[2]})" if holder else '')
+            if self.policy == 'skip':
+                raise LeaseBusy(busy)
+            if deadline is not None and now >= deadline:
+                self._leave_queue()
+                raise LeaseBusy(f"{busy} - {self.wait_timeout:.0f}초 대기 초과")
+            if not announced:
+                print(f"⏳ {busy} - 대기열에서 순서 대기")
+                announced = True
+            time.sleep(self.poll)
+
+        self._heartbeat = threading.Thread(target=self._renew, daemon=True)
+        self._heartbeat.start()
+        return self
+
+    def _leave_queue(self):
+        with _Transaction(self.path) as conn:
+            conn.execute('DELETE FROM waiters WHERE token = ?', (self.token,))
+
+    def _renew(self):
+        """보유 중 만료 시각 연장 (ttl의 1/3 주기)"""
+        while not self._stop.wait(self.ttl / 3):
+            with _Transaction(self.path) as conn:
+                renewed = conn.execute('UPDATE leases SET expires_at = ? WHERE job = ? AND token = ?',
+                                       (time.time() + self.ttl, self.job, self.token)).rowcount
+            if not renewed:
+                self.lost = True
+                print(f"⚠️ {self.job} 리스를 잃었습니다 (만료 후 다른 실행이 회수)")
+                return
+
+    def release(self):
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        with _Transaction(self.path) as conn:
+            conn.execute('DELETE FROM leases WHERE job = ? AND token = ?', (self.job, self.token))
+
+    def __enter__(self) -> 'RunLease':
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class ApiBudget:
+    """
+    서비스별 공공데이터포털 호출 예산 (모든 프로세스 공유)
+
+    acquire()는 오늘 호출 수를 1 늘리고 다음 호출 슬롯(최소 간격)을 예약한 뒤 슬롯 시각까지 대기
+    """
+
+    def __init__(self, service: str, daily_limit: int = DAILY_API_LIMIT,
+                 min_interval: float = MIN_CALL_INTERVAL, path: str = LEASE_DB):
+        self.service = service
+        self.daily_limit = daily_limit
+        self.min_interval = min_interval
+        self.path = path
+
+    def acquire(self):
+        """호출 1회 예약 (한도 소진 시 BudgetExhausted)"""
+        now = time.time()
+        day = datetime.now().strftime('%Y-%m-%d')
+        with _Transaction(self.path) as conn:
+            row = conn.execute('SELECT calls, next_slot FROM api_budget WHERE service = ? AND day = ?',
+                               (self.service, day)).fetchone()
+            calls, next_slot = row if row else (0, now)
+            if calls >= self.daily_limit:
+                raise BudgetExhausted(f"{self.service} 일일 호출 한도 소진 ({calls}/{self.daily_limit}회)")
+            slot = max(now, next_slot)
+            conn.execute('INSERT OR REPLACE INTO api_budget VALUES (?, ?, ?, ?)',
+                         (self.service, day, calls + 1, slot + self.min_interval))
+        if slot > now:
+            time.sleep(slot - now)
+
+    def defer(self, seconds: float):
+        """모든 수집기의 다음 호출을 지연 (429 Rate Limit 응답 시)"""
+        day = datetime.now().strftime('%Y-%m-%d')
+        until = time.time() + seconds
+        with _Transaction(self.path) as conn:
+            conn.execute('INSERT INTO api_budget VALUES (?, ?, 0, ?) ON CONFLICT (service, day) '
+                         'DO UPDATE SET next_slot = MAX(next_slot, excluded.next_slot)',
+                         (self.service, day, until))
+
+
+def lease_status(path: str = LEASE_DB) -> Dict[str, List[Dict]]:
+    """현재 리스/대기열/오늘 호출량"""
+    conn = _connect(path)
+    try:
+        now = time.time()
+        day = datetime.now().strftime('%Y-%m-%d')
+        leases = [
+            {'job': job, 'owner': owner, 'host': host, 'pid': pid,
+             'acquired_at': datetime.fromtimestamp(acquired_at).isoformat(),
+             'expired': expires_at < now}
+            for job, owner, host, pid, acquired_at, expires_at in conn.execute(
+                'SELECT job, owner, host, pid, acquired_at, expires_at FROM leases ORDER BY job')
+        ]
+        waiters = [
+            {'job': job, 'owner': owner, 'host': host, 'pid': pid}
+            for job, owner, host, pid in conn.execute(
+                'SELECT job, owner, host, pid FROM waiters WHERE expires_at >= ? ORDER BY ticket', (now,))
+        ]
+        budget = [
+            {'service': service, 'calls': calls, 'daily_limit': DAILY_API_LIMIT}
+            for service, calls in conn.execute(
+                'SELECT service, calls FROM api_budget WHERE day = ? ORDER BY service', (day,))
+        ]
+    finally:
+        conn.close()
+    return {'leases': leases, 'waiters': waiters, 'api_budget': budget}
+
+
+def main():
+    status = lease_status()
+    print(f"🔒 실행 리스 ({LEASE_DB})")
+    for lease in status['leases']:
+        print(f"   {lease['job']:<16} {lease['owner'] or '-':<12} {lease['host']}:{lease['pid']}  "
+              f"{lease['acquired_at']}{' (만료)' if lease['expired'] else ''}")
+    for waiter in status['waiters']:
+        print(f"   ⏳ {waiter['job']:<13} {waiter['owner'] or '-':<12} {waiter['host']}:{waiter['pid']}")
+    print("📡 오늘 API 호출량")
+    for budget in status['api_budget']:
+        print(f"   {budget['service']:<28} {budget['calls']:>6} / {budget['daily_limit']}회")
+
+
+if __name__ == '__main__':
+    main()
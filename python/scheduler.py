@@ -1,53 +1,362 @@
 """
-스케줄러 - 정기적인 데이터 수집 및 분석 실행
+스케줄러 - 의존 관계 기반 수집/분석 파이프라인
+
+DAG (pipeline.py, 상위 단계가 끝나는 즉시 하위 단계 실행, 독립 단계는 병렬):
+
+    collect_bids ─ collect_awards ─┬─ join (증분 조인 → history.ndjson) ─┐
+                                   └─ quality (품질 게이트) ──────────────┼─ prescore (히스토리로 학습한 모델로 활성 입찰 사전 예측)
+                                                                          ├─ insights (증분 인사이트 + 롤업 큐브)
+                                                                          └─ enrich (신규/변경 입찰 상세 보강 → 체크리스트 자격 요건/첨부파일)
+
+- 정기 수집마다 전체 DAG 실행 (적응형 주기: cadence.py가 요일 × 시간대 신규 공고 도착률로 API 예산 안에서 간격 결정)
+- 주기 사이에도 외부 수집 파일(PowerShell 스케줄러, API 서버 등)이 도착하면 수집 단계를 건너뛰고 즉시 하위 단계 실행
+- 단계마다 실행 리스(run_lease.py): 다른 스케줄러/API 서버/CLI 실행과 겹치면 수집은 생략(또는 대기), 나머지는 순서 대기
+- 단계별 소요 시간/재시도/결과와 데이터 신선도(입력 파일 도착 → 인사이트 반영)를 logs/pipeline_runs.ndjson에 기록
+
+실행 예시:
+    python scheduler.py
+    python scheduler.py --source real --pages 5 --min-interval 10 --max-interval 180
+    python scheduler.py --cadence fixed --interval 60
+    python scheduler.py --once
 """
 
-import schedule
+import os
+import glob
+import json
 import time
-from datetime import datetime
+import argparse
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Dict, List
+
 from collect_bids import BidDataCollector
-from analyze_insights import BidAnalyzer
+from collect_awards import AwardDataCollector
+from cadence import ArrivalRateModel, CadencePlanner, polls_per_day
+from bid_detail import BidDetailEnricher
+from analyze_insights import BidAnalyzer, INSIGHT_INDEX_PATH, LOCAL_INSIGHTS_PATH
+from data_quality import (
+    QualityIndex, RecordSource, append_timeseries, check_incremental,
+    generate_json_report, timeseries_point
+)
+from history_data import HistoryJoinIndex
+from insight_cube import CUBE_PATH, build_from_index
+from insight_store import LOCAL_EXTENSIONS, LOCAL_PREFIXES, JsonInsightWriter, LocalInsightReader
+from pipeline import HaltDownstream, Pipeline, Stage
+from quality_rules import get_rule_set
+from run_lease import LEASE_POLICIES, LeaseBusy, RunLease
+
+
+RUN_LOG_PATH = './logs/pipeline_runs.ndjson'
+HISTORY_FILE = 'history.ndjson'
+HISTORY_STATE_FILE = 'history_join.db'
+COLLECT_STAGES = {'bids': 'collect_bids', 'history': 'collect_awards'}
+
+
+class DataWatcher:
+    """수집 파일 도착 감지 (collected_bids_* / collected_awards_* 수정 시각 비교)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.seen = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, float]:
+        snapshot = {}
+        for prefix in LOCAL_PREFIXES.values():
+            for path in glob.glob(os.path.join(self.directory, prefix + '*')):
+                if path.endswith(LOCAL_EXTENSIONS):
+                    snapshot[path] = os.path.getmtime(path)
+        return snapshot
+
+    def changes(self) -> Dict[str, List[str]]:
+        """마지막 확인 이후 새로 생기거나 바뀐 파일 {컬렉션: [경로]} (확인한 파일은 처리된 것으로 기록)"""
+        snapshot = self._snapshot()
+        changed = sorted((path for path, mtime in snapshot.items() if self.seen.get(path) != mtime),
+                         key=lambda path: (snapshot[path], path))
+        self.seen.update((path, snapshot[path]) for path in changed)
+        return {collection: [path for path in changed if os.path.basename(path).startswith(prefix)]
+                for collection, prefix in LOCAL_PREFIXES.items()}
+
+    def mark(self, paths: List[str]):
+        """파이프라인이 직접 쓴 파일을 처리된 것으로 기록"""
+        for path in paths:
+            if os.path.exists(path):
+                self.seen[path] = os.path.getmtime(path)
+
 
-def run_collection():
-    """데이터 수집 작업"""
-    print(f"\n⏰ [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 데이터 수집 작업 시작")
+def collect_bids(args, context: Dict[str, Any]) -> Dict:
+    """입찰 수집 → collected_bids_{source}_{run_id}.json"""
+    collector = BidDataCollector(source=args.source)
+    bids = collector.collect(count=args.count, pages=args.pages)
+    collector.save_retry_queue(args.data_dir)
+    if not bids:
+        raise RuntimeError("수집된 입찰이 없습니다.")
+    path = collector.save_to_json(bids, context['run_id'], args.data_dir)
+    return {'paths': context.get('landed', {}).get('bids', []) + [path], 'records': len(bids)}
+
+
+def collect_awards(args, context: Dict[str, Any]) -> Dict:
+    """
+    낙찰 수집 → collected_awards_{source}_{run_id}.json
+
+    이번 실행 입찰 파일을 넘김 (collect_awards.py --bids-file과 동일: Mock 낙찰은 이 입찰 ID로 생성, 조인키 매칭율 기록)
+    """
+    bids_file = context['collect_bids']['paths'][-1]
+    collector = AwardDataCollector(source=args.source)
+    awards = collector.collect(count=max(args.count // 4, 1), pages=args.pages, bids_file=bids_file)
+    collector.save_retry_queue(args.data_dir)
+    if not awards:
+        raise RuntimeError("수집된 낙찰 정보가 없습니다.")
+    path = collector.save_to_json(awards, context['run_id'], args.data_dir)
+    match = collector.calculate_match_rate(awards, bids_file)
+    return {'paths': context.get('landed', {}).get('history', []) + [path], 'records': len(awards),
+            'match_rate': match['match_rate']}
+
+
+def join_history(args, context: Dict[str, Any]) -> Dict:
+    """
+    새 수집분만 입찰-낙찰 조인 → history.ndjson 뒤에 추가 (같은 bid_id는 마지막 레코드가 최신)
+
+    수집 파일은 지난 실행 이후 추가분만 읽고, 짝이 먼저 도착한 입찰/낙찰은 조인 상태(history_join.db)에서 찾음
+    조인 상태가 없으면(첫 실행) 전체 수집 파일로 history.ndjson를 새로 씀
+    """
+    reader = LocalInsightReader(args.data_dir)
+    index = HistoryJoinIndex(os.path.join(args.data_dir, HISTORY_STATE_FILE))
+    path = os.path.join(args.data_dir, HISTORY_FILE)
     try:
-        collector = BidDataCollector()
-        collector.run()
-    except Exception as e:
-        print(f"❌ 수집 작업 실패: {e}")
-
-def run_analysis():
-    """데이터 분석 작업"""
-    print(f"\n⏰ [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 데이터 분석 작업 시작")
+        bids, index.cursors['bids'] = reader.changes('bids', (), index.cursors.get('bids'))
+        awards, index.cursors['history'] = reader.changes('history', (), index.cursors.get('history'))
+        history = index.apply(bids, awards)
+        with open(path, 'w' if index.is_new else 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in history))
+        index.save()
+    finally:
+        index.close()
+    return {'path': path, 'records': len(history), 'bids': len(bids), 'awards': len(awards)}
+
+
+def quality_gate(args, context: Dict[str, Any]) -> Dict:
+    """
+    새 수집 파일 증분 품질 검증 (data_quality.py --incremental과 같은 인덱스/시계열/리포트)
+
+    이번 실행 입찰 판정이 FAIL이면 하위 단계(사전 예측/인사이트) 중단
+    신규 건수(arrivals)는 적응형 수집 주기의 도착률 학습에 사용
+    """
+    os.makedirs(args.reports_dir, exist_ok=True)
+    run_id = context['run_id']
+    judgments, arrivals = {}, {}
+    for collection, dataset in (('bids', 'bids'), ('history', 'awards')):
+        paths = context[COLLECT_STAGES[collection]]['paths']
+        if not paths:
+            continue
+        name = args.source if dataset == 'bids' else f'{dataset}_{args.source}'
+        index = QualityIndex(os.path.join(args.reports_dir, f'quality_index_{name}.db'))
+        results = check_incremental(RecordSource(paths), index, run_id, rules=get_rule_set(dataset))
+        index.save()
+        index.close()
+        append_timeseries(os.path.join(args.reports_dir, f'quality_timeseries_{name}.ndjson'), {
+            'run_id': run_id,
+            'timestamp': datetime.now().isoformat(),
+            **{k: v for k, v in results['incremental'].items() if k != 'run_id' and k != 'cumulative'},
+            'delta': timeseries_point(results),
+            'cumulative': results['incremental']['cumulative']
+        })
+        generate_json_report(results, os.path.join(args.reports_dir, f'data_quality_report_{name}_{run_id}.json'))
+        judgments[dataset] = results['judgment']
+        arrivals[dataset] = results['incremental']['new']
+
+    output = {'judgments': judgments, 'arrivals': arrivals}
+    if judgments.get('bids') == 'FAIL':
+        raise HaltDownstream("입찰 품질 판정 FAIL - 사전 예측/인사이트 반영 보류", output)
+    return output
+
+
+def prescore(args, context: Dict[str, Any]) -> Dict:
+    """최신 입찰 파일 활성 입찰 사전 예측 (조인 히스토리로 학습한 모델 + 낙찰률 경험분포)"""
+    from prescore import fit_model, run_prescoring
+
+    paths = [path for path in context['collect_bids']['paths'] if path.endswith('.json')]
+    if not paths:
+        return {'scored': 0}
+    return run_prescoring(paths[-1], model=fit_model(context['join']['path']))
+
+
+def insights(args, context: Dict[str, Any]) -> Dict:
+    """증분 인사이트 (로컬 수집 파일) + 임의 조회용 롤업 큐브"""
+    reader = LocalInsightReader(args.data_dir)
+    writer = JsonInsightWriter(LOCAL_INSIGHTS_PATH) if args.insights_target == 'local' else None
+    summary = BidAnalyzer(reader=reader, writer=writer).run_incremental(INSIGHT_INDEX_PATH)
+    build_from_index(INSIGHT_INDEX_PATH).save(CUBE_PATH)
+    return summary
+
+
+def enrich_details(args, context: Dict[str, Any]) -> Dict:
+    """
+    이번 실행 입찰 상세 보강 (지문이 바뀐 신규/변경 입찰만 조회, 나머지는 캐시)
+
+    보강 필드는 상세 캐시에 보관 → DocumentGenerator.generate_document가 attach_details로 병합
+    """
+    paths = context['collect_bids']['paths']
+    if not paths:
+        return {'bids': 0}
+    enricher = BidDetailEnricher(source=args.source, concurrency=args.detail_concurrency)
+    _, stats = enricher.enrich(RecordSource(paths))
+    return stats
+
+
+def leased(job: str, policy: str, func, args, context: Dict[str, Any]):
+    """
+    단계 실행을 실행 리스로 감쌈 (다른 스케줄러/API 서버/CLI 실행과 중복 방지)
+
+    skip 정책에서 다른 실행이 보유 중이면 하위 단계 중단 (그 실행의 수집 파일이 도착하면 다시 트리거됨)
+    """
+    try:
+        lease = RunLease(job, policy=policy, owner=f"scheduler:{context['run_id']}").acquire()
+    except LeaseBusy as e:
+        raise HaltDownstream(str(e))
     try:
-        analyzer = BidAnalyzer()
-        analyzer.run()
-    except Exception as e:
-        print(f"❌ 분석 작업 실패: {e}")
+        return func(args, context)
+    finally:
+        lease.release()
+
+
+def build_pipeline(args) -> Pipeline:
+    """수집 → 조인/품질 게이트 → 사전 예측/인사이트/상세 보강 DAG (수집은 --lock 정책, 상태 파일을 쓰는 단계는 순서 대기)"""
+    def stage(name, func, job=None, policy='queue', **options):
+        return Stage(name, partial(leased, job or f'pipeline:{name}', policy, func, args), **options)
+
+    return Pipeline([
+        stage('collect_bids', collect_bids, BidDataCollector.LEASE_JOB, args.lock, retries=2, retry_delay=60),
+        stage('collect_awards', collect_awards, AwardDataCollector.LEASE_JOB, args.lock, retries=2, retry_delay=60,
+              depends=('collect_bids',)),
+        stage('join', join_history, depends=('collect_bids', 'collect_awards')),
+        stage('quality', quality_gate, depends=('collect_bids', 'collect_awards')),
+        stage('prescore', prescore, depends=('join', 'quality')),
+        stage('insights', insights, depends=('quality',)),
+        stage('enrich', enrich_details, depends=('quality',)),
+    ], workers=args.workers)
+
+
+def run_pipeline(pipeline: Pipeline, watcher: DataWatcher, landed: Dict[str, List[str]], collect: bool) -> Dict:
+    """
+    파이프라인 1회 실행 후 실행 기록 저장
+
+    Args:
+        landed: 이번 실행 전에 도착한 외부 수집 파일 {컬렉션: [경로]}
+        collect: True면 수집 단계 실행, False면 도착 파일로 수집 단계를 대신함
+    """
+    print(f"\n⏰ [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 파이프라인 시작 "
+          f"({'정기 수집' if collect else '수집 파일 도착'})")
+    start_time = time.time()
+    run_id = datetime.fromtimestamp(start_time).strftime('%Y%m%d_%H%M%S')
+    preset = None if collect else {
+        stage: {'paths': landed[collection], 'records': None} for collection, stage in COLLECT_STAGES.items()
+    }
+    results = pipeline.run(run_id=run_id, preset=preset, context={'landed': landed})
+
+    inputs = [path for stage in COLLECT_STAGES.values() if results[stage].status == 'success'
+              for path in results[stage].output['paths']]
+    watcher.mark(inputs)
+
+    record = {
+        'run_id': run_id,
+        'trigger': 'schedule' if collect else 'landed',
+        'started_at': datetime.fromtimestamp(start_time).isoformat(),
+        'duration_sec': round(time.time() - start_time, 2),
+        'stages': {name: result.to_dict() for name, result in results.items()},
+    }
+    if results['quality'].output:
+        record['arrivals'] = results['quality'].output['arrivals']
+    if results['insights'].status == 'success' and inputs:
+        # 데이터 신선도: 가장 먼저 도착한 입력 파일 → 인사이트 반영 완료
+        record['freshness_sec'] = round(time.time() - min(os.path.getmtime(path) for path in inputs), 1)
+
+    os.makedirs(os.path.dirname(RUN_LOG_PATH), exist_ok=True)
+    with open(RUN_LOG_PATH, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    print(f"📋 파이프라인 완료 ({record['duration_sec']}초"
+          + (f", 데이터 신선도 {record['freshness_sec']}초" if 'freshness_sec' in record else '') + ")")
+    for name, stage in record['stages'].items():
+        print(f"   {name:<15} {stage['status']:<8} {stage['duration_sec']:>8.2f}초  {stage['attempts']}회")
+    return record
+
 
 def main():
     """스케줄러 메인"""
+    parser = argparse.ArgumentParser(description='수집/분석 파이프라인 스케줄러')
+    parser.add_argument('--source', choices=['mock', 'real'], default='mock',
+                       help='수집 소스 (기본: mock)')
+    parser.add_argument('--count', type=int, default=200, help='Mock 모드 입찰 생성 수 (기본: 200)')
+    parser.add_argument('--pages', type=int, default=3, help='Real 모드 페이지 수 (기본: 3)')
+    parser.add_argument('--data-dir', type=str, default='./', help='수집 파일 디렉토리 (기본: ./)')
+    parser.add_argument('--reports-dir', type=str, default='./reports',
+                       help='품질 리포트/인덱스 디렉토리 (기본: ./reports)')
+    parser.add_argument('--insights-target', choices=['local', 'firestore'], default='local',
+                       help=f'인사이트 저장소 (기본: local → {LOCAL_INSIGHTS_PATH})')
+    parser.add_argument('--cadence', choices=['adaptive', 'fixed'], default='adaptive',
+                       help='수집 주기: adaptive (요일 × 시간대 도착률 기반) 또는 fixed (--interval 고정)')
+    parser.add_argument('--interval', type=int, default=180, help='fixed 모드 수집 주기 / adaptive 모드 학습 전 간격 (분, 기본: 180)')
+    parser.add_argument('--min-interval', type=float, default=15, help='adaptive 모드 최소 간격 (분, 기본: 15)')
+    parser.add_argument('--max-interval', type=float, default=240, help='adaptive 모드 최대 간격 (분, 기본: 240)')
+    parser.add_argument('--budget-share', type=float, default=0.8,
+                       help='일일 API 한도 중 정기 수집 몫 (기본: 0.8, 나머지는 재시도/API 서버/CLI)')
+    parser.add_argument('--poll', type=int, default=30, help='수집 파일 도착 확인 주기 (초, 기본: 30)')
+    parser.add_argument('--workers', type=int, default=4, help='동시 실행 단계 수 (기본: 4)')
+    parser.add_argument('--detail-concurrency', type=int, default=4,
+                       help='입찰 상세 보강 동시 조회 수 (기본: 4)')
+    parser.add_argument('--lock', choices=list(LEASE_POLICIES), default='skip',
+                       help='다른 실행이 수집 중일 때: skip (이번 수집 생략) 또는 queue (끝날 때까지 대기)')
+    parser.add_argument('--once', action='store_true', help='전체 파이프라인 1회 실행 후 종료')
+
+    args = parser.parse_args()
+
     print("="*60)
     print("🤖 스마트 입찰 인텔리전스 스케줄러 시작")
     print("="*60)
     print("\n📅 스케줄 설정:")
-    print("  - 데이터 수집: 매 3시간마다")
-    print("  - 데이터 분석: 매일 자정")
+    model = ArrivalRateModel()
+    planner = CadencePlanner(model, polls_per_day(args.pages, args.budget_share),
+                             args.min_interval, args.max_interval, default_interval=args.interval)
+    if args.cadence == 'adaptive':
+        print(f"  - 정기 수집: 요일 × 시간대 도착률 기반 {args.min_interval:.0f}~{args.max_interval:.0f}분 "
+              f"(하루 최대 {planner.daily_polls:.0f}회, API 한도의 {args.budget_share:.0%})")
+    else:
+        print(f"  - 정기 수집: 매 {args.interval}분")
+    print("    (수집 → 품질 게이트 → 사전 예측/인사이트/상세 보강)")
+    print(f"  - 수집 파일 도착 확인: 매 {args.poll}초 (도착 즉시 하위 단계 실행)")
     print("\n" + "="*60 + "\n")
-    
-    # 스케줄 설정
-    schedule.every(3).hours.do(run_collection)  # 3시간마다 수집
-    schedule.every().day.at("00:00").do(run_analysis)  # 매일 자정 분석
-    
+
+    pipeline = build_pipeline(args)
+    watcher = DataWatcher(args.data_dir)
+
+    def run(landed: Dict[str, List[str]], collect: bool) -> float:
+        """실행 후 도착률 학습, 다음 정기 수집 시각 반환"""
+        started = datetime.now()
+        record = run_pipeline(pipeline, watcher, landed, collect)
+        if 'bids' in record.get('arrivals', {}):
+            model.observe(record['arrivals']['bids'], started)
+            model.save()
+        if args.cadence == 'fixed':
+            next_run = started + timedelta(minutes=args.interval)
+        else:
+            next_run = planner.next_run(started)
+        if collect:
+            print(f"⏭️ 다음 정기 수집: {next_run.strftime('%Y-%m-%d %H:%M')} "
+                  f"(현재 시간대 간격 {planner.interval(started) if args.cadence == 'adaptive' else args.interval:.0f}분)")
+        return next_run.timestamp()
+
     # 즉시 한 번 실행
-    run_collection()
-    run_analysis()
-    
-    # 스케줄 실행
+    next_collection = run(watcher.changes(), collect=True)
+    if args.once:
+        return
+
     while True:
-        schedule.run_pending()
-        time.sleep(60)  # 1분마다 체크
+        time.sleep(args.poll)
+        landed = watcher.changes()
+        if time.time() >= next_collection:
+            next_collection = run(landed, collect=True)
+        elif any(landed.values()):
+            run(landed, collect=False)  # 외부 수집도 도착률 학습에 반영 (정기 수집 시각은 유지)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+유사 과거 입찰 검색 인덱스 (Similar Past-Bid Retrieval)
+공고명 문자 n-gram TF-IDF 역색인 + 기관/업종/예산 특성 재정렬
+
+- 한글 공고명: 띄어쓰기/조사 변형에 강한 문자 2-gram/3-gram 사용
+- 후보 생성: 역색인 posting 스캔 (고빈도 n-gram은 최근 MAX_POSTING_SCAN건만 스캔)
+- 재정렬: 텍스트 유사도 + 기관/업종 일치 + 예산 로그 거리
+- 증분 추가: 낙찰 수집 후 신규 히스토리만 NDJSON 인덱스 파일에 append
+
+실행 예시:
+    python similar_bids.py --bids collected_bids.json --awards collected_awards_mock_step2_test.json
+    python similar_bids.py --index models/similar_bids.ndjson --query "스마트 플랫폼 구축 사업" --agency 조달청
+"""
+
+import os
+import re
+import json
+import hashlib
+import math
+import heapq
+import argparse
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from history_data import load_history
+
+
+_NON_WORD = re.compile(r'[^0-9a-z가-힣]+')
+
+
+def title_ngrams(title: str, sizes=(2, 3)) -> List[str]:
+    """공고명 → 문자 n-gram 집합 (토큰 경계 '_' 포함)"""
+    text = _NON_WORD.sub(' ', (title or '').lower()).strip()
+    if not text:
+        return []
+
+    grams = set()
+    for token in text.split():
+        padded = f"_{token}_"
+        for size in sizes:
+            for i in range(len(padded) - size + 1):
+                grams.add(padded[i:i + size])
+    return list(grams)
+
+
+class SimilarBidIndex:
+    """과거 입찰 유사도 검색 인덱스"""
+
+    # 특성 가중치
+    WEIGHTS = {
+        'title': 0.60,
+        'agency': 0.15,
+        'category': 0.10,
+        'budget': 0.15
+    }
+    MAX_POSTING_SCAN = 2000  # n-gram당 최대 스캔 문서 수 (최신 우선)
+    RERANK_CANDIDATES = 200  # 재정렬 후보 수
+
+    # 결과에 포함할 히스토리 필드
+    RESULT_FIELDS = ('bid_id', 'title', 'agency', 'category', 'region', 'budget',
+                     'opengDate', 'winnerRate', 'biddersCount')
+
+    def __init__(self):
+        self.rows: List[Dict] = []
+        self.row_grams: List[int] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.bid_ids = set()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, record: Dict) -> bool:
+        """히스토리 1건 추가 (이미 있는 bid_id는 무시)"""
+        bid_id = record.get('bid_id')
+        if bid_id in self.bid_ids:
+            return False
+
+        doc_id = len(self.rows)
+        grams = title_ngrams(record.get('title', ''))
+        for gram in grams:
+            self.postings[gram].append(doc_id)
+
+        self.rows.append({field: record.get(field) for field in self.RESULT_FIELDS})
+        self.row_grams.append(len(grams))
+        if bid_id:
+            self.bid_ids.add(bid_id)
+        return True
+
+    def add_many(self, records: Iterable[Dict]) -> List[Dict]:
+        """여러 건 추가, 실제로 추가된 레코드 반환"""
+        return [record for record in records if self.add(record)]
+
+    def search(self, bid_data: Dict, k: int = 5) -> List[Dict]:
+        """
+        유사 과거 입찰 top-k 검색
+
+        Args:
+            bid_data: {'title', 'agency', 'category', 'budget'} (ml_prediction 입력과 동일)
+            k: 반환 건수
+
+        Returns:
+            히스토리 레코드 + 'similarity' 리스트 (유사도 내림차순)
+        """
+        grams = title_ngrams(bid_data.get('title', ''))
+        if not grams or not self.rows:
+            return []
+
+        n_docs = len(self.rows)
+        text_scores = defaultdict(float)
+        query_weight = 0.0
+
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if not posting:
+                # 인덱스에 없는 n-gram도 질의 가중치에 포함 (df=1 취급 상한 idf)
+                query_weight += math.log(1 + n_docs)
+                continue
+            idf = math.log(1 + n_docs / len(posting))
+            query_weight += idf
+            for doc_id in posting[-self.MAX_POSTING_SCAN:]:
+                text_scores[doc_id] += idf
+
+        if not text_scores:
+            return []
+
+        candidates = heapq.nlargest(self.RERANK_CANDIDATES, text_scores.items(), key=lambda x: x[1])
+
+        query_len = len(grams)
+        agency = bid_data.get('agency')
+        category = bid_data.get('category')
+        log_budget = self._log_budget(bid_data.get('budget'))
+
+        scored = []
+        for doc_id, shared_weight in candidates:
+            row = self.rows[doc_id]
+            doc_len = self.row_grams[doc_id]
+            text_sim = (shared_weight / query_weight) * math.sqrt(
+                min(query_len, doc_len) / max(query_len, doc_len)
+            )
+
+            budget_sim = 0.0
+            row_budget = self._log_budget(row.get('budget'))
+            if log_budget is not None and row_budget is not None:
+                budget_sim = math.exp(-abs(log_budget - row_budget))
+
+            similarity = (
+                text_sim * self.WEIGHTS['title'] +
+                (1.0 if agency and row.get('agency') == agency else 0.0) * self.WEIGHTS['agency'] +
+                (1.0 if category and row.get('category') == category else 0.0) * self.WEIGHTS['category'] +
+                budget_sim * self.WEIGHTS['budget']
+            )
+            scored.append((similarity, doc_id))
+
+        return [
+            dict(self.rows[doc_id], similarity=round(similarity, 4))
+            for similarity, doc_id in heapq.nlargest(k, scored)
+        ]
+
+    @staticmethod
+    def _log_budget(budget) -> Optional[float]:
+        try:
+            value = float(budget)
+        except (TypeError, ValueError):
+            return None
+        return math.log(value) if value > 0 else None
+
+    def fingerprint(self) -> str:
+        """인덱스 지문 (수록 입찰 ID/낙찰률 기준)"""
+        digest = hashlib.sha1()
+        for row in self.rows:
+            digest.update(f"{row.get('bid_id')}|{row.get('winnerRate')}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def save(self, path: str, records: Optional[List[Dict]] = None):
+        """
+        NDJSON 인덱스 파일 저장
+
+        Args:
+            records: 지정 시 해당 레코드만 append (증분 저장), 없으면 전체 재작성
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        mode = 'a' if records is not None else 'w'
+        rows = records if records is not None else self.rows
+
+        with open(path, mode, encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps({field: row.get(field) for field in self.RESULT_FIELDS},
+                                   ensure_ascii=False) + '\n')
+
+    @classmethod
+    def load(cls, path: str) -> 'SimilarBidIndex':
+        index = cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    index.add(json.loads(line))
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='유사 과거 입찰 검색 인덱스')
+    parser.add_argument('--index', type=str, default='./models/similar_bids.ndjson',
+                       help='인덱스 파일 (기본: ./models/similar_bids.ndjson)')
+    parser.add_argument('--bids', type=str, help='입찰 데이터 파일 (증분 추가용)')
+    parser.add_argument('--awards', type=str, help='낙찰 데이터 파일 (증분 추가용)')
+    parser.add_argument('--query', type=str, help='검색할 공고명')
+    parser.add_argument('--agency', type=str, help='검색 조건: 발주기관')
+    parser.add_argument('--category', type=str, help='검색 조건: 업종')
+    parser.add_argument('--budget', type=float, help='검색 조건: 예산')
+    parser.add_argument('-k', type=int, default=5, help='반환 건수 (기본: 5)')
+
+    args = parser.parse_args()
+
+    index = SimilarBidIndex.load(args.index) if os.path.exists(args.index) else SimilarBidIndex()
+    print(f"📂 인덱스 로드: {len(index)}건")
+
+    if args.bids and args.awards:
+        added = index.add_many(load_history(args.bids, args.awards))
+        index.save(args.index, records=added)
+        print(f"✅ 증분 추가: {len(added)}건 (총 {len(index)}건) → {args.index}")
+
+    if args.query:
+        results = index.search({
+            'title': args.query,
+            'agency': args.agency,
+            'category': args.category,
+            'budget': args.budget
+        }, k=args.k)
+
+        print(f"\n🔎 유사 과거 입찰 (top {args.k}):")
+        for row in results:
+            print(f"   - [{row['similarity']:.3f}] {row['title']} | {row['agency']} | "
+                  f"낙찰률 {row['winnerRate']}% | 참여 {row['biddersCount']}개사")
+
+
+if __name__ == '__main__':
+    main()
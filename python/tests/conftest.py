@@ -0,0 +1,56 @@
+"""pytest 공통 설정 - python/ 모듈을 테스트에서 직접 import"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+
+import pytest
+
+
+QUALITY_NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def make_quality_bids():
+    """누락/타입 오류/중복/이상치/통계적 이상치가 섞인 입찰 품질 검증 픽스처"""
+    bids = []
+    for i in range(120):
+        bids.append({
+            'id': f'2025{i:05d}',
+            'title': f'공공 정보시스템 구축 사업 {i}',
+            'agency': ['조달청', '서울시청', '국방부'][i % 3],
+            'category': ['소프트웨어', '용역'][i % 2],
+            'region': '서울',
+            'budget': 100_000_000 + (i % 17) * 3_000_000,
+            'estimatedPrice': 98_000_000 + (i % 13) * 2_500_000,
+            'deadline': f'2025-06-{i % 28 + 2:02d}T18:00:00',
+            'status': 'active',
+            'createdAt': '2025-05-30T09:00:00',
+        })
+    bids[1]['title'] = ''                              # 핵심 필드 누락
+    bids[2]['agency'] = None                           # 핵심 필드 누락
+    bids[3]['budget'] = 'abc'                          # 타입 오류
+    bids[4]['deadline'] = '2025/13/45'                 # 타입 오류
+    bids[5]['deadline'] = 20250601                     # 타입 오류 (문자열 아님)
+    bids[6]['status'] = 'unknown'                      # enum 오류
+    bids[7]['status'] = 3                              # enum 오류 (문자열 아님)
+    bids[8]['budget'] = -5                             # 음수 예산
+    bids[9]['budget'] = 0                              # 0원 예산 + 필수 필드 falsy
+    bids[10]['title'] = '짧음'                          # 짧은 제목
+    bids[11]['title'] = '가' * 250                      # 긴 제목
+    bids[12]['deadline'] = '2025-05-01T10:00:00'       # 과거 마감일
+    bids[13]['deadline'] = '2025-05-01T10:00:00+09:00'  # 과거 마감일 (시간대)
+    # 통계적 이상치 (그룹 표본이 MIN_SAMPLES 이상 쌓인 뒤에 판정되므로 뒤쪽에 배치)
+    bids[110]['budget'] = 90_000_000_000
+    bids[111]['estimatedPrice'] = 1_000
+    bids[16]['createdAt'] = ''
+    bids.append(dict(bids[20]))                        # 중복 ID
+    bids.append(dict(bids[21], title='정정 공고 사업'))    # 중복 ID
+    return bids
+
+
+@pytest.fixture
+def quality_bids():
+    return make_quality_bids()
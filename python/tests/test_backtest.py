@@ -0,0 +1,29 @@
+"""walk-forward 백테스트 회귀 테스트"""
+
+from backtest import run_backtest
+
+
+def make_history(count: int = 30):
+    history = []
+    for i in range(count):
+        history.append({
+            'id': f'B{i:04d}',
+            'title': f'시스템 구축 사업 {i}',
+            'agency': ['조달청', '서울시청'][i % 2],
+            'category': '소프트웨어',
+            'region': '서울',
+            'budget': None if i % 5 == 0 else 100_000_000 + i * 1_000_000,
+            'announcementDate': f'2025-01-{i % 28 + 1:02d}T09:00:00',
+            'opengDate': f'2025-02-{i % 28 + 1:02d}T10:00:{i:02d}',
+            'winnerRate': 85.0 + (i % 10) * 0.5,
+        })
+    return history
+
+
+def test_backtest_handles_missing_budget():
+    report = run_backtest(make_history(), ['baseline', 'segment_median', 'global_mean'], folds=2, workers=1)
+
+    assert report['history_size'] == 30
+    for name, metrics in report['models'].items():
+        assert metrics['predictions'] == 20, name
+        assert metrics['mae'] is not None
@@ -0,0 +1,169 @@
+"""입찰 상세 보강 (BidDetailEnricher) 테스트 - ETag/304를 지원하는 로컬 HTTP 스텁 서버"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import bid_detail
+from bid_detail import BASE_PRICE_OPERATIONS, DETAIL_OPERATIONS, BidDetailEnricher
+from document_generator import DocumentGenerator
+from run_lease import ApiBudget
+
+NO_ETAG_OPERATION = DETAIL_OPERATIONS['attachments']  # ETag 없는 오퍼레이션 → 본문 해시로 변경 판단
+
+
+class StubState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+
+
+def stub_body(operation, bid_id):
+    if operation == DETAIL_OPERATIONS['licenseLimits']:
+        items = [{'lcnsLmtNm': '소프트웨어사업자'}]
+    elif operation == DETAIL_OPERATIONS['regionLimits']:
+        items = [{'prtcptPsblRgnNm': '서울특별시'}]
+    elif operation.endswith('BsisAmount01'):
+        items = [{'bssamt': '150000000'}]
+    else:
+        items = [{'eorderAtchFileNm': '과업지시서.pdf', 'eorderAtchFileUrl': f'https://stub/{bid_id}/0'}]
+    return json.dumps({'response': {'body': {'items': items}}}, ensure_ascii=False).encode('utf-8')
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            operation = url.path.rsplit('/', 1)[-1]
+            bid_id = parse_qs(url.query)['bidNtceNo'][0]
+            with state.lock:
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+                state.requests.append((bid_id, operation, self.headers.get('If-None-Match')))
+            try:
+                time.sleep(0.02)
+                body = stub_body(operation, bid_id)
+                etag = None if operation == NO_ETAG_OPERATION else '"%s"' % hashlib.md5(body).hexdigest()
+                if etag and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                if etag:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def stub_server():
+    state = StubState()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/BidPublicInfoService04', state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_enricher(tmp_path, stub_server, monkeypatch):
+    base_url, _ = stub_server
+    monkeypatch.setattr(bid_detail, 'API_KEY', 'test-key')
+
+    def make(concurrency=3):
+        session = requests.Session()
+        enricher = BidDetailEnricher(source='real', concurrency=concurrency,
+                                     cache_path=str(tmp_path / 'bid_detail_cache.db'), session=session)
+        enricher.base_url = base_url
+        enricher.budget = ApiBudget('test', min_interval=0, path=str(tmp_path / 'leases.db'))
+        return enricher
+    return make
+
+
+def make_bids(count=6):
+    return [{'id': f'2025060000{i}', 'title': f'정보시스템 구축 사업 {i}', 'agency': '조달청',
+             'budget': 100_000_000 + i, 'deadline': '2099-12-31T18:00:00'} for i in range(count)]
+
+
+def test_cold_warm_and_changed_runs(make_enricher, stub_server):
+    _, state = stub_server
+    bids = make_bids()
+    operations = len(DETAIL_OPERATIONS)
+
+    enriched, cold = make_enricher().enrich(bids)
+    assert (cold['fetched'], cold['cached'], cold['failed']) == (6, 0, 0)
+    assert cold['api_calls'] == cold['modified'] == 6 * operations
+    assert (cold['not_modified'], cold['unchanged'], cold['error']) == (0, 0, 0)
+    assert all(bid['basePrice'] == 150000000 and bid['licenseLimits'] == ['소프트웨어사업자'] for bid in enriched)
+    assert 1 < state.max_in_flight <= 3
+
+    enriched, warm = make_enricher().enrich(bids)
+    assert (warm['cached'], warm['fetched'], warm['api_calls']) == (6, 0, 0)
+    assert len(state.requests) == 6 * operations
+
+    changed = [dict(bid, title='정보시스템 구축 사업 (정정)') if bid['id'] == bids[2]['id'] else bid for bid in bids]
+    enriched, update = make_enricher().enrich(changed)
+    assert (update['cached'], update['fetched'], update['failed']) == (5, 1, 0)
+    assert update['api_calls'] == operations
+    assert update['not_modified'] == operations - 1  # ETag 오퍼레이션 → If-None-Match 304
+    assert update['unchanged'] == 1                  # ETag 없는 오퍼레이션 → 본문 해시 동일
+    assert update['modified'] == 0
+    assert {bid_id for bid_id, _, _ in state.requests[6 * operations:]} == {bids[2]['id']}
+    assert all(etag for _, operation, etag in state.requests[6 * operations:] if operation != NO_ETAG_OPERATION)
+    assert next(bid for bid in enriched if bid['id'] == bids[2]['id'])['attachments'][0]['name'] == '과업지시서.pdf'
+    assert state.max_in_flight <= 3
+
+
+def test_in_flight_never_exceeds_concurrency(make_enricher, stub_server):
+    _, state = stub_server
+    _, stats = make_enricher(concurrency=2).enrich(make_bids(8))
+    assert stats['fetched'] == 8
+    assert state.max_in_flight == 2
+
+
+def test_base_price_operation_follows_bid_category(make_enricher, stub_server):
+    _, state = stub_server
+    bids = make_bids(3)
+    bids[1]['category'], bids[2]['category'] = '건설', '물품'
+    enriched, stats = make_enricher().enrich(bids)
+    assert stats['fetched'] == 3
+    assert all(bid['basePrice'] == 150000000 for bid in enriched)
+    base_price = {bid_id: operation for bid_id, operation, _ in state.requests if operation.endswith('BsisAmount01')}
+    assert base_price == {bids[0]['id']: DETAIL_OPERATIONS['basePrice'],
+                          bids[1]['id']: BASE_PRICE_OPERATIONS['건설'],
+                          bids[2]['id']: BASE_PRICE_OPERATIONS['물품']}
+
+
+def test_checklist_renders_cached_details(tmp_path):
+    cache_path = str(tmp_path / 'bid_detail_cache.db')
+    bids = make_bids(2)
+    enriched, _ = BidDetailEnricher(source='mock', cache_path=cache_path).enrich(bids)
+    detail = next(bid for bid in enriched if bid['id'] == bids[0]['id'])
+
+    # 목록 레코드만 넘겨도 캐시된 보강 필드로 체크리스트 작성
+    document = DocumentGenerator(use_ai=False).generate_document(bids[0], 'checklist', detail_cache=cache_path)
+    content = document['content']
+    assert all(f"면허 보유: {name}" in content for name in detail['licenseLimits'])
+    assert all(f"첨부 검토: {item['name']}" in content for item in detail['attachments'])
+    assert f"기초금액: {detail['basePrice']:,.0f}원" in content
+    assert ('참가가능지역' in content) == bool(detail['regionLimits'])
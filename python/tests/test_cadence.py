@@ -0,0 +1,72 @@
+"""적응형 수집 주기 (ArrivalRateModel / CadencePlanner) 테스트"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from cadence import ArrivalRateModel, CadencePlanner, hour_bucket
+
+
+NOW = datetime(2025, 6, 2, 9, 30)  # 월요일
+
+
+def test_arrival_counts_decay_by_half_life(tmp_path):
+    model = ArrivalRateModel(str(tmp_path / 'arrival_model.json'), half_life_days=1)
+    assert model.observe(0, NOW - timedelta(hours=1)) is False  # 첫 수집은 시각만 기록
+    assert model.observe(12, NOW) is True                       # 08:30 ~ 09:30 → 8시/9시 버킷에 절반씩
+    assert model.counts[hour_bucket(NOW) - 1] == pytest.approx(6.0)
+    assert model.counts[hour_bucket(NOW)] == pytest.approx(6.0)
+
+    assert model.observe(0, NOW + timedelta(days=1)) is True    # 24시간 = 반감기 1회
+    assert model.counts[hour_bucket(NOW)] == pytest.approx(3.0)
+    assert model.hours[hour_bucket(NOW)] == pytest.approx(0.25 + 0.5)  # 감쇠된 관측 + 화요일 같은 시각 관측
+    assert sum(model.counts) == pytest.approx(6.0)
+
+    before = list(model.counts)
+    assert model.observe(50, NOW + timedelta(days=3)) is False  # 긴 공백은 학습하지 않음
+    assert model.counts == before
+
+    model.save()
+    reloaded = ArrivalRateModel(model.path)
+    assert reloaded.last_observed == (NOW + timedelta(days=3)).isoformat()
+    assert reloaded.counts[hour_bucket(NOW)] == pytest.approx(3.0)
+
+
+def trained_model(tmp_path):
+    """평일 9~17시에만 시간당 50건 도착, 전 시간대 10시간씩 관측"""
+    model = ArrivalRateModel(str(tmp_path / 'arrival_model.json'))
+    model.hours = [10.0] * 168
+    model.counts = [500.0 if bucket // 24 < 5 and 9 <= bucket % 24 < 18 else 0.0 for bucket in range(168)]
+    return model
+
+
+@pytest.mark.parametrize('daily_polls', [20, 40, 1000])
+def test_planner_clamps_to_interval_bounds(tmp_path, daily_polls):
+    planner = CadencePlanner(trained_model(tmp_path), daily_polls, min_interval=15, max_interval=240)
+    plan = planner.frequencies(NOW.weekday())
+    intervals = [60 / frequency for frequency in plan]
+
+    assert all(15 - 1e-9 <= interval <= 240 + 1e-9 for interval in intervals)
+    assert max(intervals[9:18]) < min(intervals[:6])  # 도착이 많은 업무 시간에 더 자주 수집
+    assert sum(plan) <= daily_polls + 1e-9
+    if daily_polls == 1000:  # 예산이 충분하면 업무 시간은 최소 간격, 남는 예산은 쓰지 않음
+        assert intervals[9:18] == pytest.approx([15] * 9)
+        assert sum(plan) < daily_polls
+    else:
+        assert sum(plan) == pytest.approx(daily_polls)
+    assert planner.interval(NOW) == pytest.approx(intervals[NOW.hour])
+
+
+def test_small_budget_overrides_max_interval(tmp_path):
+    planner = CadencePlanner(trained_model(tmp_path), daily_polls=3, min_interval=15, max_interval=240)
+    assert [60 / frequency for frequency in planner.frequencies(0)] == pytest.approx([480] * 24)
+
+
+def test_next_run_before_training_uses_default_interval(tmp_path):
+    model = ArrivalRateModel(str(tmp_path / 'arrival_model.json'))
+    planner = CadencePlanner(model, daily_polls=100, default_interval=180)
+    assert planner.next_run(NOW) == NOW + timedelta(hours=3)
+    assert planner.interval(NOW) == pytest.approx(180)
+
+    # 예산이 기본 간격보다 빠듯하면 예산 우선 (하루 4회 → 6시간 간격)
+    assert CadencePlanner(model, daily_polls=4, default_interval=180).next_run(NOW) == NOW + timedelta(hours=6)
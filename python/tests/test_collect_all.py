@@ -0,0 +1,40 @@
+"""다중 오퍼레이션 병렬 수집 테스트"""
+
+import json
+
+from collect_all import OPERATIONS, collect_all
+from collect_bids import BidDataCollector
+
+
+def test_mock_operations_do_not_collide(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # 실행 리스 DB (./state/run_leases.db)
+    manifest = collect_all(source='mock', count=100, run_id='test001', output_dir=str(tmp_path))
+
+    assert [manifest['operations'][key]['records'] for key in OPERATIONS] == [100, 100, 100, 25, 25, 25]
+    assert manifest['records'] == {'bids': 300, 'awards': 75}
+
+    with open(manifest['files']['bids'], encoding='utf-8') as f:
+        bids = json.load(f)
+    with open(manifest['files']['awards'], encoding='utf-8') as f:
+        awards = json.load(f)
+    assert len({bid['id'] for bid in bids}) == 300
+    assert {bid['category'] for bid in bids if bid['id'].startswith('C')} == {'건설'}
+    assert {bid['category'] for bid in bids if bid['id'].startswith('T')} == {'물품'}
+    assert {bid['category'] for bid in bids if bid['id'][0].isdigit()} <= {'용역', '소프트웨어', '기타'}
+    # 같은 오퍼레이션 종류의 개찰결과는 같은 ID 규칙 → 입찰과 조인 가능
+    assert {award['bidId'] for award in awards} <= {bid['id'] for bid in bids}
+
+
+def test_real_category_follows_operation():
+    item = {'bidNtceNo': '20250600001', 'bidNtceNm': '청사 시스템 유지보수', 'ntceInsttNm': '조달청'}
+    categories = {
+        operation: BidDataCollector(source='mock', operation=operation)._normalize_bids([item])[0]['category']
+        for dataset, operation, _ in OPERATIONS.values() if dataset == 'bids'
+    }
+    assert categories == {
+        'getBidPblancListInfoServc01': '소프트웨어',
+        'getBidPblancListInfoCnstwk01': '건설',
+        'getBidPblancListInfoThng01': '물품',
+    }
+    service = BidDataCollector(source='mock')
+    assert service._normalize_bids([dict(item, bidNtceNm='청사 증축 공사 감리')])[0]['category'] == '용역'
@@ -0,0 +1,117 @@
+"""입찰 수집기 인라인 품질 게이트 테스트 (정규화 전 원본 문제 반영)"""
+
+import pytest
+
+import collect_bids
+from collect_bids import BidDataCollector
+from data_quality import QualityGate
+from run_lease import ApiBudget
+
+
+def raw_item(i, **overrides):
+    item = {
+        'bidNtceNo': f'R2025{i:05d}',
+        'bidNtceNm': f'공공 정보시스템 구축 사업 {i}',
+        'ntceInsttNm': '서울특별시',
+        'asignBdgtAmt': str(100_000_000 + i),
+        'presmptPrce': str(98_000_000 + i),
+        'bidClseDt': '2099-12-31 18:00:00',
+        'bidNtceDt': '2025-06-01 09:00:00',
+    }
+    item.update(overrides)
+    return item
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, items):
+        self.items = items
+
+    def json(self):
+        return {'response': {'body': {'items': self.items}}}
+
+
+class FakeSession:
+    """페이지 번호 → 원본 레코드 목록 (호출 페이지 기록)"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(params['pageNo'])
+        return FakeResponse(self.pages.get(params['pageNo'], []))
+
+
+@pytest.fixture
+def make_collector(tmp_path, monkeypatch):
+    monkeypatch.setattr(collect_bids, 'API_KEY', 'test-key')
+    monkeypatch.setattr(collect_bids.time, 'sleep', lambda seconds: None)
+
+    def make(pages, gate):
+        session = FakeSession(pages)
+        collector = BidDataCollector(source='real', quality_gate=gate, session=session)
+        collector.budget = ApiBudget('test', min_interval=0, path=str(tmp_path / 'leases.db'))
+        return collector, session
+    return make
+
+
+def dirty_page(start, blank_titles=0, bad_budgets=0, missing_ids=0):
+    """원본 100건 페이지 (게이트 지표는 핵심/타입 필드 3개 평균 → 35건이면 평균 11.67%)"""
+    items = [raw_item(start + i) for i in range(100)]
+    for i in range(blank_titles):
+        items[i]['bidNtceNm'] = '  '
+    for i in range(bad_budgets):
+        items[i]['asignBdgtAmt'] = '미정'
+    for i in range(missing_ids):
+        items[i]['bidNtceNo'] = ''
+    return items
+
+
+def test_blank_titles_halt_collection(make_collector, tmp_path):
+    gate = QualityGate(policy='abort', quarantine_path=str(tmp_path / 'quarantine.ndjson'))
+    collector, session = make_collector({1: dirty_page(0, blank_titles=35), 2: dirty_page(100)}, gate)
+
+    bids = collector._fetch_real_data(pages=2)
+
+    assert session.calls == [1]  # 2페이지 호출 생략
+    assert gate.should_abort
+    assert gate.stats.counts['missing:title'] == 35
+    assert 'critical_missing_rate' in gate.breaches[0]
+    assert len(bids) == 65 and all(b['title'] != '제목없음' for b in bids)
+
+
+def test_unparseable_budgets_halt_collection(make_collector):
+    gate = QualityGate(policy='abort')
+    collector, session = make_collector({1: dirty_page(0, bad_budgets=35), 2: dirty_page(100)}, gate)
+
+    bids = collector._fetch_real_data(pages=2)
+
+    assert session.calls == [1]
+    assert gate.stats.counts['type:budget'] == 35
+    assert gate.stats.counts['missing:budget'] == 0
+    assert 'type_error_rate' in gate.breaches[0]
+    assert len(bids) == 65
+
+
+def test_dropped_ids_count_toward_gate(make_collector):
+    gate = QualityGate(policy='abort')
+    collector, session = make_collector({1: dirty_page(0, missing_ids=35), 2: dirty_page(100)}, gate)
+
+    bids = collector._fetch_real_data(pages=2)
+
+    assert gate.stats.total == 100 and gate.quarantined == 35
+    assert gate.stats.counts['missing:id'] == 35
+    assert gate.should_abort and len(bids) == 65
+
+
+def test_clean_pages_pass(make_collector):
+    gate = QualityGate(policy='abort')
+    collector, session = make_collector({1: dirty_page(0, blank_titles=1, bad_budgets=1), 2: dirty_page(100)}, gate)
+
+    bids = collector._fetch_real_data(pages=3)
+
+    assert session.calls == [1, 2, 3]
+    assert not gate.breaches
+    assert gate.quarantined == 1 and len(bids) == 199
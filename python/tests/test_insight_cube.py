@@ -0,0 +1,55 @@
+"""인사이트 큐브 롤업 ↔ MultiDimensionAggregator 인사이트 일치 테스트"""
+
+import random
+
+import pytest
+
+from analyze_insights import DIMENSIONS, PERIOD_TYPES, AwardIndex, MultiDimensionAggregator
+
+np = pytest.importorskip('numpy')
+from insight_cube import InsightCube  # noqa: E402
+
+VALUE_FIELDS = ('totalBids', 'awardedBids', 'averageBudget', 'budgetStdDev', 'averageWinRate', 'averageCompetition')
+
+
+def make_data(count=3000, seed=7):
+    rng = random.Random(seed)
+    agencies = [f'기관{i}' for i in range(25)]
+    bids, awards = [], []
+    for i in range(count):
+        bid_id = f'B{i:06d}'
+        month = rng.randint(1, 12)
+        bids.append({
+            'id': bid_id,
+            'agency': rng.choice(agencies),
+            'category': rng.choice(['소프트웨어', '용역', '건설', '물품', '기타']),
+            'region': rng.choice(['서울', '경기', '부산', '대전', '']),
+            'budget': rng.choice([rng.randint(10, 3000) * 1_000_000, rng.randint(1, 10**9), None]),
+            'announcementDate': f'2025-{month:02d}-{rng.randint(1, 28):02d}T09:00:00',
+        })
+        if rng.random() < 0.6:
+            awards.append({
+                'bidId': bid_id,
+                'winnerRate': round(rng.uniform(80, 100), rng.choice([2, 3])),  # sucsfbidRate 소수 2~3자리
+                'biddersCount': rng.randint(1, 20),
+                'opengDate': f'2025-{month:02d}-28',
+            })
+    return bids, awards
+
+
+def test_cube_rollup_matches_insights():
+    bids, awards = make_data()
+    award_index = AwardIndex().add_many(awards)
+    aggregator = MultiDimensionAggregator(awards=award_index).add_many(bids)
+    cube = InsightCube.build(bids, award_index)
+
+    compared = 0
+    for dim, config in DIMENSIONS.items():
+        for kind in PERIOD_TYPES:
+            expected = {(insight['name'], insight['period']): {field: insight[field] for field in VALUE_FIELDS}
+                        for insight in aggregator.insights(dim, period_types=[kind])}
+            rows = cube.query([dim, kind], min_bids=config['min_bids'])
+            actual = {(row[dim], row[kind]): {field: row[field] for field in VALUE_FIELDS} for row in rows}
+            assert actual == expected, (dim, kind)
+            compared += len(expected)
+    assert compared > 500
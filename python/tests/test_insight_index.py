@@ -0,0 +1,104 @@
+"""증분 인사이트 인덱스 (InsightIndex + LocalInsightReader 파일 커서) 테스트"""
+
+import json
+import random
+
+import insight_store
+from analyze_insights import BidAnalyzer
+from insight_store import JsonInsightWriter, LocalInsightReader
+
+
+def make_bids(count=400, seed=3):
+    rng = random.Random(seed)
+    bids, awards = [], []
+    for i in range(count):
+        bid_id = f'B{i:05d}'
+        month = rng.randint(1, 12)
+        bids.append({
+            'id': bid_id,
+            'agency': rng.choice(['조달청', '서울시청', '국방부', '경기도청']),
+            'category': rng.choice(['소프트웨어', '용역', '건설']),
+            'region': rng.choice(['서울', '경기', '']),
+            'budget': rng.randint(10, 3000) * 1_000_000,
+            'announcementDate': f'2025-{month:02d}-{rng.randint(1, 28):02d}T09:00:00',
+            'createdAt': '2025-06-01T09:00:00',
+        })
+        if rng.random() < 0.6:
+            awards.append({'bidId': bid_id, 'winnerRate': round(rng.uniform(80, 100), 3),
+                           'biddersCount': rng.randint(1, 20), 'opengDate': f'2025-{month:02d}-28',
+                           'completedAt': '2025-06-01T10:00:00'})
+    return bids, awards
+
+
+def write_ndjson(path, records, mode='w'):
+    with open(path, mode, encoding='utf-8') as f:
+        f.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+
+
+def incremental(data_dir, tmp_path):
+    writer = JsonInsightWriter(str(tmp_path / 'insights_incremental.json'))
+    analyzer = BidAnalyzer(reader=LocalInsightReader(str(data_dir)), writer=writer)
+    return analyzer.run_incremental(str(tmp_path / 'insight_index.db')), writer
+
+
+def documents(writer):
+    return {doc_id: {key: value for key, value in doc.items() if key != 'createdAt'}
+            for doc_id, doc in writer.documents.items()}
+
+
+def test_late_and_changed_records_match_full_run(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    bids, awards = make_bids()
+    with open(data_dir / 'collected_bids_1.json', 'w', encoding='utf-8') as f:
+        json.dump(bids, f, ensure_ascii=False)
+    write_ndjson(data_dir / 'collected_awards_1.ndjson', awards)
+
+    first, _ = incremental(data_dir, tmp_path)
+    assert first['bids']['new'] == len(bids)
+
+    # 과거 createdAt으로 늦게 도착한 신규 입찰 + 기관이 바뀐 재수집 + 기존 입찰의 낙찰 추가
+    late = dict(bids[0], id='LATE-1', createdAt='2024-01-01T00:00:00')
+    moved = dict(bids[1], agency='국방부' if bids[1]['agency'] != '국방부' else '조달청')
+    awarded = {award['bidId'] for award in awards}
+    target = next(bid for bid in bids if bid['id'] not in awarded)
+    write_ndjson(data_dir / 'collected_bids_2.ndjson', [late, moved])
+    write_ndjson(data_dir / 'collected_awards_1.ndjson',
+                 [{'bidId': target['id'], 'winnerRate': 91.5, 'biddersCount': 4, 'opengDate': '2025-03-28',
+                   'completedAt': '2024-01-01T00:00:00'}], mode='a')
+
+    second, writer = incremental(data_dir, tmp_path)
+    assert second['bids']['input'] == 2  # 새 파일만 읽음 (기존 입찰 파일은 다시 읽지 않음)
+    assert (second['bids']['new'], second['bids']['changed']) == (1, 1)
+    assert (second['awards']['input'], second['awards']['rejoined']) == (1, 1)  # 추가된 줄만 읽음
+
+    full = JsonInsightWriter(str(tmp_path / 'insights_full.json'))
+    BidAnalyzer(reader=LocalInsightReader(str(data_dir)), writer=full).run()
+    assert documents(writer) == documents(full)
+    assert second['total_insights'] == len(full.documents)
+
+
+def test_unchanged_files_are_not_reread(tmp_path, monkeypatch):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    bids, awards = make_bids(100)
+    write_ndjson(data_dir / 'collected_bids_1.ndjson', bids)
+    write_ndjson(data_dir / 'collected_awards_1.ndjson', awards)
+    incremental(data_dir, tmp_path)
+
+    opened = []
+
+    class CountingSource(insight_store.RecordSource):
+        def __init__(self, path):
+            opened.append(path)
+            super().__init__(path)
+
+    monkeypatch.setattr(insight_store, 'RecordSource', CountingSource)
+    summary, _ = incremental(data_dir, tmp_path)
+    assert (summary['bids']['input'], summary['awards']['input'], summary['upserted']) == (0, 0, 0)
+    assert opened == []
+
+    write_ndjson(data_dir / 'collected_bids_1.ndjson', [dict(bids[0], id='APPENDED-1')], mode='a')
+    summary, _ = incremental(data_dir, tmp_path)
+    assert (summary['bids']['input'], summary['bids']['new']) == (1, 1)
+    assert opened == []  # NDJSON 추가분은 이전 읽은 위치부터 줄 단위로 읽음
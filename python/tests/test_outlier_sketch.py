@@ -0,0 +1,47 @@
+"""학습 데이터 이상치 필터 (filter_outliers) 테스트"""
+
+from outlier_sketch import OutlierDetector, filter_outliers
+
+
+def make_history(count=80):
+    return [{
+        'bid_id': f'H{i:04d}',
+        'agency': ['조달청', '서울시청'][i % 2],
+        'category': '용역',
+        'budget': 100_000_000 + (i % 11) * 2_000_000,
+        'winnerRate': 86.0 + (i % 7) * 0.5,
+    } for i in range(count)]
+
+
+def test_outliers_in_first_rows_are_excluded():
+    history = make_history()
+    history[0]['budget'] = 100_000_000_000   # 자릿수 오류 (첫 행)
+    history[3]['winnerRate'] = 8.9           # 소수점 오류 (min_samples 이전 행)
+    history[50]['budget'] = 1_000_000        # 뒤쪽 행도 그대로 판정
+
+    kept, detector = filter_outliers(history, verbose=False)
+
+    assert {row['bid_id'] for row in history} - {row['bid_id'] for row in kept} == {'H0000', 'H0003', 'H0050'}
+    assert (detector.flagged['budget'], detector.flagged['winnerRate']) == (2, 1)
+    assert detector.judged['budget'] == len(history)  # 첫 행부터 모두 판정
+
+
+def test_small_history_is_kept_whole():
+    history = make_history(20)  # 그룹/전체 모두 min_samples 미만 → 판정하지 않음
+    history[0]['budget'] = 100_000_000_000
+
+    kept, detector = filter_outliers(history, verbose=False)
+
+    assert kept == history
+    assert detector.judged['budget'] == 0
+
+
+def test_streaming_observe_still_judges_against_prior_rows():
+    detector = OutlierDetector({'budget': 'log'})
+    history = make_history()
+    history[0]['budget'] = 100_000_000_000
+
+    flags = [detector.observe(row) for row in history]
+
+    assert flags[0] == []  # 스트리밍 판정은 이전 분포만 사용 (data_quality 경로 동작 유지)
+    assert detector.observe(dict(history[0])) == ['outlier:budget']
@@ -0,0 +1,43 @@
+"""예측 sink 회귀 테스트"""
+
+import json
+import os
+
+import pytest
+
+import prediction_sink
+from prediction_sink import JsonlPredictionSink, ParquetPredictionSink, create_sink
+
+
+def test_jsonl_sink_flushes_all_rows(tmp_path):
+    path = str(tmp_path / 'predictions.jsonl')
+    sink = JsonlPredictionSink(path, batch_size=3)
+    for i in range(7):
+        sink.write({'bid_id': f'B{i}', 'prediction': {'predicted_rate': 87.5}})
+    sink.close()
+
+    with open(path, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert [row['bid_id'] for row in rows] == [f'B{i}' for i in range(7)]
+
+
+@pytest.mark.skipif(prediction_sink.PARQUET_AVAILABLE, reason='Parquet 엔진 설치됨')
+def test_parquet_sink_fails_fast_without_engine(tmp_path):
+    with pytest.raises(ImportError):
+        ParquetPredictionSink(str(tmp_path / 'predictions.parquet'))
+    with pytest.raises(ImportError):
+        create_sink(str(tmp_path / 'predictions.parquet'))
+
+
+@pytest.mark.skipif(not prediction_sink.PARQUET_AVAILABLE, reason='Parquet 엔진 없음')
+def test_parquet_sink_roundtrip(tmp_path):
+    import pandas as pd
+
+    directory = str(tmp_path / 'predictions.parquet')
+    sink = ParquetPredictionSink(directory, batch_size=2)
+    for i in range(3):
+        sink.write({'bid_id': f'B{i}', 'prediction': {'predicted_rate': 87.5}})
+    sink.close()
+
+    frame = pd.concat(pd.read_parquet(os.path.join(directory, name)) for name in sorted(os.listdir(directory)))
+    assert list(frame['bid_id']) == ['B0', 'B1', 'B2']
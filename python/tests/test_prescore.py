@@ -0,0 +1,117 @@
+"""사전 예측 테이블 회귀 테스트"""
+
+import json
+from datetime import datetime, timedelta
+
+import prescore
+from ml_prediction import BaselinePredictionModel
+from prescore import PredictionTable, active_bids, deadline_passed, run_prescoring, table_path
+
+
+NOW = datetime(2025, 3, 10, 12, 0, 0)
+
+
+def test_deadline_passed_normalizes_g2b_formats():
+    assert deadline_passed('2025-03-10 11:59', NOW)
+    assert not deadline_passed('2025-03-10 12:30', NOW)
+    assert deadline_passed('2025-03-10T11:00:00+09:00', NOW)
+    assert not deadline_passed('202503101300', NOW)
+    assert deadline_passed('20250309', NOW)
+    assert not deadline_passed(None, NOW)
+    assert not deadline_passed('미정', NOW)
+
+
+def test_active_bids_and_prune_use_parsed_deadlines(tmp_path):
+    bids = [
+        {'id': 'A', 'status': 'active', 'deadline': '2025-03-10 11:59'},   # 문자열 비교로는 '활성'
+        {'id': 'B', 'status': 'active', 'deadline': '2025-03-10 12:30'},
+        {'id': 'C', 'status': 'active', 'deadline': None},
+    ]
+    assert sorted(bid['id'] for bid in active_bids(bids, NOW)) == ['B', 'C']
+
+    table = PredictionTable(str(tmp_path / 'table.json'))
+    for bid in bids:
+        table.put(bid['id'], 'digest', bid['deadline'], {'bid_id': bid['id']})
+    assert table.prune_expired(NOW) == ['A']
+    assert sorted(table.entries) == ['B', 'C']
+
+
+def write_bids(path, count=5):
+    deadline = (datetime.now() + timedelta(days=10)).strftime('%Y-%m-%d %H:%M')
+    bids = [{'id': f'B{i}', 'status': 'active', 'title': f'시스템 구축 {i}', 'agency': '조달청',
+             'category': '소프트웨어', 'region': '서울', 'budget': 100_000_000, 'deadline': deadline}
+            for i in range(count)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(bids, f, ensure_ascii=False)
+
+
+def history(rate: float):
+    return [{'agency': '조달청', 'category': '소프트웨어', 'region': '서울', 'winnerRate': rate + i * 0.1,
+             'biddersCount': 5} for i in range(10)]
+
+
+def test_refit_model_triggers_rescore(tmp_path):
+    bids_file = str(tmp_path / 'collected_bids_mock_t.json')
+    write_bids(bids_file)
+    table_dir = str(tmp_path / 'predictions')
+
+    model = BaselinePredictionModel(mock_mode=True, verbose=False).fit(history(86.0), exclude_outliers=False)
+    assert run_prescoring(bids_file, model=model, table_dir=table_dir)['scored'] == 5
+    assert run_prescoring(bids_file, model=model, table_dir=table_dir)['scored'] == 0
+
+    refit = BaselinePredictionModel(mock_mode=True, verbose=False).fit(history(90.0), exclude_outliers=False)
+    assert refit.model_version == model.model_version
+    assert run_prescoring(bids_file, model=refit, table_dir=table_dir)['scored'] == 5
+
+
+class FakeBatch:
+    def __init__(self, store):
+        self.store = store
+
+    def set(self, ref, data):
+        self.store[ref] = data
+
+    def delete(self, ref):
+        self.store.pop(ref, None)
+
+    def commit(self):
+        pass
+
+
+class FakeCollection:
+    def __init__(self, name):
+        self.name = name
+
+    def document(self, doc_id):
+        return (self.name, doc_id)
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.docs = {}
+
+    def collection(self, name):
+        return FakeCollection(name)
+
+    def batch(self):
+        return FakeBatch(self.docs)
+
+
+def test_expired_rows_are_deleted_from_firestore(tmp_path, monkeypatch):
+    fake_db = FakeFirestore()
+    monkeypatch.setattr(prescore, 'db', fake_db)
+    model = BaselinePredictionModel(mock_mode=True, verbose=False)
+    table_dir = str(tmp_path / 'predictions')
+
+    table = PredictionTable(table_path(model.model_version, table_dir))
+    table.put('OLD', 'digest', '2000-01-01 10:00', {'bid_id': 'OLD'})
+    table.save()
+    fake_db.docs[(prescore.TABLE_COLLECTION, f'OLD_{model.model_version}')] = {'bid_id': 'OLD'}
+
+    bids_file = str(tmp_path / 'collected_bids_mock_t.json')
+    write_bids(bids_file, count=2)
+    summary = run_prescoring(bids_file, model=model, table_dir=table_dir, to_firestore=True)
+
+    assert summary['expired'] == 1
+    assert (prescore.TABLE_COLLECTION, f'OLD_{model.model_version}') not in fake_db.docs
+    assert {doc_id for _, doc_id in fake_db.docs} == {f'B0_{model.model_version}', f'B1_{model.model_version}'}
@@ -0,0 +1,81 @@
+"""증분 품질 검증 인덱스 (QualityIndex) 테스트"""
+
+import json
+
+from conftest import make_quality_bids
+from data_quality import DataQualityChecker, QualityIndex, check_incremental
+from quality_rules import get_rule_set
+
+
+def run(index_path, records):
+    index = QualityIndex(index_path)
+    results = check_incremental(records, index, 'test', rules=get_rule_set('bids'), outliers=False)
+    index.save()
+    index.close()
+    return results
+
+
+def test_within_file_duplicates_are_not_changes(tmp_path):
+    path = str(tmp_path / 'quality_index_test.db')
+    bids = make_quality_bids()  # 마지막 2건은 앞선 ID의 중복 (1건은 내용이 다름)
+
+    first = run(path, bids)['incremental']
+    assert (first['new'], first['changed'], first['unchanged'], first['duplicates']) == (120, 0, 0, 2)
+
+    second = run(path, bids + [dict(bids[0], id='NEW-1')])['incremental']
+    assert (second['new'], second['changed'], second['unchanged'], second['duplicates']) == (1, 0, 120, 2)
+
+
+def test_delta_duplicate_rate_counts_only_this_run(tmp_path):
+    path = str(tmp_path / 'quality_index_test.db')
+    bids = make_quality_bids()
+    first = run(path, bids)
+    assert first['duplicates']['duplicate_count'] == 2
+    assert first['total_records'] == 122
+
+    second = run(path, bids + [dict(bids[0], id='NEW-1'), dict(bids[0], id='NEW-1', title='정정 공고')])
+    assert second['total_records'] == 2
+    assert second['duplicates']['duplicate_count'] == 1
+
+
+def test_cumulative_matches_full_check_and_persists(tmp_path):
+    path = str(tmp_path / 'quality_index_test.db')
+    bids = make_quality_bids()
+    run(path, bids[:60])
+    results = run(path, bids[40:])
+    assert results['incremental']['cumulative']['total_records'] == 120
+
+    # 누적 통계 = ID별 첫 레코드 전체 검증 (증분 실행과 같은 현재 시각 기준)
+    unique = list({b['id']: b for b in reversed(bids)}.values())
+    full = DataQualityChecker([], rules=get_rule_set('bids'), outliers=False).accumulate(unique)
+    index = QualityIndex(path)
+    assert index.total == len(unique) == 120
+    assert index.stats().counts == +full.counts
+    index.close()
+
+
+def test_changed_record_replaces_previous_violations(tmp_path):
+    path = str(tmp_path / 'quality_index_test.db')
+    bids = make_quality_bids()[:30]
+    run(path, bids)
+    fixed = [dict(b, budget=100_000_000) if b['id'] == bids[3]['id'] else b for b in bids]
+    results = run(path, fixed)['incremental']
+    assert (results['changed'], results['unchanged']) == (1, 29)
+
+    index = QualityIndex(path)
+    assert index.counts['type:budget'] == 0
+    index.close()
+
+
+def test_imports_legacy_json_index(tmp_path):
+    legacy = tmp_path / 'quality_index_test.json'
+    legacy.write_text(json.dumps({
+        'counts': {'type:budget': 1},
+        'outliers': None,
+        'entries': {'A': ['d1', ['type:budget'], None], 'B': ['d2', [], [['past_deadline', 'past', '2999-01-01']]]},
+    }), encoding='utf-8')
+    index = QualityIndex(str(tmp_path / 'quality_index_test.db'))
+    assert index.total == 2 and index.counts['type:budget'] == 1
+    index.save()
+    index.close()
+    assert QualityIndex(str(tmp_path / 'quality_index_test.db')).total == 2
@@ -0,0 +1,54 @@
+"""컴파일된 품질 규칙 ↔ 명세 해석 실행 회귀 테스트"""
+
+import json
+
+from conftest import QUALITY_NOW
+from data_quality import DataQualityChecker, generate_mock_awards
+from quality_rules import get_rule_set
+
+
+def run_checker(records, rules, interpreted: bool):
+    checker = DataQualityChecker(records, now=QUALITY_NOW, rules=rules, sample_size=3)
+    if interpreted:
+        check_record = rules.interpret(QUALITY_NOW)
+        if checker.outlier_detector is not None:
+            check_record = DataQualityChecker._with_outliers(check_record, checker.outlier_detector.observe)
+        checker.check_record = check_record
+    return checker.check_all()
+
+
+def test_compiled_rules_match_interpreted_per_record(quality_bids):
+    rules = get_rule_set('bids')
+    compiled, interpreted = rules.compile(QUALITY_NOW), rules.interpret(QUALITY_NOW)
+    for record in quality_bids:
+        assert compiled(record) == interpreted(record), record
+
+
+def test_compiled_report_matches_interpreted_bids(quality_bids):
+    rules = get_rule_set('bids')
+    compiled = run_checker(quality_bids, rules, interpreted=False)
+    interpreted = run_checker(quality_bids, rules, interpreted=True)
+
+    assert json.dumps(compiled, sort_keys=True, default=str) == json.dumps(interpreted, sort_keys=True, default=str)
+    # 픽스처가 모든 규칙 종류를 실제로 건드리는지 확인
+    assert compiled['field_stats']['title']['missing_count'] == 1
+    assert compiled['type_errors']['budget']['error_count'] == 1
+    assert compiled['type_errors']['deadline']['error_count'] == 2
+    assert compiled['type_errors']['status']['error_count'] == 2
+    assert compiled['duplicates']['duplicate_count'] == 2
+    assert compiled['anomalies']['negative_budget']['count'] == 2
+    assert compiled['anomalies']['past_deadline']['count'] == 2
+    assert compiled['outliers']['budget']['count'] == 1
+    assert compiled['outliers']['estimatedPrice']['count'] == 1
+
+
+def test_compiled_report_matches_interpreted_awards():
+    rules = get_rule_set('awards')
+    awards = generate_mock_awards(200)
+    awards[0]['winnerRate'] = 'n/a'
+    awards[1]['biddersCount'] = 1
+    awards[2]['winnerRate'] = 120
+    awards[3]['opengDate'] = '2999-01-01'
+    compiled = run_checker(awards, rules, interpreted=False)
+    interpreted = run_checker(awards, rules, interpreted=True)
+    assert json.dumps(compiled, sort_keys=True, default=str) == json.dumps(interpreted, sort_keys=True, default=str)
@@ -0,0 +1,89 @@
+"""실행 리스 (RunLease) / API 호출 예산 (ApiBudget) 테스트"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from run_lease import HOST, ApiBudget, BudgetExhausted, LeaseBusy, RunLease, _Transaction, lease_status
+
+
+def test_skip_policy_raises_while_held(tmp_path):
+    path = str(tmp_path / 'leases.db')
+    with RunLease('collect_bids', owner='scheduler', path=path):
+        with pytest.raises(LeaseBusy, match='scheduler'):
+            RunLease('collect_bids', policy='skip', owner='api', path=path).acquire()
+        with RunLease('collect_awards', path=path):  # 작업 종류가 다르면 독립
+            pass
+    with RunLease('collect_bids', path=path):  # 해제 후 재획득
+        pass
+
+
+def test_queue_policy_waits_for_release(tmp_path):
+    path = str(tmp_path / 'leases.db')
+    holder = RunLease('collect_bids', owner='scheduler', path=path).acquire()
+
+    with pytest.raises(LeaseBusy, match='대기 초과'):
+        RunLease('collect_bids', policy='queue', wait_timeout=0.2, poll=0.05, path=path).acquire()
+    assert lease_status(path)['waiters'] == []  # 시간 초과한 대기자는 대기열에서 제거
+
+    acquired = []
+    waiter = RunLease('collect_bids', policy='queue', owner='api', wait_timeout=5, poll=0.05, path=path)
+    thread = threading.Thread(target=lambda: acquired.append(waiter.acquire()))
+    thread.start()
+    time.sleep(0.2)
+    assert acquired == []
+    assert [w['owner'] for w in lease_status(path)['waiters']] == ['api']
+
+    holder.release()
+    thread.join(5)
+    assert acquired == [waiter]
+    assert [lease['owner'] for lease in lease_status(path)['leases']] == ['api']
+    waiter.release()
+
+
+def reclaim(path, job, host, pid, expires_at):
+    now = time.time()
+    with _Transaction(path) as conn:
+        conn.execute('INSERT INTO leases VALUES (?, ?, ?, ?, ?, ?, ?)',
+                     (job, 'stale', 'cli', host, pid, now - 700, expires_at))
+    with RunLease(job, policy='skip', owner='scheduler', path=path):
+        return [lease['owner'] for lease in lease_status(path)['leases'] if lease['job'] == job]
+
+
+def test_expired_holder_is_reclaimed(tmp_path):
+    # 다른 호스트 리스는 하트비트 만료 시각으로만 판단
+    assert reclaim(str(tmp_path / 'leases.db'), 'collect_awards', 'other-host', 1, time.time() - 100) == ['scheduler']
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='Windows는 만료 시각으로만 판단')
+def test_dead_process_holder_is_reclaimed_before_expiry(tmp_path):
+    dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead.wait()
+    assert reclaim(str(tmp_path / 'leases.db'), 'collect_bids', HOST, dead.pid, time.time() + 600) == ['scheduler']
+
+
+def test_api_budget_daily_limit_and_defer(tmp_path):
+    path = str(tmp_path / 'leases.db')
+    budget = ApiBudget('BidPublicInfoService', daily_limit=2, min_interval=0, path=path)
+    budget.acquire()
+    budget.acquire()
+    with pytest.raises(BudgetExhausted):
+        budget.acquire()
+    assert lease_status(path)['api_budget'][0]['calls'] == 2
+    ApiBudget('ScsbidInfoService', daily_limit=2, min_interval=0, path=path).acquire()  # 서비스별 한도
+
+    deferred = ApiBudget('ScsbidInfoService', min_interval=0, path=path)
+    deferred.defer(0.3)  # 429 응답 → 모든 수집기의 다음 호출 지연
+    started = time.time()
+    deferred.acquire()
+    assert time.time() - started >= 0.25
+
+    fresh = ApiBudget('HrcspSsstndrdInfoService', min_interval=0, path=path)
+    fresh.defer(0.2)  # 오늘 첫 호출 전 지연도 기록 (호출 수는 0)
+    started = time.time()
+    fresh.acquire()
+    assert time.time() - started >= 0.15
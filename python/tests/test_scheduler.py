@@ -0,0 +1,92 @@
+"""스케줄러 수집 단계 테스트"""
+
+import argparse
+import json
+
+import scheduler
+from history_data import join_bids_awards, load_history
+
+
+def make_args(tmp_path, **overrides):
+    defaults = dict(source='mock', count=40, pages=1, data_dir=str(tmp_path), reports_dir=str(tmp_path / 'reports'),
+                    workers=2, lock='skip', detail_concurrency=2, insights_target='local')
+    defaults.update(overrides)
+    return argparse.Namespace(**defaults)
+
+
+def test_collect_awards_uses_bids_from_same_run(tmp_path):
+    args = make_args(tmp_path)
+    context = {'run_id': 'test001'}
+    context['collect_bids'] = scheduler.collect_bids(args, context)
+    output = scheduler.collect_awards(args, context)
+
+    with open(context['collect_bids']['paths'][-1], encoding='utf-8') as f:
+        bid_ids = {bid['id'] for bid in json.load(f)}
+    with open(output['paths'][-1], encoding='utf-8') as f:
+        awards = json.load(f)
+    assert len(awards) == 10
+    assert {award['bidId'] for award in awards} <= bid_ids
+    assert output['match_rate'] == 100
+
+
+def test_collect_awards_runs_after_collect_bids(tmp_path):
+    pipeline = scheduler.build_pipeline(make_args(tmp_path))
+    assert pipeline.stages['collect_awards'].depends == ('collect_bids',)
+
+
+def write_ndjson(path, records, mode='w'):
+    with open(path, mode, encoding='utf-8') as f:
+        f.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+
+
+def latest_history_awards(awards):
+    return list({award['bidId']: award for award in awards}.values())
+
+
+def test_join_appends_only_new_pairs(tmp_path):
+    args = make_args(tmp_path)
+    bids = [{'id': f'B{i}', 'title': f'사업 {i}', 'agency': '조달청', 'category': '용역', 'region': '서울',
+             'budget': 100_000_000 + i, 'deadline': '2025-06-30T18:00:00'} for i in range(10)]
+    awards = [{'bidId': f'B{i}', 'winnerRate': 88.0 + i, 'biddersCount': 3, 'opengDate': '2025-07-01'}
+              for i in range(6)]
+    write_ndjson(tmp_path / 'collected_bids_1.ndjson', bids)
+    write_ndjson(tmp_path / 'collected_awards_1.ndjson', awards)
+
+    first = scheduler.join_history(args, {})
+    assert first['records'] == 6
+    assert scheduler.join_history(args, {})['records'] == 0  # 변경 없음 → 파일을 다시 읽지 않음
+
+    # 이미 수집된 입찰의 늦은 낙찰 + 기존 낙찰 정정
+    late = [{'bidId': 'B8', 'winnerRate': 90.1, 'biddersCount': 5, 'opengDate': '2025-07-02'},
+            dict(awards[0], winnerRate=91.5)]
+    write_ndjson(tmp_path / 'collected_awards_1.ndjson', late, mode='a')
+    second = scheduler.join_history(args, {})
+    assert (second['awards'], second['records']) == (2, 2)
+
+    history = load_history(first['path'])
+    assert sorted(history, key=lambda row: row['bid_id']) == sorted(
+        join_bids_awards(bids, latest_history_awards(awards + late)), key=lambda row: row['bid_id'])
+
+
+def test_prescore_fits_model_from_joined_history(tmp_path, monkeypatch):
+    args = make_args(tmp_path)
+    pipeline = scheduler.build_pipeline(args)
+    assert set(pipeline.stages['prescore'].depends) == {'join', 'quality'}
+
+    history = [{'bidId': f'H{i}', 'winnerRate': 85.0 + i % 10, 'biddersCount': 4, 'opengDate': '2025-05-01'}
+               for i in range(60)]
+    past = [{'id': f'H{i}', 'title': f'과거 사업 {i}', 'agency': '조달청', 'category': '용역', 'region': '서울',
+             'budget': 200_000_000, 'deadline': '2025-04-30T18:00:00', 'status': 'closed'} for i in range(60)]
+    active = [{'id': f'A{i}', 'title': f'신규 사업 {i}', 'agency': '조달청', 'category': '용역', 'region': '서울',
+               'budget': 200_000_000, 'deadline': '2099-12-31T18:00:00', 'status': 'active'} for i in range(5)]
+    write_ndjson(tmp_path / 'collected_bids_0.ndjson', past)
+    write_ndjson(tmp_path / 'collected_awards_0.ndjson', history)
+    bids_file = tmp_path / 'collected_bids_1.json'
+    bids_file.write_text(json.dumps(active, ensure_ascii=False), encoding='utf-8')
+
+    monkeypatch.chdir(tmp_path)  # 사전 예측 테이블 기본 경로 (./predictions)
+    context = {'collect_bids': {'paths': [str(bids_file)]}, 'join': scheduler.join_history(args, {})}
+    first = scheduler.prescore(args, context)
+    assert first['model_version'] == 'baseline-v1.1+curves'
+    assert first['scored'] == 5
+    assert scheduler.prescore(args, context)['scored'] == 0  # 같은 히스토리 → 같은 학습 상태 (무작위 Mock 아님)
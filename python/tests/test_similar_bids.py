@@ -0,0 +1,64 @@
+"""유사 과거 입찰 검색 인덱스 (SimilarBidIndex) 테스트"""
+
+from similar_bids import SimilarBidIndex
+
+
+HISTORY = [
+    {'bid_id': 'H1', 'title': '스마트 도시 플랫폼 구축 사업', 'agency': '조달청', 'category': '소프트웨어',
+     'budget': 500_000_000, 'winnerRate': 87.5, 'biddersCount': 6},
+    {'bid_id': 'H2', 'title': '스마트 도시 플랫폼 유지보수', 'agency': '서울시청', 'category': '용역',
+     'budget': 120_000_000, 'winnerRate': 88.1, 'biddersCount': 4},
+    {'bid_id': 'H3', 'title': '청사 시설물 청소 용역', 'agency': '국방부', 'category': '용역',
+     'budget': 80_000_000, 'winnerRate': 86.9, 'biddersCount': 9},
+    {'bid_id': 'H4', 'title': '하천 준설 공사', 'agency': '경기도청', 'category': '건설',
+     'budget': 2_000_000_000, 'winnerRate': 89.4, 'biddersCount': 15},
+]
+
+
+def make_index(records=HISTORY):
+    index = SimilarBidIndex()
+    index.add_many(records)
+    return index
+
+
+def test_search_ranks_closest_title_first():
+    results = make_index().search({'title': '스마트 도시 플랫폼 구축', 'agency': '조달청',
+                                   'category': '소프트웨어', 'budget': 450_000_000})
+    assert [row['bid_id'] for row in results] == ['H1', 'H2']
+    assert results[0]['similarity'] > results[1]['similarity']
+
+
+def test_unseen_query_grams_lower_text_similarity():
+    index = make_index()
+    exact = index.search({'title': '하천 준설 공사'})[0]
+    typo = index.search({'title': '하천 준설 공궤'})[0]  # n-gram 수는 같고 일부가 인덱스에 없음
+    assert exact['bid_id'] == typo['bid_id'] == 'H4'
+    # 인덱스에 없는 n-gram도 질의 가중치에 포함 → 공유 n-gram만으로 만점이 되지 않음
+    assert typo['similarity'] < exact['similarity']
+    assert exact['similarity'] == SimilarBidIndex.WEIGHTS['title']
+
+
+def test_k_and_empty_queries():
+    index = make_index()
+    assert len(index.search({'title': '스마트 도시 용역'}, k=1)) == 1
+    assert len(index.search({'title': '스마트 도시 용역'}, k=10)) == 3  # 텍스트가 겹치는 후보만 반환
+    assert index.search({'title': ''}) == []
+    assert index.search({'title': '!!!'}) == []
+    assert index.search({'title': '완전히 다른 제목'}) == []
+    assert SimilarBidIndex().search({'title': '스마트 도시'}) == []
+
+
+def test_incremental_save_then_load(tmp_path):
+    path = str(tmp_path / 'similar_bids.ndjson')
+    index = make_index(HISTORY[:2])
+    index.save(path)
+
+    added = index.add_many(HISTORY[1:])  # H2는 이미 있음 → 무시
+    assert [row['bid_id'] for row in added] == ['H3', 'H4']
+    index.save(path, records=added)
+
+    loaded = SimilarBidIndex.load(path)
+    assert len(loaded) == 4
+    assert loaded.fingerprint() == index.fingerprint() == make_index().fingerprint()
+    query = {'title': '시설물 청소 용역', 'agency': '국방부', 'budget': 90_000_000}
+    assert loaded.search(query) == index.search(query)
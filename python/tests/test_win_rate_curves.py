@@ -0,0 +1,72 @@
+"""낙찰률 경험분포 (WinRateSketch / WinRateCurves) 테스트"""
+
+import random
+
+from history_data import budget_band
+from win_rate_curves import WinRateCurves, WinRateSketch, build_curves
+
+
+def make_history(count, seed=7):
+    rng = random.Random(seed)
+    return [{
+        'agency': rng.choice(['조달청', '서울시청', '국방부']),
+        'category': rng.choice(['소프트웨어', '용역', '건설']),
+        'budget': rng.choice([None, 20_000_000, 150_000_000, 800_000_000, 3_000_000_000]),
+        'winnerRate': round(rng.uniform(80, 100), 3) if rng.random() > 0.02 else None,
+    } for _ in range(count)]
+
+
+def test_parallel_build_matches_sequential():
+    history = make_history(4200)  # workers × 1000건 이상이어야 병렬 경로 사용
+    sequential = build_curves(history, workers=1, min_samples=15)
+    parallel = build_curves(history, workers=4, min_samples=15)
+    assert parallel.fingerprint() == sequential.fingerprint()
+    assert {key: sketch.count for key, sketch in parallel.segments.items()} == \
+        {key: sketch.count for key, sketch in sequential.segments.items()}
+
+
+def test_sketch_edges():
+    empty = WinRateSketch()
+    assert empty.quantile(0.5) is None
+    assert empty.survival(88.0) == 0.0
+
+    single = WinRateSketch()
+    for _ in range(3):
+        single.add(87.755)  # 0.01%p 해상도로 반올림된 단일 버킷
+    assert single.quantile(0.0) == single.quantile(0.5) == single.quantile(1.0) == 87.76
+    assert single.survival(80.0) == single.survival(87.76) == 1.0
+    assert single.survival(87.77) == 0.0
+
+    sketch = WinRateSketch()
+    for rate in (85.0, 86.0, 87.0, 88.0):
+        sketch.add(rate)
+    assert (sketch.quantile(0.0), sketch.quantile(1.0)) == (85.0, 88.0)  # q=0/1 → 최솟값/최댓값
+    assert sketch.quantile(0.5) == 86.0
+    assert (sketch.survival(85.0), sketch.survival(86.5), sketch.survival(88.01)) == (1.0, 0.5, 0.0)
+
+
+def test_lookup_falls_back_to_general_segments():
+    curves = WinRateCurves(min_samples=3)
+    band = budget_band(150_000_000)
+    rows = ([{'agency': '조달청', 'category': '용역', 'budget': 150_000_000}] * 3 +
+            [{'agency': '조달청', 'category': '건설', 'budget': 20_000_000}] * 2 +
+            [{'agency': '국방부', 'category': '건설', 'budget': 150_000_000}] * 1)
+    for row in rows:
+        curves.add(dict(row, winnerRate=88.0))
+
+    def key(**bid):
+        return curves.lookup(bid)[0]
+
+    assert key(agency='조달청', category='용역', budget=150_000_000) == \
+        f'agency=조달청|category=용역|budget={band}'
+    assert key(agency='조달청', category='용역', budget=2_000_000_000) == 'agency=조달청|category=용역'
+    assert key(agency='조달청', category='건설', budget=20_000_000) == 'agency=조달청'
+    assert key(agency='서울시청', category='건설', budget=150_000_000) == 'category=건설'
+    assert key(agency='서울시청', category='건설', budget=20_000_000) == 'category=건설'
+    assert key(agency='국방부', category='용역', budget=150_000_000) == f'category=용역|budget={band}'
+    assert key(agency='서울시청', category='물품') == '*'
+
+    assert WinRateCurves(min_samples=3).lookup({'agency': '조달청'}) == (None, None)
+    sparse = WinRateCurves(min_samples=100)
+    sparse.add({'agency': '조달청', 'winnerRate': 88.0})
+    assert sparse.lookup({'agency': '조달청'}) == (None, None)  # 전체 세그먼트도 표본 부족
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+낙찰률 경험분포 (Empirical Win-Rate Curves)
+기관/업종/예산구간별 낙찰률 분위수 스케치를 낙찰 히스토리로부터 구축
+
+- 스케치: 0.01%p 고정 해상도 히스토그램 → 샤드별 구축 후 병합 가능 (결과 동일)
+- 조회: 누적 배열 이진 탐색 → 입찰 1건당 수 μs
+- 세그먼트 폴백: 기관+업종+예산 → 기관+업종 → 기관 → 업종+예산 → 업종 → 전체
+
+실행 예시:
+    python win_rate_curves.py --bids collected_bids.json --awards collected_awards_mock_step2_test.json
+    python win_rate_curves.py --history history.json --workers 4 --output models/win_rate_curves.json
+"""
+
+import os
+import json
+import hashlib
+import math
+import argparse
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from history_data import budget_band, load_history
+
+
+RESOLUTION = 0.01  # 낙찰률 해상도 (%p)
+
+# 세그먼트 차원 (구체적 → 일반적 순서, 조회 시 폴백 순서)
+SEGMENT_LEVELS = [
+    ('agency', 'category', 'budget'),
+    ('agency', 'category'),
+    ('agency',),
+    ('category', 'budget'),
+    ('category',),
+    (),
+]
+
+
+def _segment_values(record: Dict) -> Dict[str, str]:
+    return {
+        'agency': record.get('agency') or '',
+        'category': record.get('category') or '',
+        'budget': budget_band(record.get('budget')),
+    }
+
+
+def segment_key(values: Dict[str, str], level: Tuple[str, ...]) -> str:
+    """세그먼트 키 생성 (예: 'agency=조달청|category=소프트웨어')"""
+    if not level:
+        return '*'
+    return '|'.join(f"{dim}={values[dim]}" for dim in level)
+
+
+class WinRateSketch:
+    """병합 가능한 낙찰률 분위수 스케치 (고정 해상도 히스토그램)"""
+
+    __slots__ = ('bins', 'count', '_keys', '_cumulative')
+
+    def __init__(self, bins: Optional[Dict[int, int]] = None):
+        self.bins = bins or {}
+        self.count = sum(self.bins.values())
+        self._keys = None
+        self._cumulative = None
+
+    def add(self, rate: float, weight: int = 1):
+        key = int(round(rate / RESOLUTION))
+        self.bins[key] = self.bins.get(key, 0) + weight
+        self.count += weight
+        self._keys = None
+
+    def merge(self, other: 'WinRateSketch') -> 'WinRateSketch':
+        for key, value in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + value
+        self.count += other.count
+        self._keys = None
+        return self
+
+    def _freeze(self):
+        if self._keys is None:
+            self._keys = sorted(self.bins)
+            cumulative = []
+            running = 0
+            for key in self._keys:
+                running += self.bins[key]
+                cumulative.append(running)
+            self._cumulative = cumulative
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위수 낙찰률 (0.0 ~ 1.0)"""
+        if not self.count:
+            return None
+        self._freeze()
+        rank = min(max(1, math.ceil(q * self.count)), self.count)
+        return self._keys[bisect_left(self._cumulative, rank)] * RESOLUTION
+
+    def survival(self, rate: float) -> float:
+        """P(낙찰률 >= rate) - 해당 투찰률 이하로 투찰 시 낙찰 확률 추정치"""
+        if not self.count:
+            return 0.0
+        self._freeze()
+        idx = bisect_left(self._keys, int(round(rate / RESOLUTION)))
+        below = self._cumulative[idx - 1] if idx > 0 else 0
+        return (self.count - below) / self.count
+
+    def to_dict(self) -> Dict:
+        self._freeze()
+        return {'keys': self._keys, 'counts': [self.bins[k] for k in self._keys]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'WinRateSketch':
+        return cls(dict(zip(data['keys'], data['counts'])))
+
+
+class WinRateCurves:
+    """세그먼트별 낙찰률 스케치 모음"""
+
+    MIN_SAMPLES = 20  # 세그먼트 사용 최소 표본 수
+
+    def __init__(self, min_samples: int = MIN_SAMPLES):
+        self.min_samples = min_samples
+        self.segments: Dict[str, WinRateSketch] = {}
+
+    def add(self, record: Dict):
+        """히스토리 레코드 1건 반영 (winnerRate 필수)"""
+        rate = record.get('winnerRate')
+        if rate is None:
+            return
+        try:
+            rate = float(rate)
+        except (TypeError, ValueError):
+            return
+
+        values = _segment_values(record)
+        for level in SEGMENT_LEVELS:
+            key = segment_key(values, level)
+            sketch = self.segments.get(key)
+            if sketch is None:
+                sketch = self.segments[key] = WinRateSketch()
+            sketch.add(rate)
+
+    def merge(self, other: 'WinRateCurves') -> 'WinRateCurves':
+        for key, sketch in other.segments.items():
+            if key in self.segments:
+                self.segments[key].merge(sketch)
+            else:
+                self.segments[key] = WinRateSketch(dict(sketch.bins))
+        return self
+
+    def lookup(self, bid_data: Dict) -> Tuple[Optional[str], Optional[WinRateSketch]]:
+        """표본이 충분한 가장 구체적인 세그먼트 조회"""
+        values = _segment_values(bid_data)
+        for level in SEGMENT_LEVELS:
+            key = segment_key(values, level)
+            sketch = self.segments.get(key)
+            if sketch is not None and sketch.count >= self.min_samples:
+                return key, sketch
+        return None, None
+
+    def fingerprint(self) -> str:
+        """분포 지문 (세그먼트별 bin 카운트 기준)"""
+        payload = json.dumps([self.min_samples, sorted((key, sorted(sketch.bins.items()))
+                                                       for key, sketch in self.segments.items())])
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        data = {
+            'resolution': RESOLUTION,
+            'min_samples': self.min_samples,
+            'segments': {key: sketch.to_dict() for key, sketch in self.segments.items()}
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        print(f"💾 낙찰률 분포 저장: {path} ({len(self.segments)}개 세그먼트)")
+
+    @classmethod
+    def load(cls, path: str) -> 'WinRateCurves':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        curves = cls(min_samples=data.get('min_samples', cls.MIN_SAMPLES))
+        curves.segments = {
+            key: WinRateSketch.from_dict(value) for key, value in data['segments'].items()
+        }
+        return curves
+
+
+def _build_shard(records: List[Dict]) -> WinRateCurves:
+    curves = WinRateCurves()
+    for record in records:
+        curves.add(record)
+    return curves
+
+
+def build_curves(history: List[Dict], workers: int = 1,
+                 min_samples: int = WinRateCurves.MIN_SAMPLES) -> WinRateCurves:
+    """
+    히스토리로부터 낙찰률 분포 구축
+
+    Args:
+        history: 조인된 히스토리 레코드 (history_data.join_bids_awards)
+        workers: 병렬 프로세스 수 (샤드별 구축 후 병합)
+    """
+    if workers <= 1 or len(history) < workers * 1000:
+        curves = _build_shard(history)
+    else:
+        shard_size = math.ceil(len(history) / workers)
+        shards = [history[i:i + shard_size] for i in range(0, len(history), shard_size)]
+        curves = WinRateCurves()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(_build_shard, shards):
+                curves.merge(partial)
+
+    curves.min_samples = min_samples
+    return curves
+
+
+def main():
+    parser = argparse.ArgumentParser(description='낙찰률 경험분포 구축')
+    parser.add_argument('--bids', type=str, help='입찰 데이터 파일 (collected_bids_*.json)')
+    parser.add_argument('--awards', type=str, help='낙찰 데이터 파일 (collected_awards_*.json)')
+    parser.add_argument('--history', type=str, help='조인된 히스토리 파일 (JSON/NDJSON)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='병렬 프로세스 수 (기본: 1)')
+    parser.add_argument('--min-samples', type=int, default=WinRateCurves.MIN_SAMPLES,
+                       help=f'세그먼트 최소 표본 수 (기본: {WinRateCurves.MIN_SAMPLES})')
+    parser.add_argument('--output', type=str, default='./models/win_rate_curves.json',
+                       help='출력 파일 (기본: ./models/win_rate_curves.json)')
+
+    args = parser.parse_args()
+
+    if args.history:
+        history = load_history(args.history)
+    elif args.bids and args.awards:
+        history = load_history(args.bids, args.awards)
+    else:
+        parser.error('--history 또는 --bids/--awards가 필요합니다')
+
+    print(f"📂 히스토리 {len(history)}건 로드 완료")
+    curves = build_curves(history, workers=args.workers, min_samples=args.min_samples)
+
+    overall = curves.segments.get('*')
+    if overall:
+        print(f"📊 전체 낙찰률 분포: p10={overall.quantile(0.1):.2f}% "
+              f"p50={overall.quantile(0.5):.2f}% p90={overall.quantile(0.9):.2f}%")
+
+    curves.save(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -54,10 +54,19 @@ export default function Analytics() {
     try {
       const insightsQuery = query(collection(db, 'insights'))
       const snapshot = await getDocs(insightsQuery)
-      const insightsData = snapshot.docs.map(doc => ({
-        id: doc.id,
-        ...doc.data()
-      } as Insight))
+      // 연도 단위 인사이트만 표시 (낙찰 이력/직전 기간이 없으면 null → 0)
+      const insightsData = snapshot.docs
+        .map(doc => ({
+          id: doc.id,
+          ...doc.data()
+        } as Insight))
+        .filter(insight => !insight.periodType || insight.periodType === 'year')
+        .map(insight => ({
+          ...insight,
+          averageWinRate: insight.averageWinRate ?? 0,
+          averageCompetition: insight.averageCompetition ?? 0,
+          trend: insight.trend ?? 0
+        }))
       
       if (insightsData.length > 0) {
         setInsights(insightsData)
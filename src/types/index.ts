@@ -51,6 +51,7 @@ export interface Insight {
   averageWinRate: number
   averageCompetition: number
   period: string
+  periodType?: 'month' | 'quarter' | 'year'
   trend: number // 증감률
 }
 